@@ -24,7 +24,7 @@ Will determine the fresh-air ventilation flow rates for all the PHPP Rooms in th
 >  If you like, you can pass in a PHPP-Style ventilation schedule into the '_phppVenSched'. If not, this will read the HB Schedule applied to the Zone and use that to create a PHPP-Style schedule with a CONSTANT flow rate.
 >  If you want to use this component to align a PHPP and EP model, use an HB 'Constant Schedule' object and set the zone's ventilation schedule to '1'.
 -
-EM August 1, 2020
+EM Oct. 18, 2026
 
     Args:
         _HBZones: List. A list of all the HB Zones to use.
@@ -39,7 +39,7 @@ EM August 1, 2020
 
 ghenv.Component.Name = "BT_CalcVentFlowRates"
 ghenv.Component.NickName = "Room Vent Flowrates"
-ghenv.Component.Message = 'AUG_01_2020'
+ghenv.Component.Message = 'OCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "01 | Model"
@@ -56,6 +56,7 @@ from Grasshopper import DataTree
 from Grasshopper.Kernel.Data import GH_Path
 import ghpythonlib.components as ghc
 from collections import namedtuple
+from idf2phpp.schedules import PHPP_HourlyProfile, PHPP_ScheduleCache, scheduleKey
 
 # Defs and Classes
 PHPP_Sys_Ventilation = sc.sticky['PHPP_Sys_Ventilation']
@@ -415,6 +416,25 @@ def getHBzoneFloorArea(_HBzoneObj, _zoneGrossFloorArea):
     
     return zoneFloorArea
 
+# The schedules already read, kept between solves (and shared by any component which 
+# reads HB Schedules). Zones often share a schedule, so most are only read once
+scheduleCache = sc.sticky.setdefault('PHPP_ScheduleCache', PHPP_ScheduleCache())
+
+def getOccupancyProfile(_schedName):
+    # Read the HB/EP Schedule's hourly values (only if it isn't in the cache already)
+    def readProfile():
+        result = main(_schedName, None, None, [])
+        if result == -1:
+            return None
+        
+        # Clean up the HB/EP Occupancy Schdeule (remove text header)
+        return PHPP_HourlyProfile.fromHBResult(result[0], _schedName)
+    
+    libEntry = sc.sticky["honeybee_ScheduleLib"].get(str(_schedName).upper())
+    key = scheduleKey(_schedName, _definition=libEntry)
+    
+    return scheduleCache.get(key, readProfile) or PHPP_HourlyProfile([], _schedName)
+
 def getHBLoadAndSched(_HBzoneObj):
     ############################################################################
     # Get the HB/EP Ventilation Loads and Sched for the Zone from the Hive
@@ -432,19 +452,21 @@ def getHBLoadAndSched(_HBzoneObj):
     occupancySchedule = HBZoneSchedules['occupancySchedule']
     
     if occupancySchedule:
-        result = main(occupancySchedule, None, None, [])[0]
+        HBoccupancyProfile = getOccupancyProfile(occupancySchedule)
+    else:
+        HBoccupancyProfile = PHPP_HourlyProfile([])
     
-    # Clean up the HB/EP Occupancy Schdeule (remove text header)
-    HBoccupancySchedualAsValues_ = []
-    for eachItem in result:
-        try:
-            HBoccupancySchedualAsValues_.append(float(eachItem))
-        except:
-            pass
+    if not HBoccupancyProfile.Values:
+        if occupancySchedule:
+            warning = "Couldn't read the Occupancy Schedule '{}' for Zone: '{}'.".format(occupancySchedule, _HBzoneObj.name)
+        else:
+            warning = "Zone: '{}' has no Occupancy Schedule.".format(_HBzoneObj.name)
+        warning += " The Zone's rooms will be set to run at the full fan speed all year."
+        ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
     
-    return HBnumOfPeoplePerArea, HBventilationPerArea, HBventilationPerPerson, HBoccupancySchedualAsValues_
+    return HBnumOfPeoplePerArea, HBventilationPerArea, HBventilationPerPerson, HBoccupancyProfile
 
-def calcZoneAnnualVentFlowRateFromHB(_HBzoneObj, _userVentSched, _zoneGrossFloorArea):
+def calcZoneAnnualVentFlowRateFromHB(_HBzoneObj, _zoneLoads, _zoneGrossFloorArea):
     # Figure out the HB Zone's Floor Area to use (different than TFA)
     zoneFloorArea = getHBzoneFloorArea(_HBzoneObj, _zoneGrossFloorArea)
     
@@ -452,21 +474,17 @@ def calcZoneAnnualVentFlowRateFromHB(_HBzoneObj, _userVentSched, _zoneGrossFloor
         warning = "Something wrong with the floor area - are you sure there is at least one Floor surface in the zone?"
         ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
     
-    # Pull the Ventilaiton loads, Occupancy Schedule from the Hive
-    numOfPeoplePerArea, ventilationPerArea, ventilationPerPerson, zoneOccSchedAsValues = getHBLoadAndSched(_HBzoneObj)
+    # The Ventilaiton loads, Occupancy Schedule from the Hive
+    numOfPeoplePerArea, ventilationPerArea, ventilationPerPerson, zoneOccProfile = _zoneLoads
     
     # Calc the Avg Zone Occupancy
-    avgZoneOccupancy = (sum(zoneOccSchedAsValues) / len(zoneOccSchedAsValues)) * numOfPeoplePerArea * zoneFloorArea
-    
-    # Calc the Hourly Flow rates (m3/h) from the HB Hive Schedule
-    zoneVentilation_forArea = [ventilationPerArea * zoneFloorArea * 60 * 60] * 8760 # m3/s---> m3/h
-    zoneVentilation_forPeople = []
-    for eachHourOccRate in zoneOccSchedAsValues:
-        #zoneVentilation_forPeople.append(eachHourOccRate * numOfPeoplePerArea * zoneFloorArea * ventilationPerPerson * 60 * 60) # m3/s---> m3/h
-        zoneVentilation_forPeople.append( numOfPeoplePerArea * zoneFloorArea * ventilationPerPerson * 60 * 60) # m3/s---> m3/h
+    avgZoneOccupancy = zoneOccProfile.mean() * numOfPeoplePerArea * zoneFloorArea
     
-    zoneVentilation_forArea_Avg = sum(zoneVentilation_forArea) / len(zoneVentilation_forArea)
-    zoneVentilation_forPeople_Avg = sum(zoneVentilation_forPeople) / len(zoneVentilation_forPeople)
+    # Calc the Annual Avg Flow rates (m3/h) from the HB Hive Loads. Neither is reduced
+    # by the occupancy schedule here, so each hour's flow rate is the same all year
+    # and the annual average is just the hourly flow rate
+    zoneVentilation_forArea_Avg = ventilationPerArea * zoneFloorArea * 60 * 60 # m3/s---> m3/h
+    zoneVentilation_forPeople_Avg = numOfPeoplePerArea * zoneFloorArea * ventilationPerPerson * 60 * 60 # m3/s---> m3/h
     zoneVentilation_Total_AnnualAvg = zoneVentilation_forArea_Avg + zoneVentilation_forPeople_Avg
     
     # Return the average Annual Ventialtion Flow rate (m3/h) based on the Zone's HB Schedules
@@ -522,13 +540,17 @@ def setRoomVentFlowRates(_HBzoneObj, _type, _zoneAnnualAvgVentRate):
                     # don't do anything. Leave the rooms as-is
                     pass
 
-def setRoomVentSchedule(_HBzoneObj, _type, _userVentSched, _zoneVentilation_Total_AnnualAvg, _annualAvgZoneFlowRate_Area, _annualAvgZoneFlowRate_PPl, _zoneGrossFloorArea):
-    # Pull the Ventilation loads, Occupancy Schedule from the Hive
-    numOfPeoplePerArea, ventilationPerArea, ventilationPerPerson, zoneOccSchedAsValues = getHBLoadAndSched(_HBzoneObj)
+def setRoomVentSchedule(_HBzoneObj, _zoneLoads, _type, _userVentSched, _zoneVentilation_Total_AnnualAvg, _annualAvgZoneFlowRate_Area, _annualAvgZoneFlowRate_PPl, _zoneGrossFloorArea):
+    # The Ventilation loads, Occupancy Schedule from the Hive
+    numOfPeoplePerArea, ventilationPerArea, ventilationPerPerson, zoneOccProfile = _zoneLoads
     zoneFloorArea = getHBzoneFloorArea(_HBzoneObj, _zoneGrossFloorArea)
     
     # Convert the HB Sched Values for the zone as PHPP-Stly (bined 3)
-    bins, vals = histogram(zoneOccSchedAsValues, 2)
+    if zoneOccProfile.Values:
+        bins, vals = histogram(zoneOccProfile.Values, 2)
+    else:
+        # No Occupancy Schedule (warned about already), so all at the full speed
+        bins, vals = {0:0.0, 1:0.0, 2:1.0}, {0:0.0, 1:0.0, 2:1.0}
     bined_Sched = namedtuple('phppSched', 'speed_high time_high speed_med time_med speed_low time_low')
     hbRoomVentSched = bined_Sched(vals[2], bins[2], vals[1], bins[1], vals[0], bins[0] )
     
@@ -628,6 +650,7 @@ def preview(_zoneObjs):
 if len(_HBZones) > 0:
     HBZoneObjects = hb_hive.callFromHoneybeeHive(_HBZones)
     type = checkInputs(HBZoneObjects, airFlowInput_)
+    cacheStatsBefore = scheduleCache.stats()
     
     for zone in HBZoneObjects:
         # 1) Figure out the Zone's Annual Average Ventilation Flow Rate
@@ -641,15 +664,19 @@ if len(_HBZones) > 0:
         #print '-----'
         #print 'looking at Zone {}'.format(zone.name)
         
+        # Pull the Ventilation loads, Occupancy Schedule from the Hive (once for the zone)
+        zoneLoads = getHBLoadAndSched(zone)
+        
         (annualAvgZoneFlowRate,
         annualAvgZoneFlowRate_Area,
-        annualAvgZoneFlowRate_PPl) = calcZoneAnnualVentFlowRateFromHB(zone, _phppVentSched, zoneGrossFloorArea_)
+        annualAvgZoneFlowRate_PPl) = calcZoneAnnualVentFlowRateFromHB(zone, zoneLoads, zoneGrossFloorArea_)
         
         setRoomVentFlowRates(zone,
                             type,
                             annualAvgZoneFlowRate)
         
         setRoomVentSchedule(zone,
+                            zoneLoads,
                             type,
                             _phppVentSched,
                             annualAvgZoneFlowRate,
@@ -660,6 +687,12 @@ if len(_HBZones) > 0:
         ventilationPerArea_, ventilationPerPerson_ = calcHBzoneVentRates(zone, zoneGrossFloorArea_)
     
     HBZones_ = _HBZones
+    
+    cacheStats = scheduleCache.stats()
+    print 'Read {} Occupancy Schedule(s), re-used {} already read. {} schedule(s) kept for the next solve.'.format(
+            cacheStats['misses'] - cacheStatsBefore['misses'],
+            cacheStats['hits'] - cacheStatsBefore['hits'],
+            cacheStats['entries'])
 
 # ------------------------------------------------------------------------------
 #### Set the Zone's PHPP Ventilation System as Default
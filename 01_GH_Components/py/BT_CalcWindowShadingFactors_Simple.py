@@ -22,9 +22,10 @@
 """
 Will calculate 'shading factors' for each window in the project. Shading factors go from 0 (fully shaded) to 1 (fully unshaded) and are calculated using the simplified numerical method as implemented in the Passive House Planning Package v9.6 and DesignPH 1.5 or earlier.
 Note that this method is much faster, but a bit less accurate than other methods you could use to determine shading factors. Its useful if you just want a quick picture of the shading condition though or if you are trying to mimic the exact procedure of an older style PHPP document.
+Only the windows which could be affected by a change (their own geometry, or shading geometry near them) are re-calculated on each solve. The rest keep their results from the last solve.
 For background and reference on the methodology used, see: "Solar Gains in a Passive House: A Monthly Approach to Calculating Global Irradiaton Entering a Shaded Window" By Andrew Peel, 2007.
 -
-EM June 19, 2020
+EM Oct. 18, 2026
     Args:
         runIt_: (bool) Set to 'True' to run the shading calcuation. May take a few seconds. 
         _latitude: (float) A value for the building's latitude. Use the Ladybug 'ImportEPW' to get this value.
@@ -32,6 +33,7 @@ EM June 19, 2020
         _windowSurrounds: (Tree) Each branch of the tree should represent one window. Each branch should have a list of 4 surfaces corresponding to the Bottom, Left, Top and Right window 'reveals' for windows which are inset into the wall or surface. Use the IDF2PH 'Create Window Reveals' component to automatically create this geometry.
         _bldgEnvelopeSrfcs: (list) The building (HB Zone) surfaces with the windows 'punched' out. Use the IDF2PH 'Create Window Reveals' component to automatically create this geometry.
         _shadingSrfcs: (list) <Optional> Any additional shading geometry (overhangs, neighbors, trees, etc...) you'd like to take into account when generating shading factors. Note that the more elements included, the slower this will run. 
+        workers_: (int) <Optional> EXPERIMENTAL: The number of windows to calculate at the same time (threads). Default is 1 (one at a time). The shading calc uses Grasshopper / rhinoscriptsyntax geometry functions which are not documented as thread-safe, so check the results against a run with 1 before relying on more.
     Returns:
         HBZones_: The updated Honeybee Zone objects to pass along to the next step.
         checklines_: Preview geometry showing the search lines used to find shading geometry.
@@ -42,7 +44,7 @@ EM June 19, 2020
 
 ghenv.Component.Name = "BT_CalcWindowShadingFactors_Simple"
 ghenv.Component.NickName = "Shading Factors | Simple"
-ghenv.Component.Message = 'JUN_19_2020'
+ghenv.Component.Message = 'OCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "01 | Model"
@@ -50,6 +52,7 @@ ghenv.Component.SubCategory = "01 | Model"
 import rhinoscriptsyntax as rs
 import scriptcontext as sc
 import Grasshopper.Kernel as ghk
+from idf2phpp.parallel import mapThreaded
 
 hb_hive = sc.sticky["honeybee_Hive"]()
 HBZoneObjects = hb_hive.callFromHoneybeeHive(_HBZones)
@@ -80,27 +83,61 @@ for branch in _windowSurrounds.Branches:
     for each in branch:
         shadingObjs.append( rs.coercebrep(each) )
 
+# Index the shading geometry once, so each window only tests the objects near it
+if runIt_ and len(_HBZones)>0:
+    shadingObjs = sc.sticky['PHPP_ShadingIndex'](shadingObjs)
+
+def calcWindowShading(_phppWindowObj):
+    _phppWindowObj.calcShadingFactor_Simple( shadingObjs, latitude )
+    return _phppWindowObj
+
 # Calc the Shading Factors for each Window
+# Each window only reads the shading geometry, so they can be calculated in parallel
 if runIt_ and len(_HBZones)>0:
+    phppWindowObjs = []
     for zone in HBZoneObjects:
         for srfc in zone.surfaces:
             if srfc.hasChild == False:
                 continue
             
             for childSrfc in srfc.childSrfs:
-                phppWindowObj = zone.phppWindowDict.get(childSrfc.name, None)
+                phppWindowObjs.append( zone.phppWindowDict.get(childSrfc.name, None) )
                 windowNames_.append(childSrfc.name)
-                
-                phppWindowObj.calcShadingFactor_Simple( shadingObjs, latitude )
-                
-                winter, summer = phppWindowObj.getShadingFactors_Simple()
-                winterShadingFactors_.append(winter)
-                summerShadingFactors_.append(summer)
-                
-                checklines_.append(phppWindowObj.Checkline_hori)
-                checklines_.append(phppWindowObj.Checkline_over)
-                checklines_.append(phppWindowObj.Checkline_side1)
-                checklines_.append(phppWindowObj.Checkline_side2)
+    
+    # Only re-calculate the windows which could have changed since the last solve
+    cacheKey = 'PHPP_ShadingCache_{}'.format(ghenv.Component.InstanceGuid)
+    if cacheKey not in sc.sticky:
+        sc.sticky[cacheKey] = sc.sticky['PHPP_ShadingCache']()
+    shadingCache = sc.sticky[cacheKey]
+    staleWindowObjs = shadingCache.getStaleWindows(phppWindowObjs, shadingObjs, latitude)
+    
+    # One at a time unless asked for more. The geometry functions used aren't known to be thread-safe
+    workers = workers_ if workers_ else 1
+    try:
+        mapThreaded(calcWindowShading, staleWindowObjs, workers)
+    except Exception as e:
+        if workers == 1:
+            raise
+        
+        warning = "Calculating the windows in parallel failed: {}\n"\
+        "Calculating them one at a time instead.".format(e)
+        ghenv.Component.AddRuntimeMessage(ghk.GH_RuntimeMessageLevel.Remark, warning)
+        mapThreaded(calcWindowShading, staleWindowObjs, 1)
+    
+    shadingCache.update(staleWindowObjs, shadingObjs, latitude)
+    print 'Calculated {} of {} windows. The rest were unchanged since the last solve.'.format(len(staleWindowObjs), len(phppWindowObjs))
+    
+    
+    # Outputs in the same order as the windowNames_
+    for phppWindowObj in phppWindowObjs:
+        winter, summer = phppWindowObj.getShadingFactors_Simple()
+        winterShadingFactors_.append(winter)
+        summerShadingFactors_.append(summer)
+        
+        checklines_.append(phppWindowObj.Checkline_hori)
+        checklines_.append(phppWindowObj.Checkline_over)
+        checklines_.append(phppWindowObj.Checkline_side1)
+        checklines_.append(phppWindowObj.Checkline_side2)
 
 # Add modified Surfaces / Zones back to the HB dictionary
 if len(_HBZones)>0:
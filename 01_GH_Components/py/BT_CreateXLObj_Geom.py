@@ -24,7 +24,7 @@ Takes in the E+ objects from the IDF-->PHPP Component and creates simplied
 Excel-ready objects for writing to the PHPP
 Each 'excel-ready' object has a Value, a Cell Range ('A4', 'BB56', etc...) and a Sheet Name
 -
-EM August 22, 2020
+EM Oct. 18, 2026
 
     Args:
         _PHPPObjs: A DataTree of the PHPP Objects to write out to Excel. Connect to the 'PHPPObjs_' in the 'IDF->PHPP Objs' Component.
@@ -49,7 +49,7 @@ EM August 22, 2020
 
 ghenv.Component.Name = "BT_CreateXLObj_Geom"
 ghenv.Component.NickName = "Create Excel Obj - Geom"
-ghenv.Component.Message = 'AUG_22_2020'
+ghenv.Component.Message = 'OCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "02 | IDF2PHPP"
@@ -67,6 +67,9 @@ from collections import defaultdict
 import statistics
 
 # Classes and Defs
+from idf2phpp.convert import (getUvalues, getComponents, getAreas, getWindows, 
+                            getShading, getInfiltration, getLocation, filterName)
+
 PHPP_XL_Obj = sc.sticky['PHPP_XL_Obj'] 
 preview = sc.sticky['Preview']
 PHPP_DHW_System = sc.sticky['PHPP_DHW_System']
@@ -75,269 +78,6 @@ PHPP_DHW_branch_piping = sc.sticky['PHPP_DHW_branch_piping']
 PHPP_DHW_tank = sc.sticky['PHPP_DHW_tank']
 PHPP_DHW_RecircPipe = sc.sticky['PHPP_DHW_RecircPipe']
 
-def getUvalues(_inputBranch):
-    uID_Count = 1
-    uValueUID_Names = []
-    uValuesConstructorStartRow = 10
-    uValuesList = []
-    print 'Creating the U-Values Objects...'
-    for eachConst in _inputBranch:
-        # for each Construction Assembly in the model....
-        
-        # Get the Construction's Name and the Materal Layers in the EP Model
-        construcionNameEP = getattr(eachConst, 'Name')
-        layers = sorted(getattr(eachConst, 'Layers'))
-        intInsuFlag = eachConst.IntInsul if eachConst.IntInsul != None else ''
-        
-        # Filter out any of the Window Constructions
-        isWindow = False
-        opaqueMaterialNames = []
-        for eachMat in _PHPPObjs.Branch(0):
-            opaqueMaterialNames.append(eachMat.Name) # Get all the Opaque Construction Material Names
-        
-        # Check if the material matches any of the Opaque ones
-        for eachLayer in layers:
-            if eachLayer[1] in opaqueMaterialNames:
-                eachLayer[1]
-                break
-            else:
-                # If not... it must be a window (maybe?)
-                isWindow = True
-        
-        if isWindow == True:
-            pass
-        else:
-            # Fix the name to remove 'PHPP_CONST_'
-            if 'PHPP_CONST_' in construcionNameEP:
-                constName_clean = construcionNameEP.split('PHPP_CONST_')[1].replace('_', ' ')
-            else:
-                constName_clean = construcionNameEP.replace('_', ' ')
-            
-            # Create the list of User-ID Constructions to match PHPP
-            uValueUID_Names.append('{:02d}ud-{}'.format(uID_Count, constName_clean) )
-            
-            # Create the Objects for the Header Piece (Name, Rsi, Rse)
-            nameAddress = '{}{}'.format('M', uValuesConstructorStartRow + 1) # Construction Name
-            rSi = '{}{}'.format('M', uValuesConstructorStartRow + 3) # R-surface-int
-            rSe = '{}{}'.format('M', uValuesConstructorStartRow + 4) # R-surface-ext
-            intIns = '{}{}'.format('S', uValuesConstructorStartRow + 1) # Interior Insulation Flag
-            
-            uValuesList.append( PHPP_XL_Obj('U-Values', nameAddress, constName_clean))
-            uValuesList.append( PHPP_XL_Obj('U-Values', rSi, 0, 'M2K/W', 'HR-FT2-F/BTU'))
-            uValuesList.append( PHPP_XL_Obj('U-Values', rSe, 0, 'M2K/W', 'HR-FT2-F/BTU')) # For now, zero out
-            if eachConst.IntInsul != None:
-                uValuesList.append( PHPP_XL_Obj('U-Values', intIns, 'x'))
-            
-            # Create the actual Material Layers for PHPP U-Value
-            layerCount = 0
-            for layer in layers:
-                # For each layer in the Construction Assembly...
-                for eachMatLayer in  _PHPPObjs.Branch(0):
-                    # See if the Construction's Layer material name matches one in the Materials list....
-                    # If so, use those parameters from the Material Layer
-                    if layer[1] == getattr(eachMatLayer, 'Name'):
-                        # Filter out any MASSLAYERs
-                        if layer[1] != 'MASSLAYER':
-                            
-                            # Clean the name
-                            if 'PHPP_MAT_' in layer[1]:
-                                layerMatName = layer[1].split('PHPP_MAT_')[1].replace('_', ' ')
-                            else:
-                                layerMatName = layer[1].replace('_', ' ')
-                            
-                            layerNum = layer[0]
-                            layerMatCond = getattr(eachMatLayer, 'LayerConductivity')
-                            layerThickness = getattr(eachMatLayer, 'LayerThickness')*1000 # Cus PHPP uses mm for thickness
-                            
-                            # Set up the Range tagets
-                            layer1Address_L = '{}{}'.format('L', uValuesConstructorStartRow + 7 + layerCount) # Material Name
-                            layer1Address_M = '{}{}'.format('M', uValuesConstructorStartRow + 7 + layerCount) # Conductivity
-                            layer1Address_S = '{}{}'.format('S', uValuesConstructorStartRow + 7 + layerCount) # Thickness
-                            
-                            # Create the Layer Objects
-                            uValuesList.append( PHPP_XL_Obj('U-Values', layer1Address_L, layerMatName))# Material Name
-                            uValuesList.append( PHPP_XL_Obj('U-Values', layer1Address_M, layerMatCond, 'W/MK', 'HR-FT2-F/BTU-IN')) # Conductivity
-                            uValuesList.append( PHPP_XL_Obj('U-Values', layer1Address_S, layerThickness, 'MM', 'IN')) # Thickness
-                            
-                            layerCount+=1
-            
-            uID_Count += 1
-            uValuesConstructorStartRow += 21
-    
-    return uValuesList, uValueUID_Names
-
-def getComponents(_inputBranch):
-    winComponentStartRow = 15
-    frame_Count = 0
-    glass_Count = 0
-    winComponentsList = []
-    glassNameDict = {}
-    frameNameDict = {}
-    
-    print('Creating the Components:Window Objects...')
-    
-    for eachWin in _inputBranch:
-        # For each PHPP Style Window Object in the model....
-        
-        ########## Glass ##########
-        # Pull out the Glass info from the window
-        gNm = getattr(eachWin.Type_Glass, 'Name')
-        gV = getattr(eachWin.Type_Glass, 'gValue')
-        uG = getattr(eachWin.Type_Glass, 'uValue')
-        
-        if gNm not in glassNameDict.keys():
-            # Add the new glass type to the dict of UD Names:
-            # ie: {'Ikon: SDH': '01ud-Ikon: SDH', ....}
-            glassNameDict[gNm] = '{:02d}ud-{}'.format(glass_Count+1, gNm)
-            
-            # Set the glass range addresses
-            Address_Gname = '{}{}'.format('IE', winComponentStartRow + glass_Count) # Name
-            Address_Gvalue = '{}{}'.format('IF', winComponentStartRow + glass_Count) # g-Value
-            Address_Uvalue = '{}{}'.format('IG', winComponentStartRow + glass_Count) # U-Value
-            
-            # Create the PHPP write Objects
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Gname, gNm))# Glass Type Name
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Gvalue, gV))# g-Value
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uvalue, uG, 'W/M2K', 'BTU/HR-FT2-F' ))# U-Value
-            
-            glass_Count +=1
-            
-        # Add the new PHPP UD Glass Name to the Window:Simple Object
-        setattr(eachWin, 'UD_glass_Name', glassNameDict[gNm] )
-        
-        ########## Frames ##########
-        # Get the Frame info
-        fNm = getattr(eachWin.Type_Frame, 'Name')
-        uF_L, uF_R, uF_B, uF_T  = eachWin.Type_Frame.uLeft, eachWin.Type_Frame.uRight, eachWin.Type_Frame.uBottom, eachWin.Type_Frame.uTop
-        wF_L, wF_R, wF_B, wF_T  = eachWin.Type_Frame.fLeft, eachWin.Type_Frame.fRight, eachWin.Type_Frame.fBottom, eachWin.Type_Frame.fTop
-        psiG_L, psiG_R, psiG_B, psiG_T  = eachWin.Type_Frame.psigLeft, eachWin.Type_Frame.psigRight, eachWin.Type_Frame.psigBottom, eachWin.Type_Frame.psigTop
-        psiI_L, psiI_R, psiI_B, psiI_T  = eachWin.Type_Frame.psiInstLeft, eachWin.Type_Frame.psiInstRight, eachWin.Type_Frame.psiInstBottom, eachWin.Type_Frame.psiInstTop
-        
-        if fNm not in frameNameDict.keys():
-            # Add the new frame type to the dict of UD Names:
-            # ie: {'Ikon: SDH': '01ud-Ikon: SDH', ....}
-            frameNameDict[fNm] = '{:02d}ud-{}'.format(frame_Count+1, fNm) # was glass_count????
-            
-            # Set the frame range address
-            Address_Fname = '{}{}'.format('IL', winComponentStartRow + frame_Count)
-            Address_Uf_Left = '{}{}'.format('IM', winComponentStartRow + frame_Count)
-            Address_Uf_Right = '{}{}'.format('IN', winComponentStartRow + frame_Count)
-            Address_Uf_Bottom = '{}{}'.format('IO', winComponentStartRow + frame_Count)
-            Address_Uf_Top = '{}{}'.format('IP', winComponentStartRow + frame_Count)
-            Address_W_Left = '{}{}'.format('IQ', winComponentStartRow + frame_Count)
-            Address_W_Right = '{}{}'.format('IR', winComponentStartRow + frame_Count)
-            Address_W_Bottom = '{}{}'.format('IS', winComponentStartRow + frame_Count)
-            Address_W_Top = '{}{}'.format('IT', winComponentStartRow + frame_Count)
-            Address_Psi_g_Left = '{}{}'.format('IU', winComponentStartRow + frame_Count)
-            Address_Psi_g_Right = '{}{}'.format('IV', winComponentStartRow + frame_Count)
-            Address_Psi_g_Bottom = '{}{}'.format('IW', winComponentStartRow + frame_Count)
-            Address_Psi_g_Top = '{}{}'.format('IX', winComponentStartRow + frame_Count)
-            Address_Psi_I_Left = '{}{}'.format('IY', winComponentStartRow + frame_Count)
-            Address_Psi_I_Right = '{}{}'.format('IZ', winComponentStartRow + frame_Count)
-            Address_Psi_I_Bottom = '{}{}'.format('JA', winComponentStartRow + frame_Count)
-            Address_Psi_I_Top = '{}{}'.format('JB', winComponentStartRow + frame_Count)
-            
-            # Create the PHPP Objects for the Frames
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Fname, fNm))# Frame Type Name
-            
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Left, uF_L, 'W/M2K', 'BTU/HR-FT2-F')) # Frame Type U-Values
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Right, uF_R, 'W/M2K', 'BTU/HR-FT2-F'))
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Bottom, uF_B, 'W/M2K', 'BTU/HR-FT2-F'))
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Top, uF_T, 'W/M2K', 'BTU/HR-FT2-F'))
-            
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Left, wF_L, 'M', 'IN')) # Frame Type Widths
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Right, wF_R, 'M', 'IN'))
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Bottom, wF_B, 'M', 'IN'))
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Top, wF_T, 'M', 'IN'))
-            
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Left, psiG_L, 'W/MK', 'BTU/HR-FT-F')) # Frame Type Psi-Glazing
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Right, psiG_R, 'W/MK', 'BTU/HR-FT-F'))
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Bottom, psiG_B, 'W/MK', 'BTU/HR-FT-F'))
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Top, psiG_T, 'W/MK', 'BTU/HR-FT-F'))
-            
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Left, psiI_L, 'W/MK', 'BTU/HR-FT-F')) # Frame Type Psi-Installs
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Right, psiI_R, 'W/MK', 'BTU/HR-FT-F'))
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Bottom, psiI_B, 'W/MK', 'BTU/HR-FT-F'))
-            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Top, psiI_T, 'W/MK', 'BTU/HR-FT-F'))
-            
-            frame_Count +=1
-            
-        # Add the PHPP UD Frame Name to the Window:Simple Object
-        setattr(eachWin, 'UD_frame_Name', frameNameDict[fNm] )
-    
-    return winComponentsList
-
-def getAreas(_inputBranch, _zones):
-    areasRowStart = 41
-    areaCount = 0
-    uID_Count = 1
-    areasList = []
-    surfacesIncluded = []
-    print "Creating the 'Areas' Objects..."
-    for surface in _inputBranch:
-        # for each Opaque Surface in the model....
-        
-        # First, see if the Surface should be included in the output
-        for eachZoneName in _zones:
-            if surface.HostZoneName == eachZoneName:
-                includeSurface = True
-                break
-            else:
-                includeSurface = False
-        
-        if includeSurface:
-            # Get the Surface Parameters
-            nm = getattr(surface, 'Name')
-            groupNum = getattr(surface, 'GroupNum')
-            quantity = 1
-            surfaceArea = getattr(surface, 'SurfaceArea')
-            assemblyName = getattr(surface, 'AssemblyName').replace('_', ' ') 
-            angleFromNorth = getattr(surface, 'AngleFromNorth')
-            angleFromHoriz = getattr(surface, 'AngleFromHoriz')
-            shading = getattr(surface, 'Factor_Shading')
-            abs = getattr(surface, 'Factor_Absorptivity')
-            emmis = getattr(surface, 'Factor_Emissivity')
-            
-            # Find the right UID name (with the numeric prefix)
-            for uIDName in uValueUID_Names:
-                if assemblyName in uIDName[5:] or uIDName[5:] in assemblyName: # compare to slice without prefix
-                    assemblyName = uIDName
-            
-            # Setup the Excel Address Locations
-            Address_Name = '{}{}'.format('L', areasRowStart + areaCount)
-            Address_GroupNum = '{}{}'.format('M', areasRowStart + areaCount)
-            Address_Quantity = '{}{}'.format('P', areasRowStart + areaCount)
-            Address_Area = '{}{}'.format('V', areasRowStart + areaCount)
-            Address_Assembly = '{}{}'.format('AC', areasRowStart + areaCount)
-            Address_AngleNorth = '{}{}'.format('AG', areasRowStart + areaCount)
-            Address_AngleHoriz = '{}{}'.format('AH', areasRowStart + areaCount)
-            Address_ShadingFac = '{}{}'.format('AJ', areasRowStart + areaCount)
-            Address_Abs = '{}{}'.format('AK', areasRowStart + areaCount)
-            Address_Emmis = '{}{}'.format('AL', areasRowStart + areaCount)
-            
-            areasList.append( PHPP_XL_Obj('Areas', Address_Name, nm))# Surface Name
-            areasList.append( PHPP_XL_Obj('Areas', Address_GroupNum, groupNum))# Surface Group Number
-            areasList.append( PHPP_XL_Obj('Areas', Address_Quantity, quantity))# Surface Quantity
-            areasList.append( PHPP_XL_Obj('Areas', Address_Area, surfaceArea, 'M2', 'FT2'))# Surface Area (m2)
-            areasList.append( PHPP_XL_Obj('Areas', Address_Assembly, assemblyName))# Assembly Type Name
-            areasList.append( PHPP_XL_Obj('Areas', Address_AngleNorth, angleFromNorth))# Orientation Off North
-            areasList.append( PHPP_XL_Obj('Areas', Address_AngleHoriz, angleFromHoriz))# Orientation Off Horizontal
-            areasList.append( PHPP_XL_Obj('Areas', Address_ShadingFac, shading))# Shading Factor
-            areasList.append( PHPP_XL_Obj('Areas', Address_Abs, abs))# Absorptivity
-            areasList.append( PHPP_XL_Obj('Areas', Address_Emmis, emmis))# Emmissivity
-            
-            # Add the PHPP UD Surface Name to the Surface Object
-            setattr(surface, 'UD_Srfc_Name', '{:d}-{}'.format(uID_Count, nm) )
-            
-            # Keep track of which Surfaces are included in the output
-            surfacesIncluded.append(nm)
-            
-            uID_Count += 1
-            areaCount += 1
-    
-    areasList.append( PHPP_XL_Obj('Areas', 'L19', 'Suspended Floor') )
-    return areasList, surfacesIncluded
-
 def getThermalBridges(_inputBranch, _startRows):
     tb_RowStart = _startRows.get('Areas').get('TB')
     tb_List = []
@@ -364,110 +104,6 @@ def getThermalBridges(_inputBranch, _startRows):
     
     return tb_List
 
-def getWindows(_inputBranch, _surfacesIncluded, _srfcBranch):
-    windowsRowStart = 24
-    windowsCount = 0
-    winSurfacesList = []
-    
-    print "Creating the 'Windows' Objects..."
-    for window in _inputBranch:
-        # for each Window Surface Object in the model....
-        # Get the window's basic params
-        quant = getattr(window, 'Quantity')
-        nm = getattr(window, 'Name')
-        w = getattr(window, 'Width')
-        h = getattr(window, 'Height')
-        host = getattr(window, 'HostSrfc')
-        glassType = getattr(window.Type_Glass, 'Name')
-        frameType = getattr(window.Type_Frame, 'Name')
-        glassTypeUD = getattr(window, 'UD_glass_Name')
-        frameTypeUD = getattr(window, 'UD_frame_Name')
-        variantType = getattr(window, 'Type_Variant', 'a')
-        
-        # See if the Window should be included in the output
-        includeWindow = False
-        for eachSurfaceName in _surfacesIncluded:
-            if eachSurfaceName == host:
-                includeWindow = True
-                break
-            else:
-                includeWindow = False
-        
-        if includeWindow:
-            # Find the Window's Host Surface UD
-            for srfc in _srfcBranch:
-                if host == getattr(srfc, 'Name'):
-                    hostUD = getattr(srfc, 'UD_Srfc_Name')
-           
-           # Get the Window Range Addresses
-            Address_varType = '{}{}'.format('F', windowsRowStart + windowsCount)
-            Address_winQuantity = '{}{}'.format('L', windowsRowStart + windowsCount)
-            Address_winName = '{}{}'.format('M', windowsRowStart + windowsCount)
-            Address_w = '{}{}'.format('Q', windowsRowStart + windowsCount)
-            Address_h = '{}{}'.format('R', windowsRowStart + windowsCount)
-            Address_hostName = '{}{}'.format('S', windowsRowStart + windowsCount)
-            Address_glassType = '{}{}'.format('T', windowsRowStart + windowsCount)
-            Address_frameType = '{}{}'.format('U', windowsRowStart + windowsCount)
-            Address_install_Left = '{}{}'.format('AA', windowsRowStart + windowsCount)
-            Address_install_Right = '{}{}'.format('AB', windowsRowStart + windowsCount)
-            Address_install_Bottom = '{}{}'.format('AC', windowsRowStart + windowsCount)
-            Address_install_Top = '{}{}'.format('AD', windowsRowStart + windowsCount)
-            
-            # Create the PHPP Window Object
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_varType, variantType)) # Quantity
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_winQuantity, quant)) # Quantity
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_winName, nm)) # Name
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_w, w, 'M', 'FT')) # Width
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_h, h, 'M', 'FT')) # Height
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_hostName, hostUD)) # Host Name
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_glassType, glassTypeUD)) # Glass UD Name
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_frameType, frameTypeUD)) # Frame UD Name
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Left, window.Installs.Inst_L)) # Install Condition Left
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Right, window.Installs.Inst_R)) # Install Condition Right
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Bottom, window.Installs.Inst_B)) # Install Condition Bottom
-            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Top, window.Installs.Inst_T)) # Install Condition Top
-            
-            windowsCount += 1
-            
-    return winSurfacesList
-
-def getShading(_inputBranch, _surfacesIncluded):
-    shadingRowStart = 17
-    shadingCount = 0
-    shadingList = []
-    print "Creating the 'Shading' Objects..."
-    for window in _inputBranch:
-        # for each Window IDF Object in the model....
-        
-        # First, see if the Window should be included in the output
-        host = getattr(window, 'HostSrfc')
-        includeWindow = False
-        for eachSurfaceName in _surfacesIncluded:
-            if eachSurfaceName == host:
-                includeWindow = True
-                break
-            else:
-                includeWindow = False
-        
-        if includeWindow:
-            # Get the Window's shading Params
-            try:
-                winterShadingFactor = getattr(window, 'winterShadingFac')
-                summerShadingFactor = getattr(window, 'summerShadingFac')
-            except:
-                winterShadingFactor = 0.75
-                summerShadingFactor = 0.75
-            
-            # Create the PHPP Objects
-            Address1_start = '{}{}'.format('AF', shadingRowStart + shadingCount)
-            Address1_end = '{}{}'.format('AG', shadingRowStart + shadingCount)
-            shadingList.append( PHPP_XL_Obj( 'Shading', Address1_start , winterShadingFactor))
-            shadingList.append( PHPP_XL_Obj( 'Shading', Address1_end , summerShadingFactor))
-            
-            shadingCount += 1
-        
-    return shadingList
-
 def getTFA(tfaFromUser, tfaBranch, _zones):
     ##########################################
     ##############     TFA     ###############
@@ -835,44 +471,6 @@ def getNonResRoomData(_inputBranch, _zones, _startRows):
     
     return elecNonRes
 
-def getInfiltration(_inputBranch, _zonesToInclude):
-    ##########################################
-    ######   Envelope Airtightness    ########
-    
-    # Defaults
-    Coef_E = 0.07
-    Coef_F  = 15
-    bldgWeightedACH = None
-    bldgVn50 = None
-    
-    # Find the Floor-Area Weighted Average ACH of the Zones
-    zonesVn50 = []
-    zonesFloorArea = []
-    zonesWeightedACH = []
-    
-    for zoneNametoInclude in _zonesToInclude:
-        for zoneObj in _inputBranch:
-            if zoneObj.ZoneName == zoneNametoInclude:
-                try:
-                    zonesFloorArea.append(zoneObj.FloorArea_Gross if zoneObj.FloorArea_Gross else False)
-                    zonesWeightedACH.append(zoneObj.InfiltrationACH50 * zoneObj.FloorArea_Gross)
-                    zonesVn50.append(zoneObj.Volume_Vn50)
-                except:
-                    pass
-    
-    if sum(zonesFloorArea)!= 0:
-        bldgWeightedACH = sum(zonesWeightedACH) / sum(zonesFloorArea)
-        bldgVn50 = sum(zonesVn50)
-    
-    airtightness = []
-    print("Creating the Airtightness Objects...")
-    airtightness.append(PHPP_XL_Obj('Ventilation', 'N25', Coef_E if Coef_E else float(0.07) ))# Wind protection E
-    airtightness.append(PHPP_XL_Obj('Ventilation', 'N26', Coef_F if Coef_F else float(15) ))# Wind protection F
-    airtightness.append(PHPP_XL_Obj('Ventilation', 'N27', bldgWeightedACH if bldgWeightedACH else float(0.6) ))# ACH50
-    airtightness.append(PHPP_XL_Obj('Ventilation', 'P27', bldgVn50 if bldgVn50 else '=N9*1.2', 'M3', 'FT3' ))#  Internal Reference Volume
-    
-    return airtightness
-
 def updateStartRows(_startRowDict, _udIn):
     """Takes in the dictionary of start rows and any user-determined inputs
     modifies the dict values based on iputs. This is useful if the user has
@@ -891,14 +489,6 @@ def updateStartRows(_startRowDict, _udIn):
     
     return _startRowDict
 
-def filterName(_zoneName, _zonesNamesToFilter):
-    flag = True
-    for each in _zonesNamesToFilter:
-        if each in _zoneName:
-            flag = False
-    
-    return flag
-
 def getGround(_floorElements, _zones):
     ground = []
     
@@ -1236,21 +826,6 @@ def combineDHWSystems(_dhwSystems):
     
     return combinedDHWSys
 
-def getLocation(_locationObjs):
-    climate = []
-    
-    if len(_locationObjs) == 0:
-        return climate
-    
-    loc = _locationObjs[0]
-    print("Creating the 'Climate' Objeects...")
-    climate.append( PHPP_XL_Obj('Climate', 'D9', loc.Country if loc else 'US-United States of America' )) # Climate Data Set Name (Dropdown)
-    climate.append( PHPP_XL_Obj('Climate', 'D10', loc.Region if loc else 'New York' )) # Climate Data Set Name (Dropdown)
-    climate.append( PHPP_XL_Obj('Climate', 'D12', loc.DataSet if loc else 'US0055b-New York' )) # Climate Data Set Name (Dropdown)
-    climate.append( PHPP_XL_Obj('Climate', 'D18', loc.Altitude if loc else '=D17' )) # Altitude
-    
-    return climate
-
 ##########################################
 # Figure out the right Rows to start writing
 # Modify values based on user input (if any)
@@ -1286,9 +861,9 @@ if _PHPPObjs.BranchCount>0:
 # Construct the Excel-Ready Write Objects
 toPHPP_Geom_ = DataTree[Object]() # Master tree to hold all the results
 if _PHPPObjs.BranchCount != 0:
-    uValuesList, uValueUID_Names    = getUvalues( _PHPPObjs.Branch(1) )
+    uValuesList, uValueUID_Names    = getUvalues( _PHPPObjs.Branch(1), _PHPPObjs.Branch(0) )
     winComponentsList               = getComponents( _PHPPObjs.Branch(5) )
-    areasList, surfacesIncluded     = getAreas( _PHPPObjs.Branch(4), zones )
+    areasList, surfacesIncluded     = getAreas( _PHPPObjs.Branch(4), zones, uValueUID_Names )
     tb_List                         = getThermalBridges( thermalBridges_, startRows)
     winSurfacesList                 = getWindows( _PHPPObjs.Branch(5), surfacesIncluded, _PHPPObjs.Branch(4) )   
     shadingList                     = getShading( _PHPPObjs.Branch(5), surfacesIncluded )
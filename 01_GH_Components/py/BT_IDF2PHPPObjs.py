@@ -22,11 +22,11 @@
 """
 Takes in the IDF 'Objects' from the reader and organizes them for export to the PHPP. Gets all the relevant Materials, Constructions and Surfaces from the IDF file.
 -
-EM August 1, 2020
+EM Oct. 18, 2026
 
     Args:
         _HBZones: <Optional> If connected, the component will try and read detailed 'Frame' and 'Glass' Object data for each window in building. If this isn't hooked up, the normal EP windows will be used to create PHPP-Style Window Components. 
-        _IDF_Objs_List: Takes in a list if IDF objects. Connect to the 'IDF_Objs_List' output on the 'IDF Reader' Component
+        _IDF_Objs_List: Takes in the IDF Model (or a list of IDF objects). Connect to the 'IDF_Objs_List' output on the 'IDF Reader' Component
     Returns:
         opaqueSurfaces: A List of the opaque surface IDF Objects found 
         windowObjects: A List of the window surface IDF Objects found
@@ -36,7 +36,7 @@ EM August 1, 2020
 
 ghenv.Component.Name = "BT_IDF2PHPPObjs"
 ghenv.Component.NickName = "IDF-->PHPP Objs"
-ghenv.Component.Message = 'AUG_01_2020'
+ghenv.Component.Message = 'OCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "02 | IDF2PHPP"
@@ -49,183 +49,28 @@ import scriptcontext as sc
 from collections import namedtuple
 import ghpythonlib.components as ghc
 import math
-import copy
 from collections import defaultdict
 
 # Classes and Defs
+from idf2phpp.convert import parseIDFObjects, filterConstructions, getIDFWindowObjects, filterSurfaces
+from idf2phpp.climate import findNearestPHPPclimateZone
+
 preview=sc.sticky['Preview']
-phpp_calcNorthAngle=sc.sticky['phpp_calcNorthAngle']
-phpp_GetWindowSize=sc.sticky['phpp_GetWindowSize']
+idf2ph_ghWarnings = sc.sticky['idf2ph_ghWarnings']
 phpp_makeHBMaterial=sc.sticky['phpp_makeHBMaterial']
 phpp_makeHBConstruction=sc.sticky['phpp_makeHBConstruction']
 
 phpp_ClimateData = sc.sticky['phpp_ClimateData']
 
 PHPP_XL_Obj=sc.sticky['PHPP_XL_Obj']
-PHPP_Glazing=sc.sticky['PHPP_Glazing']
-PHPP_Frame=sc.sticky['PHPP_Frame']
-PHPP_Window_Install=sc.sticky['PHPP_Window_Install']
-PHPP_ClimateDataSet = sc.sticky['PHPP_ClimateDataSet']
 
-IDF_Zone = sc.sticky['IDF_Zone']
-IDF_ZoneInfilFlowRate = sc.sticky['IDF_ZoneInfilFlowRate']
-IDF_ZoneList = sc.sticky['IDF_ZoneList']
-IDF_Obj_building=sc.sticky['IDF_Obj_building']
-IDF_Obj_MaterialLayer=sc.sticky['IDF_Obj_MaterialLayer']
-IDF_Obj_MaterialWindowSimple=sc.sticky['IDF_Obj_MaterialWindowSimple']
-IDF_Obj_MaterialWindowGlazing = sc.sticky['IDF_Obj_MaterialWindowGlazing']
-IDF_Obj_MaterialWindowGas = sc.sticky['IDF_Obj_MaterialWindowGas']
-IDF_Obj_Construction=sc.sticky['IDF_Obj_Construction']
+IDF_Model = sc.sticky['IDF_Model']
 IDF_Obj_surfaceWindow=sc.sticky['IDF_Obj_surfaceWindow']
 IDF_Obj_surfaceOpaque=sc.sticky['IDF_Obj_surfaceOpaque']
-IDF_Obj_location = sc.sticky['IDF_Obj_location']
 
 hb_hive = sc.sticky["honeybee_Hive"]()
 HBZoneObjects = hb_hive.callFromHoneybeeHive(_HBZones)
 
-def parseIDFObjects(_IDF_Objs):
-    # Looks at the IDF Objects and parses them  out
-    # Builds class objects as appropriate
-    zones = []
-    zoneInfiltrationRates = []
-    zonesList = []
-    opaqueMaterials = []
-    windowMaterialsSimple = {}
-    windowMaterialGas = {}
-    windowMaterialGlazing = {}
-    allConstructions = []
-    opaqueSurfaces = []
-    location = []
-    
-    # First, need to find the North Direction. Have to do that before the rest
-    for each in _IDF_Objs:
-    # Look at each of the IDF objects coming in....
-        try:
-            idfObjName = getattr(each, 'objName')
-        except:
-            idfObjName = ''
-        
-        if idfObjName == 'Building':
-            # If the IDF Obj is a 'Building'
-            # Create the Building Object and get the Project's North Angle Vector
-            bldg = IDF_Obj_building(each)
-            bldgNorthVec = bldg.NorthVector
-    
-    # Now go through and pull out each class object
-    for eachIDFobj in _IDF_Objs:
-        try:
-            idfObjName = getattr(eachIDFobj, 'objName')
-        except:
-            idfObjName = ''
-        
-        # If its an opaque Building Surface object
-        if 'BuildingSurface:Detailed' in idfObjName:
-            opaqueSurfaces.append(  IDF_Obj_surfaceOpaque(eachIDFobj, bldgNorthVec)  )
-        
-        # If its a 'Material' or 'Material:AirGap' object
-        elif idfObjName == 'Material:AirGap' or idfObjName == 'Material':
-            opaqueMaterials.append( IDF_Obj_MaterialLayer(eachIDFobj) )
-        
-        elif idfObjName == 'Material:NoMass':
-            opaqueMaterials.append( IDF_Obj_MaterialLayer(eachIDFobj, noMass=True) )
-        
-        # If its a simple EP Style Window Material
-        elif 'WindowMaterial:SimpleGlazingSystem' in idfObjName:
-            windowMaterialsSimple[eachIDFobj.Name] = IDF_Obj_MaterialWindowSimple(eachIDFobj)
-        
-        elif 'WindowMaterial:Gas' in idfObjName:
-            windowMaterialGas[eachIDFobj.Name]  = IDF_Obj_MaterialWindowGas( eachIDFobj )
-        
-        elif 'WindowMaterial:Glazing' in idfObjName:
-            windowMaterialGlazing[eachIDFobj.Name]  = IDF_Obj_MaterialWindowGlazing( eachIDFobj )
-        
-        elif 'Construction' in idfObjName:
-            allConstructions.append( IDF_Obj_Construction( eachIDFobj )  )
-        
-        elif idfObjName == 'Zone':
-            newObj = IDF_Zone( eachIDFobj )
-            zones.append( IDF_Zone( eachIDFobj ) )
-        
-        elif idfObjName == 'ZoneList':
-            zonesList.append( IDF_ZoneList( eachIDFobj ) )
-            
-        elif 'ZoneInfiltration:DesignFlowRate' in idfObjName:
-            zoneInfiltrationRates.append( IDF_ZoneInfilFlowRate( eachIDFobj  ) )
-        
-        elif 'Site:Location' in idfObjName:
-            location = eachIDFobj
-            
-    return opaqueSurfaces, opaqueMaterials, windowMaterialsSimple, windowMaterialGas, windowMaterialGlazing, allConstructions, zones, zoneInfiltrationRates, zonesList, location
-
-def materialWindowSimpleFromLayers(_const):
-    # If its a Window 'construction' of multiple layers, calc an approximate effective Uw
-    # https://bigladdersoftware.com/epx/docs/8-5/engineering-reference/window-heat-balance-calculation.html#equivalent-layer-thermal-model
-    # NOTE: Not doing this correctly right now. Neglecting radiation of convective effects. Only a super simplified approximiation for now....
-    
-    class temp:
-        # temp holder for params to pass
-        def __init__(self):
-            pass
-    
-    # Ok... so its a window with multiple layers. So need to calc equiv conductivity
-    newWinUg = [0.04, 0.13] # Start with the Surface Film Resistances...
-    for eachLayer in _const.Layers:
-        if eachLayer[1] in windowMaterialGlazing:
-            newWinUg.append( 1 / windowMaterialGlazing[ eachLayer[1] ].uValue ) # Resistance of Glass Layers
-        elif eachLayer[1] in windowMaterialGas:
-            newWinUg.append( 1 / windowMaterialGas[ eachLayer[1] ].uValue * 0.5 ) # Resistance of Gas Layers
-    newWinUg = 1/sum(newWinUg)
-    
-    # Create a New WindowMaterial:SimpleGlazingSystem Object to approximate this built-up construction
-    tempObj = temp()
-    setattr(tempObj, 'U-Factor {W/m2-K}', newWinUg)
-    setattr(tempObj, 'Solar Heat Gain Coefficient', 0.4)
-    setattr(tempObj, 'Visible Transmittance', 0.75)
-    setattr(tempObj, 'Name', _const.Name)
-    
-    return IDF_Obj_MaterialWindowSimple( tempObj )
-
-def filterConstructions(_allConst, _materialsWindowSimple, _windowMaterialGas, _windowMaterialGlazing):
-    # Takes in all the construction and splits them into 
-    # Window and Opaque constructions
-    
-    opaqueConstructions = []
-    windowConstructionsSimple = {}
-    
-    for construction in allConstructions:
-        isWindow = False
-        
-        # Is it a Window Construction?
-        # If the Construction includes any materials found in the WindowMaterialsSimple, WindowGas or WindowGlazing, then yes
-        for eachMat in _materialsWindowSimple.keys():
-            if _materialsWindowSimple[eachMat].Name in construction.LayerNames:
-                 isWindow = True
-        for eachMat in _windowMaterialGas:
-            if eachMat in construction.LayerNames:
-                 isWindow = True
-        for eachMat in _windowMaterialGlazing:
-            if eachMat in construction.LayerNames:
-                 isWindow = True
-        
-        # Now branch off the construction as appropriate
-        if isWindow==True:
-            # Its a window, so add to the Window Construction list
-            
-            if len(construction.Layers) > 1:
-                # Its a built up window. So turn that into a Simple Window
-                # Modify window construction using approximation and create a 'Simple' Window
-                materialWindowSimple = materialWindowSimpleFromLayers( construction )  # Create a new MaterialWindowSimple
-                _materialsWindowSimple[construction.Name] = materialWindowSimple       # Add the new MaterialWindowSimple to the list
-                construction.Layers = [ ['Layer1', materialWindowSimple.Name]  ]       # Change the Construction Layers to ONLY include the MaterialWindowSimple now  
-                windowConstructionsSimple[construction.Name] = construction            # Add the modified window construction to the list
-            else:
-                windowConstructionsSimple[construction.Name] =  construction
-        else:
-            # its not a window, so add to the Opaque Construction List
-            opaqueConstructions.append( construction )
-    
-    return opaqueConstructions, windowConstructionsSimple, _materialsWindowSimple
-
 def getPHPPRooms(_HBZoneObjects):
     # Looks at for all the rooms and ventilation systems
     
@@ -251,93 +96,6 @@ def getPHPPRooms(_HBZoneObjects):
         
     return HBZonePHPPRooms, HBZoneVentSystems
 
-def getIDFWindowObjects(_IDF_Objs, _windowConstructionsSimple, _windowMaterialsSimple):
-    # Finds all  the widnow surfaces and builds window objects
-    windowSurfaces = []
-    windowObjs_raw = []
-    windowObjs_filtered = []
-    windowObjs_triangulated = {}
-    
-    for eachIDFobj in _IDF_Objs:
-        try:
-            idfObjName = getattr(eachIDFobj, 'objName')
-            
-        except:
-            idfObjName = ''
-        
-        # If its an EP Window Object
-        if 'FenestrationSurface:Detailed' in idfObjName:
-            windowObjs_raw.append(eachIDFobj)
-    
-    ##################################################
-    # Fix for window triangulation
-    for windowObj in windowObjs_raw:
-        # Honeybee adds the code '..._glzP_0, ..._glzP_1, etc..' suffix to the name for its triangulated windows
-        if '_glzP_' in windowObj.Name:
-            # See if it has only 3 vertices as well just to double check
-            numOfVerts = 0
-            for key in windowObj.__dict__.keys():
-                if 'XYZ Vertex' in key:
-                    numOfVerts += 1
-            if numOfVerts == 3:
-                # Ok, so its a triangulated window.
-                # File the triangulated window in the dictionary using its name as key
-                
-                tempWindowName = windowObj.Name.split('_glzP_')[0]
-                if tempWindowName not in windowObjs_triangulated.keys():
-                    windowObjs_triangulated[ tempWindowName ] = [windowObj]
-                else:
-                    windowObjs_triangulated[ tempWindowName ].append(windowObj)
-            else:
-                windowObjs_filtered.append(windowObj)
-        else:
-            windowObjs_filtered.append(windowObj)
-
-    # Unite the triangulated objects
-    for key in windowObjs_triangulated.keys():
-        perims = []
-        for windowObj in windowObjs_triangulated[key]:
-            triangleVerts = []
-            # Get the verts
-            for key in windowObj.__dict__.keys():
-                if 'XYZ Vertex' in key:
-                    verts = getattr(windowObj, key).split(' ')
-                    verts = [float(x) for x in verts]
-                    point = ghc.ConstructPoint(verts[0], verts[1], verts[2])
-                    triangleVerts.append( point )
-            
-            # Union the Segments, find the outside perimeter
-            perim = ghc.PolyLine(triangleVerts, closed=True)
-            perims.append(perim)
-        
-        unionedPerim = ghc.RegionUnion(perims)
-        
-        # Build a new Window Obj using this now unioned geometry
-        newVertPoints = ghc.ControlPoints(unionedPerim).points #windowObj.__dict__
-        newWindowObj = copy.deepcopy(windowObj)
-        
-        for i in range(len(newVertPoints)):
-            setattr(newWindowObj, 'XYZ Vertex {} {}'.format(i+1, '{m}'), str(newVertPoints[i]).replace(',',' '))
-            setattr(newWindowObj, 'Name', windowObj.Name[:-7])
-        
-        windowObjs_filtered.append(newWindowObj)
-    
-    ##################################################
-    
-    # Build the Window Objects
-    for eachWindowObj in windowObjs_filtered:
-            # Find the windows's CONSTRUCTION and MATERIAL information in the IDF
-            thisWindowEP_CONST_Name = getattr(eachWindowObj, 'Construction Name')                         # Get the name of the Windows' Construction  
-            thisWindowEP_MAT_Name = _windowConstructionsSimple[  thisWindowEP_CONST_Name  ].Layers[0][1]  # Find the Material name of 'Layer 1' in the Window's Construction
-            thisWindowEP_WinSimp_Obj = _windowMaterialsSimple[  thisWindowEP_MAT_Name  ]                  # Find the 'WindowMaterial:SimpleGlazingSystem' Object with the same name as 'Layer 1' 
-            winterShadingFactor = 0.75
-            summerShadingFactor = 0.75
-            
-            # Create the new IDF_Obj_surfaceWindow Object
-            windowSurfaces.append( IDF_Obj_surfaceWindow(eachWindowObj, thisWindowEP_WinSimp_Obj, winterShadingFactor, summerShadingFactor) )
-    
-    return windowSurfaces
-
 def updatePHPPStyleWindows(_zoneObjs, _IDFwindowSurfaces):
     # Used to update / overwrite the IDF window Params with the more detailed
     # Params from the HB Zone 'phppWindowDict' <if they exist>
@@ -366,17 +124,6 @@ def updatePHPPStyleWindows(_zoneObjs, _IDFwindowSurfaces):
                         pass
                     break
 
-def filterSurfaces(_surfaces):
-    # Filter to only include the surface if its 'exposed' to the outdoors or Ground (not an interior floor / wall)
-    exposedSurfaces = []
-    
-    for srfc in _surfaces:
-        if srfc.exposure != 'Surface':
-        #if srfc.exposure == 'Outdoors' or srfc.exposure == 'Ground':
-            exposedSurfaces.append(srfc)
-        
-    return exposedSurfaces
-
 def buildZoneBrep(_zoneObjs, _opaqueSurfaces):
     # Takes in the IDF Surfaces and builds Zone Breps from them
     # Sets the ZoneObj as an attr using the new Brep
@@ -387,7 +134,7 @@ def buildZoneBrep(_zoneObjs, _opaqueSurfaces):
         zoneSurfaces = []
         for srfc in _opaqueSurfaces:
             if srfc.HostZoneName == zone.ZoneName:
-                zoneSurfaces.append( ghc.BoundarySurfaces(srfc.Boundary) )
+                zoneSurfaces.append( srfc.Srfc )
         zoneBrep = ghc.BrepJoin( zoneSurfaces ).breps
         zoneBreps.append( zoneBrep )
         setattr(zone, 'ZoneBrep', zoneBrep)
@@ -499,65 +246,36 @@ def getGround(_zoneObjs):
     
     return groundObjs
 
-def findNearestPHPPclimateZone(_lat, _long, _climateData):
-    """ Finds the nearest PHPP Climate zone to the EPW Lat /Long 
-    
-    Methodology copied from the PHPP v 9.6a (SI) Climate worksheet
-    """
-    def sortByDist(e):
-        return e['distToEPW']
-    
-    for each in _climateData:
-        eachLat = float(each.get('Latitude', 0))
-        eachLong = float(each.get('Longitude', 0))
-        
-        a = math.sin(math.pi/180*eachLat)*math.sin(math.pi/180*_lat)+math.cos(math.pi/180*eachLat)*math.cos(math.pi/180*_lat)*math.cos(math.pi/180*(eachLong-_long))
-        b = max([-1, a])
-        c = min([1, b])
-        d = math.acos(c)
-        kmFromEPWLocation = 6378 * d
-        
-        each['distToEPW'] = kmFromEPWLocation
-    
-    _climateData.sort(key=sortByDist)
-    climateSetToUse = _climateData[0]
-    
-    dataSet = climateSetToUse.get('Dataset', 'US0055b-New York')
-    alt = '=J23'
-    country = climateSetToUse.get('Country', 'US-United States of America')
-    region = climateSetToUse.get('Region', 'New York')
-    
-    climateSetToUse = PHPP_ClimateDataSet(dataSet, alt, country, region)
-    
-    return [climateSetToUse]
-
 #-------------------------------------------------------------------------------
 ##### Read the IDF Objects and Build class objects  ##########
 
-# Get Material Layers, Constructions, Surfaces
-(opaqueSurfaces,
-opaqueMaterials,
-windowMaterialsSimple,
-windowMaterialGas,
-windowMaterialGlazing,
-allConstructions,
-zones,
-zoneInfiltrationRates,
-zonesList,
-location) = parseIDFObjects(_IDF_Objs_List)
-
-opaqueSurfaces_Exposed = filterSurfaces(opaqueSurfaces)
-
-# Filter Constructions into Opaque/Window
-(opaqueConstructions,
-windowConstructionsSimple,
-windowMaterialsSimple) = filterConstructions(allConstructions, windowMaterialsSimple, windowMaterialGas, windowMaterialGlazing)
+idfModel = IDF_Model.fromInput(_IDF_Objs_List)
 
-# IDf Window Objects
-windowObjects = getIDFWindowObjects(_IDF_Objs_List, windowConstructionsSimple, windowMaterialsSimple)
+with idf2ph_ghWarnings(ghenv):
+    # Get Material Layers, Constructions, Surfaces
+    (opaqueSurfaces,
+    opaqueMaterials,
+    windowMaterialsSimple,
+    windowMaterialGas,
+    windowMaterialGlazing,
+    allConstructions,
+    zones,
+    zoneInfiltrationRates,
+    zonesList,
+    location) = parseIDFObjects(idfModel, IDF_Obj_surfaceOpaque)
+    
+    opaqueSurfaces_Exposed = filterSurfaces(opaqueSurfaces)
+    
+    # Filter Constructions into Opaque/Window
+    (opaqueConstructions,
+    windowConstructionsSimple,
+    windowMaterialsSimple) = filterConstructions(allConstructions, windowMaterialsSimple, windowMaterialGas, windowMaterialGlazing)
+    
+    # IDf Window Objects
+    windowObjects = getIDFWindowObjects(idfModel, windowConstructionsSimple, windowMaterialsSimple, IDF_Obj_surfaceWindow)
 
 # Zone Rooms, Ventialtion from HB, Update windows to Detailed data from HB Zones
-if len(_HBZones)>0 and len(_IDF_Objs_List)>1:
+if len(_HBZones)>0 and len(idfModel)>1:
     HBZonePHPPRooms, HBZoneVentSystems = getPHPPRooms(HBZoneObjects)
     updatePHPPStyleWindows(HBZoneObjects, windowObjects)
     
@@ -21,7 +21,7 @@
 #
 """
 This will read in the contents of a PHPP-Style Excel file window library ('Components' worksheet). You can certainly point this at any actual PHPP file, but that will probably be slow. Recomended to extract the 'Components' worksheeet from a PHPP file into a dedicated 'Libary' Excel file (Duplicate). That will allow this to run much faster. Will read only the 'Glazing' and 'Frames' portions of the 'Components' worksheet (blocks IE15:IG113 and IL15:JC113).
--Input *.xls or *.xlsx files only.
+-Input *.xls or *.xlsx files only. The *.xlsx (and *.xlsm) files are read directly, without opening Excel. The older *.xls files still need Excel.
 -
 EM Feb. 25, 2020
     Args:
@@ -35,20 +35,17 @@ EM Feb. 25, 2020
 
 ghenv.Component.Name = "BT_LoadWindowLibrary"
 ghenv.Component.NickName = "Load Window Lib"
-ghenv.Component.Message = 'FEB_25_2020'
+ghenv.Component.Message = 'OCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "01 | Model"
 
 import os
-from shutil import copyfile
-import random
 import json
 import Grasshopper.Kernel as ghK
-import clr
-clr.AddReferenceByName('Microsoft.Office.Interop.Excel, Culture=neutral, PublicKeyToken=71e9bce111e9429c')
-from Microsoft.Office.Interop import Excel
 import scriptcontext as sc
+from idf2phpp.xlsxreader import XLSX_Reader
+from idf2phpp.excel import getExcelService
 
 PHPP_Glazing = sc.sticky['PHPP_Glazing']
 PHPP_Frame = sc.sticky['PHPP_Frame']
@@ -90,29 +87,40 @@ def getLibraryPath(_libFolderPath=None, _libFileName=None):
 def getDataFromExcel(_filePath):
     # Pulls the Glass and Frame data from the Excel file
     
-    # Open an Excel Instance and the Temporary Lib File
+    # Borrow the Lib File (read-only) from the shared Excel, it's closed again when done
     print '  >Opening Excel document and reading contents....'
-    ex = Excel.ApplicationClass()
-    ex.Visible = False  # False means excel is hidden as it works
-    ex.DisplayAlerts = False
-    workbook = ex.Workbooks.Open(_filePath)
+    with getExcelService().workbook(_filePath, _readOnly=True) as xlWorkbook:
+        
+        # Find the Windows Worksheet
+        try:
+            wsComponents = xlWorkbook.Worksheets['Components']
+            print '  >Found the Excel Worksheet:', wsComponents.Name
+        except:
+            print "Could not find the 'Components' Worksheet in the taget file?"
+            return [], []
+        
+        # Read in the Components from Excel Worksheet
+        # Come in as 2D Arrays..... grrr.....
+        xlArrayGlazing_ =  wsComponents.Range['IE15:IG113'].Value2
+        xlArrayFrames_ = wsComponents.Range['IL15:JC113'].Value2
     
-    # Find the Windows Worksheet
-    worksheets = workbook.Worksheets
-    try:
-        wsComponents = worksheets['Components']
-        print '  >Found the Excel Worksheet:', wsComponents.Name
-    except:
-        print "Could not find the 'Components' Worksheet in the taget file?"
+    return xlArrayGlazing_, xlArrayFrames_
 
-    # Read in the Components from Excel Worksheet
-    # Come in as 2D Arrays..... grrr.....
-    xlArrayGlazing_ =  wsComponents.Range['IE15:IG113'].Value2
-    xlArrayFrames_ = wsComponents.Range['IL15:JC113'].Value2
+def getDataFromXLSX(_filePath):
+    # Pulls the Glass and Frame data straight from the .xlsx file, no Excel needed
     
-    workbook.Close()  # Close the worbook itself
-    ex.Quit()  # Close out the instance of Excel
-    os.remove(_filePath) # Remove the temporary read-file
+    print '  >Reading the .xlsx document contents....'
+    with XLSX_Reader(_filePath) as reader:
+        if 'Components' not in reader.SheetNames:
+            print "Could not find the 'Components' Worksheet in the taget file?"
+            return [], []
+        
+        print '  >Found the Excel Worksheet: Components'
+        xlArrayGlazing_, xlArrayFrames_ = reader.readRanges('Components', ['IE15:IG113', 'IL15:JC113'])
+    
+    # Flatten the rows out, the same as list() does to the Excel 2D Arrays
+    xlArrayGlazing_ = [val for row in xlArrayGlazing_ for val in row]
+    xlArrayFrames_ = [val for row in xlArrayFrames_ for val in row]
     
     return xlArrayGlazing_, xlArrayFrames_
 
@@ -120,14 +128,12 @@ def getDataFromExcel(_filePath):
 libraryFilePath = getLibraryPath(_libFolderPath, _libFileName)
 
 if _LoadLib and libraryFilePath:
-    # Make a Temporary copy of the Library File
-    saveDir = os.path.split(libraryFilePath)[0]
-    tempFileName = 'tempLibFile_{}.xlsx'.format(random.randint(0,1000))
-    tempFilePath = os.path.join(saveDir, tempFileName)
-    copyfile(libraryFilePath, tempFilePath) # create a copy of the file to read from
-    
-    # Get the Data from the Excel File
-    xlArrayGlazing, xlArrayFrames = getDataFromExcel(tempFilePath)
+    if os.path.splitext(libraryFilePath)[1].lower() in ('.xlsx', '.xlsm'):
+        # Read the Data right out of the file, no need for Excel or a copy
+        xlArrayGlazing, xlArrayFrames = getDataFromXLSX(libraryFilePath)
+    else:
+        # Get the Data from the Excel File (opened read-only, so no need for a copy)
+        xlArrayGlazing, xlArrayFrames = getDataFromExcel(libraryFilePath)
 
     # Read in the Glazing Data and Build new Glazing Objects
     lib_Glazing = []
@@ -28,7 +28,7 @@ Enables the COM interface connecting Rhino to Excel on the user's computer.
 Component by Jack Hymowitz, August 20, 2020
 
     Args:
-        _run: Set to true to enable the excel application, false saves the open sheet and stops the application
+        _run: Set to true to enable the excel application, false saves the open sheet and stops the application. Excel itself is kept running in the background (hidden) so the next start is quick, and is closed when Rhino closes.
         visibl_e: Set to true to show the Excel application on the screen. Default true.
         useUserWorkbook_: Set to true to look for and use an open excel interface instead of starting a new one. For now, should not be used (set to false or disconnected)
         oldFilename: The full file path to the source file
@@ -40,7 +40,7 @@ Component by Jack Hymowitz, August 20, 2020
 
 ghenv.Component.Name = "BT_OpenXLWorkbook"
 ghenv.Component.NickName = "Open XL Workbook"
-ghenv.Component.Message = 'AUG_20_2020'
+ghenv.Component.Message = 'OCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "02 | IDF2PHPP"
@@ -60,6 +60,7 @@ from Microsoft.Office.Interop import Excel
 from shutil import copyfile
 import Grasshopper.Kernel as ghK
 import inspect
+from idf2phpp.excel import getExcelService, isAlive, releaseCOM
 
 
 class ExcelInstance:
@@ -68,19 +69,25 @@ class ExcelInstance:
     #Run once on startup, defines the variables that we will use
     def __init__(self):
         self.ex=None
+        self.xlWorkbook=None    #The workbook borrowed from the Excel service
         self.activeWorkbook=None
         self.activeWorkbookName=""
         self.sheetsDict={}
         self.userOpened=False
+        self.recalcPending=False    #True when 'Write XL Workbook' has left the recalculation for the next read
     
-    #Starts a brand new excel instance
+    #Borrows an excel instance from the shared Excel service (only starts a new one if none are free)
     def startNewInstance(self):
-        """Start a new Excel Application instance"""
-        self.ex = Excel.ApplicationClass()
+        """Borrow an Excel Application instance from the shared Excel service"""
+        self.ex = getExcelService().acquireApp()
         self.ex.DisplayAlerts = False
         self.ex.EnableEvents = False
         self.userOpened=False
     
+    def isRunning(self):
+        """Returns False if the Excel application has been closed (ie: by the user)"""
+        return self.ex!=None and isAlive(self.ex)
+    
     #Not working right now 100%, but should find an already running excel window
     def findExistingInstance(self):
         """Find an Excel instance that is already running
@@ -122,7 +129,11 @@ class ExcelInstance:
             return False
         self.close(True)
         self.activeWorkbookName=filename
-        self.activeWorkbook=self.ex.Workbooks.Open(filename)
+        if self.userOpened:
+            self.activeWorkbook=self.ex.Workbooks.Open(filename)
+        else:
+            self.xlWorkbook=getExcelService().openWorkbook(filename, _app=self.ex)
+            self.activeWorkbook=self.xlWorkbook.Workbook
         self.loadSheets()
         return True
     
@@ -159,22 +170,35 @@ class ExcelInstance:
         Args:
             closeIfUser (boolean): Set to true if this method is to run even if this was a user-opened file, 
                 false to run only if was an instance created here."""
-        if self.activeWorkbook!=None or (not closeIfUser and self.userOpened):
+        if self.activeWorkbook==None or (not closeIfUser and self.userOpened):
             return
-        try:
-            self.ex.activeWorkbook.Close()
-        except:
-            pass
+        if self.xlWorkbook!=None:
+            self.xlWorkbook.release()   #Closes it, and releases the COM references
+            self.xlWorkbook=None
+        else:
+            try:
+                self.activeWorkbook.Close()
+            except:
+                pass
+        self.activeWorkbook=None
+        self.activeWorkbookName=""
+        self.sheetsDict={}
     def quit(self, closeIfUser):
         """Stop the running excel instance
         Args:
             closeIfUser (boolean): Set to true if this method is to run even if this was a user-opened file, 
                 false to run only if was an instance created here."""
+        self.close(closeIfUser)
         self.activeWorkbook=None
         self.activeWorkbookName=""
+        self.sheetsDict={}
         if self.ex!=None:
-            self.ex.Quit()
-            ex=None
+            if not self.userOpened:
+                getExcelService().releaseApp(self.ex)   #Back to the pool, hidden, for the next start
+            elif closeIfUser:
+                self.ex.Quit()
+                releaseCOM(self.ex)
+            self.ex=None
         
     def __unicode__(self):
         return u"Excel Instance | Active Worksheet: {self.activeWorkbookName}".format(self=self)
@@ -190,6 +214,8 @@ class ExcelInstance:
 class MyComponent(component):
     
     def StartExcel(self,useUserWorkbook):
+        if "excel" in sc.sticky and not sc.sticky["excel"].userOpened and not sc.sticky["excel"].isRunning():
+            del sc.sticky["excel"]  #Excel was closed by the user, start it again
         if not "excel" in sc.sticky: #Excel interface isn't already running, so start it
             excel = ExcelInstance()
             if useUserWorkbook:
@@ -246,8 +272,8 @@ class MyComponent(component):
             if newFilename:
                 filename=self.doCopy(oldFilename,newDirectory,newFilename)
                 if excel.openWorkbook(filename): #If we need to open a new sheet, set it up
-                    if "XLSdata" in sc.sticky: 
-                        del sc.sticky["XLSdata"]
+                    if "XLDiffStores" in sc.sticky: #Unsaved writes are gone, re-load the written values from the saved files
+                        del sc.sticky["XLDiffStores"]
                     excel.loadSheets()
             else:
                 return False
@@ -28,7 +28,7 @@ Will try and figure out the 'Rooms' inside each of the HB zones.
 > Note that a 'Room' can have more than one floor area / volume / space (closets in bedrooms, for instance).
 > This component will need to be able to read TFA and Room Name/Number data from the Rhino Scene (User-Text 'Object Name', 'Room_Number', 'TFA_Factor').
 -
-EM July 31, 2020
+EM Oct. 18, 2026
 
     Args:
         _roomTFASurfaces: (List) An input for the user-determined room floor area(s) to use.
@@ -48,7 +48,7 @@ EM July 31, 2020
 
 ghenv.Component.Name = "BT_PHPProomsFromRH"
 ghenv.Component.NickName = "PHPP Rooms from Rhino"
-ghenv.Component.Message = 'JUL_31_2020'
+ghenv.Component.Message = 'OCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "01 | Model"
@@ -61,9 +61,11 @@ import Rhino
 from contextlib import contextmanager
 import copy
 from collections import defaultdict
+from idf2phpp.spatial import boxAround, overlappingPairs, PHPP_UnionFind
 
 # Classes and Defs
 preview=sc.sticky['Preview']
+idf2ph_modelTolerance = sc.sticky['idf2ph_modelTolerance']
 PHPP_TFA_Surface = sc.sticky['PHPP_TFA_Surface']
 PHPP_Room = sc.sticky['PHPP_Room']
 PHPP_RoomVolume = sc.sticky['PHPP_RoomVolume']
@@ -72,6 +74,10 @@ PHPP_Sys_Ventilation = sc.sticky['PHPP_Sys_Ventilation']
 hb_hive = sc.sticky["honeybee_Hive"]()
 HBZoneObjects = hb_hive.callFromHoneybeeHive(_HBZones)
 
+# Find the TFA Surfaces' host zones with one locator, keeping what it found for the next solve
+cacheKey = 'PHPP_ZoneCache_{}'.format(ghenv.Component.InstanceGuid)
+zoneLocator = sc.sticky['PHPP_ZoneLocator'](HBZoneObjects, sc.sticky.setdefault(cacheKey, {}))
+
 @contextmanager
 def rhDoc():
     """For reaching into the Rhino document
@@ -146,25 +152,31 @@ def createTFASurfaces(_tfaSrfcs, _HBZoneObjects):
 
 def findNeighbors(_srfcList):
     """ Takes in a list of surfaces. tests against others in the
-    set to see if they are touching. Adds a 'Neighbor' marker if so"""
+    set to see if they are touching. Adds a 'Neighbor' marker if so
+    
+    Only the pairs whose bounding boxes overlap get tested (and not the ones
+    already known to be in the same group). Touching groups are merged, and each
+    group's marker is the index of its first surface, so the result doesn't
+    depend on the order the pairs get tested in. Surfaces touching no others get
+    their own index as the marker, so no two groups share one."""
+    
+    tol = idf2ph_modelTolerance()
+    boxes = []
+    for srfc in _srfcList:
+        bbox = rs.coercebrep(srfc.Surface).GetBoundingBox(True)
+        boxes.append(boxAround([bbox.Min, bbox.Max], tol))
     
-    for i, srfc in enumerate(_srfcList):
+    groups = PHPP_UnionFind(len(_srfcList))
+    for i, k in overlappingPairs(boxes):
+        if groups.find(i) == groups.find(k):
+            continue
         
-        for k in range(0, len(_srfcList)):
-            #print 'Surface: {} looking at Surface: {}...'.format(i, k)
-            vertsI =  ghc.DeconstructBrep( _srfcList[i].Surface ).vertices
-            vertsK =  ghc.DeconstructBrep( _srfcList[k].Surface ).vertices
-            
-            if ghc.BrepXBrep(_srfcList[i].Surface, _srfcList[k].Surface).curves:
-                if _srfcList[i].Neighbors != None:
-                    matchSetID = _srfcList[i].Neighbors
-                elif _srfcList[k].Neighbors != None:
-                    matchSetID = _srfcList[k].Neighbors
-                else:
-                    matchSetID = i
-                
-                _srfcList[i].addNeighbor(matchSetID) #branch[k].ID)
-                _srfcList[k].addNeighbor(matchSetID) #branch[i].ID)
+        if ghc.BrepXBrep(_srfcList[i].Surface, _srfcList[k].Surface).curves:
+            groups.union(i, k)
+    
+    for group in groups.groups():
+        for i in group:
+            _srfcList[i].addNeighbor(group[0])
     
     return _srfcList
 
@@ -200,7 +212,7 @@ roomsDict = defaultdict()
 with rhDoc():
     for i, brepGUID in enumerate(_roomGeometry): roomGeomBreps.append(rs.coercebrep(brepGUID) )
     for i, brepGUID in enumerate(_roomTFASurfaces): tfaSrfcBreps.append(rs.coercebrep(brepGUID) )
-    if len(_roomTFASurfaces)>0 and len(_HBZones)>0: tfaSrfcObjs = createTFASurfaces(_roomTFASurfaces, HBZoneObjects)
+    if len(_roomTFASurfaces)>0 and len(_HBZones)>0: tfaSrfcObjs = createTFASurfaces(_roomTFASurfaces, zoneLocator)
 
 #------------------------------------------------------------------------------
 # Build a Default room if nothing is passed in
@@ -215,7 +227,7 @@ if len(_HBZones)>0 and len(_roomTFASurfaces)==0:
                 except:
                     ventFlowRates = ['Automatic']
                 try:
-                    newTFASurfaceObj = PHPP_TFA_Surface(surface.geometry, HBZoneObjects, ventFlowRates, _inset=0.1, _offsetZ=0.1)
+                    newTFASurfaceObj = PHPP_TFA_Surface(surface.geometry, zoneLocator, ventFlowRates, _inset=0.1, _offsetZ=0.1)
                 except:
                     errorMsg = "Something went wrong building the TFA Floor Surfaces."\
                     "Are you sure you applied TFA and Room Name info for all the surfaces?"
@@ -231,7 +243,7 @@ for k, tfaSrfcObjList in tfaSrfcObjs.items():
         srfcSets_Joined = binByNeighbor(srfcSets)
         for k, each in srfcSets_Joined.items():
             if len(each)>1:
-                joinedSrfc = joinTouchingTFAsurfaces(each, HBZoneObjects)
+                joinedSrfc = joinTouchingTFAsurfaces(each, zoneLocator)
                 tfaSrfcObjs_Unioned.append( joinedSrfc )
             else:
                 tfaSrfcObjs_Unioned.append( each[0] )
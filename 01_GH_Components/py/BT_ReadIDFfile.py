@@ -20,14 +20,15 @@
 # @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
 #
 """
-Use this to Read and parse an IDF file (EnergyPlus). This will go thorugh the IDF and pull out all the 'Objects'. It finds the empty newlines in the .IDF to identify each 'new' object and create a new object for each using the standard '!-' marker to establish keys. Will create key/value for EACH key found. Can use the getattr() method for keys with spaces in the name
+Use this to Read and parse an IDF file (EnergyPlus). This will go thorugh the IDF and pull out all the 'Objects'. The file is read in place, one line at a time, following the EnergyPlus grammar (fields end with a comma, objects end with a semicolon, '!' starts a comment) and each object is created as soon as its closing semicolon is found. The parsed objects are cached in an 'idf2phpp_cache' folder next to the IDF so that re-reading an unchanged file is fast. The standard '!-' marker is used to establish keys. Will create key/value for EACH key found. Can use the getattr() method for keys with spaces in the name
 -
-EM Mar. 26, 2020
+EM Oct. 18, 2026
 
     Args:
         _idfFileAddress: Input the path/file location of the .IDF file used for the EnergyPlus simulation. Connect to the 'idfFileAddress' output from the Honeybee 'exportToOpenStudio' Component.
+        invalidateCache_: <Optional> Set to 'True' to delete any cached copy of this IDF file and read it again from scratch. Default=False
     Returns:
-        IDF_Objs_List: A list of IDF-Objects found in the source file containing all their relevant parameters. Connect this to the '_IDF_Objs_List' input on the 'IDF-->PHPP' component in order to create PHPP writable objects from these.
+        IDF_Objs_List: The IDF Model: all the IDF-Objects found in the source file containing all their relevant parameters, indexed by IDF Class and Name. Connect this to the '_IDF_Objs_List' input on the 'IDF-->PHPP' component in order to create PHPP writable objects from these.
         surfaces_: A text preview of all the Opaque surface objects found in the IDF along with all their parameters
         fenestration_: A text preview of all the Fenestration objects found in the IDF along with all their parameters
         constuctions_: A text preview of all the EP-Construction objects found in the IDF along with all their parameters
@@ -38,44 +39,49 @@ EM Mar. 26, 2020
 
 ghenv.Component.Name = "BT_ReadIDFfile"
 ghenv.Component.NickName = "Read IDF File"
-ghenv.Component.Message = 'MAR_26_2020'
+ghenv.Component.Message = 'OCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "02 | IDF2PHPP"
 
-from System import Object
-from Grasshopper import DataTree
-from Grasshopper.Kernel.Data import GH_Path
-from shutil import copyfile
 import os
+import scriptcontext as sc
 
-class IDF_Class:
-    # A simple class to hold onto the IDF object data
-    
-    def __init__(self, _varName, *_initial_data):   
-        """Setting up the IDF Class Object and bringing in all its attributes
-        """
-        self.objName = _varName
-        for dictionary in _initial_data:
-            for key in dictionary:
-                if key != None and dictionary[key] != None:
-                    setattr(self, key, dictionary[key])
-    def __repr__(self):
-        return "An IDF File object with all its Params"
+# Classes and Defs
+readIDF = sc.sticky['readIDF']
+idf2ph_ghWarnings = sc.sticky['idf2ph_ghWarnings']
 
 def idfObjPreview(_obj):
     outputList = []
     
-    outputList.append(_obj.__dict__.get('objName') + '::')
-    for k, v in _obj.__dict__.items():
+    outputList.append(_obj.objName + '::')
+    for k, v in _obj.getFields():
         outputList.append(' > {}: {}'.format(k, v) )
     outputList.append('-------')
     
     return outputList
 
+def outputIsConnected(_outputName):
+    """ True if anything downstream is connected to the named output """
+    
+    for eachOutput in ghenv.Component.Params.Output:
+        if eachOutput.NickName == _outputName:
+            return eachOutput.Recipients.Count > 0
+    return True
+
+def idfObjsPreview(_idfModel, _outputName, _classNames):
+    """ Text preview of all the objects of the IDF Classes given. Skipped if the output isn't used """
+    
+    outputList = []
+    if not outputIsConnected(_outputName):
+        return outputList
+    
+    for eachObj in _idfModel.getObjs(*_classNames):
+        outputList.extend( idfObjPreview(eachObj) )
+    
+    return outputList
+
 # Clear out the temporary variables
-file = ''
-lines_clean = []
 idfFilePath = None
 
 if _idfFileAddress:
@@ -87,60 +93,17 @@ elif resultFileAddress_:
 
 ##### Bring in the data from the IDF file
 if idfFilePath: 
-    # Make a copy of the IDF file as a text file
-    newFile = idfFilePath.replace('.idf', '.txt')
-    copyfile(idfFilePath, newFile)
+    if invalidateCache_:
+        print('>>>Clearing out the cached copies of the IDF file....')
     
-    print('>>>Opening the file to read....')
+    # Index all the IDF objects, one at a time as the file is read (or read the cached copy)
+    with idf2ph_ghWarnings(ghenv):
+        IDF_Objs_List = readIDF(idfFilePath, _invalidateCache=invalidateCache_)
     
-    # Open file for reading
-    file = open(newFile, 'r')
-    
-    # Read lines into variable called lines
-    lines = file.readlines()
-    
-    print('>>>Read the file successfully. Closing file.')
-    # Close the file
-    file.close()
-
-if file:
-    # Clean up the file a bit (get rid of the line breaks)
-    for line in lines:
-        if line != '\n': # get rid of the empty lines
-            newLine = line.strip() # Get ride of any newlines at end of str
-            newLineAsList = newLine.split('!- ') # Break into pieces
-            
-            # Get rid of all the extra white spaces, remove commas
-            newLineAsList_Clean = []
-            for each in newLineAsList:
-                each = each.replace(",", "")
-                each = each.replace(";", "")
-                each = each.rstrip()
-                newLineAsList_Clean.append( each )
-            
-            lines_clean.append(newLineAsList_Clean)
-    
-    # Organize the date into Class blocks (break at each 'header')
-    tempTree = DataTree[Object]()
-    p = 0
-    # Go through the imported Data and create a new branch for each item
-    for i in range(len(lines_clean)):
-        if len(lines_clean[i]) == 1:
-            p += 1
-        tempTree.Add(lines_clean[i], GH_Path(p))
-    
-    # Create all the IDF Class object blocks
-    IDF_Objs_List = []
-    for each in tempTree.Branches:
-        tempDict = {}
-        Name = ''
-        for eachListItem in each:
-            if len(eachListItem) == 1:
-                objName = eachListItem[0]
-            else:
-                tempDict[eachListItem[1]] = eachListItem[0]
-        
-        IDF_Objs_List.append(IDF_Class(objName, tempDict))
+    if IDF_Objs_List.FromCache:
+        print('>>>Read {} objects from the cached IDF file.'.format(len(IDF_Objs_List)))
+    else:
+        print('>>>Read {} objects from the file successfully.'.format(len(IDF_Objs_List)))
 
 # Output the preview items
 surfaces_ = []
@@ -149,13 +112,15 @@ constuctions_ = []
 materials_ = []
 
 if IDF_Objs_List != None:
-    for each in IDF_Objs_List:
-        if 'BuildingSurface' in each.__dict__.get('objName', None):
-            surfaces_ =  surfaces_ + idfObjPreview(each)
-        elif 'Fenestration' in each.__dict__.get('objName', None):
-            fenestration_ =  fenestration_ + idfObjPreview(each)
-        elif 'Construction' in each.__dict__.get('objName', None):
-            constuctions_ =  constuctions_ + idfObjPreview(each)
-        elif 'Material' in each.__dict__.get('objName', None):
-            materials_ =  materials_ + idfObjPreview(each)
-
+    # Sort the IDF Classes into the preview groups (first match wins)
+    previewGroups = [['BuildingSurface', []], ['Fenestration', []], ['Construction', []], ['Material', []]]
+    for className in IDF_Objs_List.getClassNames():
+        for classText, classNames in previewGroups:
+            if classText in className:
+                classNames.append(className)
+                break
+    
+    surfaces_ = idfObjsPreview(IDF_Objs_List, 'surfaces_', previewGroups[0][1])
+    fenestration_ = idfObjsPreview(IDF_Objs_List, 'fenestration_', previewGroups[1][1])
+    constuctions_ = idfObjsPreview(IDF_Objs_List, 'constuctions_', previewGroups[2][1])
+    materials_ = idfObjsPreview(IDF_Objs_List, 'materials_', previewGroups[3][1])
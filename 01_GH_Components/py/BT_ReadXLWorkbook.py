@@ -22,14 +22,17 @@
 """
 Read a list of fields from an Excel workbook.
 To configure this module, provide three comma separated lists of the same length for the sheet name, cell name, and the label of the result. Alternatively, use the form entry option.
+If 'Write XL Workbook' has left the recalculation until the next read (its recalc_ set to 'deferred'), the workbook is recalculated first.
+The fields are read a range at a time: the cells on each sheet are grouped into as few ranges as possible (a few cells in between which weren't asked for are read too, rather than making another trip to Excel).
 -
 Component by Jack Hymowitz, July 31, 2020
 
     Args:
-        excel: A running excel instance
+        excel: A running excel instance. Or, the path to a PHPP .xlsx file to read the values straight from the file, without Excel (the values as of the last time Excel saved the file).
         sheets: A comma separated list of the worksheet to read from for each output.
         fields: A comma separated list of the cells to read for each output
         labels: A comma separated list of what to  label each read cell
+        watchChanges: Set to True to only output the fields whose value has changed since the last read (the first read outputs them all). Default is False.
     Returns:
         data: The values of the requested fields in a list of length-2 tuple (label, value)
         text: The information from data written out to a string.
@@ -37,7 +40,7 @@ Component by Jack Hymowitz, July 31, 2020
 
 ghenv.Component.Name = "BT_ReadXLWorkbook"
 ghenv.Component.NickName = "Read XL Workbook"
-ghenv.Component.Message = 'JUL_31_2020'
+ghenv.Component.Message = 'OCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "02 | IDF2PHPP"
@@ -45,14 +48,57 @@ ghenv.Component.SubCategory = "02 | IDF2PHPP"
 from ghpythonlib.componentbase import executingcomponent as component
 import Grasshopper, GhPython
 import System
+import os
 import Rhino
 import rhinoscriptsyntax as rs
 import scriptcontext as sc
 import Grasshopper.Kernel as ghK
 from math import floor,log10
+from idf2phpp.xlsxreader import XLSX_Reader
+from idf2phpp.cells import parseCellAddress, cellAddress, groupCellReads, blockValues
+from idf2phpp.excel import recalculate, XL_RecalcTimer, RECALC_DEFERRED, XL_CALCULATION_AUTOMATIC
 
 class MyComponent(component):
-    def doRead(self, excel, sheets, fields, labels):
+    def getReadPlan(self, cells):
+        """The cells grouped into ranges to read, by sheet. Only worked out again when the cells change"""
+        key=tuple(cells)
+        if getattr(self,"readPlanKey",None)!=key:
+            self.readPlanKey=key
+            self.readPlan=groupCellReads(cells)
+        return self.readPlan
+    
+    def readCells(self, excel, cells):
+        """Reads the (sheet, address) cells, with one Range.Value2 call for each range in the read plan"""
+        if isinstance(excel, basestring):
+            # Read all the fields in one go, straight from the .xlsx file
+            with XLSX_Reader(excel) as reader:
+                return reader.readCells(cells)
+        if getattr(excel,"recalcPending",False):
+            self.doDeferredRecalc(excel)
+        values={}
+        for sheetName, blocks in self.getReadPlan(cells).items():
+            if not sheetName in excel.sheetsDict:
+                continue
+            sheet=excel.sheetsDict[sheetName]
+            for block in blocks:
+                try:
+                    value2=sheet.Range[block.Address].Value2
+                except:
+                    continue
+                for address, val in blockValues(block, value2).items():
+                    values[(sheetName,address)]=val
+        return values
+    
+    def doDeferredRecalc(self, excel):
+        """Does the full recalculation 'Write XL Workbook' left for the next read"""
+        seconds=recalculate(excel.ex)
+        excel.ex.Calculation=XL_CALCULATION_AUTOMATIC #Nothing left to calculate, so doesn't set off another one
+        excel.recalcPending=False
+        timer=sc.sticky.setdefault("XLRecalcTimer", XL_RecalcTimer())
+        timer.add(RECALC_DEFERRED, seconds)
+        print(timer.summary(RECALC_DEFERRED))
+    
+    def doRead(self, excel, sheets, fields, labels, watchChanges):
         if sheets:
             sheetsList=sheets.split(",")
             fieldsList=fields.split(",")
@@ -87,23 +133,48 @@ class MyComponent(component):
                     ]
             else:
                 labelList=sc.sticky["displayFields"]
-        data=[]
-        text=""
+        cells=[]
         for cell in labelList:
-            label=cell[0].strip()
             sheet=cell[1].strip()
             field=cell[2].strip()
-            if sheet in excel.sheetsDict:
-                val=excel.sheetsDict[sheet].Range[field].Value2
-                if(type(val).__name__=="float" and val!=0): #Round to 4 significant figures
-                    val=str(round(val,3-int(floor(log10(abs(val))))))
-                data.append((label,val))
-                text+=str(label)+": "+str(val)+"\n"
+            rowCol=parseCellAddress(field) #Same address format as the ranges read back
+            cells.append((sheet, cellAddress(*rowCol) if rowCol else field))
+        values=self.readCells(excel, cells)
+        
+        workbook=excel if isinstance(excel, basestring) else excel.activeWorkbookName
+        if not watchChanges or getattr(self,"lastWorkbook",None)!=workbook:
+            self.lastValues={}  #Start over, so the first watched read outputs everything
+            self.lastWorkbook=workbook
+        
+        data=[]
+        text=""
+        for cell, key in zip(labelList, cells):
+            label=cell[0].strip()
+            if not key in values:
+                continue
+            val=values[key]
+            if(type(val).__name__=="float" and val!=0): #Round to 4 significant figures
+                val=str(round(val,3-int(floor(log10(abs(val))))))
+            if watchChanges:
+                if (label,)+key in self.lastValues and self.lastValues[(label,)+key]==val:
+                    continue
+                self.lastValues[(label,)+key]=val
+            data.append((label,val))
+            text+=str(label)+": "+str(val)+"\n"
         return (data,text)
-    def RunScript(self, excel, sheets, fields, labels):
+    def RunScript(self, excel, sheets, fields, labels, watchChanges=None):
+        if isinstance(excel, basestring):
+            if excel.lower().endswith(('.xlsx','.xlsm')) and os.path.exists(excel):
+                try:
+                    return self.doRead(excel,sheets,fields,labels,watchChanges)
+                except (IOError, OSError, KeyError) as e:
+                    ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Error, "Couldn't read the file: {}".format(e))
+                    return (None,None)
+            msg1 = "Can't find the .xlsx file: {}".format(excel)
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
+            return (None,None)
         if excel and excel.activeWorkbook and excel.sheetsDict:
-            return self.doRead(excel,sheets,fields,labels)
+            return self.doRead(excel,sheets,fields,labels,watchChanges)
         msg1 = "No Excel Instance!"
         ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
-        return (None,None)
-
+        return (None,None)
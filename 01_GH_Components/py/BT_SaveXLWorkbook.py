@@ -20,7 +20,8 @@
 # @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
 #
 """
-Saves the open workbook in an excel instance
+Saves the open workbook in an excel instance, along with the values 'Write XL Workbook' 
+has written to it (in the 'idf2phpp_cache' folder next to the workbook)
 -
 Component by Jack Hymowitz, July 31, 2020
 
@@ -33,7 +34,7 @@ Component by Jack Hymowitz, July 31, 2020
 
 ghenv.Component.Name = "BT_SaveXLWorkbook"
 ghenv.Component.NickName = "Save XL Workbook"
-ghenv.Component.Message = 'JUL_31_2020'
+ghenv.Component.Message = 'OCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "02 | IDF2PHPP"
@@ -45,16 +46,33 @@ import System
 import Rhino
 import rhinoscriptsyntax as rs
 import Grasshopper.Kernel as ghK
+import scriptcontext as sc
+import warnings
 
 class MyComponent(component):
     
+    def saveDiffStore(self, excel):
+        """ Saves the values written to the workbook, so the next write only needs the differances """
+        
+        store = sc.sticky.get("XLDiffStores", {}).get(excel.activeWorkbook.FullName)
+        if not store:
+            return
+        
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            store.save()
+        
+        for warning in caught:
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, str(warning.message))
+    
     def RunScript(self, save, excel):
         if (save is None  or save) and excel:
             if not excel.save():
                 msg1 = "Unable to save"
                 ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
+            else:
+                self.saveDiffStore(excel)
         else:
             msg1 = "No Excel Instance or save set to false"
             ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
-        return excel
-
+        return excel
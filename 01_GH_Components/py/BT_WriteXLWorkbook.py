@@ -23,21 +23,35 @@
 Writes a series of objects to an excel sheet, then recalculates the sheet.
 These objects should be in a Treemap, and need a Worksheet, Range, and Value variable.
 Optionally only writes the differances from the last execution of this function, to reduce writing time.
+The values written are remembered for each workbook (and saved next to it by 'Save XL Workbook') so
+the differances still work after Rhino is restarted. If the workbook has changed since, the values 
+in the workbook are read and checked first.
+Cells next to each other on a worksheet are written (and highlighted) together as one block.
+Instead of a running Excel, the full path to the PHPP .xlsx file can be passed in. The values are then
+written straight into the file (it must not be open in Excel), which is much quicker and doesn't need Excel
+at all. Excel recalculates the workbook the next time it opens it. The fields are not highlighted.
 -
 Component by Jack Hymowitz, August 20, 2020
 
     Args:
-        _excel: A running ExcelInterface from OpenExcel Workbook
+        _excel: A running ExcelInterface from OpenExcel Workbook, or the full path to a PHPP .xlsx file to write to directly (without Excel)
         useDiff_: Set to True to only write the differance out to excel, enabled by default.
         color_: set to True to highlight outputted fields, enabled by default.
         _XL_Objects: TreeMap of objects to write with Worksheet, Range, and Value
+        verifyDiff_: Set to True to read the values in the workbook and only write the ones which are different. Use this if the workbook has been edited by hand.
+        recalc_: How to recalculate once the values are written. The time each recalculation takes is printed, along with the average, to compare them.
+            - 'full' (default): Recalculate every open workbook.
+            - 'sheets': Only recalculate the worksheets written to, then the recalcSheets_ worksheets, in that order. Quicker, but anything on other worksheets is left out of date, so check the results match 'full' on your PHPP version first.
+            - 'deferred': Don't recalculate now. The next 'Read XL Workbook' read does a full recalculation first. Quickest when writing several times before reading.
+            With 'sheets' and 'deferred' Excel is left on manual calculation.
+        recalcSheets_: The worksheets (comma separated) to recalculate after the ones written to, when recalc_ is 'sheets'. Default: Heating, Cooling, Verification
     Returns:
-        excel: The running ExcelInterface is outputted after this function runs.
+        excel: The running ExcelInterface (or the .xlsx file path) is outputted after this function runs.
         numWrites: The number of writes that occured, for debugging purposes.
 """
 ghenv.Component.Name = "BT_WriteXLWorkbook"
 ghenv.Component.NickName = "Write XL Workbook"
-ghenv.Component.Message = 'AUG_20_2020'
+ghenv.Component.Message = 'OCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "02 | IDF2PHPP"
@@ -49,12 +63,24 @@ import Rhino
 import rhinoscriptsyntax as rs
 import Grasshopper.Kernel as ghK
 import scriptcontext as sc
+import os
+import time
+import warnings
 from System import Object
 from Grasshopper.Kernel.Data import GH_Path
 import clr
 from contextlib import contextmanager
 clr.AddReferenceByName('Microsoft.Office.Interop.Excel')#, Culture=neutral, PublicKeyToken=71e9bce111e9429c')
 from Microsoft.Office.Interop import Excel
+from idf2phpp.cells import groupCellWrites, groupCellReads, blockValues, parseCellAddress
+from idf2phpp.diffstore import XL_DiffStore
+from idf2phpp.xlsx import writeXLSX
+from idf2phpp.xlsxreader import XLSX_Reader, readXLSXCells
+from idf2phpp.excel import (parseRecalcPolicy, recalculate, XL_RecalcTimer, RECALC_SHEETS, 
+    RECALC_DEFERRED, XL_CALCULATION_MANUAL, XL_CALCULATION_AUTOMATIC)
+
+# The worksheets the PHPP results come from, recalculated last with recalc_ 'sheets'
+RECALC_SHEETS_DEFAULT = ['Heating', 'Cooling', 'Verification']
 
 
 class MyComponent(component):
@@ -62,21 +88,32 @@ class MyComponent(component):
     @staticmethod
     @contextmanager
     def writingToExcel(_excel):
-        """ Changes the Excel Doc settings to help speed up """
+        """ Changes the Excel Doc settings to help speed up. Calculation is left on manual, see doRecalc() """
         
         # Note: xlCalculationManual / Automatic set only works AFTER the workbook is opened
         
         try:
-            _excel.ex.Calculation = -4135 
+            _excel.ex.Calculation = XL_CALCULATION_MANUAL
             _excel.ex.ScreenUpdating = False
             yield
         finally:
-            _excel.ex.Calculation = -4105 
             _excel.ex.ScreenUpdating = True
     
-    def checkPHPPVersion(self, _excel):
+    @staticmethod
+    @contextmanager
+    def showWarnings():
+        """ Shows any warnings from the idf2phpp package as runtime messages on the component """
+        
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            yield
+        
+        for warning in caught:
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, str(warning.message))
+    
+    def checkPHPPVersion(self, _readCells):
         """ Looks at !Data:D3 to find version number. Returns 'SI' or 'IP' unit type"""
-        version = _excel.sheetsDict['Data'].Range['B3'].Value2
+        version = _readCells([('Data', 'B3')]).get(('Data', 'B3'))
         
         if not version:
             print('Using "SI" Units')
@@ -97,60 +134,236 @@ class MyComponent(component):
                 diff.append((obj.getWorksheet(_unitType),obj.Range,obj.getValue(_unitType)))
         return diff
     
-    def doDiff(self, objects, _unitType):
-        #If useDiff is true (or not set), this is used. Only objects that have changed are written
-        
+    def getNewValues(self, objects, _unitType):
         newObj={}
         for eachBranch in objects.Branches:
             for obj in eachBranch:
                 newObj[(obj.getWorksheet(_unitType),obj.Range)]=obj.getValue(_unitType);
+        return newObj
+    
+    def getDiffStore(self, workbookPath):
+        """ Returns the values last written to the workbook. Loaded from its sidecar file the first time """
         
-        diff=[]
-        if "XLSdata" in sc.sticky:    #We are checking diffs
-            oldObj=sc.sticky["XLSdata"]
-            for x in newObj.keys():
-                if not x in oldObj.keys() or oldObj[x]!=newObj[x]: #If the value didn't exist before or was changed, it's a change
-                    diff.append((x[0],x[1],newObj[x]))
-            for x in oldObj.keys():
-                if not x in newObj.keys():                         #If the value existed before and is now gone, it is a change
-                    diff.append((x[0],x[1],""))
+        stores = sc.sticky.setdefault("XLDiffStores", {})
+        if workbookPath not in stores:
+            stores[workbookPath] = XL_DiffStore.load(workbookPath)
+        return stores[workbookPath]
+    
+    def readCells(self, _excel, _cells):
+        """ Reads the current values of the (worksheet, address) cells from the workbook, a range at a time """
+        
+        liveValues = {}
+        for sheetName, blocks in groupCellReads(_cells).items():
+            if sheetName not in _excel.sheetsDict:
+                continue
             
-        else:                                       #Not checking diffs
-            for x in newObj.keys():
-                diff.append((x[0],x[1],newObj[x]))
-        sc.sticky["newXLSdata"]=newObj
-        return diff
+            sheet = _excel.sheetsDict[sheetName]
+            for block in blocks:
+                try:
+                    value = sheet.Range[block.Address].Value2
+                except:
+                    continue
+                
+                for address, val in blockValues(block, value).items():
+                    liveValues[(sheetName, address)] = val
+        
+        return liveValues
+    
+    def doDiff(self, readCells, store, newObj, verify):
+        #If useDiff is true (or not set), this is used. Only objects that have changed are written
+        
+        if store.Trusted and not verify:
+            return store.diff(newObj)
+        
+        # The stored values can't be trusted (the workbook changed since they were saved), or verify is on
+        print('Checking the values in the workbook first')
+        liveObj = readCells(store.cellsToVerify(newObj))
+        return store.verify(newObj, liveObj)
+    
+    @staticmethod
+    def toArray(_block):
+        """ Returns the block's values as the 2-D array that Range.Value2 needs """
+        
+        arr = System.Array.CreateInstance(Object, _block.NumRows, _block.NumCols)
+        for i, row in enumerate(_block.Values):
+            for j, value in enumerate(row):
+                arr[i, j] = value
+        
+        return arr
+    
+    def writeBlock(self, _sheet, _block):
+        """ Writes a whole block of cells with one COM call. Returns the Ranges written, and the cell addresses written
+        
+        If the block won't write, falls back to writing its cells one at a time so one
+        bad cell doesn't lose the rest of the block.
+        """
+        
+        try:
+            rng = _sheet.Range[_block.Address]
+            rng.Value2 = self.toArray(_block) if _block.Size > 1 else _block.Values[0][0]
+            return [rng], [address for address, _ in _block.cells()]
+        except:
+            pass
+        
+        written = []
+        addresses = []
+        for address, value in _block.cells():
+            try:
+                rng = _sheet.Range[address]
+                rng.Value2 = value
+                written.append(rng)
+                addresses.append(address)
+            except:
+                msg1 = "Unable to write to: {}!{}".format(_sheet.Name, address)
+                ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
+        
+        return written, addresses
+    
+    @staticmethod
+    def highlight(_excel, _ranges):
+        """ Colors all the Ranges (on one worksheet) with a single Union Range """
+        
+        # Union only takes up to 30 Ranges at a time
+        union = _ranges[0]
+        for i in range(1, len(_ranges), 29):
+            union = _excel.ex.Union(union, *_ranges[i:i+29])
+        
+        union.Interior.ColorIndex = 8
     
     def doWrite(self, excel, border, data):
-        #Write out the data we have found
+        #Write out the data we have found, a block of neighbouring cells at a time
+        #Returns the (worksheet, address) of the cells actually written
         
+        writtenCells = []
+        numBlocks = 0
+        start = time.time()
         with self.writingToExcel(excel):
-            for eachItem in data:
-                try:
-                    excel.sheetsDict[eachItem[0]].Range[eachItem[1]].Value2 = eachItem[2]
-                    if(border == None or border):
-                        excel.sheetsDict[eachItem[0]].Range[eachItem[1]].Interior.ColorIndex=8
-                except:
-                    msg1 = "Sheet not found: " + eachItem[0]
+            for sheetName, blocks in groupCellWrites(data).items():
+                if sheetName not in excel.sheetsDict:
+                    msg1 = "Sheet not found: " + sheetName
                     ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
-            if "newXLSdata" in sc.sticky:
-                sc.sticky["XLSdata"]=sc.sticky["newXLSdata"]
+                    continue
+                
+                sheet = excel.sheetsDict[sheetName]
+                written = []
+                for block in blocks:
+                    ranges, addresses = self.writeBlock(sheet, block)
+                    written.extend(ranges)
+                    writtenCells.extend((sheetName, address) for address in addresses)
+                numBlocks += len(blocks)
+                
+                if written and (border == None or border):
+                    self.highlight(excel, written)
+        
+        print('Wrote {} cells in {} blocks ({:.3f} s)'.format(len(writtenCells), numBlocks, time.time() - start))
+        return writtenCells
+    
+    def doRecalc(self, excel, policy, data, recalcSheets):
+        """ Recalculates the workbook after a write, the way the recalc_ policy says to """
+        
+        if policy == RECALC_DEFERRED:
+            excel.recalcPending = True
+            print('Recalculation deferred until the next read')
+            return
+        
+        if policy == RECALC_SHEETS:
+            sheetNames = []
+            for sheetName in [row[0] for row in data] + recalcSheets:
+                if sheetName not in sheetNames:
+                    sheetNames.append(sheetName)
+            
+            missing = [sheetName for sheetName in sheetNames if sheetName not in excel.sheetsDict]
+            if missing:
+                msg1 = "Can't recalculate, sheet not found: " + ", ".join(missing)
+                ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
+            
+            seconds = recalculate(excel.ex, [excel.sheetsDict[n] for n in sheetNames if n in excel.sheetsDict])
+        else:
+            seconds = recalculate(excel.ex)
+            excel.ex.Calculation = XL_CALCULATION_AUTOMATIC # Nothing left to calculate, so doesn't set off another one
+            excel.recalcPending = False
+        
+        timer = sc.sticky.setdefault("XLRecalcTimer", XL_RecalcTimer())
+        timer.add(policy, seconds)
+        print(timer.summary(policy))
     
-    def RunScript(self, excel, useDiff, border, XL_Objects):
+    def doWriteXLSX(self, xlsxPath, data):
+        #Write the data straight into the .xlsx file. Returns True if the file was written
+        
+        if not data:
+            print('Nothing to write to {}'.format(xlsxPath))
+            return True
+        
+        try:
+            with self.showWarnings():
+                numWritten = writeXLSX(xlsxPath, data)
+        except (IOError, OSError) as e:
+            msg1 = "Unable to write to: {}. Is it open in Excel?\n{}".format(xlsxPath, e)
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Error, msg1)
+            return False
         
-        if not excel or not excel.activeWorkbook or not XL_Objects:
+        print('Wrote {} cells to {}'.format(numWritten, xlsxPath))
+        return True
+    
+    def RunScript(self, excel, useDiff, border, XL_Objects, verifyDiff=None, recalc=None, recalcSheets=None):
+        
+        xlsxFile = isinstance(excel, basestring)
+        if xlsxFile and not os.path.exists(excel):
+            msg1 = "File not found: {}".format(excel)
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
+            return (None,0)
+        
+        if not excel or not (xlsxFile or excel.activeWorkbook) or not XL_Objects:
             msg1 = "No Excel Instance!"
             ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
             return (None,0)
         
-        unitType = self.checkPHPPVersion(excel)
+        try:
+            policy = parseRecalcPolicy(recalc)
+        except ValueError as e:
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Error, str(e))
+            return (None,0)
+        
+        if recalcSheets:
+            recalcSheets = [sheetName.strip() for sheetName in recalcSheets.split(",") if sheetName.strip()]
+        else:
+            recalcSheets = RECALC_SHEETS_DEFAULT
+        
+        if xlsxFile:
+            workbookPath = os.path.abspath(excel)
+            readCells = lambda _cells: readXLSXCells(workbookPath, _cells)
+        else:
+            workbookPath = excel.activeWorkbook.FullName
+            readCells = lambda _cells: self.readCells(excel, _cells)
+        
+        unitType = self.checkPHPPVersion(readCells)
+        store = self.getDiffStore(workbookPath)
+        newObj = self.getNewValues(XL_Objects, unitType)
         
         if useDiff is None or useDiff:
-            diff=self.doDiff(XL_Objects, unitType)
+            diff=self.doDiff(readCells, store, newObj, verifyDiff)
         else:
             diff=self.doReadObjs(XL_Objects, unitType)
+            
+            # Everything new is written, the cells from last time not in it are left as they were
+            allObj = dict(store.Values)
+            allObj.update(newObj)
+            newObj = allObj
         
-        self.doWrite(excel, border,diff)
-        excel.ex.Calculate()
+        if xlsxFile:
+            if not self.doWriteXLSX(workbookPath, diff):
+                return (excel,0)
+            
+            # The file is saved already. Cells on worksheets it doesn't have weren't written
+            with XLSX_Reader(workbookPath) as reader:
+                sheetNames = set(reader.SheetNames)
+            writtenCells = [(sheet, address) for sheet, address, _ in diff if sheet in sheetNames and parseCellAddress(address)]
+            store.update(newObj, writtenCells)
+            with self.showWarnings():
+                store.save()
+        else:
+            writtenCells = self.doWrite(excel, border,diff)
+            store.update(newObj, writtenCells)
+            self.doRecalc(excel, policy, diff, recalcSheets)
         
         return (excel,len(diff))
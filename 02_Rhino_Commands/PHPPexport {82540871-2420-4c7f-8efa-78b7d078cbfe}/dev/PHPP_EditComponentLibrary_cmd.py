@@ -26,7 +26,7 @@ including window Psi-Installs. This uses a Model-View-Controller configuration
 mostly just cus' I wanted to test that out. Might be way overkill for something like
 this... but was fun to build.
 -
-EM August 21, 2020
+EM October 18, 2026
 """
 
 import rhinoscriptsyntax as rs
@@ -40,29 +40,37 @@ import System.Windows.Forms.DialogResult
 import System.Drawing.Image
 import os
 import random
-from shutil import copyfile
-import clr
-clr.AddReferenceByName('Microsoft.Office.Interop.Excel, Culture=neutral, PublicKeyToken=71e9bce111e9429c')
-from Microsoft.Office.Interop import Excel
 import re
+from idf2phpp.xlsxreader import XLSX_Reader
+from idf2phpp.excel import getExcelService
 from contextlib import contextmanager
-from System.Runtime.InteropServices import Marshal
-import gc
 import unicodedata
 
 __commandname__ = "PHPP_EditComponentLibrary"
 
 class Model:
     
-    # {Unit you want: {unit you input}, {..}, ...}
+    # {Unit you want: {unit you input: factor}, {..}, ...}
+    # A factor of ('1/x', f) is a reciprocal: f / value (ie: R-Value --> U-Value)
     unitsConversionSchema = {
-            'W/M2K': {'SI':1, 'W/M2K':1, 'IP':5.678264134, 'BTU/HR-FT2-F':5.678264134, 'HR-FT2-F/BTU':'**-1*5.678264134'},
+            'W/M2K': {'SI':1, 'W/M2K':1, 'IP':5.678264134, 'BTU/HR-FT2-F':5.678264134, 'HR-FT2-F/BTU':('1/x', 5.678264134)},
             'M'    : {'SI': 1, 'M':1, 'CM':0.01, 'MM':0.001, 'FT':0.3048, "'":0.3048, 'IN':0.0254, '"':0.0254},
             'W/MK' : {'SI':1, 'W/MK':1, 'IP':1.730734908, 'BTU/HR-FT-F':1.730734908},
             'W/K'  : {'SI':1, 'W/K':1, 'BTU/HR-F':1.895633976},
             '-'    : {'SI':1, '-':1}
             }
     
+    @staticmethod
+    def buildConverter(_factor):
+        """ Returns a function which converts a number using the factor from the unitsConversionSchema """
+        
+        if isinstance(_factor, tuple):
+            reciprocal = float(_factor[1])
+            return lambda _val: reciprocal / float(_val)
+        
+        factor = float(_factor)
+        return lambda _val: float(_val) * factor
+    
     def __init__(self, selObjs):
         self.selectedObjects = selObjs
         self.GroupContent = self.setGroupContent()
@@ -193,45 +201,30 @@ class Model:
     
     @contextmanager
     def readingFromExcel(self, _lib_path):
-        """ Context Manager for handling open / close / cleanup for Excel App"""
-        #
-        #Ref: https://stackoverflow.com/questions/158706/how-do-i-properly-clean-up-excel-interop-objects
-        #Ref: https://devblogs.microsoft.com/visualstudio/marshal-releasecomobject-considered-dangerous/
+        """ Context Manager for borrowing the workbook from the shared Excel service"""
         #
-        # Appears that we can / should leave the Marshal.ReleaseComObect() off?
-        # Just using gc.collect() seems to catch all but the first instance, so
-        # at least they don't build up past the first. Still don't know why
-        # I can't kill that first instance though...
+        # The workbook is opened read-only (so no need for a temporary copy) in
+        # an Excel which is kept running for re-use. It's closed, and its COM
+        # references released, as soon as the last user gives it back. The Excel
+        # itself is closed when Rhino closes.
         #
         
-        try:
-            #-----------------------------------------------------------
-            # Make a Temporary copy
-            self.saveDir = os.path.split(_lib_path)[0]
-            self.tempFile = '{}_temp.xlsx'.format(random.randint(0,1000))
-            self.tempFilePath = os.path.join(self.saveDir, self.tempFile)
-            copyfile(_lib_path, self.tempFilePath)
-            
-            #-----------------------------------------------------------
-            # Read from the Excel file
-            self.ex = Excel.ApplicationClass()
-            self.ex.Visible = False  # False means excel is hidden as it works
-            self.ex.DisplayAlerts = False
-            self.workbook = self.ex.Workbooks.Open(self.tempFilePath)
-            self.worksheets = self.workbook.Worksheets
-            yield
-        except:
-            self.workbook.Close()        # Close the worbook itself
-            self.ex.Quit()               # Close out the instance of Excel
-            self.ex = None
-            gc.collect()
-            os.remove(self.tempFilePath) # Remove the temporary read-file
-        finally:
-            self.workbook.Close()        # Close the worbook itself
-            self.ex.Quit()               # Close out the instance of Excel
-            self.ex = None
-            gc.collect()
-            os.remove(self.tempFilePath) # Remove the temporary read-file
+        with getExcelService().workbook(_lib_path, _readOnly=True) as xlWorkbook:
+            self.worksheets = xlWorkbook.Worksheets
+            try:
+                yield
+            finally:
+                self.worksheets = None
+    
+    def readCompoRangesFromXLSX(self, _lib_path):
+        """ Reads the 'Components' worksheet ranges straight from the .xlsx file, no Excel needed"""
+        
+        with XLSX_Reader(_lib_path) as reader:
+            xlRanges = reader.readRanges('Components', ['IE15:IG113', 'IL15:JC113', 'E15:H113',
+                                                        'IE14:IG14', 'IL14:JC14', 'E14:H14'])
+        
+        # Flatten the rows out, the same as list() does to the Excel 2D Arrays
+        return [[val for row in xlRange for val in row] for xlRange in xlRanges]
     
     @staticmethod
     def determineUnitsFromStr(_inputStr):
@@ -271,7 +264,7 @@ class Model:
         return outputList
         
     def determineConversionFactors(self, _inputList):
-        """ Takes in a list of Tuples, finds the right conversion factor for each"""
+        """ Takes in a list of Tuples, finds the right conversion function for each"""
         # Args: _inputList = [(Final_Unit, Input_Unit), (Final_Unit, Input_Unit), ...]
         
         factors = []
@@ -281,7 +274,7 @@ class Model:
             if targetUnit and inputUnit:
                 d = self.unitsConversionSchema.get(each_tuple[0], {})
                 f = d.get(each_tuple[1], 2)
-                factors.append(f)
+                factors.append(self.buildConverter(f))
             else:
                 factors.append(None)
             
@@ -289,7 +282,7 @@ class Model:
     
     @staticmethod
     def convertInputVal(_inputListofTuples):
-        """ Takes a list of tuples, returns a list of the products"""
+        """ Takes a list of (value, conversion function) tuples, returns a list of the converted values"""
         
         outputList = []
         
@@ -298,14 +291,9 @@ class Model:
                 outputList.append(eachTuple[0])
             else:
                 try:
-                    result = float(eachTuple[0]) * float(eachTuple[1])
-                    outputList.append(result)
-                except:
-                    try:
-                        result = eval(str(eachTuple[0]) + str(eachTuple[1]))
-                        outputList.append(result)
-                    except:
-                        outputList.append(eachTuple[0])
+                    outputList.append( eachTuple[1](eachTuple[0]) )
+                except (ValueError, TypeError, ZeroDivisionError):
+                    outputList.append(eachTuple[0])
         
         return outputList
     
@@ -322,24 +310,32 @@ class Model:
             
             #-------------------------------------------------------------------
             print 'Reading the Main Component Library File....'
-            with self.readingFromExcel(libPath):
+            if os.path.splitext(libPath)[1].lower() in ('.xlsx', '.xlsm'):
+                # Read right from the file, no need to start up Excel
                 try:
-                    wsComponents = self.worksheets['Components']
-                except:
+                    xl_glazing, xl_frames, xl_assemblies, xl_glazing_units, xl_frames_units, xl_assemblies_units = self.readCompoRangesFromXLSX(libPath)
+                except KeyError:
                     print "ERROR: Could not find the 'Components' Worksheet in the target file?"
                     return [], [], []
-                
-                #---------------------------------------------------------------
-                # Read in the Components from Excel Worksheet
-                # Come in as 2D Arrays..... grrr.....
-                xl_glazing =  list(wsComponents.Range['IE15:IG113'].Value2)
-                xl_frames = list(wsComponents.Range['IL15:JC113'].Value2)
-                xl_assemblies = list(wsComponents.Range['E15:H113'].Value2)
-                
-                # Read the units headings
-                xl_glazing_units = list(wsComponents.Range['IE14:IG14'].Value2)
-                xl_frames_units = list(wsComponents.Range['IL14:JC14'].Value2)
-                xl_assemblies_units = list(wsComponents.Range['E14:H14'].Value2)
+            else:
+                with self.readingFromExcel(libPath):
+                    try:
+                        wsComponents = self.worksheets['Components']
+                    except:
+                        print "ERROR: Could not find the 'Components' Worksheet in the target file?"
+                        return [], [], []
+                    
+                    #-----------------------------------------------------------
+                    # Read in the Components from Excel Worksheet
+                    # Come in as 2D Arrays..... grrr.....
+                    xl_glazing =  list(wsComponents.Range['IE15:IG113'].Value2)
+                    xl_frames = list(wsComponents.Range['IL15:JC113'].Value2)
+                    xl_assemblies = list(wsComponents.Range['E15:H113'].Value2)
+                    
+                    # Read the units headings
+                    xl_glazing_units = list(wsComponents.Range['IE14:IG14'].Value2)
+                    xl_frames_units = list(wsComponents.Range['IL14:JC14'].Value2)
+                    xl_assemblies_units = list(wsComponents.Range['E14:H14'].Value2)
             
             #-------------------------------------------------------------------
             # Figure out the Unit Conversion Factors to use
@@ -474,11 +470,11 @@ class Model:
         """ Converts the user values to the right SI values for the column being edited """
         
         outputUnitFactors = self.unitsConversionSchema.get(str(_displayColumnUnit).upper(), {})
-        conversionFactor = outputUnitFactors.get(_inputUnit, 1)
+        converter = self.buildConverter( outputUnitFactors.get(_inputUnit, 1) )
         
         try:
-            return float(_inputVal) * float(conversionFactor)
-        except:
+            return converter(_inputVal)
+        except (ValueError, TypeError, ZeroDivisionError):
             return _inputVal
     
     def determineDisplayVal(self, _inputVal, _displayColumnUnit):
@@ -26,7 +26,7 @@ such as windows, frames, glasss. This uses a Model-View-Controller configuration
 mostly just cus' I wanted to test that out. Might be way overkill for something like
 this... but was fun to build.
 -
-EM August 16, 2020
+EM October 18, 2026
 """
 
 import rhinoscriptsyntax as rs
@@ -40,11 +40,9 @@ import System.Windows.Forms.DialogResult
 import System.Drawing.Image
 import os
 import random
-from shutil import copyfile
-import clr
-clr.AddReferenceByName('Microsoft.Office.Interop.Excel, Culture=neutral, PublicKeyToken=71e9bce111e9429c')
-from Microsoft.Office.Interop import Excel
 import re
+from idf2phpp.xlsxreader import XLSX_Reader
+from idf2phpp.excel import getExcelService
 
 __commandname__ = "PHPP_EditTBLibrary"
 
@@ -162,6 +160,25 @@ class Model:
             rs.SetDocumentUserText('PHPP_TB_Lib', fd.FileName)
             return fd.FileName
     
+    def readTBRangesFromXLSX(self, _lib_path):
+        """ Reads the Thermal Bridge and Psi-Install ranges straight from the .xlsx file, no Excel needed"""
+        
+        xlArray_TBs = None
+        xlArray_Psi = None
+        with XLSX_Reader(_lib_path) as reader:
+            # Flatten the rows out, the same as list() does to the Excel 2D Arrays
+            if 'Thermal Bridges' in reader.SheetNames:
+                xlArray_TBs = [val for row in reader.readRange('Thermal Bridges', 'A2:C100') for val in row]
+            else:
+                print 'Could not find a worksheet named "Thermal Bridges" in the taget file?'
+            
+            if 'Psi-Installs' in reader.SheetNames:
+                xlArray_Psi = [val for row in reader.readRange('Psi-Installs', 'B3:F103') for val in row]
+            else:
+                print 'Could not find a worksheet named "Psi-Installs" in the target file?'
+        
+        return xlArray_TBs, xlArray_Psi
+    
     def readTBDataFromExcel(self):
         if rs.IsDocumentUserText():
             libPath = rs.GetDocumentUserText('PHPP_TB_Lib')
@@ -172,36 +189,28 @@ class Model:
                 if os.path.exists(libPath):
                     print 'Reading the Thermal Bridge Library File....'
                     
-                    # Make a Temporary copy
-                    saveDir = os.path.split(libPath)[0]
-                    tempFile = '{}_temp.xlsx'.format(random.randint(0,1000))
-                    tempFilePath = os.path.join(saveDir, tempFile)
-                    copyfile(libPath, tempFilePath) # create a copy of the file to read from
-                    
-                    # Open the Excel Instance and File
-                    ex = Excel.ApplicationClass()   
-                    ex.Visible = False  # False means excel is hidden as it works
-                    ex.DisplayAlerts = False
-                    workbook = ex.Workbooks.Open(tempFilePath)
-                    worksheets = workbook.Worksheets
-                    
-                    try:
-                        xlArray_TBs = None
-                        ws_TBs = worksheets['Thermal Bridges']
-                        xlArray_TBs = ws_TBs.Range['A2:C100'].Value2
-                    except:
-                        print 'Could not find a worksheet named "Thermal Bridges" in the taget file?'
-                        
-                    try:
-                        xlArray_Psi = None
-                        ws_PsiInst = worksheets['Psi-Installs']
-                        xlArray_Psi = ws_PsiInst.Range['B3:F103'].Value2
-                    except:
-                        print 'Could not find a worksheet named "Psi-Installs" in the target file?'
-                    
-                    workbook.Close()  # Close the worbook itself
-                    ex.Quit()  # Close out the instance of Excel
-                    os.remove(tempFilePath) # Remove the temporary read-file
+                    if os.path.splitext(libPath)[1].lower() in ('.xlsx', '.xlsm'):
+                        # Read right from the file, no need to start up Excel
+                        xlArray_TBs, xlArray_Psi = self.readTBRangesFromXLSX(libPath)
+                    else:
+                        # Borrow the File (read-only, so no need for a copy) from the shared 
+                        # Excel. It's closed again, and cleaned up, at the end of the 'with'
+                        with getExcelService().workbook(libPath, _readOnly=True) as xlWorkbook:
+                            worksheets = xlWorkbook.Worksheets
+                            
+                            try:
+                                xlArray_TBs = None
+                                ws_TBs = worksheets['Thermal Bridges']
+                                xlArray_TBs = ws_TBs.Range['A2:C100'].Value2
+                            except:
+                                print 'Could not find a worksheet named "Thermal Bridges" in the taget file?'
+                                
+                            try:
+                                xlArray_Psi = None
+                                ws_PsiInst = worksheets['Psi-Installs']
+                                xlArray_Psi = ws_PsiInst.Range['B3:F103'].Value2
+                            except:
+                                print 'Could not find a worksheet named "Psi-Installs" in the target file?'
                     
                     # Build the Thermal Bridge Library
                     lib_TBs = []
@@ -0,0 +1,44 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+IDF2PHPP core: reads EnergyPlus IDF files and converts them into the Excel-ready
+cell writes for the Passive House Planning Package (PHPP). 
+
+Pure Python (Python 2.7 / IronPython and Python 3), with no Rhino or Grasshopper 
+needed, so conversions can run in batch from the command line:
+
+    python -m idf2phpp path/to/in.idf --format json --output in_phpp.json
+    python -m idf2phpp.batch path/to/sweep --output sweep_phpp --workers 8
+
+Inside Grasshopper the BT_CORE component imports this package and adds the 
+Rhino / Grasshopper geometry on top.
+"""
+
+from __future__ import absolute_import
+
+from ._compat import IDF2PHPPWarning
+from .idf import IDF_Model, IDF_Class, readIDF
+from .phpp import PHPP_XL_Obj
+from .units import convertValue, convertMany
+from .convert import idfToPHPPObjs, phppObjsToXLObjs, convertIDF, xlObjToDict
+
+__version__ = '0.1.0'
@@ -0,0 +1,83 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Command line IDF --> PHPP conversion. Writes the list of PHPP cell writes as JSON or CSV.
+
+    python -m idf2phpp in.idf                         (JSON to the screen)
+    python -m idf2phpp in.idf -f csv -o in_phpp.csv   (CSV file)
+    python -m idf2phpp in.idf --units IP --tfa 185.5 --exclude Garage
+
+Any warnings found during the conversion are printed to stderr.
+"""
+
+from __future__ import absolute_import, print_function
+import sys
+import argparse
+import logging
+import warnings
+
+from ._compat import PY2
+from .convert import convertIDF, xlObjToDict, writeJSON, writeCSV
+
+def parseArgs(_args=None):
+    parser = argparse.ArgumentParser(prog='idf2phpp', description='Convert an EnergyPlus IDF file into PHPP cell writes (JSON or CSV)')
+    parser.add_argument('idf', help='The .idf file to convert')
+    parser.add_argument('-f', '--format', choices=['json', 'csv'], default='json', help='Output format (default: json)')
+    parser.add_argument('-o', '--output', help='The file to write to (default: print to the screen)')
+    parser.add_argument('--units', choices=['SI', 'IP'], default='SI', help='Unit system for the values (default: SI)')
+    parser.add_argument('--include', nargs='*', default=[], help='Only output zones whose name includes any of these')
+    parser.add_argument('--exclude', nargs='*', default=[], help="Don't output zones whose name includes any of these")
+    parser.add_argument('--tfa', type=float, help='The Treated Floor Area (m2) to write to the PHPP')
+    parser.add_argument('--no-cache', action='store_true', help="Don't read or write the parsed IDF cache")
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print the conversion progress to stderr')
+    
+    return parser.parse_args(_args)
+
+def main(_args=None):
+    args = parseArgs(_args)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(message)s')
+    
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        try:
+            xlObjs = convertIDF(args.idf, args.include, args.exclude, args.tfa, not args.no_cache)
+        except Exception as e:
+            print('Error: unable to convert {}: {!r}'.format(args.idf, e), file=sys.stderr)
+            return 1
+    
+    for warning in caught:
+        print('Warning: {}'.format(warning.message), file=sys.stderr)
+    
+    records = [xlObjToDict(xlObj, args.units) for xlObj in xlObjs]
+    writer = writeCSV if args.format == 'csv' else writeJSON
+    
+    if not args.output:
+        writer(records, sys.stdout)
+    else:
+        mode = 'wb' if PY2 and args.format == 'csv' else 'w'
+        with open(args.output, mode) as outFile:
+            writer(records, outFile)
+    
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
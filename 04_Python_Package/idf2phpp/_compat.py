@@ -0,0 +1,50 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Python 2 (IronPython in Rhino / Grasshopper) and Python 3 compatibility helpers
+"""
+
+from __future__ import absolute_import
+import sys
+
+PY2 = sys.version_info[0] == 2
+
+if PY2:
+    text_type = unicode
+    string_types = basestring
+else:
+    text_type = str
+    string_types = str
+
+def toStr(_text):
+    """ Returns the unicode text as a native str (utf-8 bytes on Py2) for __str__ """
+    
+    if PY2:
+        return _text.encode('utf-8')
+    return _text
+
+class IDF2PHPPWarning(UserWarning):
+    """ Raised through warnings.warn() for anything the user should know about during a conversion
+    
+    Grasshopper shows these as runtime messages on the component, the command line prints them to stderr.
+    """
+    pass
@@ -0,0 +1,328 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Batch IDF --> PHPP conversion for a whole folder (or glob) of IDF files, such as 
+all the variants from a Honeybee parametric sweep. The files are converted in 
+parallel over a multiprocessing Pool.
+
+    python -m idf2phpp.batch sweep/ -o sweep_phpp -j 8
+    python -m idf2phpp.batch "sweep/**/*.idf" -o sweep_phpp --format csv --units IP
+
+Written to the output folder, as each file finishes:
+    <name>.json / .csv      The PHPP cell writes for that IDF file (same as 'python -m idf2phpp')
+    results.jsonl           One line per IDF: status, warnings, error, timings, output file
+At the end:
+    summary.json            Totals, failures and the slowest files
+    summary.csv             One row per IDF file
+
+An IDF that fails to convert is recorded as an 'error' in the results and the batch 
+carries on with the rest.
+"""
+
+from __future__ import absolute_import, print_function
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import hashlib
+import argparse
+import logging
+import warnings
+import traceback
+
+from ._compat import PY2, IDF2PHPPWarning
+from .idf import readIDF
+from .convert import idfToPHPPObjs, phppObjsToXLObjs, xlObjToDict, writeJSON, writeCSV
+from .parallel import cpuCount
+
+log = logging.getLogger(__name__)
+
+RESULTS_FILE = 'results.jsonl'
+SUMMARY_FILE = 'summary.json'
+SUMMARY_CSV_FILE = 'summary.csv'
+SUMMARY_FIELDS = ['idf', 'status', 'output', 'cells', 'warnings', 'fromCache', 
+                    'readSeconds', 'convertSeconds', 'totalSeconds', 'error']
+
+#-------------------------------------------------------------------------------
+# Finding the files
+def findIDFFiles(_paths):
+    """ Returns all the .idf files for the folders, globs or file paths given
+    
+    Folders are searched recursively. Each file is only included once.
+    
+    Args:
+        _paths (list): Folders, glob patterns or .idf file paths
+    Returns:
+        list: The full paths to the .idf files, sorted
+    """
+    
+    found = set()
+    for path in _paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                found.update(os.path.join(root, f) for f in files if f.lower().endswith('.idf'))
+        elif os.path.isfile(path):
+            found.add(path)
+        else:
+            matches = glob.glob(path, recursive=True) if not PY2 else glob.glob(path)
+            found.update(f for f in matches if os.path.isfile(f))
+    
+    return sorted(set(os.path.abspath(f) for f in found))
+
+def outputNames(_idfPaths):
+    """ Returns a unique output file name (no extension) for each IDF file
+    
+    Uses the IDF file's name, unless more than one file has the same name (Honeybee
+    sweeps often name every variant 'in.idf'). Those get a short hash of their full 
+    path added so they don't overwrite each other.
+    
+    Args:
+        _idfPaths (list): The full paths to the .idf files
+    Returns:
+        dict: {idf path: output name}
+    """
+    
+    stems = {}
+    for idfPath in _idfPaths:
+        stem = os.path.splitext(os.path.basename(idfPath))[0]
+        stems.setdefault(stem.lower(), []).append(idfPath)
+    
+    names = {}
+    for paths in stems.values():
+        for idfPath in paths:
+            stem = os.path.splitext(os.path.basename(idfPath))[0]
+            if len(paths) > 1:
+                stem = '{}_{}'.format(stem, hashlib.sha1(idfPath.encode('utf-8')).hexdigest()[:8])
+            names[idfPath] = stem
+    
+    return names
+
+#-------------------------------------------------------------------------------
+# Converting one file (runs in the worker processes)
+def convertOne(_job):
+    """ Converts one IDF file and writes its cell writes to the output folder
+    
+    Never raises: any error during the conversion is returned in the result instead,
+    so that one bad IDF file doesn't stop the batch. A file with no zones and no 
+    building surfaces (empty, or not an IDF) is an error too.
+    
+    Args:
+        _job (tuple): (idf path, output file path, options dict). The options are the
+            keyword arguments: 'units', 'format', 'zonesInclude', 'zonesExclude', 'tfa', 'useCache'
+    Returns:
+        dict: The result for the file, with the SUMMARY_FIELDS keys
+    """
+    
+    idfPath, outputPath, options = _job
+    result = {'idf': idfPath, 'status': 'ok', 'output': None, 'cells': 0, 'warnings': [], 
+                'fromCache': False, 'readSeconds': 0.0, 'convertSeconds': 0.0, 
+                'totalSeconds': 0.0, 'error': None}
+    
+    t0 = time.time()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        try:
+            idfModel = readIDF(idfPath, options.get('useCache', True))
+            result['fromCache'] = idfModel.FromCache
+            t1 = time.time()
+            result['readSeconds'] = round(t1 - t0, 3)
+            
+            phppObjs = idfToPHPPObjs(idfModel)
+            if not phppObjs['zones'] and not phppObjs['opaqueSurfaces']:
+                # An empty file, or one which isn't an IDF, would otherwise come out as 'ok'
+                raise ValueError('No zones or building surfaces found in the IDF file: {}'.format(idfPath))
+            elif not phppObjs['zones']:
+                warnings.warn('No zones found in the IDF file: {}'.format(idfPath), IDF2PHPPWarning)
+            elif not phppObjs['opaqueSurfaces']:
+                warnings.warn('No building surfaces found in the IDF file: {}'.format(idfPath), IDF2PHPPWarning)
+            
+            xlObjs = phppObjsToXLObjs(phppObjs, options.get('zonesInclude'), options.get('zonesExclude'), options.get('tfa'))
+            records = [xlObjToDict(xlObj, options.get('units', 'SI')) for xlObj in xlObjs]
+            result['convertSeconds'] = round(time.time() - t1, 3)
+            
+            writeOutput(records, outputPath, options.get('format', 'json'))
+            result['output'] = os.path.basename(outputPath)
+            result['cells'] = len(records)
+        except Exception as e:
+            result['status'] = 'error'
+            result['error'] = '{!r}'.format(e)
+            result['traceback'] = traceback.format_exc()
+    
+    result['warnings'] = ['{}'.format(w.message) for w in caught]
+    result['totalSeconds'] = round(time.time() - t0, 3)
+    
+    return result
+
+def writeOutput(_records, _outputPath, _format='json'):
+    mode = 'wb' if PY2 and _format == 'csv' else 'w'
+    with open(_outputPath, mode) as outFile:
+        if _format == 'csv':
+            writeCSV(_records, outFile)
+        else:
+            writeJSON(_records, outFile)
+
+#-------------------------------------------------------------------------------
+# The batch
+def runBatch(_idfPaths, _outputFolder, _workers=None, _format='json', _units='SI', 
+                _zonesInclude=None, _zonesExclude=None, _tfa=None, _useCache=True):
+    """ Converts all the IDF files, in parallel, and writes the results to the output folder
+    
+    Each file's result is added to 'results.jsonl' as soon as it finishes, so a long
+    batch can be followed (or picked over if it is stopped part way). The 'summary.json' 
+    and 'summary.csv' reports are written at the end.
+    
+    Args:
+        _idfPaths (list): The full paths to the .idf files
+        _outputFolder (str): The folder to write the results to. Created if needed.
+        _workers (int): <Optional> Number of worker processes. Default is the number of 
+            CPUs. Use 1 to run in this process (no multiprocessing).
+        _format (str): 'json' or 'csv'. The format for each file's cell writes
+        _units (str): 'SI' or 'IP'. The unit system for the values
+        _zonesInclude (list): <Optional> Only output the zones whose name includes any of these
+        _zonesExclude (list): <Optional> Don't output the zones whose name includes any of these
+        _tfa (float): <Optional> The Treated Floor Area (m2) to write to the PHPP
+        _useCache (bool): Default=True. Read / write the parsed IDF cache next to each file
+    Returns:
+        dict: The summary report
+    """
+    
+    if not os.path.isdir(_outputFolder):
+        os.makedirs(_outputFolder)
+    
+    options = {'units': _units, 'format': _format, 'zonesInclude': _zonesInclude, 
+                'zonesExclude': _zonesExclude, 'tfa': _tfa, 'useCache': _useCache}
+    names = outputNames(_idfPaths)
+    jobs = [(idfPath, os.path.join(_outputFolder, '{}.{}'.format(names[idfPath], _format)), options)
+                for idfPath in _idfPaths]
+    
+    workers = _workers or cpuCount()
+    workers = max(1, min(workers, len(jobs) or 1))
+    log.info('Converting {} IDF files with {} worker(s)'.format(len(jobs), workers))
+    
+    t0 = time.time()
+    results = []
+    with open(os.path.join(_outputFolder, RESULTS_FILE), 'w') as resultsFile:
+        for result in iterResults(jobs, workers):
+            results.append(result)
+            resultsFile.write(json.dumps(result) + '\n')
+            resultsFile.flush()
+            
+            log.info('[{}/{}] {} {} ({:.2f}s)'.format(len(results), len(jobs), result['status'].upper(), 
+                        result['idf'], result['totalSeconds']))
+    
+    summary = summarize(results, workers, time.time() - t0)
+    writeSummary(summary, results, _outputFolder)
+    
+    return summary
+
+def iterResults(_jobs, _workers):
+    """ Yields the result for each job as it finishes (not in job order) """
+    
+    if _workers == 1:
+        for job in _jobs:
+            yield convertOne(job)
+        return
+    
+    # Fresh workers every so often, so a big sweep doesn't build up memory
+    import multiprocessing
+    pool = multiprocessing.Pool(_workers, maxtasksperchild=25)
+    try:
+        for result in pool.imap_unordered(convertOne, _jobs, chunksize=1):
+            yield result
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+def summarize(_results, _workers, _wallSeconds):
+    ok = [r for r in _results if r['status'] == 'ok']
+    failed = [r for r in _results if r['status'] != 'ok']
+    slowest = sorted(_results, key=lambda r: r['totalSeconds'], reverse=True)[:10]
+    
+    return {'files': len(_results),
+            'ok': len(ok),
+            'failed': len(failed),
+            'withWarnings': len([r for r in _results if r['warnings']]),
+            'warnings': sum(len(r['warnings']) for r in _results),
+            'cells': sum(r['cells'] for r in ok),
+            'fromCache': len([r for r in _results if r['fromCache']]),
+            'workers': _workers,
+            'wallSeconds': round(_wallSeconds, 3),
+            'cpuSeconds': round(sum(r['totalSeconds'] for r in _results), 3),
+            'failures': [{'idf': r['idf'], 'error': r['error']} for r in failed],
+            'slowest': [{'idf': r['idf'], 'totalSeconds': r['totalSeconds']} for r in slowest]}
+
+def writeSummary(_summary, _results, _outputFolder):
+    with open(os.path.join(_outputFolder, SUMMARY_FILE), 'w') as summaryFile:
+        json.dump(_summary, summaryFile, indent=1)
+        summaryFile.write('\n')
+    
+    mode = 'wb' if PY2 else 'w'
+    with open(os.path.join(_outputFolder, SUMMARY_CSV_FILE), mode) as csvFile:
+        writer = csv.DictWriter(csvFile, fieldnames=SUMMARY_FIELDS, extrasaction='ignore', lineterminator='\n')
+        writer.writeheader()
+        for result in sorted(_results, key=lambda r: r['idf']):
+            row = dict(result)
+            row['warnings'] = len(result['warnings'])
+            writer.writerow(row)
+
+#-------------------------------------------------------------------------------
+# Command line
+def parseArgs(_args=None):
+    parser = argparse.ArgumentParser(prog='idf2phpp.batch', description='Convert a folder (or glob) of EnergyPlus IDF files into PHPP cell writes, in parallel')
+    parser.add_argument('paths', nargs='+', help='Folders, glob patterns or .idf files to convert')
+    parser.add_argument('-o', '--output', required=True, help='The folder to write the results to')
+    parser.add_argument('-j', '--workers', type=int, help='Number of worker processes (default: the number of CPUs)')
+    parser.add_argument('-f', '--format', choices=['json', 'csv'], default='json', help='Output format for each file (default: json)')
+    parser.add_argument('--units', choices=['SI', 'IP'], default='SI', help='Unit system for the values (default: SI)')
+    parser.add_argument('--include', nargs='*', default=[], help='Only output zones whose name includes any of these')
+    parser.add_argument('--exclude', nargs='*', default=[], help="Don't output zones whose name includes any of these")
+    parser.add_argument('--tfa', type=float, help='The Treated Floor Area (m2) to write to the PHPP')
+    parser.add_argument('--no-cache', action='store_true', help="Don't read or write the parsed IDF cache")
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print each file as it finishes to stderr')
+    
+    return parser.parse_args(_args)
+
+def main(_args=None):
+    args = parseArgs(_args)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(message)s')
+    
+    idfPaths = findIDFFiles(args.paths)
+    if not idfPaths:
+        print('Error: no .idf files found in {}'.format(' '.join(args.paths)), file=sys.stderr)
+        return 1
+    
+    summary = runBatch(idfPaths, args.output, args.workers, args.format, args.units, 
+                        args.include, args.exclude, args.tfa, not args.no_cache)
+    
+    print('Converted {ok} of {files} IDF files ({failed} failed, {warnings} warnings) in {wallSeconds:.1f}s'.format(**summary), file=sys.stderr)
+    for failure in summary['failures']:
+        print('Failed: {idf}: {error}'.format(**failure), file=sys.stderr)
+    
+    return 1 if summary['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,350 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Excel cell address helpers, and the grouping of single cell writes (and reads) into 
+rectangular blocks so that a whole block can be written to (or read from) Excel in one go. 
+
+    >>> blocks = groupCellWrites([('Areas', 'L41', 1), ('Areas', 'M41', 2), ('Areas', 'L42', 3), ('Areas', 'M42', 4)])
+    >>> blocks['Areas']
+    [CellBlock( _row=41, _col=12, _values=[[1, 2], [3, 4]], _address=None )]
+    >>> blocks['Areas'][0].Address
+    'L41:M42'
+"""
+
+from __future__ import absolute_import
+import re
+import heapq
+from collections import OrderedDict
+
+from ._compat import toStr
+
+_A1 = re.compile(r'^\$?([A-Za-z]{1,3})\$?([0-9]+)$')
+
+def parseCellAddress(_address):
+    """ Returns the (row, column) numbers (1 based) for a single cell address like 'AB12' or '$AB$12'
+    
+    Returns None for anything which is not a single cell (ranges 'A1:B2', names...)
+    """
+    
+    match = _A1.match(str(_address).strip())
+    if not match:
+        return None
+    
+    col = 0
+    for letter in match.group(1).upper():
+        col = col * 26 + (ord(letter) - 64)
+    
+    return int(match.group(2)), col
+
+def parseRangeAddress(_address):
+    """ Returns the (top row, left column, bottom row, right column) numbers (1 based) for
+    a range address like 'IE15:IG113', or a single cell address like 'AB12'
+    
+    Returns None for anything else (whole rows / columns 'A:C', names...)
+    """
+    
+    corners = [parseCellAddress(part) for part in str(_address).split(':')]
+    if not 1 <= len(corners) <= 2 or None in corners:
+        return None
+    
+    (row1, col1), (row2, col2) = corners[0], corners[-1]
+    return min(row1, row2), min(col1, col2), max(row1, row2), max(col1, col2)
+
+def columnLetters(_col):
+    """ Returns the Excel column letters for the column number (1 based). ie: 28 --> 'AB' """
+    
+    letters = ''
+    while _col > 0:
+        _col, remainder = divmod(_col - 1, 26)
+        letters = chr(65 + remainder) + letters
+    
+    return letters
+
+def cellAddress(_row, _col):
+    return '{}{}'.format(columnLetters(_col), _row)
+
+class CellBlock:
+    """ A rectangular block of cell values to write to a worksheet in one go """
+    
+    def __init__(self, _row, _col, _values, _address=None):
+        """
+        Args:
+            _row (int): The top row number (1 based)
+            _col (int): The left column number (1 based)
+            _values (list): The values, as a list of rows (each a list of values)
+            _address (str): <Optional> Use this address as is, for writes which are 
+                not a single cell (ranges, names). The _values are then just [[value]].
+        """
+        self.Row = _row
+        self.Col = _col
+        self.Values = _values
+        self._address = _address
+    
+    @property
+    def NumRows(self):
+        return len(self.Values)
+    
+    @property
+    def NumCols(self):
+        return len(self.Values[0])
+    
+    @property
+    def Size(self):
+        return self.NumRows * self.NumCols
+    
+    @property
+    def Address(self):
+        if self._address:
+            return self._address
+        
+        topLeft = cellAddress(self.Row, self.Col)
+        if self.Size == 1:
+            return topLeft
+        return '{}:{}'.format(topLeft, cellAddress(self.Row + self.NumRows - 1, self.Col + self.NumCols - 1))
+    
+    def cells(self):
+        """ Yields the (address, value) of each cell in the block """
+        
+        if self._address:
+            yield self._address, self.Values[0][0]
+            return
+        
+        for i, row in enumerate(self.Values):
+            for j, value in enumerate(row):
+                yield cellAddress(self.Row + i, self.Col + j), value
+    
+    def __unicode__(self):
+        return u"Cell Block | {}  |  {} cells".format(self.Address, self.Size)
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}( _row={!r}, _col={!r}, _values={!r}, _address={!r} )".format(
+                self.__class__.__name__,
+                self.Row,
+                self.Col,
+                self.Values,
+                self._address)
+
+def findBlocks(_cells):
+    """ Groups the cells into as few rectangular blocks as it can
+    
+    Works down the rows: each block is started at the first cell not yet used, made as 
+    wide as the row of cells to its right allows, then as tall as the rows below 
+    have all of those cells.
+    
+    Args:
+        _cells (dict): {(row, col): value}
+    Returns:
+        list: The CellBlocks, in top-left to bottom-right order
+    """
+    
+    used = set()
+    blocks = []
+    for row, col in sorted(_cells):
+        if (row, col) in used:
+            continue
+        
+        width = 1
+        while (row, col + width) in _cells and (row, col + width) not in used:
+            width += 1
+        
+        height = 1
+        while all((row + height, col + i) in _cells and (row + height, col + i) not in used for i in range(width)):
+            height += 1
+        
+        values = []
+        for r in range(row, row + height):
+            values.append([_cells[(r, c)] for c in range(col, col + width)])
+            used.update((r, c) for c in range(col, col + width))
+        
+        blocks.append(CellBlock(row, col, values))
+    
+    return blocks
+
+def groupCellWrites(_writes):
+    """ Groups the (worksheet, address, value) cell writes into rectangular blocks, by worksheet
+    
+    If the same cell is written more than once, the last value is used. Addresses which 
+    are not a single cell (ranges, names) are kept as their own block.
+    
+    Args:
+        _writes (list): The (worksheet name, cell address, value) writes
+    Returns:
+        OrderedDict: {worksheet name: [CellBlock, ...]}, in the order the worksheets are first written to
+    """
+    
+    cellsBySheet = OrderedDict()
+    otherBySheet = {}
+    for sheet, address, value in _writes:
+        rowCol = parseCellAddress(address)
+        if rowCol:
+            cellsBySheet.setdefault(sheet, {})[rowCol] = value
+        else:
+            cellsBySheet.setdefault(sheet, {})
+            otherBySheet.setdefault(sheet, OrderedDict())[address] = value
+    
+    blocks = OrderedDict()
+    for sheet, cells in cellsBySheet.items():
+        blocks[sheet] = findBlocks(cells)
+        for address, value in otherBySheet.get(sheet, {}).items():
+            blocks[sheet].append(CellBlock(None, None, [[value]], address))
+    
+    return blocks
+
+def mergeBlocks(_blocks, _maxExtraCells=8):
+    """ Merges the blocks into fewer (bigger) rectangular blocks, for reading
+    
+    Each trip to Excel costs far more than reading a few extra cells, so two blocks 
+    are merged into the rectangle around them both whenever that rectangle has no more 
+    than _maxExtraCells cells in it which weren't asked for. The closest pair is merged 
+    first, until no pair is close enough.
+    
+    Args:
+        _blocks (list): The CellBlocks (single cells / rectangles, not named ranges)
+        _maxExtraCells (int): Default=8. The most cells not asked for a merge may add.
+    Returns:
+        list: The merged CellBlocks, in top-left to bottom-right order. Their Values are all None.
+    """
+    
+    # {id: [top, left, bottom, right, number of cells asked for]}
+    rects = {i: [b.Row, b.Col, b.Row + b.NumRows - 1, b.Col + b.NumCols - 1, b.Size] for i, b in enumerate(_blocks)}
+    
+    def around(_a, _b):
+        return [min(_a[0], _b[0]), min(_a[1], _b[1]), max(_a[2], _b[2]), max(_a[3], _b[3]), _a[4] + _b[4]]
+    
+    def extraCells(_rect):
+        return (_rect[2] - _rect[0] + 1) * (_rect[3] - _rect[1] + 1) - _rect[4]
+    
+    def overlaps(_a, _b):
+        return _a[0] <= _b[2] and _b[0] <= _a[2] and _a[1] <= _b[3] and _b[1] <= _a[3]
+    
+    # Each row (or column) between two blocks adds at least one extra cell, so only blocks 
+    # with no more than _maxExtraCells rows and columns between them can ever be merged. The 
+    # rects are kept in a grid of squares, and only the ones in nearby squares are compared.
+    size = max(_maxExtraCells, 0) + 1
+    grid = {}
+    
+    def squares(_rect, _pad=0):
+        for row in range((_rect[0] - _pad) // size, (_rect[2] + _pad) // size + 1):
+            for col in range((_rect[1] - _pad) // size, (_rect[3] + _pad) // size + 1):
+                yield row, col
+    
+    def addRect(_i, _rect):
+        rects[_i] = _rect
+        for square in squares(_rect):
+            grid.setdefault(square, set()).add(_i)
+    
+    def popRect(_i):
+        rect = rects.pop(_i)
+        for square in squares(rect):
+            grid[square].discard(_i)
+        return rect
+    
+    def near(_rect, _pad):
+        found = set()
+        for square in squares(_rect, _pad):
+            found.update(grid.get(square, ()))
+        return found
+    
+    # The pairs close enough to merge, closest first
+    candidates = []
+    def addCandidate(_i, _j):
+        extra = extraCells(around(rects[_i], rects[_j]))
+        if extra <= _maxExtraCells:
+            heapq.heappush(candidates, (extra, _i, _j))
+    
+    for i, rect in list(rects.items()):
+        addRect(i, rect)
+    
+    for i in sorted(rects):
+        for j in sorted(near(rects[i], size)):
+            if j > i:
+                addCandidate(i, j)
+    
+    nextID = len(rects)
+    while candidates:
+        extra, i, j = heapq.heappop(candidates)
+        if i not in rects or j not in rects:
+            continue  # One of them has already been merged into another
+        
+        box = around(popRect(i), popRect(j))
+        
+        # Take in any other blocks the new rectangle now overlaps
+        overlapping = [k for k in near(box, 0) if overlaps(box, rects[k])]
+        while overlapping:
+            for k in overlapping:
+                box = around(box, popRect(k))
+            overlapping = [k for k in near(box, 0) if overlaps(box, rects[k])]
+        
+        addRect(nextID, box)
+        for k in sorted(near(box, size)):
+            if k != nextID:
+                addCandidate(k, nextID)
+        nextID += 1
+    
+    return [CellBlock(top, left, [[None] * (right - left + 1) for _ in range(bottom - top + 1)])
+            for top, left, bottom, right, _ in sorted(rects.values())]
+
+def groupCellReads(_cells, _maxExtraCells=8):
+    """ Groups the (worksheet, address) cells to read into as few rectangular ranges as it can, by worksheet
+    
+    Cells close to each other are read as one range, even with a few cells between 
+    them which weren't asked for (see mergeBlocks). Addresses which are not a single 
+    cell (ranges, names) are kept as their own block.
+    
+    Args:
+        _cells (list): The (worksheet name, cell address) cells to read
+        _maxExtraCells (int): Default=8. The most cells not asked for a merge may add.
+    Returns:
+        OrderedDict: {worksheet name: [CellBlock, ...]}. The blocks' Values are all None.
+    """
+    
+    blocks = groupCellWrites([(sheet, address, None) for sheet, address in _cells])
+    for sheet, sheetBlocks in blocks.items():
+        cellBlocks = [block for block in sheetBlocks if not block._address]
+        otherBlocks = [block for block in sheetBlocks if block._address]
+        blocks[sheet] = mergeBlocks(cellBlocks, _maxExtraCells) + otherBlocks
+    
+    return blocks
+
+def blockValues(_block, _value2):
+    """ Returns {address: value} for each cell in the block, from the block's Range.Value2
+    
+    Args:
+        _block (CellBlock): The block read
+        _value2: The Range.Value2 read for the block. A single value for a single cell, 
+            otherwise a 2-D array: from Excel a .NET array (which starts at 1), or a 
+            tuple of rows from the XLSX_Reader.
+    Returns:
+        dict: {cell address: value}
+    """
+    
+    if _block.Size == 1:
+        return {_block.Address: _value2}
+    
+    if hasattr(_value2, 'GetLowerBound'):
+        r0, c0 = _value2.GetLowerBound(0), _value2.GetLowerBound(1)
+        values = [_value2[r0 + i, c0 + j] for i in range(_block.NumRows) for j in range(_block.NumCols)]
+    else:
+        values = [value for row in _value2 for value in row]
+    
+    return {address: value for (address, _), value in zip(_block.cells(), values)}
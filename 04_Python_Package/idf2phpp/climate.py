@@ -0,0 +1,626 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+The PHPP Climate Data Sets, and finding the nearest one to a location
+"""
+
+from __future__ import absolute_import
+import math
+
+from .phpp import PHPP_ClimateDataSet
+
+def getClimateData():
+    return [
+    {'Dataset': 'AD0001a-Andorra de la Vella', 'Comments': '2015 PHI', 'Code': '0001a', 'Latitude': '42.51', 'Source': 'Meteonorm & EOSWEB satellite data. Load data derived by PHI. ', 'Location': 'Andorra de la Vella', 'Longitude': '1.52', 'Region': '', 'Country': 'AD'},
+    {'Dataset': 'AE0001a-Dubai', 'Comments': '2015 PHI & ZEPHIR', 'Code': '0001a', 'Latitude': '25.25', 'Source': 'Different sources; comparison & work by ZEPHIR Passivhaus Italia & PHI', 'Location': 'Dubai', 'Longitude': '55.33', 'Region': '', 'Country': 'AE'},
+    {'Dataset': 'AT0001a-Eisenstadt', 'Comments': '2007 PHI. ', 'Code': '0001a', 'Latitude': '47.85', 'Source': 'source: ZAMG', 'Location': 'Eisenstadt', 'Longitude': '16.53', 'Region': 'Burgenland', 'Country': 'AT'},
+    {'Dataset': 'AT0002a-Kleinzicken', 'Comments': '2007 PHI. ', 'Code': '0002a', 'Latitude': '47.22', 'Source': 'source: ZAMG', 'Location': 'Kleinzicken', 'Longitude': '16.33', 'Region': 'Burgenland', 'Country': 'AT'},
+    {'Dataset': 'AT0003a-Neusiedl am See', 'Comments': '2007 PHI. ', 'Code': '0003a', 'Latitude': '47.95', 'Source': 'source: ZAMG', 'Location': 'Neusiedl am See', 'Longitude': '16.87', 'Region': 'Burgenland', 'Country': 'AT'},
+    {'Dataset': u'AT0004a-Feldkirchen/K\xc3\xa4rnten', 'Comments': '2007 PHI. ', 'Code': '0004a', 'Latitude': '46.72', 'Source': 'source: ZAMG', 'Location': u'Feldkirchen/K\xc3\xa4rnten', 'Longitude': '14.1', 'Region': u'K\xc3\xa4rnten', 'Country': 'AT'},
+    {'Dataset': u'AT0005a-K\xc3\xb6tschach-Mauthen', 'Comments': '2007 PHI. ', 'Code': '0005a', 'Latitude': '46.68', 'Source': 'source: ZAMG', 'Location': u'K\xc3\xb6tschach-Mauthen', 'Longitude': '13', 'Region': u'K\xc3\xa4rnten', 'Country': 'AT'},
+    {'Dataset': 'AT0006a-Spittal/Drau', 'Comments': '2007 PHI. ', 'Code': '0006a', 'Latitude': '46.79', 'Source': 'source: ZAMG', 'Location': 'Spittal/Drau', 'Longitude': '13.49', 'Region': u'K\xc3\xa4rnten', 'Country': 'AT'},
+    {'Dataset': u'AT0007a-St. Andr\xc3\xa4/Lavanttal', 'Comments': '2007 PHI. ', 'Code': '0007a', 'Latitude': '46.76', 'Source': 'source: ZAMG', 'Location': u'St. Andr\xc3\xa4/Lavanttal', 'Longitude': '14.83', 'Region': u'K\xc3\xa4rnten', 'Country': 'AT'},
+    {'Dataset': 'AT0008a-Weissensee', 'Comments': '2007 PHI. ', 'Code': '0008a', 'Latitude': '46.72', 'Source': 'source: ZAMG', 'Location': 'Weissensee', 'Longitude': '13.29', 'Region': u'K\xc3\xa4rnten', 'Country': 'AT'},
+    {'Dataset': 'AT0009a-Amstetten', 'Comments': '2007 PHI. ', 'Code': '0009a', 'Latitude': '48.11', 'Source': 'source: ZAMG', 'Location': 'Amstetten', 'Longitude': '14.9', 'Region': u'Nieder\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': 'AT0010a-Baden', 'Comments': '2007 PHI. ', 'Code': '0010a', 'Latitude': '48.01', 'Source': 'source: ZAMG', 'Location': 'Baden', 'Longitude': '16.25', 'Region': u'Nieder\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': 'AT0011a-Lilienfeld', 'Comments': '2007 PHI. ', 'Code': '0011a', 'Latitude': '48.03', 'Source': 'source: ZAMG', 'Location': 'Lilienfeld', 'Longitude': '15.58', 'Region': u'Nieder\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': 'AT0012a-Stockerau', 'Comments': '2007 PHI. ', 'Code': '0012a', 'Latitude': '48.4', 'Source': 'source: ZAMG', 'Location': 'Stockerau', 'Longitude': '16.19', 'Region': u'Nieder\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': 'AT0013a-Zwettl', 'Comments': '2007 PHI. ', 'Code': '0013a', 'Latitude': '48.62', 'Source': 'source: ZAMG', 'Location': 'Zwettl', 'Longitude': '15.2', 'Region': u'Nieder\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': 'AT0014a-Bad Goisern', 'Comments': '2007 PHI. ', 'Code': '0014a', 'Latitude': '47.64', 'Source': 'source: ZAMG', 'Location': 'Bad Goisern', 'Longitude': '13.62', 'Region': u'Ober\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': 'AT0015a-Gmunden', 'Comments': '2007 PHI. ', 'Code': '0015a', 'Latitude': '47.9', 'Source': 'source: ZAMG', 'Location': 'Gmunden', 'Longitude': '13.78', 'Region': u'Ober\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': u'AT0016a-K\xc3\xb6nigswiesen', 'Comments': '2007 PHI. ', 'Code': '0016a', 'Latitude': '48.41', 'Source': 'source: ZAMG', 'Location': u'K\xc3\xb6nigswiesen', 'Longitude': '14.84', 'Region': u'Ober\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': 'AT0017a-Linz', 'Comments': '2007 PHI. ', 'Code': '0017a', 'Latitude': '48.32', 'Source': 'source: ZAMG', 'Location': 'Linz', 'Longitude': '14.3', 'Region': u'Ober\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': 'AT0018a-Ried/Innkreis', 'Comments': '2007 PHI. ', 'Code': '0018a', 'Latitude': '48.22', 'Source': 'source: ZAMG', 'Location': 'Ried/Innkreis', 'Longitude': '13.48', 'Region': u'Ober\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': u'AT0019a-Rohrbach/M\xc3\xbchlkreis', 'Comments': '2007 PHI. ', 'Code': '0019a', 'Latitude': '48.57', 'Source': 'source: ZAMG', 'Location': u'Rohrbach/M\xc3\xbchlkreis', 'Longitude': '14', 'Region': u'Ober\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': 'AT0020a-Weyer', 'Comments': '2007 PHI. ', 'Code': '0020a', 'Latitude': '47.86', 'Source': 'source: ZAMG', 'Location': 'Weyer', 'Longitude': '14.67', 'Region': u'Ober\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': 'AT0021a-Windischgarsten', 'Comments': '2007 PHI. ', 'Code': '0021a', 'Latitude': '47.73', 'Source': 'source: ZAMG', 'Location': 'Windischgarsten', 'Longitude': '14.33', 'Region': u'Ober\xc3\xb6sterreich', 'Country': 'AT'},
+    {'Dataset': 'AT0022a-Mattsee', 'Comments': '2007 PHI. ', 'Code': '0022a', 'Latitude': '47.98', 'Source': 'source: ZAMG', 'Location': 'Mattsee', 'Longitude': '13.11', 'Region': 'Salzburg', 'Country': 'AT'},
+    {'Dataset': 'AT0023a-Salzburg', 'Comments': '2007 PHI. ', 'Code': '0023a', 'Latitude': '47.78', 'Source': 'source: ZAMG', 'Location': 'Salzburg', 'Longitude': '13.05', 'Region': 'Salzburg', 'Country': 'AT'},
+    {'Dataset': 'AT0024a-St. Johann/Pongau', 'Comments': '2007 PHI. ', 'Code': '0024a', 'Latitude': '47.32', 'Source': 'source: ZAMG', 'Location': 'St. Johann/Pongau', 'Longitude': '13.18', 'Region': 'Salzburg', 'Country': 'AT'},
+    {'Dataset': 'AT0025a-Tamsweg', 'Comments': '2007 PHI. ', 'Code': '0025a', 'Latitude': '47.12', 'Source': 'source: ZAMG', 'Location': 'Tamsweg', 'Longitude': '13.81', 'Region': 'Salzburg', 'Country': 'AT'},
+    {'Dataset': 'AT0026a-Zell am See', 'Comments': '2007 PHI. ', 'Code': '0026a', 'Latitude': '47.33', 'Source': 'source: ZAMG', 'Location': 'Zell am See', 'Longitude': '12.8', 'Region': 'Salzburg', 'Country': 'AT'},
+    {'Dataset': 'AT0027a-Aigen/Ennstal', 'Comments': '2007 PHI. ', 'Code': '0027a', 'Latitude': '47.53', 'Source': 'source: ZAMG', 'Location': 'Aigen/Ennstal', 'Longitude': '14.13', 'Region': 'Steiermark', 'Country': 'AT'},
+    {'Dataset': 'AT0028a-Bad Gleichenberg', 'Comments': '2007 PHI. ', 'Code': '0028a', 'Latitude': '46.88', 'Source': 'source: ZAMG', 'Location': 'Bad Gleichenberg', 'Longitude': '15.91', 'Region': 'Steiermark', 'Country': 'AT'},
+    {'Dataset': 'AT0029a-Graz', 'Comments': '2007 PHI. ', 'Code': '0029a', 'Latitude': '47.08', 'Source': 'source: ZAMG', 'Location': 'Graz', 'Longitude': '15.37', 'Region': 'Steiermark', 'Country': 'AT'},
+    {'Dataset': 'AT0030a-Kapfenberg', 'Comments': '2007 PHI. ', 'Code': '0030a', 'Latitude': '47.45', 'Source': 'source: ZAMG', 'Location': 'Kapfenberg', 'Longitude': '15.3', 'Region': 'Steiermark', 'Country': 'AT'},
+    {'Dataset': 'AT0031a-Ramsau/Dachstein', 'Comments': '2007 PHI. ', 'Code': '0031a', 'Latitude': '47.42', 'Source': 'source: ZAMG', 'Location': 'Ramsau/Dachstein', 'Longitude': '13.63', 'Region': 'Steiermark', 'Country': 'AT'},
+    {'Dataset': 'AT0032b-Innsbruck', 'Comments': '2014 PHI. Vergleich mit Meteonorm & IWEC. PassREg. ', 'Code': '0032b', 'Latitude': '47.26', 'Source': 'source: ZAMG', 'Location': 'Innsbruck', 'Longitude': '11.38', 'Region': 'Tirol', 'Country': 'AT'},
+    {'Dataset': 'AT0033a-Kirchberg/Tirol', 'Comments': '2007 PHI. ', 'Code': '0033a', 'Latitude': '47.45', 'Source': 'source: ZAMG', 'Location': 'Kirchberg/Tirol', 'Longitude': '12.32', 'Region': 'Tirol', 'Country': 'AT'},
+    {'Dataset': u'AT0034a-S\xc3\xb6lden', 'Comments': '2007 PHI. ', 'Code': '0034a', 'Latitude': '46.97', 'Source': 'source: ZAMG', 'Location': u'S\xc3\xb6lden', 'Longitude': '11.01', 'Region': 'Tirol', 'Country': 'AT'},
+    {'Dataset': 'AT0035a-Stams', 'Comments': '2007 PHI. ', 'Code': '0035a', 'Latitude': '47.28', 'Source': 'source: ZAMG', 'Location': 'Stams', 'Longitude': '10.98', 'Region': 'Tirol', 'Country': 'AT'},
+    {'Dataset': 'AT0036a-Weissenbach/Lech', 'Comments': '2007 PHI. ', 'Code': '0036a', 'Latitude': '47.44', 'Source': 'source: ZAMG', 'Location': 'Weissenbach/Lech', 'Longitude': '10.64', 'Region': 'Tirol', 'Country': 'AT'},
+    {'Dataset': u'AT0037a-W\xc3\xb6rgl', 'Comments': '2007 PHI. ', 'Code': '0037a', 'Latitude': '47.49', 'Source': 'source: ZAMG', 'Location': u'W\xc3\xb6rgl', 'Longitude': '12.07', 'Region': 'Tirol', 'Country': 'AT'},
+    {'Dataset': 'AT0038a-Zell am Ziller', 'Comments': '2007 PHI. ', 'Code': '0038a', 'Latitude': '47.25', 'Source': 'source: ZAMG', 'Location': 'Zell am Ziller', 'Longitude': '11.9', 'Region': 'Tirol', 'Country': 'AT'},
+    {'Dataset': 'AT0039a-Alberschwende', 'Comments': '2007 PHI. ', 'Code': '0039a', 'Latitude': '47.46', 'Source': 'source: ZAMG', 'Location': 'Alberschwende', 'Longitude': '9.85', 'Region': 'Vorarlberg', 'Country': 'AT'},
+    {'Dataset': 'AT0040a-Bregenz', 'Comments': '2007 PHI. ', 'Code': '0040a', 'Latitude': '47.5', 'Source': 'source: ZAMG', 'Location': 'Bregenz', 'Longitude': '9.75', 'Region': 'Vorarlberg', 'Country': 'AT'},
+    {'Dataset': 'AT0041a-Dornbirn', 'Comments': '2007 PHI. ', 'Code': '0041a', 'Latitude': '47.43', 'Source': 'source: ZAMG', 'Location': 'Dornbirn', 'Longitude': '9.73', 'Region': 'Vorarlberg', 'Country': 'AT'},
+    {'Dataset': 'AT0042a-Feldkirch', 'Comments': '2007 PHI. ', 'Code': '0042a', 'Latitude': '47.27', 'Source': 'source: ZAMG', 'Location': 'Feldkirch', 'Longitude': '9.6', 'Region': 'Vorarlberg', 'Country': 'AT'},
+    {'Dataset': 'AT0043a-Warth', 'Comments': '2007 PHI. ', 'Code': '0043a', 'Latitude': '47.25', 'Source': 'source: ZAMG', 'Location': 'Warth', 'Longitude': '10.18', 'Region': 'Vorarlberg', 'Country': 'AT'},
+    {'Dataset': u'AT0044a-Wien Ost (Gro\xc3\x9f-Enzersdorf)', 'Comments': '2007 PHI. ', 'Code': '0044a', 'Latitude': '48.2', 'Source': 'source: ZAMG', 'Location': u'Wien Ost (Gro\xc3\x9f-Enzersdorf)', 'Longitude': '16.57', 'Region': 'Wien', 'Country': 'AT'},
+    {'Dataset': 'AT0045a-Wien-Donaufeld', 'Comments': '2007 PHI. ', 'Code': '0045a', 'Latitude': '48.26', 'Source': 'source: ZAMG', 'Location': 'Wien-Donaufeld', 'Longitude': '16.43', 'Region': 'Wien', 'Country': 'AT'},
+    {'Dataset': 'AT0046a-Wien-Hohe Warte', 'Comments': '2007 PHI. ', 'Code': '0046a', 'Latitude': '48.25', 'Source': 'source: ZAMG', 'Location': 'Wien-Hohe Warte', 'Longitude': '16.37', 'Region': 'Wien', 'Country': 'AT'},
+    {'Dataset': 'AT0047a-Wien-Innere Stadt', 'Comments': '2007 PHI. ', 'Code': '0047a', 'Latitude': '48.2', 'Source': 'source: ZAMG', 'Location': 'Wien-Innere Stadt', 'Longitude': '16.37', 'Region': 'Wien', 'Country': 'AT'},
+    {'Dataset': 'AT0048a-Imst', 'Comments': '2015 PHI', 'Code': '0048a', 'Latitude': '47.25', 'Source': 'Temp = 1981-2010; Strahlung / Lastdaten basierend auf ZAMG', 'Location': 'Imst', 'Longitude': '10.74', 'Region': 'Tirol', 'Country': 'AT'},
+    {'Dataset': 'AU0001a-Melbourne', 'Comments': '2011 PHI. Vergleich mit EOSWEB, IWEC.', 'Code': '0001a', 'Latitude': '-37.817', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)  Source: NatHERS (A) RMY data 2012.', 'Location': 'Melbourne', 'Longitude': '144.967', 'Region': 'Victoria', 'Country': 'AU'},
+    {'Dataset': 'AU0002a-Perth', 'Comments': '2014 PHI', 'Code': '0002a', 'Latitude': '-31.93', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)  Source: NatHERS (A) RMY data 2012.', 'Location': 'Perth', 'Longitude': '115.98', 'Region': 'Western Australia', 'Country': 'AU'},
+    {'Dataset': 'AU0003a-Canberra', 'Comments': '2014 PHI', 'Code': '0003a', 'Latitude': '-35.31', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!) . Source: NatHERS (A) RMY data 2012.', 'Location': 'Canberra', 'Longitude': '149.2', 'Region': 'Australian Capital Territory', 'Country': 'AU'},
+    {'Dataset': 'AU0004a-Adelaide', 'Comments': '2014 PHI', 'Code': '0004a', 'Latitude': '-34.93', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!) . Monthly values: MN7 Adelaide (WS, new period). Compared with TMY2 NatHERS and IWEC.', 'Location': 'Adelaide', 'Longitude': '138.53', 'Region': 'South Australia', 'Country': 'AU'},
+    {'Dataset': 'AU0005a-Hobart', 'Comments': '2015 PHI', 'Code': '0005a', 'Latitude': '-42.89', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!). Temp = 1981-2010; Other = derived from NatHERS (A) RMY data 2012.', 'Location': 'Hobart', 'Longitude': '147.33', 'Region': 'Tasmania', 'Country': 'AU'},
+    {'Dataset': 'AU0006a-Applethorpe', 'Comments': '2015 PHI', 'Code': '0006a', 'Latitude': '-28.61', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!). Source = Meteonorm 7, new period. CL = NatHERS Armidale. PHI January 2015', 'Location': 'Applethorpe', 'Longitude': '151.95', 'Region': 'Queensland', 'Country': 'AU'},
+    {'Dataset': 'AU0007a-Armidale', 'Comments': '2015 PHI', 'Code': '0007a', 'Latitude': '-30.53', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!). Source = Meteonorm 7, new period. CL = NatHERS Armidale. PHI January 2015', 'Location': 'Armidale', 'Longitude': '151.62', 'Region': 'New South Wales', 'Country': 'AU'},
+    {'Dataset': 'AU0008a-Toowoomba', 'Comments': '2016 PHI', 'Code': '0008a', 'Latitude': '-27.54', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!). Temp = 2006-2015; Other derived from Meteonorm. ', 'Location': 'Toowoomba', 'Longitude': '151.91', 'Region': 'Queensland', 'Country': 'AU'},
+    {'Dataset': 'AU0009a-Oakey', 'Comments': '2016 PHI', 'Code': '0009a', 'Latitude': '-27.4', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!). Temp = 1981-2010; Other derived from Meteonorm and NatHERS. ', 'Location': 'Oakey', 'Longitude': '151.74', 'Region': 'Queensland', 'Country': 'AU'},
+    {'Dataset': u'BE0001c-Br\xc3\xbcssel (Ukkel)', 'Comments': '2014 PHI. Load data from IWEC. PassREg', 'Code': '0001c', 'Latitude': '50.78', 'Source': 'Source: Temperature & Dew Point from KMI (1981-2010). Radiation: MN7 Station (1968-2005).', 'Location': u'Br\xc3\xbcssel (Ukkel)', 'Longitude': '4.35', 'Region': '', 'Country': 'BE'},
+    {'Dataset': 'BE0002b-Saint-Hubert', 'Comments': '', 'Code': '0002b', 'Latitude': '50.017', 'Source': '', 'Location': 'Saint-Hubert', 'Longitude': '5.317', 'Region': '', 'Country': 'BE'},
+    {'Dataset': 'BE0003b-Oostende', 'Comments': '', 'Code': '0003b', 'Latitude': '51.217', 'Source': '', 'Location': 'Oostende', 'Longitude': '2.917', 'Region': '', 'Country': 'BE'},
+    {'Dataset': 'BE0004b-Florennes', 'Comments': '', 'Code': '0004b', 'Latitude': '50.25', 'Source': '', 'Location': 'Florennes', 'Longitude': '4.7', 'Region': '', 'Country': 'BE'},
+    {'Dataset': 'BE0005b-Elsenhorn', 'Comments': '', 'Code': '0005b', 'Latitude': '50.45', 'Source': '', 'Location': 'Elsenhorn', 'Longitude': '6.217', 'Region': '', 'Country': 'BE'},
+    {'Dataset': 'BE0006b-Limbourg', 'Comments': '', 'Code': '0006b', 'Latitude': '50.617', 'Source': '', 'Location': 'Limbourg', 'Longitude': '5.933', 'Region': '', 'Country': 'BE'},
+    {'Dataset': 'BG0001a-Varna', 'Comments': '2011 PHI. Vergleich mit EOSWEB.', 'Code': '0001a', 'Latitude': '43.21', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Varna', 'Longitude': '27.91', 'Region': 'Climate Zone 1', 'Country': 'BG'},
+    {'Dataset': 'BG0002a-Shumen', 'Comments': '2011 PHI. Vergleich mit EOSWEB.', 'Code': '0002a', 'Latitude': '43.283', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Shumen', 'Longitude': '26.933', 'Region': 'Climate Zone 2', 'Country': 'BG'},
+    {'Dataset': 'BG0003a-Ruse', 'Comments': '2011 PHI. Vergleich mit EOSWEB.', 'Code': '0003a', 'Latitude': '43.856', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Ruse', 'Longitude': '25.971', 'Region': 'Climate Zone 3', 'Country': 'BG'},
+    {'Dataset': 'BG0004b-Veliko Tarnovo', 'Comments': '2011 PHI. Confirmed 2014 by comparison with data from national regulation. PassREg', 'Code': '0004b', 'Latitude': '43.086', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Veliko Tarnovo', 'Longitude': '25.656', 'Region': 'Climate Zone 4', 'Country': 'BG'},
+    {'Dataset': 'BG0005b-Burgas', 'Comments': '2011 PHI. Confirmed 2014 by comparison with data from national regulation. PassREg', 'Code': '0005b', 'Latitude': '42.51', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Burgas', 'Longitude': '27.47', 'Region': 'Climate Zone 5', 'Country': 'BG'},
+    {'Dataset': 'BG0006a-Plovdiv', 'Comments': '2011 PHI. Vergleich mit EOSWEB.', 'Code': '0006a', 'Latitude': '42.15', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Plovdiv', 'Longitude': '24.75', 'Region': 'Climate Zone 6', 'Country': 'BG'},
+    {'Dataset': 'BG0007a-Sofia', 'Comments': '2011 PHI. Vergleich mit EOSWEB.', 'Code': '0007a', 'Latitude': '42.697', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Sofia', 'Longitude': '23.323', 'Region': 'Climate Zone 7', 'Country': 'BG'},
+    {'Dataset': 'BG0008a-Haskovo', 'Comments': '2011 PHI. Vergleich mit EOSWEB.', 'Code': '0008a', 'Latitude': '41.933', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Haskovo', 'Longitude': '25.567', 'Region': 'Climate Zone 8', 'Country': 'BG'},
+    {'Dataset': 'BG0009a-Blagoevgrad', 'Comments': '2011 PHI. Vergleich mit EOSWEB.', 'Code': '0009a', 'Latitude': '42.014', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Blagoevgrad', 'Longitude': '23.095', 'Region': 'Climate Zone 9', 'Country': 'BG'},
+    {'Dataset': 'BR0001b-Brasilia', 'Comments': '2011 PHI', 'Code': '0001b', 'Latitude': '-15.78', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)  Source: Meteonorm V6. ', 'Location': 'Brasilia', 'Longitude': '-47.93', 'Region': '', 'Country': 'BR'},
+    {'Dataset': 'BY0001a-Minsk', 'Comments': '', 'Code': '0001a', 'Latitude': '53.9', 'Source': '', 'Location': 'Minsk', 'Longitude': '27.5', 'Region': '', 'Country': 'BY'},
+    {'Dataset': 'CA0001b-Toronto', 'Comments': 'CanPHI dataset', 'Code': '0001b', 'Latitude': '43.661', 'Source': '', 'Location': 'Toronto', 'Longitude': '-79.383', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': u'CA0002c-Montr\xc3\xa9al', 'Comments': u'2015 PHI. Erg\xc3\xa4nzt um 2 K\xc3\xbchllastdaten, sonst identisch zu Vorg\xc3\xa4nger.', 'Code': '0002c', 'Latitude': '45.51', 'Source': 'source: Meteonorm. Cooling load: PHI', 'Location': u'Montr\xc3\xa9al', 'Longitude': '-73.56', 'Region': u'Qu\xc3\xa9bec', 'Country': 'CA'},
+    {'Dataset': 'CA0003d-Vancouver', 'Comments': '2015 PHI', 'Code': '0003d', 'Latitude': '49.2', 'Source': 'Temp: Environment Canada data (Climate Normal 1981-2010). Radiation & load data: Derived from Meteonorm & CWEC. ', 'Location': 'Vancouver', 'Longitude': '-123.18', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0004b-Ottawa', 'Comments': 'CanPHI dataset', 'Code': '0004b', 'Latitude': '45.412', 'Source': '', 'Location': 'Ottawa', 'Longitude': '-75.699', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': 'CA0005b-Calgary', 'Comments': 'CanPHI dataset', 'Code': '0005b', 'Latitude': '51.046', 'Source': '', 'Location': 'Calgary', 'Longitude': '-114.061', 'Region': 'Alberta', 'Country': 'CA'},
+    {'Dataset': 'CA0006b-Edmonton', 'Comments': 'CanPHI dataset', 'Code': '0006b', 'Latitude': '53.541', 'Source': '', 'Location': 'Edmonton', 'Longitude': '-113.494', 'Region': 'Alberta', 'Country': 'CA'},
+    {'Dataset': 'CA0007b-Quebec', 'Comments': 'CanPHI dataset', 'Code': '0007b', 'Latitude': '46.816', 'Source': '', 'Location': 'Quebec', 'Longitude': '-71.224', 'Region': u'Qu\xc3\xa9bec', 'Country': 'CA'},
+    {'Dataset': 'CA0008b-Winnipeg', 'Comments': 'CanPHI dataset', 'Code': '0008b', 'Latitude': '49.896', 'Source': '', 'Location': 'Winnipeg', 'Longitude': '-97.143', 'Region': 'Manitoba', 'Country': 'CA'},
+    {'Dataset': 'CA0009b-St. Catherines', 'Comments': 'CanPHI dataset', 'Code': '0009b', 'Latitude': '43.183', 'Source': '', 'Location': 'St. Catherines', 'Longitude': '-79.233', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': 'CA0010b-Halifax', 'Comments': 'CanPHI dataset', 'Code': '0010b', 'Latitude': '44.648', 'Source': '', 'Location': 'Halifax', 'Longitude': '-63.572', 'Region': 'Nova Scotia', 'Country': 'CA'},
+    {'Dataset': 'CA0011b-Saskatoon', 'Comments': 'CanPHI dataset', 'Code': '0011b', 'Latitude': '52.129', 'Source': '', 'Location': 'Saskatoon', 'Longitude': '-106.662', 'Region': 'Saskatchewan', 'Country': 'CA'},
+    {'Dataset': 'CA0012b-Regina', 'Comments': 'CanPHI dataset', 'Code': '0012b', 'Latitude': '50.447', 'Source': '', 'Location': 'Regina', 'Longitude': '-104.618', 'Region': 'Saskatchewan', 'Country': 'CA'},
+    {'Dataset': 'CA0013b-Sherbrooke', 'Comments': 'CanPHI dataset', 'Code': '0013b', 'Latitude': '45.401', 'Source': '', 'Location': 'Sherbrooke', 'Longitude': '-71.888', 'Region': u'Qu\xc3\xa9bec', 'Country': 'CA'},
+    {'Dataset': "CA0014b-St. John's", 'Comments': 'CanPHI dataset', 'Code': '0014b', 'Latitude': '47.567', 'Source': '', 'Location': "St. John's", 'Longitude': '-52.705', 'Region': 'Newfoundland', 'Country': 'CA'},
+    {'Dataset': 'CA0015b-Kelowna', 'Comments': 'CanPHI dataset', 'Code': '0015b', 'Latitude': '49.882', 'Source': '', 'Location': 'Kelowna', 'Longitude': '-119.455', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0016b-Thunder Bay', 'Comments': 'CanPHI dataset', 'Code': '0016b', 'Latitude': '48.383', 'Source': '', 'Location': 'Thunder Bay', 'Longitude': '-89.25', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': 'CA0017b-Saint John', 'Comments': 'CanPHI dataset', 'Code': '0017b', 'Latitude': '45.268', 'Source': '', 'Location': 'Saint John', 'Longitude': '-66.055', 'Region': 'New Brunswick', 'Country': 'CA'},
+    {'Dataset': 'CA0018b-Prince George', 'Comments': 'CanPHI dataset', 'Code': '0018b', 'Latitude': '53.916', 'Source': '', 'Location': 'Prince George', 'Longitude': '-122.75', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0019b-Charlottetown', 'Comments': 'CanPHI dataset', 'Code': '0019b', 'Latitude': '46.233', 'Source': '', 'Location': 'Charlottetown', 'Longitude': '-63.133', 'Region': 'Prince Edward Island', 'Country': 'CA'},
+    {'Dataset': 'CA0020b-Yellowknife', 'Comments': 'CanPHI dataset', 'Code': '0020b', 'Latitude': '62.444', 'Source': '', 'Location': 'Yellowknife', 'Longitude': '-114.396', 'Region': 'Northwest Territories', 'Country': 'CA'},
+    {'Dataset': 'CA0021a-Smithers', 'Comments': '2014 PHI', 'Code': '0021a', 'Latitude': '54.82', 'Source': 'Source: CWEC', 'Location': 'Smithers', 'Longitude': '-127.18', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0022a-Whistler', 'Comments': 'CanPHI dataset', 'Code': '0022a', 'Latitude': '50.121', 'Source': '', 'Location': 'Whistler', 'Longitude': '-122.954', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0023b-Upper Squamish', 'Comments': '2015 PHI', 'Code': '0023b', 'Latitude': '49.9', 'Source': 'Temp: Environment Canada data (Climate Normal 1981-2010). Radiation & load data: Derived from Meteonorm.', 'Location': 'Upper Squamish', 'Longitude': '-123.28', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0024a-Cranbrook', 'Comments': 'CanPHI dataset', 'Code': '0024a', 'Latitude': '49.514', 'Source': '', 'Location': 'Cranbrook', 'Longitude': '-115.769', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0025a-Victoria', 'Comments': 'CanPHI dataset', 'Code': '0025a', 'Latitude': '48.42', 'Source': '', 'Location': 'Victoria', 'Longitude': '-123.37', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0026a-Fort St.John', 'Comments': 'CanPHI dataset', 'Code': '0026a', 'Latitude': '56.247', 'Source': '', 'Location': 'Fort St.John', 'Longitude': '-120.848', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0027a-Medicine Hat', 'Comments': 'CanPHI dataset', 'Code': '0027a', 'Latitude': '50.042', 'Source': '', 'Location': 'Medicine Hat', 'Longitude': '-110.678', 'Region': 'Alberta', 'Country': 'CA'},
+    {'Dataset': 'CA0028a-Banff', 'Comments': 'CanPHI dataset', 'Code': '0028a', 'Latitude': '51.178', 'Source': '', 'Location': 'Banff', 'Longitude': '-115.572', 'Region': 'Alberta', 'Country': 'CA'},
+    {'Dataset': 'CA0029a-Edson', 'Comments': 'CanPHI dataset', 'Code': '0029a', 'Latitude': '53.582', 'Source': '', 'Location': 'Edson', 'Longitude': '-116.434', 'Region': 'Alberta', 'Country': 'CA'},
+    {'Dataset': 'CA0030a-Grand Prairie', 'Comments': 'CanPHI dataset', 'Code': '0030a', 'Latitude': '55.171', 'Source': '', 'Location': 'Grand Prairie', 'Longitude': '-118.795', 'Region': 'Alberta', 'Country': 'CA'},
+    {'Dataset': 'CA0031a-Lethbridge', 'Comments': 'CanPHI dataset', 'Code': '0031a', 'Latitude': '49.694', 'Source': '', 'Location': 'Lethbridge', 'Longitude': '-112.833', 'Region': 'Alberta', 'Country': 'CA'},
+    {'Dataset': 'CA0032a-Swift Current', 'Comments': 'CanPHI dataset', 'Code': '0032a', 'Latitude': '50.288', 'Source': '', 'Location': 'Swift Current', 'Longitude': '-107.794', 'Region': 'Saskatchewan', 'Country': 'CA'},
+    {'Dataset': 'CA0033a-Yorkton', 'Comments': 'CanPHI dataset', 'Code': '0033a', 'Latitude': '51.214', 'Source': '', 'Location': 'Yorkton', 'Longitude': '-102.463', 'Region': 'Saskatchewan', 'Country': 'CA'},
+    {'Dataset': 'CA0034a-Prince Albert', 'Comments': 'CanPHI dataset', 'Code': '0034a', 'Latitude': '53.2', 'Source': '', 'Location': 'Prince Albert', 'Longitude': '-105.75', 'Region': 'Saskatchewan', 'Country': 'CA'},
+    {'Dataset': 'CA0035a-Brandon', 'Comments': 'CanPHI dataset', 'Code': '0035a', 'Latitude': '49.833', 'Source': '', 'Location': 'Brandon', 'Longitude': '-99.95', 'Region': 'Manitoba', 'Country': 'CA'},
+    {'Dataset': 'CA0036a-Peterborough', 'Comments': 'CanPHI dataset', 'Code': '0036a', 'Latitude': '44.3', 'Source': '', 'Location': 'Peterborough', 'Longitude': '-78.317', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': 'CA0037a-Windsor', 'Comments': 'CanPHI dataset', 'Code': '0037a', 'Latitude': '42.3', 'Source': '', 'Location': 'Windsor', 'Longitude': '-83.02', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': 'CA0038a-London', 'Comments': 'CanPHI dataset', 'Code': '0038a', 'Latitude': '42.97', 'Source': '', 'Location': 'London', 'Longitude': '-81.25', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': 'CA0039a-Kingston', 'Comments': 'CanPHI dataset', 'Code': '0039a', 'Latitude': '44.23', 'Source': '', 'Location': 'Kingston', 'Longitude': '-76.5', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': 'CA0040a-Sudbury', 'Comments': 'CanPHI dataset', 'Code': '0040a', 'Latitude': '46.5', 'Source': '', 'Location': 'Sudbury', 'Longitude': '-81.02', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': 'CA0041a-Sault Ste. Marie', 'Comments': 'CanPHI dataset', 'Code': '0041a', 'Latitude': '46.533', 'Source': '', 'Location': 'Sault Ste. Marie', 'Longitude': '-84.35', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': 'CA0042a-Parry Sound', 'Comments': 'CanPHI dataset', 'Code': '0042a', 'Latitude': '45.333', 'Source': '', 'Location': 'Parry Sound', 'Longitude': '-80.033', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': 'CA0043a-Saguenay', 'Comments': 'CanPHI dataset', 'Code': '0043a', 'Latitude': '48.417', 'Source': '', 'Location': 'Saguenay', 'Longitude': '-71.067', 'Region': u'Qu\xc3\xa9bec', 'Country': 'CA'},
+    {'Dataset': 'CA0044a-Maniwaki', 'Comments': 'CanPHI dataset', 'Code': '0044a', 'Latitude': '46.383', 'Source': '', 'Location': 'Maniwaki', 'Longitude': '-75.983', 'Region': u'Qu\xc3\xa9bec', 'Country': 'CA'},
+    {'Dataset': 'CA0045a-Baie Comeau', 'Comments': 'CanPHI dataset', 'Code': '0045a', 'Latitude': '49.217', 'Source': '', 'Location': 'Baie Comeau', 'Longitude': '-68.15', 'Region': u'Qu\xc3\xa9bec', 'Country': 'CA'},
+    {'Dataset': 'CA0046a-Shawinigan', 'Comments': 'CanPHI dataset', 'Code': '0046a', 'Latitude': '46.55', 'Source': '', 'Location': 'Shawinigan', 'Longitude': '-72.733', 'Region': u'Qu\xc3\xa9bec', 'Country': 'CA'},
+    {'Dataset': 'CA0047a-Fredericton', 'Comments': 'CanPHI dataset', 'Code': '0047a', 'Latitude': '45.95', 'Source': '', 'Location': 'Fredericton', 'Longitude': '-66.667', 'Region': 'New Brunswick', 'Country': 'CA'},
+    {'Dataset': 'CA0048a-Moncton', 'Comments': 'CanPHI dataset', 'Code': '0048a', 'Latitude': '46.07', 'Source': '', 'Location': 'Moncton', 'Longitude': '-64.77', 'Region': 'New Brunswick', 'Country': 'CA'},
+    {'Dataset': 'CA0049a-Bathurst', 'Comments': 'CanPHI dataset', 'Code': '0049a', 'Latitude': '47.62', 'Source': '', 'Location': 'Bathurst', 'Longitude': '-65.65', 'Region': 'New Brunswick', 'Country': 'CA'},
+    {'Dataset': 'CA0050a-Truro', 'Comments': 'CanPHI dataset', 'Code': '0050a', 'Latitude': '45.365', 'Source': '', 'Location': 'Truro', 'Longitude': '-63.28', 'Region': 'Nova Scotia', 'Country': 'CA'},
+    {'Dataset': 'CA0051a-Sydney', 'Comments': 'CanPHI dataset', 'Code': '0051a', 'Latitude': '46.138', 'Source': '', 'Location': 'Sydney', 'Longitude': '-60.183', 'Region': 'Nova Scotia', 'Country': 'CA'},
+    {'Dataset': 'CA0052a-Kentville', 'Comments': 'CanPHI dataset', 'Code': '0052a', 'Latitude': '45.078', 'Source': '', 'Location': 'Kentville', 'Longitude': '-64.496', 'Region': 'Nova Scotia', 'Country': 'CA'},
+    {'Dataset': 'CA0053a-Yarmouth', 'Comments': 'CanPHI dataset', 'Code': '0053a', 'Latitude': '43.836', 'Source': '', 'Location': 'Yarmouth', 'Longitude': '-66.118', 'Region': 'Nova Scotia', 'Country': 'CA'},
+    {'Dataset': 'CA0054a-Corner Brook', 'Comments': 'CanPHI dataset', 'Code': '0054a', 'Latitude': '48.95', 'Source': '', 'Location': 'Corner Brook', 'Longitude': '-57.95', 'Region': 'Newfoundland', 'Country': 'CA'},
+    {'Dataset': 'CA0055a-Whitehorse', 'Comments': 'CanPHI dataset', 'Code': '0055a', 'Latitude': '60.717', 'Source': '', 'Location': 'Whitehorse', 'Longitude': '-135.05', 'Region': 'Yukon', 'Country': 'CA'},
+    {'Dataset': 'CA0056a-Dawson', 'Comments': 'CanPHI dataset', 'Code': '0056a', 'Latitude': '64.06', 'Source': '', 'Location': 'Dawson', 'Longitude': '-139.411', 'Region': 'Yukon', 'Country': 'CA'},
+    {'Dataset': 'CA0057a-Campbell Island, Dryad Point', 'Comments': '2015 PHI', 'Code': '0057a', 'Latitude': '52.19', 'Source': 'Source: Environment Canada data (Canadian Climate Normals 1981-2010). Radiation & Load data: satellite data (Passipedia). T', 'Location': 'Campbell Island, Dryad Point', 'Longitude': '-128.11', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0058a-Nelson', 'Comments': u'2014 PHI. Keine K\xc3\xbchllast. Compared with satellite and Government of Canada normal data.', 'Code': '0058a', 'Latitude': '49.5', 'Source': 'Source:  Meteonorm', 'Location': 'Nelson', 'Longitude': '-117.3', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0059a-Blue River', 'Comments': '2015 PHI', 'Code': '0059a', 'Latitude': '52.13', 'Source': 'Temp: Environment Canada data (Climate Normal 1981-2010). Radiation & load data: based on MN7. ', 'Location': 'Blue River', 'Longitude': '-119.29', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0060a-Minden', 'Comments': '2015 PHI. ', 'Code': '0060a', 'Latitude': '44.93', 'Source': 'Source: Environment Canada data (Canadian Climate Normals 1981-2010). Radiation & Load data: Meteonorm / PHI.', 'Location': 'Minden', 'Longitude': '-78.72', 'Region': 'Ontario', 'Country': 'CA'},
+    {'Dataset': 'CA0061a-Kamloops', 'Comments': '2015 PHI', 'Code': '0061a', 'Latitude': '50.7', 'Source': 'Temp: Environment Canada data (Climate Normal 1981-2010). Radiation & load data: based on MN7 / CWEC. ', 'Location': 'Kamloops', 'Longitude': '-120.44', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0062a-Merritt', 'Comments': '2015 PHI', 'Code': '0062a', 'Latitude': '50.11', 'Source': 'Temp: Environment Canada data (Climate Normal 1981-2010). Radiation & load data: approximation.', 'Location': 'Merritt', 'Longitude': '-120.8', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0063a-Abbotsford', 'Comments': '2015 PHI', 'Code': '0063a', 'Latitude': '49.03', 'Source': 'Temp: Environment Canada data (Climate Normal 1981-2010). Radiation & load data: Derived from Meteonorm. ', 'Location': 'Abbotsford', 'Longitude': '-122.36', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CA0064a-Hope', 'Comments': '2015 PHI', 'Code': '0064a', 'Latitude': '49.37', 'Source': 'Derived from Meteonorm. ', 'Location': 'Hope', 'Longitude': '-121.48', 'Region': 'British Columbia', 'Country': 'CA'},
+    {'Dataset': 'CH0001a-Altdorf', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0001a', 'Latitude': '46.87', 'Source': '', 'Location': 'Altdorf', 'Longitude': '8.63', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0002a-Basel (Binningen)', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0002a', 'Latitude': '47.55', 'Source': '', 'Location': 'Basel (Binningen)', 'Longitude': '7.58', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0003a-Bern (Liebefeld)', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0003a', 'Latitude': '46.93', 'Source': '', 'Location': 'Bern (Liebefeld)', 'Longitude': '7.42', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0004a-Chur', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0004a', 'Latitude': '46.87', 'Source': '', 'Location': 'Chur', 'Longitude': '9.53', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0005a-Davos', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0005a', 'Latitude': '46.82', 'Source': '', 'Location': 'Davos', 'Longitude': '9.85', 'Region': '', 'Country': 'CH'},
+    {'Dataset': u'CH0006a-Gen\xc3\xa8ve (Cointrin)', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0006a', 'Latitude': '46.25', 'Source': '', 'Location': u'Gen\xc3\xa8ve (Cointrin)', 'Longitude': '6.13', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0007a-Glarus', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0007a', 'Latitude': '47.03', 'Source': '', 'Location': 'Glarus', 'Longitude': '9.07', 'Region': '', 'Country': 'CH'},
+    {'Dataset': u'CH0008a-G\xc3\xbcttingen', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0008a', 'Latitude': '47.6', 'Source': '', 'Location': u'G\xc3\xbcttingen', 'Longitude': '9.28', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0009a-Interlaken', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0009a', 'Latitude': '46.67', 'Source': '', 'Location': 'Interlaken', 'Longitude': '7.87', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0010a-La Chaux de Fonds', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0010a', 'Latitude': '47.08', 'Source': '', 'Location': 'La Chaux de Fonds', 'Longitude': '6.8', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0011a-Locarno', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0011a', 'Latitude': '46.17', 'Source': '', 'Location': 'Locarno', 'Longitude': '8.88', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0012a-Lugano', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0012a', 'Latitude': '46', 'Source': '', 'Location': 'Lugano', 'Longitude': '8.97', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0013a-Luzern', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0013a', 'Latitude': '47.03', 'Source': '', 'Location': 'Luzern', 'Longitude': '8.3', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0014a-Montana', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0014a', 'Latitude': '46.32', 'Source': '', 'Location': 'Montana', 'Longitude': '7.48', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0015a-Payerne', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0015a', 'Latitude': '46.82', 'Source': '', 'Location': 'Payerne', 'Longitude': '6.95', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0016a-Pully', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0016a', 'Latitude': '46.52', 'Source': '', 'Location': 'Pully', 'Longitude': '6.67', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0017a-St. Moritz', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0017a', 'Latitude': '46.53', 'Source': '', 'Location': 'St. Moritz', 'Longitude': '9.88', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0018a-Sion', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0018a', 'Latitude': '46.22', 'Source': '', 'Location': 'Sion', 'Longitude': '7.33', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0019a-St. Gallen', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0019a', 'Latitude': '47.43', 'Source': '', 'Location': 'St. Gallen', 'Longitude': '9.4', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CH0020a-Wynau', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0020a', 'Latitude': '47.25', 'Source': '', 'Location': 'Wynau', 'Longitude': '7.78', 'Region': '', 'Country': 'CH'},
+    {'Dataset': u'CH0021a-Z\xc3\xbcrich', 'Comments': '2007 PHI. TRY konvertiert mit Meteonorm', 'Code': '0021a', 'Latitude': '47.43', 'Source': '', 'Location': u'Z\xc3\xbcrich', 'Longitude': '8.55', 'Region': '', 'Country': 'CH'},
+    {'Dataset': 'CL0001a-Santiago de Chile', 'Comments': '', 'Code': '0001a', 'Latitude': '-33.383', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)  ', 'Location': 'Santiago de Chile', 'Longitude': '-70.783', 'Region': '', 'Country': 'CL'},
+    {'Dataset': 'CN0001a-Shanghai', 'Comments': '2011 PHI', 'Code': '0001a', 'Latitude': '31.4', 'Source': 'source: Meteonorm V6', 'Location': 'Shanghai', 'Longitude': '121.4', 'Region': 'Shanghai', 'Country': 'CN'},
+    {'Dataset': 'CN0002a-Beijing', 'Comments': '2011 PHI. Vergleich mit EOSWEB, SWERA, IWEC.', 'Code': '0002a', 'Latitude': '39.933', 'Source': 'source: Meteonorm V6', 'Location': 'Beijing', 'Longitude': '116.283', 'Region': 'Beijing', 'Country': 'CN'},
+    {'Dataset': u'CN0003a-\xc3\x9cr\xc3\xbcmqi', 'Comments': '2010 PHI. Vergleich mit Daten von EOSWEB & China Meteorological Administration. ', 'Code': '0003a', 'Latitude': '43.8', 'Source': 'source: Meteonorm V6', 'Location': u'\xc3\x9cr\xc3\xbcmqi', 'Longitude': '87.58', 'Region': 'Xinjiang', 'Country': 'CN'},
+    {'Dataset': 'CN0004a-Fuzhou', 'Comments': '2016 PHI', 'Code': '0004a', 'Latitude': '26.08', 'Source': 'Temp = 1981-2010, Other = Meteonorm. ', 'Location': 'Fuzhou', 'Longitude': '119.28', 'Region': 'Fujian', 'Country': 'CN'},
+    {'Dataset': 'CN0005a-Harbin', 'Comments': '2016 PHI', 'Code': '0005a', 'Latitude': '45.75', 'Source': 'Temp = 1981-2010; Other derived from Meteonorm V7 & CSWD data. ', 'Location': 'Harbin', 'Longitude': '126.77', 'Region': 'Heilongjiang', 'Country': 'CN'},
+    {'Dataset': 'CN0006a-Yanji', 'Comments': '2016 PHI', 'Code': '0006a', 'Latitude': '42.87', 'Source': 'Temp = 1981-2010; Other = derived from Meteonorm', 'Location': 'Yanji', 'Longitude': '129.5', 'Region': 'Jilin', 'Country': 'CN'},
+    {'Dataset': 'CN0007a-Songjianghezhen', 'Comments': '2016 PHI', 'Code': '0007a', 'Latitude': '42.18', 'Source': 'Derived from Meteonorm & CSWD. ', 'Location': 'Songjianghezhen', 'Longitude': '127.48', 'Region': 'Jilin', 'Country': 'CN'},
+    {'Dataset': 'CN0008a-Guangzhou', 'Comments': '2016 PHI', 'Code': '0008a', 'Latitude': '23.17', 'Source': 'Derived from CSWD and Meteonorm V7. ', 'Location': 'Guangzhou', 'Longitude': '113.33', 'Region': 'Guangdong', 'Country': 'CN'},
+    {'Dataset': 'CN0009a-Chengdu', 'Comments': '2016 PHI', 'Code': '0009a', 'Latitude': '30.67', 'Source': 'Derived from Meteonorm', 'Location': 'Chengdu', 'Longitude': '104.02', 'Region': 'Sichuan', 'Country': 'CN'},
+    {'Dataset': 'CN0010a-Lhasa', 'Comments': '2016 PHI', 'Code': '0010a', 'Latitude': '29.67', 'Source': 'Temp = 1981-2010. Other derived from Meteonorm & CSWD ', 'Location': 'Lhasa', 'Longitude': '91.13', 'Region': 'Tibet', 'Country': 'CN'},
+    {'Dataset': 'CN0011a-Kunming', 'Comments': '2016 PHI', 'Code': '0011a', 'Latitude': '25.02', 'Source': 'Temp = 1971-2000; Other derived from Meteonorm (version7) and CSWD data', 'Location': 'Kunming', 'Longitude': '102.68', 'Region': 'Yunnan', 'Country': 'CN'},
+    {'Dataset': 'CN0012a-Qionghai', 'Comments': '2016 PHI', 'Code': '0012a', 'Latitude': '19.23', 'Source': 'Temp = 1981-2010; Other derived from CSWD', 'Location': 'Qionghai', 'Longitude': '110.47', 'Region': 'Hainan', 'Country': 'CN'},
+    {'Dataset': 'CN0013a-Tianjin', 'Comments': '2016 PHI', 'Code': '0013a', 'Latitude': '39.1', 'Source': 'Temp = 1981-2010;  Other derived from CSWD & Meteonorm V7. ', 'Location': 'Tianjin', 'Longitude': '117.17', 'Region': 'Tianjin', 'Country': 'CN'},
+    {'Dataset': 'CZ0001a-Praha', 'Comments': '', 'Code': '0001a', 'Latitude': '50.1', 'Source': '', 'Location': 'Praha', 'Longitude': '14.43', 'Region': '', 'Country': 'CZ'},
+    {'Dataset': 'CZ0002a-Brno', 'Comments': '', 'Code': '0002a', 'Latitude': '49.22', 'Source': '', 'Location': 'Brno', 'Longitude': '16.7', 'Region': '', 'Country': 'CZ'},
+    {'Dataset': u'CZ0003a-\xc4\x8cesk\xc3\xa9 Bud\xc4\x9bjovice', 'Comments': '', 'Code': '0003a', 'Latitude': '48.9', 'Source': '', 'Location': u'\xc4\x8cesk\xc3\xa9 Bud\xc4\x9bjovice', 'Longitude': '14.5', 'Region': '', 'Country': 'CZ'},
+    {'Dataset': u'CZ0004a-Hradec Kr\xc3\xa1lov\xc3\xa9', 'Comments': '', 'Code': '0004a', 'Latitude': '50.183', 'Source': '', 'Location': u'Hradec Kr\xc3\xa1lov\xc3\xa9', 'Longitude': '15.833', 'Region': '', 'Country': 'CZ'},
+    {'Dataset': 'CZ0005a-Jihlava', 'Comments': '', 'Code': '0005a', 'Latitude': '49.24', 'Source': '', 'Location': 'Jihlava', 'Longitude': '15.5', 'Region': '', 'Country': 'CZ'},
+    {'Dataset': 'CZ0006a-Karlovy Vary', 'Comments': '', 'Code': '0006a', 'Latitude': '50.2', 'Source': '', 'Location': 'Karlovy Vary', 'Longitude': '12.9', 'Region': '', 'Country': 'CZ'},
+    {'Dataset': 'CZ0007a-Liberec', 'Comments': '', 'Code': '0007a', 'Latitude': '50.8', 'Source': '', 'Location': 'Liberec', 'Longitude': '15.08', 'Region': '', 'Country': 'CZ'},
+    {'Dataset': 'CZ0008a-Olomouc', 'Comments': '', 'Code': '0008a', 'Latitude': '49.63', 'Source': '', 'Location': 'Olomouc', 'Longitude': '17.25', 'Region': '', 'Country': 'CZ'},
+    {'Dataset': 'CZ0009a-Ostrava', 'Comments': '', 'Code': '0009a', 'Latitude': '49.83', 'Source': '', 'Location': 'Ostrava', 'Longitude': '18.25', 'Region': '', 'Country': 'CZ'},
+    {'Dataset': u'CZ0010a-Plze\xc5\x88', 'Comments': '', 'Code': '0010a', 'Latitude': '49.75', 'Source': '', 'Location': u'Plze\xc5\x88', 'Longitude': '13.42', 'Region': '', 'Country': 'CZ'},
+    {'Dataset': 'CZ0012a-Znojmo', 'Comments': '', 'Code': '0012a', 'Latitude': '48.88', 'Source': '', 'Location': 'Znojmo', 'Longitude': '16.08', 'Region': '', 'Country': 'CZ'},
+    {'Dataset': 'DE0001a-Norderney', 'Comments': 'Niedersachsen', 'Code': '0001a', 'Latitude': '53.71', 'Source': 'source: DIN 4108-6:2003. Klimaregion 1', 'Location': 'Norderney', 'Longitude': '7.15', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0002a-Husum', 'Comments': 'Schleswig-Holstein', 'Code': '0002a', 'Latitude': '54.48', 'Source': 'source: DIN 4108-6:2003. Klimaregion 1', 'Location': 'Husum', 'Longitude': '9.06', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0003a-Hamburg', 'Comments': 'Hamburg', 'Code': '0003a', 'Latitude': '53.64', 'Source': 'source: DIN 4108-6:2003. Klimaregion 2', 'Location': 'Hamburg', 'Longitude': '9.99', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0004a-Hannover', 'Comments': 'Niedersachsen', 'Code': '0004a', 'Latitude': '52.47', 'Source': 'source: DIN 4108-6:2003. Klimaregion 2', 'Location': 'Hannover', 'Longitude': '9.68', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0005a-Kiel', 'Comments': 'Schleswig-Holstein', 'Code': '0005a', 'Latitude': '54.34', 'Source': 'source: DIN 4108-6:2003. Klimaregion 2', 'Location': 'Kiel', 'Longitude': '10.09', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0006a-Arkona', 'Comments': 'Mecklenburg-Vorpommern', 'Code': '0006a', 'Latitude': '54.68', 'Source': 'source: DIN 4108-6:2003. Klimaregion 3', 'Location': 'Arkona', 'Longitude': '13.44', 'Region': '', 'Country': 'DE'},
+    {'Dataset': u'DE0007a-Warnem\xc3\xbcnde', 'Comments': 'Mecklenburg-Vorpommern', 'Code': '0007a', 'Latitude': '54.18', 'Source': 'source: DIN 4108-6:2003. Klimaregion 3', 'Location': u'Warnem\xc3\xbcnde', 'Longitude': '12.08', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0008a-Potsdam', 'Comments': 'Brandenburg', 'Code': '0008a', 'Latitude': '52.38', 'Source': 'source: DIN 4108-6:2003. Klimaregion 4', 'Location': 'Potsdam', 'Longitude': '13.06', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0009a-Schwerin', 'Comments': 'Mecklenburg-Vorpommern', 'Code': '0009a', 'Latitude': '53.64', 'Source': 'source: DIN 4108-6:2003. Klimaregion 4', 'Location': 'Schwerin', 'Longitude': '11.39', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0010a-Teterow', 'Comments': 'Mecklenburg-Vorpommern', 'Code': '0010a', 'Latitude': '53.76', 'Source': 'source: DIN 4108-6:2003. Klimaregion 4', 'Location': 'Teterow', 'Longitude': '12.56', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0011a-Braunschweig', 'Comments': 'Niedersachsen', 'Code': '0011a', 'Latitude': '52.29', 'Source': 'source: DIN 4108-6:2003. Klimaregion 5', 'Location': 'Braunschweig', 'Longitude': '10.45', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0012a-Dresden', 'Comments': 'Sachsen', 'Code': '0012a', 'Latitude': '51.02', 'Source': 'source: DIN 4108-6:2003. Klimaregion 5', 'Location': 'Dresden', 'Longitude': '13.78', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0013a-Wittenberg', 'Comments': 'Sachsen-Anhalt', 'Code': '0013a', 'Latitude': '51.89', 'Source': 'source: DIN 4108-6:2003. Klimaregion 5', 'Location': 'Wittenberg', 'Longitude': '12.65', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0014a-Erfurt', 'Comments': u'Th\xc3\xbcringen', 'Code': '0014a', 'Latitude': '50.98', 'Source': 'source: DIN 4108-6:2003. Klimaregion 6', 'Location': 'Erfurt', 'Longitude': '10.96', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0015a-Harzgerode', 'Comments': 'Sachsen-Anhalt', 'Code': '0015a', 'Latitude': '51.65', 'Source': 'source: DIN 4108-6:2003. Klimaregion 6', 'Location': 'Harzgerode', 'Longitude': '11.14', 'Region': '', 'Country': 'DE'},
+    {'Dataset': u'DE0016a-L\xc3\xbcdenscheid', 'Comments': 'Nordrhein-Westfalen', 'Code': '0016a', 'Latitude': '51.25', 'Source': 'source: DIN 4108-6:2003. Klimaregion 6', 'Location': u'L\xc3\xbcdenscheid', 'Longitude': '7.64', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0017a-Essen', 'Comments': 'Nordrhein-Westfalen', 'Code': '0017a', 'Latitude': '51.41', 'Source': 'source: DIN 4108-6:2003. Klimaregion 7', 'Location': 'Essen', 'Longitude': '6.97', 'Region': '', 'Country': 'DE'},
+    {'Dataset': u'DE0018a-K\xc3\xb6ln', 'Comments': 'Nordrhein-Westfalen', 'Code': '0018a', 'Latitude': '50.87', 'Source': 'source: DIN 4108-6:2003. Klimaregion 7', 'Location': u'K\xc3\xb6ln', 'Longitude': '7.16', 'Region': '', 'Country': 'DE'},
+    {'Dataset': u'DE0019a-M\xc3\xbcnster', 'Comments': 'Nordrhein-Westfalen', 'Code': '0019a', 'Latitude': '51.95', 'Source': 'source: DIN 4108-6:2003. Klimaregion 7', 'Location': u'M\xc3\xbcnster', 'Longitude': '7.59', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0020a-Geisenheim', 'Comments': 'Hessen', 'Code': '0020a', 'Latitude': '49.99', 'Source': 'source: DIN 4108-6:2003. Klimaregion 8', 'Location': 'Geisenheim', 'Longitude': '7.95', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0021a-Kassel', 'Comments': 'Hessen', 'Code': '0021a', 'Latitude': '51.3', 'Source': 'source: DIN 4108-6:2003. Klimaregion 8', 'Location': 'Kassel', 'Longitude': '9.44', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0022a-Trier', 'Comments': 'Rheinland-Pfalz', 'Code': '0022a', 'Latitude': '49.75', 'Source': 'source: DIN 4108-6:2003. Klimaregion 8', 'Location': 'Trier', 'Longitude': '6.65', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0023a-Chemnitz', 'Comments': 'Sachsen', 'Code': '0023a', 'Latitude': '50.79', 'Source': 'source: DIN 4108-6:2003. Klimaregion 9', 'Location': 'Chemnitz', 'Longitude': '12.87', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0024a-Leipzig', 'Comments': 'Sachsen', 'Code': '0024a', 'Latitude': '51.39', 'Source': 'source: DIN 4108-6:2003. Klimaregion 9', 'Location': 'Leipzig', 'Longitude': '12.4', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0025a-Cham', 'Comments': 'Bayern', 'Code': '0025a', 'Latitude': '49.24', 'Source': 'source: DIN 4108-6:2003. Klimaregion 10', 'Location': 'Cham', 'Longitude': '12.62', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0026a-Hof', 'Comments': 'Bayern', 'Code': '0026a', 'Latitude': '50.31', 'Source': 'source: DIN 4108-6:2003. Klimaregion 10', 'Location': 'Hof', 'Longitude': '11.88', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0027a-Freudenstadt', 'Comments': u'Baden-W\xc3\xbcrttemberg', 'Code': '0027a', 'Latitude': '48.45', 'Source': 'source: DIN 4108-6:2003. Klimaregion 11', 'Location': 'Freudenstadt', 'Longitude': '8.41', 'Region': '', 'Country': 'DE'},
+    {'Dataset': u'DE0028a-N\xc3\xbcrnberg', 'Comments': 'Bayern', 'Code': '0028a', 'Latitude': '49.5', 'Source': 'source: DIN 4108-6:2003. Klimaregion 11', 'Location': u'N\xc3\xbcrnberg', 'Longitude': '11.06', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0029a-Stuttgart', 'Comments': u'Baden-W\xc3\xbcrttemberg', 'Code': '0029a', 'Latitude': '48.77', 'Source': 'source: DIN 4108-6:2003. Klimaregion 11', 'Location': 'Stuttgart', 'Longitude': '9.18', 'Region': '', 'Country': 'DE'},
+    {'Dataset': u'DE0030a-W\xc3\xbcrzburg', 'Comments': 'Bayern', 'Code': '0030a', 'Latitude': '49.77', 'Source': 'source: DIN 4108-6:2003. Klimaregion 11', 'Location': u'W\xc3\xbcrzburg', 'Longitude': '9.96', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0031a-Frankfurt am Main', 'Comments': 'Hessen', 'Code': '0031a', 'Latitude': '50.15', 'Source': 'source: DIN 4108-6:2003. Klimaregion 12', 'Location': 'Frankfurt am Main', 'Longitude': '8.68', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0032a-Mannheim', 'Comments': u'Baden-W\xc3\xbcrttemberg', 'Code': '0032a', 'Latitude': '49.51', 'Source': 'source: DIN 4108-6:2003. Klimaregion 12', 'Location': 'Mannheim', 'Longitude': '8.56', 'Region': '', 'Country': 'DE'},
+    {'Dataset': u'DE0033a-Saarbr\xc3\xbccken', 'Comments': 'Saarland', 'Code': '0033a', 'Latitude': '49.21', 'Source': 'source: DIN 4108-6:2003. Klimaregion 12', 'Location': u'Saarbr\xc3\xbccken', 'Longitude': '7.11', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0034a-Freiburg', 'Comments': u'Baden-W\xc3\xbcrttemberg', 'Code': '0034a', 'Latitude': '48.02', 'Source': 'source: DIN 4108-6:2003. Klimaregion 13', 'Location': 'Freiburg', 'Longitude': '7.84', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0035a-Konstanz', 'Comments': u'Baden-W\xc3\xbcrttemberg', 'Code': '0035a', 'Latitude': '47.68', 'Source': 'source: DIN 4108-6:2003. Klimaregion 13', 'Location': 'Konstanz', 'Longitude': '9.19', 'Region': '', 'Country': 'DE'},
+    {'Dataset': u'DE0036a-M\xc3\xbcnchen', 'Comments': 'Bayern', 'Code': '0036a', 'Latitude': '48.16', 'Source': 'source: DIN 4108-6:2003. Klimaregion 14', 'Location': u'M\xc3\xbcnchen', 'Longitude': '11.54', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0037a-Passau', 'Comments': 'Bayern', 'Code': '0037a', 'Latitude': '48.58', 'Source': 'source: DIN 4108-6:2003. Klimaregion 14', 'Location': 'Passau', 'Longitude': '13.42', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0038a-Garmisch-Partenkirchen', 'Comments': 'Bayern', 'Code': '0038a', 'Latitude': '47.48', 'Source': 'source: DIN 4108-6:2003. Klimaregion 15', 'Location': 'Garmisch-Partenkirchen', 'Longitude': '11.06', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE0039a-Oberstdorf', 'Comments': 'Bayern', 'Code': '0039a', 'Latitude': '47.4', 'Source': 'source: DIN 4108-6:2003. Klimaregion 15', 'Location': 'Oberstdorf', 'Longitude': '10.28', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE-9999-PHPP-Standard', 'Comments': '', 'Code': '-9999', 'Latitude': '51.301', 'Source': 'Representative of typical climate conditions in Central Europe. This dataset can be used for an assessment independent of the location. ', 'Location': 'PHPP-Standard', 'Longitude': '9.44', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE------Referenzklima (DIN 4108-6:2003)', 'Comments': u'Im PHPP auff\xc3\xbchren oder nicht (weil veraltet)?', 'Code': '', 'Latitude': '50', 'Source': 'Referenzklima Deutschland aus DIN 4108-6. ', 'Location': 'Referenzklima (DIN 4108-6:2003)', 'Longitude': '10', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DE------Referenzklima - EnEV 2014', 'Comments': '', 'Code': '', 'Latitude': '52.38', 'Source': u'Referenzklima f\xc3\xbcr Deutschland nach DIN V 18599-10:2011-12 (TRY Region 4, Potsdam)', 'Location': 'Referenzklima - EnEV 2014', 'Longitude': '13.07', 'Region': '', 'Country': 'DE'},
+    {'Dataset': 'DK0001a-Kopenhagen', 'Comments': '', 'Code': '0001a', 'Latitude': '55.72', 'Source': '', 'Location': 'Kopenhagen', 'Longitude': '12.57', 'Region': '', 'Country': 'DK'},
+    {'Dataset': 'EE0001a-Toravere', 'Comments': '2011 PHI. Vergleich mit EOSWEB Daten. ', 'Code': '0001a', 'Latitude': '58.45', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Toravere', 'Longitude': '26.783', 'Region': '', 'Country': 'EE'},
+    {'Dataset': 'ES0001b-Madrid', 'Comments': '2015 PHI. (LastermittlungPHI-141119)', 'Code': '0001b', 'Latitude': '40.41', 'Source': 'Source: CTE. ', 'Location': 'Madrid', 'Longitude': '-3.68', 'Region': 'D3 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0002c-Barcelona', 'Comments': '2016 PHI', 'Code': '0002c', 'Latitude': '41.38', 'Source': 'Temp derived from on 1981-2010 data. Other from CTE & Meteonorm. ', 'Location': 'Barcelona', 'Longitude': '2.13', 'Region': 'B2 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0003b-Sevilla', 'Comments': '2015 PHI', 'Code': '0003b', 'Latitude': '37.42', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Sevilla', 'Longitude': '-5.88', 'Region': 'B4 (CTE)', 'Country': 'ES'},
+    {'Dataset': u'ES0004a-L\xc3\xa9rida', 'Comments': '2011 PHI', 'Code': '0004a', 'Latitude': '41.63', 'Source': '', 'Location': u'L\xc3\xa9rida', 'Longitude': '0.6', 'Region': 'D3 (CTE)', 'Country': 'ES'},
+    {'Dataset': u'ES0005a-M\xc3\xa1laga', 'Comments': u'2011 PHI.   EOSWEB Heiz- & K\xc3\xbchllastdaten.', 'Code': '0005a', 'Latitude': '36.67', 'Source': 'Source: CTE, Meteonorm V6.', 'Location': u'M\xc3\xa1laga', 'Longitude': '-4.48', 'Region': 'A3 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0006c-Bilbao', 'Comments': '2015 PHI', 'Code': '0006c', 'Latitude': '43.3', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Bilbao', 'Longitude': '-2.91', 'Region': 'C1 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0007b-Santiago de Compostela', 'Comments': '2016 PHI', 'Code': '0007b', 'Latitude': '42.89', 'Source': 'Temp = 1981-2010; Other derived from Meteonorm. ', 'Location': 'Santiago de Compostela', 'Longitude': '-8.41', 'Region': 'C1 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0008b-Albacete', 'Comments': '2015 PHI', 'Code': '0008b', 'Latitude': '38.95', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Albacete', 'Longitude': '-1.86', 'Region': 'D3 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0009b-Alicante', 'Comments': '2015 PHI', 'Code': '0009b', 'Latitude': '38.37', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Alicante', 'Longitude': '-0.49', 'Region': 'B4 (CTE)', 'Country': 'ES'},
+    {'Dataset': u'ES0010b-Almer\xc3\xada', 'Comments': '2015 PHI', 'Code': '0010b', 'Latitude': '36.85', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': u'Almer\xc3\xada', 'Longitude': '-2.36', 'Region': 'A4 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0011b-Badajoz', 'Comments': '2015 PHI', 'Code': '0011b', 'Latitude': '38.88', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Badajoz', 'Longitude': '-6.81', 'Region': 'C4 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0013b-Burgos', 'Comments': '2015 PHI', 'Code': '0013b', 'Latitude': '42.36', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Burgos', 'Longitude': '-3.62', 'Region': 'E1 (CTE)', 'Country': 'ES'},
+    {'Dataset': u'ES0014b-C\xc3\xa1diz', 'Comments': '2015 PHI', 'Code': '0014b', 'Latitude': '36.5', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': u'C\xc3\xa1diz', 'Longitude': '-6.26', 'Region': 'A3 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0015b-Granada', 'Comments': '2015 PHI', 'Code': '0015b', 'Latitude': '37.14', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Granada', 'Longitude': '-3.63', 'Region': 'C3 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0016b-Las Palmas de Gran Canaria', 'Comments': '2015 PHI', 'Code': '0016b', 'Latitude': '27.92', 'Source': 'Temp = 1981-2010; Other monthly = Satellite & CTE; Load data derived by PHI. ', 'Location': 'Las Palmas de Gran Canaria', 'Longitude': '-15.39', 'Region': 'A3 (CTE)', 'Country': 'ES'},
+    {'Dataset': u'ES0017b-Le\xc3\xb3n', 'Comments': '2015 PHI', 'Code': '0017b', 'Latitude': '42.59', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': u'Le\xc3\xb3n', 'Longitude': '-5.65', 'Region': 'E1 (CTE)', 'Country': 'ES'},
+    {'Dataset': u'ES0018b-Logro\xc3\xb1o', 'Comments': '2014 PHI', 'Code': '0018b', 'Latitude': '42.45', 'Source': 'Source: CTE. Radiation = satellite data.', 'Location': u'Logro\xc3\xb1o', 'Longitude': '-2.33', 'Region': 'D2 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0019b-Murcia', 'Comments': '2015 PHI', 'Code': '0019b', 'Latitude': '38', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Murcia', 'Longitude': '-1.17', 'Region': 'B3 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0020b-Ourense', 'Comments': '2015 PHI', 'Code': '0020b', 'Latitude': '42.33', 'Source': 'Temp = 1981-2010; Other monthly = satellite data; Load data derived by PHI. ', 'Location': 'Ourense', 'Longitude': '-7.86', 'Region': 'C2 (CTE)', 'Country': 'ES'},
+    {'Dataset': u'ES0021b-Ovi\xc3\xa9do', 'Comments': '2015 PHI', 'Code': '0021b', 'Latitude': '43.35', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': u'Ovi\xc3\xa9do', 'Longitude': '-5.87', 'Region': 'C1 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0022b-Palma de Mallorca', 'Comments': '2015 PHI', 'Code': '0022b', 'Latitude': '39.55', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Palma de Mallorca', 'Longitude': '2.63', 'Region': 'B3 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0023b-Pamplona', 'Comments': '2015 PHI', 'Code': '0023b', 'Latitude': '42.78', 'Source': 'Source: CTE. ', 'Location': 'Pamplona', 'Longitude': '-1.65', 'Region': 'D1 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0024b-Pontevedra', 'Comments': '2015 PHI', 'Code': '0024b', 'Latitude': '42.44', 'Source': 'Temp = 1981-2010; Monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Pontevedra', 'Longitude': '-8.62', 'Region': 'C1 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0025b-Salamanca', 'Comments': '2015 PHI', 'Code': '0025b', 'Latitude': '40.96', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Salamanca', 'Longitude': '-5.5', 'Region': 'D2 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0026b-Toledo', 'Comments': '2015 PHI', 'Code': '0026b', 'Latitude': '39.88', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Toledo', 'Longitude': '-4.05', 'Region': 'C4 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0027b-Valencia', 'Comments': '2015 PHI', 'Code': '0027b', 'Latitude': '39.49', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Valencia', 'Longitude': '-0.47', 'Region': 'B3 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0028b-Valladolid', 'Comments': '2015 PHI', 'Code': '0028b', 'Latitude': '41.64', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Valladolid', 'Longitude': '-4.75', 'Region': 'D2 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0029b-Vitoria-Gasteiz', 'Comments': '2015 PHI', 'Code': '0029b', 'Latitude': '42.88', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Vitoria-Gasteiz', 'Longitude': '-2.74', 'Region': 'D1 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0030b-Zaragoza', 'Comments': '2015 PHI', 'Code': '0030b', 'Latitude': '41.66', 'Source': 'Temp: AEMET 1981-2010 climate normals. Based on CTE data', 'Location': 'Zaragoza', 'Longitude': '-1', 'Region': 'D3 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0031a-Gerona', 'Comments': '2014 PHI', 'Code': '0031a', 'Latitude': '41.9', 'Source': 'Source: CTE. ', 'Location': 'Gerona', 'Longitude': '1.25', 'Region': 'C2 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0032a-Santander', 'Comments': '2015 PHI', 'Code': '0032a', 'Latitude': '43.46', 'Source': 'Source: CTE. ', 'Location': 'Santander', 'Longitude': '-3.82', 'Region': 'C1 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0033a-Segovia', 'Comments': '2015 PHI', 'Code': '0033a', 'Latitude': '40.95', 'Source': 'Source: CTE. ', 'Location': 'Segovia', 'Longitude': '-4.13', 'Region': 'D2 (CTE)', 'Country': 'ES'},
+    {'Dataset': u'ES0034a-\xc3\x81vilaz', 'Comments': '2015 PHI', 'Code': '0034a', 'Latitude': '40.66', 'Source': 'Source: CTE. ', 'Location': u'\xc3\x81vilaz', 'Longitude': '-4.7', 'Region': 'E1 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0035a-Santa Cruz', 'Comments': '2015 PHI', 'Code': '0035a', 'Latitude': '28.46', 'Source': 'Source: CTE. ', 'Location': 'Santa Cruz', 'Longitude': '-16.25', 'Region': 'A3 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0036a-Huesca', 'Comments': '2015 PHI', 'Code': '0036a', 'Latitude': '42.08', 'Source': 'Temp: AEMET 1981-2010 climate normals. Based on CTE data.', 'Location': 'Huesca', 'Longitude': '0.33', 'Region': 'D2 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0037a-A Coruna', 'Comments': '2016 PHI', 'Code': '0037a', 'Latitude': '43.37', 'Source': 'Temp = 1981-2010; Other derived from Meteonorm. ', 'Location': 'A Coruna', 'Longitude': '-8.42', 'Region': 'C1 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'ES0038a-Lugo', 'Comments': '2016 PHI', 'Code': '0038a', 'Latitude': '43.11', 'Source': 'Temp = 1981-2010; Other derived from Meteonorm. ', 'Location': 'Lugo', 'Longitude': '-7.46', 'Region': 'D1 (CTE)', 'Country': 'ES'},
+    {'Dataset': u'ES0039a-Ir\xc3\xban', 'Comments': '2016 PHI', 'Code': '0039a', 'Latitude': '43.35', 'Source': 'Derived from Meteonorm & 1981-2010 Climate Normals. ', 'Location': u'Ir\xc3\xban', 'Longitude': '-1.8', 'Region': 'C1 (CTE)', 'Country': 'ES'},
+    {'Dataset': 'FI0001a-Helsinki', 'Comments': 'IWEC? ', 'Code': '0001a', 'Latitude': '60.22', 'Source': '', 'Location': 'Helsinki', 'Longitude': '25', 'Region': '', 'Country': 'FI'},
+    {'Dataset': 'FI0002a-Tampere', 'Comments': '', 'Code': '0002a', 'Latitude': '61.5', 'Source': '', 'Location': 'Tampere', 'Longitude': '23.75', 'Region': '', 'Country': 'FI'},
+    {'Dataset': 'FR0001a-Paris', 'Comments': '', 'Code': '0001a', 'Latitude': '48.87', 'Source': '', 'Location': 'Paris', 'Longitude': '2.33', 'Region': u'\xc3\x8ele-de-France', 'Country': 'FR'},
+    {'Dataset': 'FR0002a-Nantes', 'Comments': '', 'Code': '0002a', 'Latitude': '47.23', 'Source': '', 'Location': 'Nantes', 'Longitude': '-1.58', 'Region': 'Pays de la Loire', 'Country': 'FR'},
+    {'Dataset': 'FR0003a-Dijon', 'Comments': '', 'Code': '0003a', 'Latitude': '47.33', 'Source': '', 'Location': 'Dijon', 'Longitude': '5.03', 'Region': u'Bourgogne-Franche-Comt\xc3\xa9', 'Country': 'FR'},
+    {'Dataset': 'FR0004a-Lyon', 'Comments': '', 'Code': '0004a', 'Latitude': '45.77', 'Source': '', 'Location': 'Lyon', 'Longitude': '4.83', 'Region': u'Auvergne-Rh\xc3\xb4ne-Alpes', 'Country': 'FR'},
+    {'Dataset': 'FR0005b-Bordeaux', 'Comments': '2014 PHI. PassREg. Compared with EOSWEB, IWEC, WWR data. ', 'Code': '0005b', 'Latitude': '44.83', 'Source': 'Source: Meteonorm V7. ', 'Location': 'Bordeaux', 'Longitude': '-0.57', 'Region': 'Aquitaine-Limousin-Pitou-Charentes', 'Country': 'FR'},
+    {'Dataset': 'FR0006a-Marseille', 'Comments': '', 'Code': '0006a', 'Latitude': '43.3', 'Source': '', 'Location': 'Marseille', 'Longitude': '5.37', 'Region': u'Provence-Alpes-C\xc3\xb4te d\xe2\x80\x99Azur', 'Country': 'FR'},
+    {'Dataset': 'FR0007b-Brest', 'Comments': '', 'Code': '0007b', 'Latitude': '48.45', 'Source': '', 'Location': 'Brest', 'Longitude': '-4.42', 'Region': 'Bretagne', 'Country': 'FR'},
+    {'Dataset': 'FR0008a-Clermont-Ferrand', 'Comments': '', 'Code': '0008a', 'Latitude': '45.78', 'Source': '', 'Location': 'Clermont-Ferrand', 'Longitude': '3.17', 'Region': u'Auvergne-Rh\xc3\xb4ne-Alpes', 'Country': 'FR'},
+    {'Dataset': 'FR0009a-Montpellier', 'Comments': '', 'Code': '0009a', 'Latitude': '43.58', 'Source': '', 'Location': 'Montpellier', 'Longitude': '3.97', 'Region': u'Languedoc-Roussillon-Midi-Pyr\xc3\xa9n\xc3\xa9es', 'Country': 'FR'},
+    {'Dataset': 'FR0010a-Nancy', 'Comments': '', 'Code': '0010a', 'Latitude': '48.68', 'Source': '', 'Location': 'Nancy', 'Longitude': '6.22', 'Region': 'Alsace-Champagne-Ardenne-Lorraine', 'Country': 'FR'},
+    {'Dataset': 'FR0011a-Nice', 'Comments': '', 'Code': '0011a', 'Latitude': '43.65', 'Source': '', 'Location': 'Nice', 'Longitude': '7.2', 'Region': u'Provence-Alpes-C\xc3\xb4te d\xe2\x80\x99Azur', 'Country': 'FR'},
+    {'Dataset': 'FR0012a-Strasbourg', 'Comments': '', 'Code': '0012a', 'Latitude': '48.55', 'Source': '', 'Location': 'Strasbourg', 'Longitude': '7.63', 'Region': 'Alsace-Champagne-Ardenne-Lorraine', 'Country': 'FR'},
+    {'Dataset': 'FR0013a-Rennes', 'Comments': '', 'Code': '0013a', 'Latitude': '48.12', 'Source': '', 'Location': 'Rennes', 'Longitude': '-1.68', 'Region': 'Bretagne', 'Country': 'FR'},
+    {'Dataset': u'FR0014a-M\xc3\xa2con', 'Comments': '', 'Code': '0014a', 'Latitude': '46.3', 'Source': '', 'Location': u'M\xc3\xa2con', 'Longitude': '4.83', 'Region': u'Bourgogne-Franche-Comt\xc3\xa9', 'Country': 'FR'},
+    {'Dataset': 'FR0015a-La Rochelle', 'Comments': '', 'Code': '0015a', 'Latitude': '46.17', 'Source': '', 'Location': 'La Rochelle', 'Longitude': '-1.15', 'Region': 'Aquitaine-Limousin-Pitou-Charentes', 'Country': 'FR'},
+    {'Dataset': 'FR0016a-Carpentras', 'Comments': '', 'Code': '0016a', 'Latitude': '44.05', 'Source': '', 'Location': 'Carpentras', 'Longitude': '5.05', 'Region': u'Provence-Alpes-C\xc3\xb4te d\xe2\x80\x99Azur', 'Country': 'FR'},
+    {'Dataset': 'FR0017a-Agen', 'Comments': '', 'Code': '0017a', 'Latitude': '44.2', 'Source': '', 'Location': 'Agen', 'Longitude': '0.62', 'Region': 'Aquitaine-Limousin-Pitou-Charentes', 'Country': 'FR'},
+    {'Dataset': 'FR0018a-Reims', 'Comments': '2015 PHI', 'Code': '0018a', 'Latitude': '49.3', 'Source': 'Temp = 1981-2010; Other derived from Meteonorm.', 'Location': 'Reims', 'Longitude': '4.03', 'Region': 'Alsace-Champagne-Ardenne-Lorraine', 'Country': 'FR'},
+    {'Dataset': 'FR0019a-Lille', 'Comments': '2015 PHI', 'Code': '0019a', 'Latitude': '50.56', 'Source': 'Temp = 1981-2010; Other derived from Meteonorm V7. ', 'Location': 'Lille', 'Longitude': '3.09', 'Region': 'Nord-Pas-de-Calais-Picardie', 'Country': 'FR'},
+    {'Dataset': 'FR0020a-Abbeville', 'Comments': '2015 PHI', 'Code': '0020a', 'Latitude': '50.14', 'Source': 'Temp = 1981-2010; Other derived from Meteonorm V7. ', 'Location': 'Abbeville', 'Longitude': '1.83', 'Region': 'Nord-Pas-de-Calais-Picardie', 'Country': 'FR'},
+    {'Dataset': 'GB0001a-London (Central)', 'Comments': '2011 PHI & BRE.', 'Code': '0001a', 'Latitude': '51.517', 'Source': 'Source: Meteonorm V6. ', 'Location': 'London (Central)', 'Longitude': '-0.111', 'Region': 'Zone 01 - London ', 'Country': 'GB'},
+    {'Dataset': 'GB0002a-Silsoe', 'Comments': '2011 PHI & BRE.', 'Code': '0002a', 'Latitude': '52.017', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Silsoe', 'Longitude': '-0.417', 'Region': 'Zone 02 - Thames Valley', 'Country': 'GB'},
+    {'Dataset': 'GB0003a-London Gatwick', 'Comments': '2011 PHI & BRE.', 'Code': '0003a', 'Latitude': '51.15', 'Source': 'Source: Meteonorm V6. ', 'Location': 'London Gatwick', 'Longitude': '-0.183', 'Region': 'Zone 03 - South East England', 'Country': 'GB'},
+    {'Dataset': 'GB0004a-Efford', 'Comments': '2011 PHI & BRE.', 'Code': '0004a', 'Latitude': '50.733', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Efford', 'Longitude': '-1.567', 'Region': 'Zone 04 - South England', 'Country': 'GB'},
+    {'Dataset': 'GB0005a-Exeter', 'Comments': '2011 PHI & BRE.', 'Code': '0005a', 'Latitude': '50.73', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Exeter', 'Longitude': '-3.41', 'Region': 'Zone 05 - South West', 'Country': 'GB'},
+    {'Dataset': 'GB0006a-Lyneham', 'Comments': '2011 PHI & BRE.', 'Code': '0006a', 'Latitude': '51.5', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Lyneham', 'Longitude': '-1.983', 'Region': 'Zone 06 - Severn', 'Country': 'GB'},
+    {'Dataset': 'GB0007a-Sutton Bonnington', 'Comments': '2011 PHI & BRE.', 'Code': '0007a', 'Latitude': '52.833', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Sutton Bonnington', 'Longitude': '-1.25', 'Region': 'Zone 07 - Midlands', 'Country': 'GB'},
+    {'Dataset': 'GB0008a-Fairfield', 'Comments': '2011 PHI & BRE.', 'Code': '0008a', 'Latitude': '53.8', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Fairfield', 'Longitude': '-2.883', 'Region': 'Zone 08 - West Pennines', 'Country': 'GB'},
+    {'Dataset': 'GB0009a-Carlise', 'Comments': '2011 PHI & BRE.', 'Code': '0009a', 'Latitude': '54.88', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Carlise', 'Longitude': '-2.93', 'Region': 'Zone 09 - NW England / SW Scotland', 'Country': 'GB'},
+    {'Dataset': 'GB0010a-Eskdalemuir', 'Comments': '2011 PHI & BRE.', 'Code': '0010a', 'Latitude': '55.317', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Eskdalemuir', 'Longitude': '-3.2', 'Region': 'Zone 10 - Borders', 'Country': 'GB'},
+    {'Dataset': 'GB0011a-Leeming', 'Comments': '2011 PHI & BRE.', 'Code': '0011a', 'Latitude': '54.3', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Leeming', 'Longitude': '-1.533', 'Region': 'Zone 11 - North East', 'Country': 'GB'},
+    {'Dataset': 'GB0012a-Waddington', 'Comments': '2011 PHI & BRE.', 'Code': '0012a', 'Latitude': '53.167', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Waddington', 'Longitude': '-0.517', 'Region': 'Zone 12 - East Pennines', 'Country': 'GB'},
+    {'Dataset': 'GB0013a-Hemsby', 'Comments': '2011 PHI & BRE.', 'Code': '0013a', 'Latitude': '52.683', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Hemsby', 'Longitude': '1.683', 'Region': 'Zone 13 - East Anglia', 'Country': 'GB'},
+    {'Dataset': 'GB0014a-Sennybridge', 'Comments': '2011 PHI & BRE.', 'Code': '0014a', 'Latitude': '52.06', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Sennybridge', 'Longitude': '-3.61', 'Region': 'Zone 14 - Wales', 'Country': 'GB'},
+    {'Dataset': 'GB0015b-Glasgow Airport', 'Comments': 'PHI & BRE. Corrected 2015', 'Code': '0015b', 'Latitude': '55.86', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Glasgow Airport', 'Longitude': '-4.43', 'Region': 'Zone 15 - West Scotland', 'Country': 'GB'},
+    {'Dataset': 'GB0016a-Dundee', 'Comments': '2011 PHI & BRE.', 'Code': '0016a', 'Latitude': '56.45', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Dundee', 'Longitude': '-3.067', 'Region': 'Zone 16 - East Scotland', 'Country': 'GB'},
+    {'Dataset': 'GB0017a-Aberdeen', 'Comments': '2011 PHI & BRE.', 'Code': '0017a', 'Latitude': '57.167', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Aberdeen', 'Longitude': '-2.083', 'Region': 'Zone 17 - North East Scotland', 'Country': 'GB'},
+    {'Dataset': 'GB0018a-Aviemore', 'Comments': '2011 PHI & BRE.', 'Code': '0018a', 'Latitude': '57.2', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Aviemore', 'Longitude': '-3.83', 'Region': 'Zone 18 - Highlands', 'Country': 'GB'},
+    {'Dataset': 'GB0019a-Stornoway', 'Comments': '2011 PHI & BRE.', 'Code': '0019a', 'Latitude': '58.217', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Stornoway', 'Longitude': '-6.317', 'Region': 'Zone 19 - Western Isles', 'Country': 'GB'},
+    {'Dataset': 'GB0020a-Kirkwall Airport', 'Comments': '2011 PHI & BRE.', 'Code': '0020a', 'Latitude': '58.95', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Kirkwall Airport', 'Longitude': '-2.9', 'Region': 'Zone 20 - Orkney', 'Country': 'GB'},
+    {'Dataset': 'GB0021a-Lerwick', 'Comments': '2011 PHI & BRE.', 'Code': '0021a', 'Latitude': '60.133', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Lerwick', 'Longitude': '-1.183', 'Region': 'Zone 21 - Shetland', 'Country': 'GB'},
+    {'Dataset': 'GB0022a-Belfast-Aldergrove', 'Comments': '2011 PHI & BRE.', 'Code': '0022a', 'Latitude': '54.65', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Belfast-Aldergrove', 'Longitude': '-6.217', 'Region': 'Zone 22 - Northern Ireland', 'Country': 'GB'},
+    {'Dataset': 'GR0001a-Volos', 'Comments': '2011 PHI. Vergleich mit IWEC Daten', 'Code': '0001a', 'Latitude': '39.34', 'Source': 'Source: Meteonorm V6.', 'Location': 'Volos', 'Longitude': '23.01', 'Region': '', 'Country': 'GR'},
+    {'Dataset': 'GR0002b-Athen', 'Comments': '2015 PHI', 'Code': '0002b', 'Latitude': '37.9', 'Source': 'Source: Meteonorm V7 (Hellenkion, new period). Load data by PHI. ', 'Location': 'Athen', 'Longitude': '23.73', 'Region': '', 'Country': 'GR'},
+    {'Dataset': 'HR0001b-Zagreb', 'Comments': '2014 PHI. PassREg. ', 'Code': '0001b', 'Latitude': '45.82', 'Source': 'Source: DHMZ Climate Atlas & Meteonorm V7. ', 'Location': 'Zagreb', 'Longitude': '16.37', 'Region': '', 'Country': 'HR'},
+    {'Dataset': 'HU0001a-Budapest', 'Comments': '', 'Code': '0001a', 'Latitude': '47.5', 'Source': '', 'Location': 'Budapest', 'Longitude': '19.05', 'Region': '', 'Country': 'HU'},
+    {'Dataset': 'ID0001a-Jakarta', 'Comments': '2015 PHI. ', 'Code': '0001a', 'Latitude': '-5.63', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see handbook)! Source: BerkeleyEarth database (1981-2010 raw data) & satellite data.', 'Location': 'Jakarta', 'Longitude': '106.55', 'Region': '', 'Country': 'ID'},
+    {'Dataset': 'IE0001a-Dublin', 'Comments': '2012 PHI. ', 'Code': '0001a', 'Latitude': '53.33', 'Source': 'Source: Meteonorm V6 & satellite data. ', 'Location': 'Dublin', 'Longitude': '-6.25', 'Region': '', 'Country': 'IE'},
+    {'Dataset': 'IE0002a-Birr', 'Comments': '', 'Code': '0002a', 'Latitude': '53.083', 'Source': '', 'Location': 'Birr', 'Longitude': '-7.9', 'Region': '', 'Country': 'IE'},
+    {'Dataset': 'IE0003a-Cork', 'Comments': '2014 PHI. ', 'Code': '0003a', 'Latitude': '51.85', 'Source': 'Source: 1981-2010 Climate Normals (met.ie). Other data = MN7 Cork Airport. CL = Passipedia. ', 'Location': 'Cork', 'Longitude': '-8.48', 'Region': '', 'Country': 'IE'},
+    {'Dataset': 'IE0004a-Belmullet', 'Comments': '2015 PHI. IWEC', 'Code': '0004a', 'Latitude': '54.23', 'Source': '', 'Location': 'Belmullet', 'Longitude': '-10', 'Region': '', 'Country': 'IE'},
+    {'Dataset': 'IS0001a-Reykjavik', 'Comments': '', 'Code': '0001a', 'Latitude': '64.13', 'Source': '', 'Location': 'Reykjavik', 'Longitude': '-20.07', 'Region': '', 'Country': 'IS'},
+    {'Dataset': "IT0001a-L'Aquila", 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0001a', 'Latitude': '42.135', 'Source': '', 'Location': "L'Aquila", 'Longitude': '13.621', 'Region': 'Abruzzo', 'Country': 'IT'},
+    {'Dataset': 'IT0002a-Potenza', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0002a', 'Latitude': '40.636', 'Source': '', 'Location': 'Potenza', 'Longitude': '15.813', 'Region': 'Basilicata', 'Country': 'IT'},
+    {'Dataset': 'IT0003a-Catanzaro', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0003a', 'Latitude': '38.9', 'Source': '', 'Location': 'Catanzaro', 'Longitude': '16.6', 'Region': 'Calabria', 'Country': 'IT'},
+    {'Dataset': 'IT0004a-Napoli', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0004a', 'Latitude': '40.837', 'Source': '', 'Location': 'Napoli', 'Longitude': '14.252', 'Region': 'Campania', 'Country': 'IT'},
+    {'Dataset': 'IT0005a-Bologna', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0005a', 'Latitude': '44.533', 'Source': '', 'Location': 'Bologna', 'Longitude': '11.3', 'Region': 'Emilia-Romagna', 'Country': 'IT'},
+    {'Dataset': 'IT0006a-Trieste', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0006a', 'Latitude': '45.65', 'Source': '', 'Location': 'Trieste', 'Longitude': '13.78', 'Region': 'Friuli Venezia Giulia', 'Country': 'IT'},
+    {'Dataset': 'IT0007a-Roma (Pratica di Mare)', 'Comments': u'2005 PHI. Pr\xc3\xbcfen!!', 'Code': '0007a', 'Latitude': '41.88', 'Source': 'Source: Meteonorm. Load data based on IGDG. ', 'Location': 'Roma (Pratica di Mare)', 'Longitude': '12.5', 'Region': 'Lazio', 'Country': 'IT'},
+    {'Dataset': 'IT0008a-Genova ', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0008a', 'Latitude': '44.4', 'Source': '', 'Location': 'Genova ', 'Longitude': '8.93', 'Region': 'Liguria', 'Country': 'IT'},
+    {'Dataset': 'IT0009a-Brescia', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0009a', 'Latitude': '45.55', 'Source': '', 'Location': 'Brescia', 'Longitude': '10.22', 'Region': 'Lombardia', 'Country': 'IT'},
+    {'Dataset': 'IT0010b-Milano', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0010b', 'Latitude': '45.47', 'Source': '1996-2005', 'Location': 'Milano', 'Longitude': '9.2', 'Region': 'Lombardia', 'Country': 'IT'},
+    {'Dataset': 'IT0011b-Ancona', 'Comments': '2014 PHI. PassREg', 'Code': '0011b', 'Latitude': '43.62', 'Source': '', 'Location': 'Ancona', 'Longitude': '13.52', 'Region': 'Marche', 'Country': 'IT'},
+    {'Dataset': 'IT0012a-Campobasso', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0012a', 'Latitude': '41.556', 'Source': '', 'Location': 'Campobasso', 'Longitude': '14.659', 'Region': 'Molise', 'Country': 'IT'},
+    {'Dataset': 'IT0013b-Torino', 'Comments': '2015 PHI & ZEPHIR', 'Code': '0013b', 'Latitude': '45.19', 'Source': 'Verschiedene sourcen; Vergleich & Bearbeitung durch ZEPHIR Passivhaus Italia & PHI', 'Location': 'Torino', 'Longitude': '7.65', 'Region': 'Piemonte', 'Country': 'IT'},
+    {'Dataset': 'IT0014a-Bari', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0014a', 'Latitude': '41.117', 'Source': '', 'Location': 'Bari', 'Longitude': '16.867', 'Region': 'Puglia', 'Country': 'IT'},
+    {'Dataset': 'IT0015a-Cagliari', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0015a', 'Latitude': '39.22', 'Source': '', 'Location': 'Cagliari', 'Longitude': '9.13', 'Region': 'Sardegna', 'Country': 'IT'},
+    {'Dataset': 'IT0016b-Palermo  (Punta Raisi)', 'Comments': u'2005 PHI. Pr\xc3\xbcfen!!', 'Code': '0016b', 'Latitude': '38.1', 'Source': 'Source: Meteonorm. Load data based on IGDG. ', 'Location': 'Palermo  (Punta Raisi)', 'Longitude': '13.38', 'Region': 'Sicilia', 'Country': 'IT'},
+    {'Dataset': 'IT0017a-Firenze', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0017a', 'Latitude': '43.778', 'Source': '', 'Location': 'Firenze', 'Longitude': '11.254', 'Region': 'Toscana', 'Country': 'IT'},
+    {'Dataset': 'IT0018a-Pisa', 'Comments': u'2005 PHI. Pr\xc3\xbcfen!!', 'Code': '0018a', 'Latitude': '43.67', 'Source': 'Source: Meteonorm. Load data based on IGDG. ', 'Location': 'Pisa', 'Longitude': '10.38', 'Region': 'Toscana', 'Country': 'IT'},
+    {'Dataset': 'IT0019a-Venezia', 'Comments': u'2005 PHI. Pr\xc3\xbcfen!!', 'Code': '0019a', 'Latitude': '45.49', 'Source': 'Source: Meteonorm. Load data based on IGDG. ', 'Location': 'Venezia', 'Longitude': '12.33', 'Region': 'Veneto', 'Country': 'IT'},
+    {'Dataset': 'IT0020a-Bolzano', 'Comments': u'2005 PHI. Pr\xc3\xbcfen!!', 'Code': '0020a', 'Latitude': '46.46', 'Source': 'Source: Meteonorm. Load data based on IGDG. ', 'Location': 'Bolzano', 'Longitude': '11.33', 'Region': 'Trentino - Alto Adige', 'Country': 'IT'},
+    {'Dataset': 'IT0021a-Trento', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0021a', 'Latitude': '46.069', 'Source': '', 'Location': 'Trento', 'Longitude': '11.12', 'Region': 'Trentino - Alto Adige', 'Country': 'IT'},
+    {'Dataset': 'IT0022a-Perugia', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0022a', 'Latitude': '43.98', 'Source': '', 'Location': 'Perugia', 'Longitude': '12.65', 'Region': 'Umbria', 'Country': 'IT'},
+    {'Dataset': 'IT0023a-Aosta', 'Comments': u'pr\xc3\xbcfen!!', 'Code': '0023a', 'Latitude': '45.735', 'Source': '', 'Location': 'Aosta', 'Longitude': '7.309', 'Region': "Valle d'Aosta", 'Country': 'IT'},
+    {'Dataset': 'IT0024a-Catania', 'Comments': '2014 PHI. PassREg', 'Code': '0024a', 'Latitude': '37.4', 'Source': 'Source: ClimateAtlas 1971-2000 & ground measured data 2009-2013.', 'Location': 'Catania', 'Longitude': '14.91', 'Region': 'Sicilia', 'Country': 'IT'},
+    {'Dataset': 'IT0025a-Cervia', 'Comments': '2014 PHI. PassREg. Compared with satellite, UNI, ground measured, ClimateAtlas. ', 'Code': '0025a', 'Latitude': '44.21', 'Source': 'Source: Meteonorm V7 Station Cervia ("new" period). Load data from CTI TRY. ', 'Location': 'Cervia', 'Longitude': '12.3', 'Region': 'Emilia-Romagna', 'Country': 'IT'},
+    {'Dataset': 'IT0026a-Verona / Valeggio', 'Comments': '2015 PHI & ZEPHIR', 'Code': '0026a', 'Latitude': '45.38', 'Source': 'Verschiedene sourcen; Vergleich & Bearbeitung durch ZEPHIR Passivhaus Italia & PHI', 'Location': 'Verona / Valeggio', 'Longitude': '10.87', 'Region': 'Veneto', 'Country': 'IT'},
+    {'Dataset': 'IT0027a-Bergamo', 'Comments': '2015 PHI & ZEPHIR', 'Code': '0027a', 'Latitude': '45.66', 'Source': 'Verschiedene sourcen; Vergleich & Bearbeitung durch ZEPHIR Passivhaus Italia & PHI', 'Location': 'Bergamo', 'Longitude': '9.66', 'Region': 'Lombardia', 'Country': 'IT'},
+    {'Dataset': 'JP0001a-Tokyo', 'Comments': '2009 PHI. Vergleich mit IWEC, EOSWEB, NOAA.', 'Code': '0001a', 'Latitude': '35.683', 'Source': 'Source: Meteonorm. ', 'Location': 'Tokyo', 'Longitude': '139.767', 'Region': '', 'Country': 'JP'},
+    {'Dataset': 'JP0002a-Sapporo', 'Comments': '2009 PHI. Vergleich mit IWEC.', 'Code': '0002a', 'Latitude': '43.08', 'Source': 'Source: Meteonorm. ', 'Location': 'Sapporo', 'Longitude': '141.35', 'Region': '', 'Country': 'JP'},
+    {'Dataset': 'KP0001a-Hyesan', 'Comments': '2016 PHI', 'Code': '0001a', 'Latitude': '41.4', 'Source': 'Temp = 1981-2010; Other = derived from Meteonorm', 'Location': 'Hyesan', 'Longitude': '128.17', 'Region': '', 'Country': 'KP'},
+    {'Dataset': 'KR0001a-Seoul', 'Comments': 'confirmed 2015 PHI', 'Code': '0001a', 'Latitude': '37.5', 'Source': '', 'Location': 'Seoul', 'Longitude': '127', 'Region': '', 'Country': 'KR'},
+    {'Dataset': 'KR0002a-Jeonju', 'Comments': '2013 PHI. MN Station: Chonchu (Jeonju) KS, Perez, neuePeriode. KL: EOSWEB. Vergleich mit EOSWEB & Korean Meteorology Organisation (1981-2012).', 'Code': '0002a', 'Latitude': '35.82', 'Source': 'Source: Meteonorm V6.1 & satellite data', 'Location': 'Jeonju', 'Longitude': '127.15', 'Region': '', 'Country': 'KR'},
+    {'Dataset': 'KR0003a-Cheongju', 'Comments': '2011 PHI', 'Code': '0003a', 'Latitude': '36.65', 'Source': 'Source: Meteonorm V6.1 & satellite data', 'Location': 'Cheongju', 'Longitude': '127.45', 'Region': '', 'Country': 'KR'},
+    {'Dataset': 'KZ0001a-Almaty', 'Comments': '2011 PHI', 'Code': '0001a', 'Latitude': '43.32', 'Source': 'Source: Meteonorm.', 'Location': 'Almaty', 'Longitude': '76.92', 'Region': '', 'Country': 'KZ'},
+    {'Dataset': 'LT0001a-Vilnius', 'Comments': '', 'Code': '0001a', 'Latitude': '54.68333333', 'Source': '', 'Location': 'Vilnius', 'Longitude': '25.26666667', 'Region': '', 'Country': 'LT'},
+    {'Dataset': 'LT0002a-Panara', 'Comments': '2012 PHI. ', 'Code': '0002a', 'Latitude': '54.09', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Panara', 'Longitude': '24.11', 'Region': '', 'Country': 'LT'},
+    {'Dataset': 'LU0001a-Luxembourg', 'Comments': '', 'Code': '0001a', 'Latitude': '49.612', 'Source': '', 'Location': 'Luxembourg', 'Longitude': '6.13', 'Region': '', 'Country': 'LU'},
+    {'Dataset': 'LV0001a-Riga', 'Comments': '2014 PHI. PassREg. New period. Compared with WMO, EOSWEB, LBN 003-01.', 'Code': '0001a', 'Latitude': '56.97', 'Source': 'Source: Meteonorm7, Station: Riga. ', 'Location': 'Riga', 'Longitude': '24.05', 'Region': '', 'Country': 'LV'},
+    {'Dataset': 'LV0002a-Dougavpils', 'Comments': '2014 PHI. PassREg. Compared with WMO, EOSWEB, LBN 003-01. PHI May 2014', 'Code': '0002a', 'Latitude': '55.87', 'Source': 'Source: Meteonorm7, Station: Dougavpils.', 'Location': 'Dougavpils', 'Longitude': '26.62', 'Region': '', 'Country': 'LV'},
+    {'Dataset': 'MX0001b-Puebla, Puebla', 'Comments': '2012 PHI. ', 'Code': '0001b', 'Latitude': '19.05', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Puebla, Puebla', 'Longitude': '-98.2', 'Region': u'6 - Templado subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': 'MX0002b-Jalisco, Guadalajara', 'Comments': '2012 PHI. ', 'Code': '0002b', 'Latitude': '20.7', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Jalisco, Guadalajara', 'Longitude': '-103.3', 'Region': u'6 - Templado subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': 'MX0003b-Sonora, Hermosillo', 'Comments': '2012 PHI. ', 'Code': '0003b', 'Latitude': '29.1', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Sonora, Hermosillo', 'Longitude': '-111', 'Region': '3 - Muy seco', 'Country': 'MX'},
+    {'Dataset': u'MX0004b-Quintana Roo, Canc\xc3\xban', 'Comments': '2012 PHI. ', 'Code': '0004b', 'Latitude': '21.1', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': u'Quintana Roo, Canc\xc3\xban', 'Longitude': '-86.8', 'Region': u'2 - C\xc3\xa1lido subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': 'MX0005a-Aguascalientes, Aguascalientes', 'Comments': '2012 PHI. ', 'Code': '0005a', 'Latitude': '21.88', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Aguascalientes, Aguascalientes', 'Longitude': '-102.3', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': u'MX0006a-Distrito Federal, M\xc3\xa9xico D.F.', 'Comments': '2012 PHI. ', 'Code': '0006a', 'Latitude': '19.47', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': u'Distrito Federal, M\xc3\xa9xico D.F.', 'Longitude': '-99.08', 'Region': u'6 - Templado subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': u'MX0007a-Nuevo Le\xc3\xb3n, Monterrey', 'Comments': '2012 PHI. ', 'Code': '0007a', 'Latitude': '25.67', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': u'Nuevo Le\xc3\xb3n, Monterrey', 'Longitude': '-100.31', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': 'MX0008a-Oaxaca, Oaxaca', 'Comments': '2012 PHI. ', 'Code': '0008a', 'Latitude': '17.08', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Oaxaca, Oaxaca', 'Longitude': '-96.71', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': 'MX0009a-Baja California, Tijuana', 'Comments': '2012 PHI. ', 'Code': '0009a', 'Latitude': '32.44', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Baja California, Tijuana', 'Longitude': '-116.91', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': 'MX0010a-Veracruz, Xalapa', 'Comments': '2012 PHI. ', 'Code': '0010a', 'Latitude': '19.54166667', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Veracruz, Xalapa', 'Longitude': '-96.91383333', 'Region': u'1 - C\xc3\xa1lido h\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': 'MX0011a-Chihuahua, Chihuahua', 'Comments': '2012 PHI. ', 'Code': '0011a', 'Latitude': '28.4', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Chihuahua, Chihuahua', 'Longitude': '-106.12', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': 'MX0012a-Chihuahua, Juarez', 'Comments': '2012 PHI. ', 'Code': '0012a', 'Latitude': '31.63', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Chihuahua, Juarez', 'Longitude': '-106.43', 'Region': '3 - Muy seco', 'Country': 'MX'},
+    {'Dataset': u'MX0013a-Quer\xc3\xa9taro, Quer\xc3\xa9taro', 'Comments': '2012 PHI. ', 'Code': '0013a', 'Latitude': '20.57', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': u'Quer\xc3\xa9taro, Quer\xc3\xa9taro', 'Longitude': '-100.37', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': u'MX0014a-San Luis Potos\xc3\xad, San Luis Potos\xc3\xad', 'Comments': '2012 PHI. ', 'Code': '0014a', 'Latitude': '22.15', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': u'San Luis Potos\xc3\xad, San Luis Potos\xc3\xad', 'Longitude': '-101', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': u'MX0015a-M\xc3\xa9xico, Toluca', 'Comments': '2012 PHI. ', 'Code': '0015a', 'Latitude': '19.3', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': u'M\xc3\xa9xico, Toluca', 'Longitude': '-99.7', 'Region': u'6 - Templado subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': u'MX0016a-Guanajuato, Le\xc3\xb3n', 'Comments': '2012 PHI. ', 'Code': '0016a', 'Latitude': '21.1', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': u'Guanajuato, Le\xc3\xb3n', 'Longitude': '-101.7', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': 'MX0017a-Guerrero, Acapulco', 'Comments': '2012 PHI. ', 'Code': '0017a', 'Latitude': '16.8', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Guerrero, Acapulco', 'Longitude': '-99.9', 'Region': u'2 - C\xc3\xa1lido subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': 'MX0018a-Campeche, Campeche', 'Comments': '2012 PHI. ', 'Code': '0018a', 'Latitude': '19.85', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Campeche, Campeche', 'Longitude': '-90.55', 'Region': u'2 - C\xc3\xa1lido subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': 'MX0019a-Tamaulipas, Ciudad Victoria', 'Comments': '2012 PHI. ', 'Code': '0019a', 'Latitude': '23.73', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Tamaulipas, Ciudad Victoria', 'Longitude': '-99.17', 'Region': u'6 - Templado subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': u'MX0020a-Sinaloa, Culiac\xc3\xa1n', 'Comments': '2012 PHI. ', 'Code': '0020a', 'Latitude': '24.79', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': u'Sinaloa, Culiac\xc3\xa1n', 'Longitude': '-107.4', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': 'MX0021a-Durango, Durango', 'Comments': '2012 PHI. Koordinaten korrigiert', 'Code': '0021a', 'Latitude': '24.09', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Durango, Durango', 'Longitude': '-104.6', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': 'MX0022a-Baja California Sur, La Paz', 'Comments': '2012 PHI. ', 'Code': '0022a', 'Latitude': '24.06', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Baja California Sur, La Paz', 'Longitude': '-110.36', 'Region': '3 - Muy seco', 'Country': 'MX'},
+    {'Dataset': 'MX0023a-Tamaulipas, Matamoros', 'Comments': '2012 PHI. ', 'Code': '0023a', 'Latitude': '25.76', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Tamaulipas, Matamoros', 'Longitude': '-97.53', 'Region': u'2 - C\xc3\xa1lido subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': 'MX0024a-Sinaloa, Mazatlan', 'Comments': '2012 PHI. ', 'Code': '0024a', 'Latitude': '23.22', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Sinaloa, Mazatlan', 'Longitude': '-106.41', 'Region': u'2 - C\xc3\xa1lido subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': 'MX0025a-Baja California, Mexicali', 'Comments': '2012 PHI. ', 'Code': '0025a', 'Latitude': '32.66', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Baja California, Mexicali', 'Longitude': '-115.47', 'Region': '3 - Muy seco', 'Country': 'MX'},
+    {'Dataset': 'MX0026a-Tamaulipas, Nuevo Laredo', 'Comments': '2012 PHI. ', 'Code': '0026a', 'Latitude': '27.55', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Tamaulipas, Nuevo Laredo', 'Longitude': '-99.46', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': 'MX0027a-Coahuila, Saltillo', 'Comments': '2012 PHI. ', 'Code': '0027a', 'Latitude': '25.38', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Coahuila, Saltillo', 'Longitude': '-101.17', 'Region': '4 - Seco y semiseco', 'Country': 'MX'},
+    {'Dataset': 'MX0028a-Tamaulipas, Tampico', 'Comments': '2012 PHI. ', 'Code': '0028a', 'Latitude': '22.2', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Tamaulipas, Tampico', 'Longitude': '-97.86', 'Region': u'2 - C\xc3\xa1lido subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': u'MX0029a-Puebla, Teziutl\xc3\xa1n', 'Comments': '2012 PHI. ', 'Code': '0029a', 'Latitude': '19.82', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': u'Puebla, Teziutl\xc3\xa1n', 'Longitude': '-97.36', 'Region': u'5 - Templado h\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': u'MX0030b-Coahuila, Torre\xc3\xb3n', 'Comments': '2015 PHI. DEEVi 2', 'Code': '0030b', 'Latitude': '25.54', 'Source': 'Temp & humidity = 1981-2010 SMN; Other = Satellite data. ', 'Location': u'Coahuila, Torre\xc3\xb3n', 'Longitude': '-103.47', 'Region': '3 - Muy seco', 'Country': 'MX'},
+    {'Dataset': 'MX0031a-Chiapas, Tuxtla', 'Comments': '2012 PHI. ', 'Code': '0031a', 'Latitude': '16.75', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Chiapas, Tuxtla', 'Longitude': '-93.13', 'Region': u'2 - C\xc3\xa1lido subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': u'MX0032a-Michoac\xc3\xa1n, Uruapan', 'Comments': u'2012 PHI. (2015 L\xc3\xa4ngengrad korrigiert)', 'Code': '0032a', 'Latitude': '19.4', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': u'Michoac\xc3\xa1n, Uruapan', 'Longitude': '-102.03', 'Region': u'1 - C\xc3\xa1lido h\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': 'MX0033a-Veracruz, Veracruz', 'Comments': '2012 PHI. ', 'Code': '0033a', 'Latitude': '19.16', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Veracruz, Veracruz', 'Longitude': '-96.14', 'Region': u'2 - C\xc3\xa1lido subh\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': 'MX0034a-Tabasco, Villahermosa', 'Comments': '2012 PHI. ', 'Code': '0034a', 'Latitude': '18', 'Source': 'Source: Satellite data / SMN / Meteonorm.', 'Location': 'Tabasco, Villahermosa', 'Longitude': '-92.93', 'Region': u'1 - C\xc3\xa1lido h\xc3\xbamedo', 'Country': 'MX'},
+    {'Dataset': 'NL0001b-Amsterdam (Schiphol)', 'Comments': '2015 PHI', 'Code': '0001b', 'Latitude': '52.3', 'Source': 'Source: KNMI (1980-2009), supplemented with MN7 data for radiation.', 'Location': 'Amsterdam (Schiphol)', 'Longitude': '4.77', 'Region': '', 'Country': 'NL'},
+    {'Dataset': 'NL0002b-Groningen (Eelde)', 'Comments': '2015 PHI', 'Code': '0002b', 'Latitude': '53.13', 'Source': 'Source: KNMI (1980-2009), supplemented with MN7 data for radiation.', 'Location': 'Groningen (Eelde)', 'Longitude': '6.59', 'Region': '', 'Country': 'NL'},
+    {'Dataset': 'NL0003c-De Bilt', 'Comments': '2015 PHI', 'Code': '0003c', 'Latitude': '52.1', 'Source': 'Source: KNMI (1980-2009), supplemented with MN7 data for radiation.', 'Location': 'De Bilt', 'Longitude': '5.18', 'Region': '', 'Country': 'NL'},
+    {'Dataset': 'NL0004b-De Kooy', 'Comments': '2015 PHI', 'Code': '0004b', 'Latitude': '52.92', 'Source': 'Source: KNMI (1980-2009), supplemented with MN7 data for radiation.', 'Location': 'De Kooy', 'Longitude': '4.79', 'Region': '', 'Country': 'NL'},
+    {'Dataset': 'NL0005b-Vlissingen', 'Comments': '2015 PHI', 'Code': '0005b', 'Latitude': '51.44', 'Source': 'Source: KNMI (1980-2009), supplemented with MN7 data for radiation.', 'Location': 'Vlissingen', 'Longitude': '3.6', 'Region': '', 'Country': 'NL'},
+    {'Dataset': 'NL0006b-Twente', 'Comments': '2015 PHI', 'Code': '0006b', 'Latitude': '52.27', 'Source': 'Source: KNMI (1980-2009), supplemented with MN7 data for radiation.', 'Location': 'Twente', 'Longitude': '6.9', 'Region': '', 'Country': 'NL'},
+    {'Dataset': 'NL0007a-Eindhoven', 'Comments': '2015 PHI', 'Code': '0007a', 'Latitude': '51.45', 'Source': 'Source: KNMI (1980-2009), supplemented with MN7 data for radiation.', 'Location': 'Eindhoven', 'Longitude': '5.41', 'Region': '', 'Country': 'NL'},
+    {'Dataset': 'NL0008a-Leiden (Valkenburg)', 'Comments': '2015 PHI', 'Code': '0008a', 'Latitude': '52.17', 'Source': 'Source: KNMI (1980-2009), supplemented with MN7 data for radiation.', 'Location': 'Leiden (Valkenburg)', 'Longitude': '4.42', 'Region': '', 'Country': 'NL'},
+    {'Dataset': 'NL0009a-Maastricht', 'Comments': '2015 PHI', 'Code': '0009a', 'Latitude': '50.91', 'Source': 'Source: KNMI (1980-2009), supplemented with MN7 data for radiation.', 'Location': 'Maastricht', 'Longitude': '5.77', 'Region': '', 'Country': 'NL'},
+    {'Dataset': 'NO0001a-Oslo', 'Comments': '', 'Code': '0001a', 'Latitude': '59.93', 'Source': '', 'Location': 'Oslo', 'Longitude': '10.75', 'Region': '', 'Country': 'NO'},
+    {'Dataset': 'NO0002a-Bergen', 'Comments': 'PEP project', 'Code': '0002a', 'Latitude': '60.38', 'Source': '', 'Location': 'Bergen', 'Longitude': '5.33', 'Region': '', 'Country': 'NO'},
+    {'Dataset': 'NO0003a-Trondheim', 'Comments': '', 'Code': '0003a', 'Latitude': '63.42', 'Source': '', 'Location': 'Trondheim', 'Longitude': '10.4', 'Region': '', 'Country': 'NO'},
+    {'Dataset': 'NZ0001a-Auckland', 'Comments': 'PHPP 8 ', 'Code': '0001a', 'Latitude': '-37', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)   Source: NIWA, TMY2. ', 'Location': 'Auckland', 'Longitude': '174.8', 'Region': 'AK (Auckland) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0002a-Wellington', 'Comments': 'PHPP 8 ', 'Code': '0002a', 'Latitude': '-41.4', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)   Source: NIWA, TMY2. ', 'Location': 'Wellington', 'Longitude': '174.9', 'Region': 'WN (Wellington) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0003a-Christchurch', 'Comments': 'PHPP 8 ', 'Code': '0003a', 'Latitude': '-43.5', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)   Source: NIWA, TMY2. ', 'Location': 'Christchurch', 'Longitude': '172.6', 'Region': 'CC (Christchurch) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0004a-Masterton', 'Comments': '2012 PHI. ', 'Code': '0004a', 'Latitude': '-41.02', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)   Source: NIWA, TMY2. ', 'Location': 'Masterton', 'Longitude': '175.62', 'Region': 'WI (Wairarapa) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0005a-New Plymouth', 'Comments': '2012 PHI. ', 'Code': '0005a', 'Latitude': '-39.01', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)   Source: NIWA, TMY2. ', 'Location': 'New Plymouth', 'Longitude': '174.18', 'Region': 'NP (New Plymouth) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0006b-Queenstown', 'Comments': '2015 PHI', 'Code': '0006b', 'Latitude': '-45.02', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)   Source: NIWA, TMY2. ', 'Location': 'Queenstown', 'Longitude': '168.74', 'Region': 'QL (Queenstown-Lakes) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0007a-Tauranga', 'Comments': '2012 PHI. ', 'Code': '0007a', 'Latitude': '-37.67', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)   Source: NIWA, TMY2. ', 'Location': 'Tauranga', 'Longitude': '176.2', 'Region': 'BP (Bay of Plenty) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0008a-Turangi', 'Comments': '2012 PHI. ', 'Code': '0008a', 'Latitude': '-38.99', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)   Source: NIWA, TMY2. ', 'Location': 'Turangi', 'Longitude': '175.81', 'Region': 'TP (Taupo) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0009a-Paraparaumu', 'Comments': '2014 PHI. Compared with MN7, IWEC, satellite data.', 'Code': '0009a', 'Latitude': '-40.91', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)   Source: NIWA, TMY2. ', 'Location': 'Paraparaumu', 'Longitude': '174.98', 'Region': 'MW (Manawatu) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0010a-Hamilton / Ruakura', 'Comments': '2014 PHI. Compard with Meteonorm & satellite data', 'Code': '0010a', 'Latitude': '-37.78', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!)   Source: NIWA, TMY2. ', 'Location': 'Hamilton / Ruakura', 'Longitude': '175.31', 'Region': 'HN (Hamilton) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0011a-Napier', 'Comments': '2015 PHI', 'Code': '0011a', 'Latitude': '-39.45', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!). Source: Meteonorm7. Load data derived from NIWA data. ', 'Location': 'Napier', 'Longitude': '176.85', 'Region': 'EC (East Coast) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0012a-Nelson ', 'Comments': '2015 PHI', 'Code': '0012a', 'Latitude': '-41.3', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!). Source: Meteonorm7. Load data derived from NIWA data. ', 'Location': 'Nelson ', 'Longitude': '173.23', 'Region': 'NM (Nelson Marlborough) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'NZ0013a-Dunedin', 'Comments': '2015 PHI', 'Code': '0013a', 'Latitude': '-45.9', 'Source': 'Location is on the Southern Hemisphere. The original data has been adapted for use in the PHPP (see PHPP manual!). Source: NIWA & Satellite data (radiation)', 'Location': 'Dunedin', 'Longitude': '170.51', 'Region': 'DN (Dunedin) NIWA Zone', 'Country': 'NZ'},
+    {'Dataset': 'PH0001a-Manila/Naia', 'Comments': '2011 PHI. Vergleich mit EOSWEB, IWEC. ', 'Code': '0001a', 'Latitude': '14.517', 'Source': 'Source: Meteonorm. ', 'Location': 'Manila/Naia', 'Longitude': '121', 'Region': '', 'Country': 'PH'},
+    {'Dataset': 'PL0001a-Koszalin/Kolobrzeg', 'Comments': '2005 PHI', 'Code': '0001a', 'Latitude': '54.17', 'Source': '', 'Location': 'Koszalin/Kolobrzeg', 'Longitude': '16.17', 'Region': 'Strefa I', 'Country': 'PL'},
+    {'Dataset': 'PL0002a-Poznan/Pila', 'Comments': '2005 PHI', 'Code': '0002a', 'Latitude': '52.42', 'Source': '', 'Location': 'Poznan/Pila', 'Longitude': '16.88', 'Region': 'Strefa II', 'Country': 'PL'},
+    {'Dataset': 'PL0003a-Warszawa', 'Comments': '2005 PHI', 'Code': '0003a', 'Latitude': '52.25', 'Source': '', 'Location': 'Warszawa', 'Longitude': '21', 'Region': 'Strefa III', 'Country': 'PL'},
+    {'Dataset': 'PL0004a-Bialystok/Mikolajki', 'Comments': '2005 PHI', 'Code': '0004a', 'Latitude': '53.15', 'Source': '', 'Location': 'Bialystok/Mikolajki', 'Longitude': '23.17', 'Region': 'Strefa IV', 'Country': 'PL'},
+    {'Dataset': 'PL0005a-Suwalki/Mikolajki', 'Comments': '2005 PHI', 'Code': '0005a', 'Latitude': '54.1', 'Source': '', 'Location': 'Suwalki/Mikolajki', 'Longitude': '22.95', 'Region': 'Strefa V N', 'Country': 'PL'},
+    {'Dataset': 'PL0006a-Zakopane', 'Comments': '2005 PHI', 'Code': '0006a', 'Latitude': '49.3', 'Source': '', 'Location': 'Zakopane', 'Longitude': '19.95', 'Region': 'Strefa V S', 'Country': 'PL'},
+    {'Dataset': 'PT0001a-Lisboa', 'Comments': '', 'Code': '0001a', 'Latitude': '38.73', 'Source': '', 'Location': 'Lisboa', 'Longitude': '-9.13', 'Region': '', 'Country': 'PT'},
+    {'Dataset': 'PT0002a-Porto ', 'Comments': '2011 PHI. Vergleich mit IWEC Daten.', 'Code': '0002a', 'Latitude': '41.133', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Porto ', 'Longitude': '-8.6', 'Region': '', 'Country': 'PT'},
+    {'Dataset': 'RO0001a-Satu-Mare', 'Comments': '2011 PHI', 'Code': '0001a', 'Latitude': '47.8', 'Source': 'Source: Meteonorm V6. ', 'Location': 'Satu-Mare', 'Longitude': '22.87', 'Region': '', 'Country': 'RO'},
+    {'Dataset': 'RO0002a-Sibiu', 'Comments': '2015 PHI', 'Code': '0002a', 'Latitude': '45.8', 'Source': 'Source: Meteonorm. Compared with INCERC', 'Location': 'Sibiu', 'Longitude': '24.15', 'Region': '', 'Country': 'RO'},
+    {'Dataset': 'RO0003a-Cluj', 'Comments': '2015 PHI', 'Code': '0003a', 'Latitude': '46.78', 'Source': 'Temp = INCERC, Other =  Meteonorm. Load data derived by PHI. ', 'Location': 'Cluj', 'Longitude': '23.57', 'Region': '', 'Country': 'RO'},
+    {'Dataset': 'RS0001a-Belgrad', 'Comments': '', 'Code': '0001a', 'Latitude': '44.82', 'Source': '', 'Location': 'Belgrad', 'Longitude': '20.47', 'Region': '', 'Country': 'RS'},
+    {'Dataset': u'RS0002a-Ni\xc5\xa1', 'Comments': '', 'Code': '0002a', 'Latitude': '43.33', 'Source': '', 'Location': u'Ni\xc5\xa1', 'Longitude': '21.9', 'Region': '', 'Country': 'RS'},
+    {'Dataset': u'RS0003a-Pri\xc5\xa1tina', 'Comments': '', 'Code': '0003a', 'Latitude': '42.65', 'Source': '', 'Location': u'Pri\xc5\xa1tina', 'Longitude': '21.15', 'Region': '', 'Country': 'RS'},
+    {'Dataset': 'RS0004a-Banja Luka', 'Comments': '', 'Code': '0004a', 'Latitude': '44.78', 'Source': '', 'Location': 'Banja Luka', 'Longitude': '17.22', 'Region': '', 'Country': 'RS'},
+    {'Dataset': 'RU0001a-Moskva', 'Comments': '', 'Code': '0001a', 'Latitude': '55.77', 'Source': '', 'Location': 'Moskva', 'Longitude': '37.67', 'Region': '', 'Country': 'RU'},
+    {'Dataset': 'RU0002a-Ekaterinburg', 'Comments': '', 'Code': '0002a', 'Latitude': '56.85', 'Source': '', 'Location': 'Ekaterinburg', 'Longitude': '60.6', 'Region': '', 'Country': 'RU'},
+    {'Dataset': 'SD0001a-Khartoum', 'Comments': '2015 PHI', 'Code': '0001a', 'Latitude': '15.6', 'Source': 'Temp = 1981-2010; Other = Meteonorm V7. ', 'Location': 'Khartoum', 'Longitude': '32.55', 'Region': '', 'Country': 'SD'},
+    {'Dataset': 'SE0001a-Stockholm', 'Comments': '', 'Code': '0001a', 'Latitude': '59.325', 'Source': '', 'Location': 'Stockholm', 'Longitude': '18.07', 'Region': '', 'Country': 'SE'},
+    {'Dataset': u'SE0002a-Borl\xc3\xa4nge', 'Comments': '', 'Code': '0002a', 'Latitude': '60.433', 'Source': '', 'Location': u'Borl\xc3\xa4nge', 'Longitude': '15.5', 'Region': '', 'Country': 'SE'},
+    {'Dataset': u'SE0003a-G\xc3\xb6teborg', 'Comments': '', 'Code': '0003a', 'Latitude': '57.783', 'Source': '', 'Location': u'G\xc3\xb6teborg', 'Longitude': '11.883', 'Region': '', 'Country': 'SE'},
+    {'Dataset': u'SE0004a-J\xc3\xb6nk\xc3\xb6ping', 'Comments': '', 'Code': '0004a', 'Latitude': '57.75', 'Source': '', 'Location': u'J\xc3\xb6nk\xc3\xb6ping', 'Longitude': '14.17', 'Region': '', 'Country': 'SE'},
+    {'Dataset': 'SE0005a-Kalmar', 'Comments': '', 'Code': '0005a', 'Latitude': '56.73', 'Source': '', 'Location': 'Kalmar', 'Longitude': '16.3', 'Region': '', 'Country': 'SE'},
+    {'Dataset': 'SE0006a-Karlstad', 'Comments': '', 'Code': '0006a', 'Latitude': '59.367', 'Source': '', 'Location': 'Karlstad', 'Longitude': '13.467', 'Region': '', 'Country': 'SE'},
+    {'Dataset': 'SE0007a-Kiruna', 'Comments': '', 'Code': '0007a', 'Latitude': '67.81', 'Source': '', 'Location': 'Kiruna', 'Longitude': '20.33', 'Region': '', 'Country': 'SE'},
+    {'Dataset': u'SE0008a-Lule\xc3\xa5', 'Comments': '', 'Code': '0008a', 'Latitude': '65.55', 'Source': '', 'Location': u'Lule\xc3\xa5', 'Longitude': '22.133', 'Region': '', 'Country': 'SE'},
+    {'Dataset': 'SE0009a-Lund', 'Comments': '', 'Code': '0009a', 'Latitude': '55.717', 'Source': '', 'Location': 'Lund', 'Longitude': '13.217', 'Region': '', 'Country': 'SE'},
+    {'Dataset': u'SE0010a-\xc3\x96stersund', 'Comments': '', 'Code': '0010a', 'Latitude': '63.183', 'Source': '', 'Location': u'\xc3\x96stersund', 'Longitude': '14.5', 'Region': '', 'Country': 'SE'},
+    {'Dataset': 'SE0011a-Sundsvall', 'Comments': '', 'Code': '0011a', 'Latitude': '62.533', 'Source': '', 'Location': 'Sundsvall', 'Longitude': '17.45', 'Region': '', 'Country': 'SE'},
+    {'Dataset': u'SE0012a-Ume\xc3\xa5', 'Comments': '', 'Code': '0012a', 'Latitude': '63.817', 'Source': '', 'Location': u'Ume\xc3\xa5', 'Longitude': '20.25', 'Region': '', 'Country': 'SE'},
+    {'Dataset': 'SI0001a-Ljubljana', 'Comments': '2015 PHI', 'Code': '0001a', 'Latitude': '46.07', 'Source': 'Temp = 1981-2010; Other derived from Meteonorm. ', 'Location': 'Ljubljana', 'Longitude': '14.52', 'Region': '', 'Country': 'SI'},
+    {'Dataset': 'SK0001a-Bratislava', 'Comments': '2007 PHI. Mit Meteonorm bearbeitet. Vergleich mit Meteonorm & NOAA. Lastadaten auf Basis von NOAA Daten. 2007', 'Code': '0001a', 'Latitude': '48.17', 'Source': 'Based on: STN EN ISO 13 790', 'Location': 'Bratislava', 'Longitude': '17.17', 'Region': '', 'Country': 'SK'},
+    {'Dataset': 'SK0002a-Hurbanovo', 'Comments': '2007 PHI. Mit Meteonorm bearbeitet. Vergleich mit Meteonorm & NOAA. Lastadaten auf Basis von NOAA Daten. 2007', 'Code': '0002a', 'Latitude': '47.867', 'Source': 'Based on: STN EN ISO 13 790', 'Location': 'Hurbanovo', 'Longitude': '18.2', 'Region': '', 'Country': 'SK'},
+    {'Dataset': 'SK0003a-Kamenica nad Cirochou', 'Comments': '2007 PHI. Mit Meteonorm bearbeitet. Vergleich mit Meteonorm & NOAA. Lastadaten auf Basis von NOAA Daten. 2007', 'Code': '0003a', 'Latitude': '48.93', 'Source': 'Based on: STN EN ISO 13 790', 'Location': 'Kamenica nad Cirochou', 'Longitude': '22', 'Region': '', 'Country': 'SK'},
+    {'Dataset': u'SK0004a-Ko\xc5\xa1ice', 'Comments': '2007 PHI. Mit Meteonorm bearbeitet. Vergleich mit Meteonorm & NOAA. Lastadaten auf Basis von NOAA Daten. 2007', 'Code': '0004a', 'Latitude': '48.73', 'Source': 'Based on: STN EN ISO 13 790', 'Location': u'Ko\xc5\xa1ice', 'Longitude': '21.25', 'Region': '', 'Country': 'SK'},
+    {'Dataset': u'SK0005a-Pie\xc5\xa1\xc5\xa5any', 'Comments': '2007 PHI. Mit Meteonorm bearbeitet. Vergleich mit Meteonorm & NOAA. Lastadaten auf Basis von NOAA Daten. 2007', 'Code': '0005a', 'Latitude': '48.53', 'Source': 'Based on: STN EN ISO 13 790', 'Location': u'Pie\xc5\xa1\xc5\xa5any', 'Longitude': '17.83', 'Region': '', 'Country': 'SK'},
+    {'Dataset': 'SK0006a-Poprad', 'Comments': '2007 PHI. Mit Meteonorm bearbeitet. Vergleich mit Meteonorm & NOAA. Lastadaten auf Basis von NOAA Daten. 2007', 'Code': '0006a', 'Latitude': '49.067', 'Source': 'Based on: STN EN ISO 13 790', 'Location': 'Poprad', 'Longitude': '20.25', 'Region': '', 'Country': 'SK'},
+    {'Dataset': 'SK0007a-Sliac', 'Comments': '2007 PHI. Mit Meteonorm bearbeitet. Vergleich mit Meteonorm & NOAA. Lastadaten auf Basis von NOAA Daten. 2007', 'Code': '0007a', 'Latitude': '48.65', 'Source': 'Based on: STN EN ISO 13 790', 'Location': 'Sliac', 'Longitude': '19.15', 'Region': '', 'Country': 'SK'},
+    {'Dataset': u'SK0008a-\xc5\xbdilina', 'Comments': '2007 PHI. Mit Meteonorm bearbeitet. Vergleich mit Meteonorm & NOAA. Lastadaten auf Basis von NOAA Daten. 2007', 'Code': '0008a', 'Latitude': '49.23', 'Source': 'Based on: STN EN ISO 13 790', 'Location': u'\xc5\xbdilina', 'Longitude': '18.61', 'Region': '', 'Country': 'SK'},
+    {'Dataset': 'SY0001a-Aleppo/Neirab', 'Comments': '', 'Code': '0001a', 'Latitude': '36.183', 'Source': '', 'Location': 'Aleppo/Neirab', 'Longitude': '37.217', 'Region': '', 'Country': 'SY'},
+    {'Dataset': 'TR0001b-Gaziantep', 'Comments': '2015 PHI', 'Code': '0001b', 'Latitude': '37.08', 'Source': 'Temp = 1981-2010; Other = Meteonorm. ', 'Location': 'Gaziantep', 'Longitude': '37.37', 'Region': '', 'Country': 'TR'},
+    {'Dataset': 'UA0001a-Kiev', 'Comments': '', 'Code': '0001a', 'Latitude': '50.45', 'Source': '', 'Location': 'Kiev', 'Longitude': '30.5', 'Region': '', 'Country': 'UA'},
+    {'Dataset': 'US0001a-Birmingham', 'Comments': '2009 PHI', 'Code': '0001a', 'Latitude': '33.5', 'Source': 'Source: Meteonorm', 'Location': 'Birmingham', 'Longitude': '-86.92', 'Region': 'Alabama', 'Country': 'US'},
+    {'Dataset': 'US0002a-Anchorage', 'Comments': '2009 PHI', 'Code': '0002a', 'Latitude': '61.16', 'Source': 'Source: Meteonorm', 'Location': 'Anchorage', 'Longitude': '-150', 'Region': 'Alaska', 'Country': 'US'},
+    {'Dataset': 'US0003a-Kodiak', 'Comments': '2009 PHI', 'Code': '0003a', 'Latitude': '57.75', 'Source': 'Source: Meteonorm', 'Location': 'Kodiak', 'Longitude': '-152.5', 'Region': 'Alaska', 'Country': 'US'},
+    {'Dataset': 'US0004a-Little Rock', 'Comments': '2009 PHI', 'Code': '0004a', 'Latitude': '34.7', 'Source': 'Source: Meteonorm', 'Location': 'Little Rock', 'Longitude': '-92.28', 'Region': 'Arkansas', 'Country': 'US'},
+    {'Dataset': 'US0005a-Phoenix', 'Comments': '2009 PHI', 'Code': '0005a', 'Latitude': '33.5', 'Source': 'Source: Meteonorm', 'Location': 'Phoenix', 'Longitude': '-112.17', 'Region': 'Arizona', 'Country': 'US'},
+    {'Dataset': 'US0006a-Tucson', 'Comments': '2009 PHI', 'Code': '0006a', 'Latitude': '32.25', 'Source': 'Source: Meteonorm', 'Location': 'Tucson', 'Longitude': '-110.95', 'Region': 'Arizona', 'Country': 'US'},
+    {'Dataset': 'US0007a-Bakersfield', 'Comments': '2009 PHI', 'Code': '0007a', 'Latitude': '35.37', 'Source': 'Source: Meteonorm', 'Location': 'Bakersfield', 'Longitude': '-119.02', 'Region': 'California', 'Country': 'US'},
+    {'Dataset': 'US0008a-Fresno', 'Comments': '2009 PHI', 'Code': '0008a', 'Latitude': '36.68', 'Source': 'Source: Meteonorm', 'Location': 'Fresno', 'Longitude': '-119.78', 'Region': 'California', 'Country': 'US'},
+    {'Dataset': 'US0009b-Los Angeles', 'Comments': '2015 PHI', 'Code': '0009b', 'Latitude': '34.05', 'Source': 'Temp = 1981-2010; Other monthly = Meteonorm; Load data derived by PHI. ', 'Location': 'Los Angeles', 'Longitude': '-118.24', 'Region': 'California', 'Country': 'US'},
+    {'Dataset': 'US0010a-Sacramento', 'Comments': '2009 PHI', 'Code': '0010a', 'Latitude': '38.65', 'Source': 'Source: Meteonorm', 'Location': 'Sacramento', 'Longitude': '-121.5', 'Region': 'California', 'Country': 'US'},
+    {'Dataset': 'US0011a-San Diego', 'Comments': '2009 PHI', 'Code': '0011a', 'Latitude': '32.83', 'Source': 'Source: Meteonorm', 'Location': 'San Diego', 'Longitude': '-117.17', 'Region': 'California', 'Country': 'US'},
+    {'Dataset': 'US0012a-San Francisco', 'Comments': '2009 PHI', 'Code': '0012a', 'Latitude': '37.75', 'Source': 'Source: Meteonorm', 'Location': 'San Francisco', 'Longitude': '-122.45', 'Region': 'California', 'Country': 'US'},
+    {'Dataset': 'US0013a-San Jose', 'Comments': '2009 PHI', 'Code': '0013a', 'Latitude': '37.33', 'Source': 'Source: Meteonorm', 'Location': 'San Jose', 'Longitude': '-122', 'Region': 'California', 'Country': 'US'},
+    {'Dataset': 'US0014a-Colorado Springs', 'Comments': '2009 PHI', 'Code': '0014a', 'Latitude': '38.83', 'Source': 'Source: Meteonorm', 'Location': 'Colorado Springs', 'Longitude': '-104.83', 'Region': 'Colorado', 'Country': 'US'},
+    {'Dataset': 'US0015a-Denver', 'Comments': '2009 PHI', 'Code': '0015a', 'Latitude': '39.75', 'Source': 'Source: Meteonorm', 'Location': 'Denver', 'Longitude': '-105', 'Region': 'Colorado', 'Country': 'US'},
+    {'Dataset': 'US0016a-Hartford', 'Comments': '2009 PHI', 'Code': '0016a', 'Latitude': '41.77', 'Source': 'Source: Meteonorm', 'Location': 'Hartford', 'Longitude': '-72.68', 'Region': 'Connecticut', 'Country': 'US'},
+    {'Dataset': 'US0017a-New Haven', 'Comments': '2009 PHI', 'Code': '0017a', 'Latitude': '41.33', 'Source': 'Source: Meteonorm', 'Location': 'New Haven', 'Longitude': '-72.9', 'Region': 'Connecticut', 'Country': 'US'},
+    {'Dataset': 'US0018a-Washington', 'Comments': '2009 PHI', 'Code': '0018a', 'Latitude': '38.87', 'Source': 'Source: Meteonorm', 'Location': 'Washington', 'Longitude': '-77', 'Region': 'D.C.', 'Country': 'US'},
+    {'Dataset': 'US0019a-Jacksonville', 'Comments': '2009 PHI', 'Code': '0019a', 'Latitude': '30.33', 'Source': 'Source: Meteonorm', 'Location': 'Jacksonville', 'Longitude': '-81.67', 'Region': 'Florida', 'Country': 'US'},
+    {'Dataset': 'US0020a-Miami', 'Comments': '2009 PHI', 'Code': '0020a', 'Latitude': '25.87', 'Source': 'Source: Meteonorm', 'Location': 'Miami', 'Longitude': '-80.25', 'Region': 'Florida', 'Country': 'US'},
+    {'Dataset': 'US0021a-Orlando', 'Comments': '2009 PHI', 'Code': '0021a', 'Latitude': '28.5', 'Source': 'Source: Meteonorm', 'Location': 'Orlando', 'Longitude': '-81.42', 'Region': 'Florida', 'Country': 'US'},
+    {'Dataset': 'US0022a-Tampa', 'Comments': '2009 PHI', 'Code': '0022a', 'Latitude': '28.01', 'Source': 'Source: Meteonorm', 'Location': 'Tampa', 'Longitude': '-82.63', 'Region': 'Florida', 'Country': 'US'},
+    {'Dataset': 'US0023a-Atlanta', 'Comments': '2009 PHI', 'Code': '0023a', 'Latitude': '33.83', 'Source': 'Source: Meteonorm', 'Location': 'Atlanta', 'Longitude': '-84.4', 'Region': 'Georgia', 'Country': 'US'},
+    {'Dataset': 'US0024a-Augusta', 'Comments': '2009 PHI', 'Code': '0024a', 'Latitude': '33.367', 'Source': 'Source: Meteonorm', 'Location': 'Augusta', 'Longitude': '-81.967', 'Region': 'Georgia', 'Country': 'US'},
+    {'Dataset': 'US0025a-Honolulu', 'Comments': '2009 PHI', 'Code': '0025a', 'Latitude': '21.32', 'Source': 'Source: Meteonorm', 'Location': 'Honolulu', 'Longitude': '-157.83', 'Region': 'Hawaii', 'Country': 'US'},
+    {'Dataset': 'US0026a-Des Moines', 'Comments': '2009 PHI', 'Code': '0026a', 'Latitude': '41.58', 'Source': 'Source: Meteonorm', 'Location': 'Des Moines', 'Longitude': '-93.62', 'Region': 'Iowa', 'Country': 'US'},
+    {'Dataset': 'US0027a-Boise City', 'Comments': '2009 PHI', 'Code': '0027a', 'Latitude': '36.73', 'Source': 'Source: Meteonorm', 'Location': 'Boise City', 'Longitude': '-102.52', 'Region': 'Idaho', 'Country': 'US'},
+    {'Dataset': 'US0028a-Chicago', 'Comments': '2009 PHI', 'Code': '0028a', 'Latitude': '41.83', 'Source': 'Source: Meteonorm', 'Location': 'Chicago', 'Longitude': '-87.75', 'Region': 'Illinois', 'Country': 'US'},
+    {'Dataset': 'US0029a-Fort Wayne', 'Comments': '2009 PHI', 'Code': '0029a', 'Latitude': '41.08', 'Source': 'Source: Meteonorm', 'Location': 'Fort Wayne', 'Longitude': '-85.13', 'Region': 'Indiana', 'Country': 'US'},
+    {'Dataset': 'US0030a-Indianapolis', 'Comments': '2009 PHI', 'Code': '0030a', 'Latitude': '39.75', 'Source': 'Source: Meteonorm', 'Location': 'Indianapolis', 'Longitude': '-86.17', 'Region': 'Indiana', 'Country': 'US'},
+    {'Dataset': 'US0031a-Wichita', 'Comments': '2009 PHI', 'Code': '0031a', 'Latitude': '37.72', 'Source': 'Source: Meteonorm', 'Location': 'Wichita', 'Longitude': '-97.33', 'Region': 'Kansas', 'Country': 'US'},
+    {'Dataset': 'US0032a-Louisville', 'Comments': '2009 PHI', 'Code': '0032a', 'Latitude': '38.25', 'Source': 'Source: Meteonorm', 'Location': 'Louisville', 'Longitude': '-85.77', 'Region': 'Kentucky', 'Country': 'US'},
+    {'Dataset': 'US0033a-Baton Rouge', 'Comments': '2009 PHI', 'Code': '0033a', 'Latitude': '30.5', 'Source': 'Source: Meteonorm', 'Location': 'Baton Rouge', 'Longitude': '-91.17', 'Region': 'Louisiana', 'Country': 'US'},
+    {'Dataset': 'US0034a-New Orleans', 'Comments': '2009 PHI', 'Code': '0034a', 'Latitude': '30', 'Source': 'Source: Meteonorm', 'Location': 'New Orleans', 'Longitude': '-90.05', 'Region': 'Louisiana', 'Country': 'US'},
+    {'Dataset': 'US0035a-Boston', 'Comments': '2009 PHI', 'Code': '0035a', 'Latitude': '42.33', 'Source': 'Source: Meteonorm', 'Location': 'Boston', 'Longitude': '-71.07', 'Region': 'Massachusetts', 'Country': 'US'},
+    {'Dataset': 'US0036a-Baltimore', 'Comments': '2009 PHI', 'Code': '0036a', 'Latitude': '39.3', 'Source': 'Source: Meteonorm', 'Location': 'Baltimore', 'Longitude': '-76.62', 'Region': 'Maryland', 'Country': 'US'},
+    {'Dataset': 'US0037a-Detroit', 'Comments': '2009 PHI', 'Code': '0037a', 'Latitude': '42.33', 'Source': 'Source: Meteonorm', 'Location': 'Detroit', 'Longitude': '-83.08', 'Region': 'Michigan', 'Country': 'US'},
+    {'Dataset': 'US0038a-Grand Rapids', 'Comments': '2009 PHI', 'Code': '0038a', 'Latitude': '42.97', 'Source': 'Source: Meteonorm', 'Location': 'Grand Rapids', 'Longitude': '-85.67', 'Region': 'Michigan', 'Country': 'US'},
+    {'Dataset': 'US0039a-Duluth', 'Comments': '2009 PHI', 'Code': '0039a', 'Latitude': '46.83', 'Source': 'Source: Meteonorm', 'Location': 'Duluth', 'Longitude': '-92.18', 'Region': 'Minnesota', 'Country': 'US'},
+    {'Dataset': 'US0040a-Minneapolis', 'Comments': '2009 PHI', 'Code': '0040a', 'Latitude': '44.97', 'Source': 'Source: Meteonorm', 'Location': 'Minneapolis', 'Longitude': '-93.33', 'Region': 'Minnesota', 'Country': 'US'},
+    {'Dataset': 'US0042a-Kansas City', 'Comments': '2009 PHI', 'Code': '0042a', 'Latitude': '39.05', 'Source': 'Source: Meteonorm', 'Location': 'Kansas City', 'Longitude': '-94.5', 'Region': 'Missouri', 'Country': 'US'},
+    {'Dataset': 'US0043a-St. Louis', 'Comments': '2009 PHI', 'Code': '0043a', 'Latitude': '38.62', 'Source': 'Source: Meteonorm', 'Location': 'St. Louis', 'Longitude': '-90.2', 'Region': 'Missouri', 'Country': 'US'},
+    {'Dataset': 'US0044a-Jackson', 'Comments': '2009 PHI', 'Code': '0044a', 'Latitude': '32.33', 'Source': 'Source: Meteonorm', 'Location': 'Jackson', 'Longitude': '-90.18', 'Region': 'Mississippi', 'Country': 'US'},
+    {'Dataset': 'US0045a-Charlotte', 'Comments': '2009 PHI', 'Code': '0045a', 'Latitude': '35.22', 'Source': 'Source: Meteonorm', 'Location': 'Charlotte', 'Longitude': '-80.85', 'Region': 'North Carolina', 'Country': 'US'},
+    {'Dataset': 'US0046a-Raleigh', 'Comments': '2009 PHI', 'Code': '0046a', 'Latitude': '35.77', 'Source': 'Source: Meteonorm', 'Location': 'Raleigh', 'Longitude': '-78.63', 'Region': 'North Carolina', 'Country': 'US'},
+    {'Dataset': 'US0047a-Winston-Salem', 'Comments': '2009 PHI', 'Code': '0047a', 'Latitude': '36.08', 'Source': 'Source: Meteonorm', 'Location': 'Winston-Salem', 'Longitude': '-80.3', 'Region': 'North Carolina', 'Country': 'US'},
+    {'Dataset': 'US0048a-Omaha', 'Comments': '2009 PHI', 'Code': '0048a', 'Latitude': '41.25', 'Source': 'Source: Meteonorm', 'Location': 'Omaha', 'Longitude': '-96', 'Region': 'Nebraska', 'Country': 'US'},
+    {'Dataset': 'US0050a-Albuquerque', 'Comments': '2009 PHI', 'Code': '0050a', 'Latitude': '35.08', 'Source': 'Source: Meteonorm', 'Location': 'Albuquerque', 'Longitude': '-106.63', 'Region': 'New Mexico', 'Country': 'US'},
+    {'Dataset': 'US0051a-Rosewell', 'Comments': '2009 PHI', 'Code': '0051a', 'Latitude': '33.3', 'Source': 'Source: Meteonorm', 'Location': 'Rosewell', 'Longitude': '-104.53', 'Region': 'New Mexico', 'Country': 'US'},
+    {'Dataset': 'US0052a-Las Vegas', 'Comments': '2009 PHI', 'Code': '0052a', 'Latitude': '36.17', 'Source': 'Source: Meteonorm', 'Location': 'Las Vegas', 'Longitude': '-115.17', 'Region': 'Neavda', 'Country': 'US'},
+    {'Dataset': 'US0053a-Reno', 'Comments': '2009 PHI', 'Code': '0053a', 'Latitude': '39.53', 'Source': 'Source: Meteonorm', 'Location': 'Reno', 'Longitude': '-119.82', 'Region': 'Neavda', 'Country': 'US'},
+    {'Dataset': 'US0054a-Buffalo', 'Comments': '2009 PHI', 'Code': '0054a', 'Latitude': '42.88', 'Source': 'Source: Meteonorm', 'Location': 'Buffalo', 'Longitude': '-78.88', 'Region': 'New York', 'Country': 'US'},
+    {'Dataset': 'US0055b-New York', 'Comments': '2016 PHI', 'Code': '0055b', 'Latitude': '40.78', 'Source': 'Temp = 1981-2010; Other derivede from Meteonrom and TMY3', 'Location': 'New York', 'Longitude': '-73.97', 'Region': 'New York', 'Country': 'US'},
+    {'Dataset': 'US0056b-Rochester', 'Comments': '2015 PHI', 'Code': '0056b', 'Latitude': '43.12', 'Source': 'Temp = Normals Data 1981-2010. Radiation & Load data based on TMY3 (Class I). ', 'Location': 'Rochester', 'Longitude': '-77.68', 'Region': 'New York', 'Country': 'US'},
+    {'Dataset': 'US0057a-Cincinnati', 'Comments': '2009 PHI', 'Code': '0057a', 'Latitude': '39.17', 'Source': 'Source: Meteonorm', 'Location': 'Cincinnati', 'Longitude': '-84.43', 'Region': 'Ohio', 'Country': 'US'},
+    {'Dataset': 'US0058a-Cleveland', 'Comments': '2009 PHI', 'Code': '0058a', 'Latitude': '41.47', 'Source': 'Source: Meteonorm', 'Location': 'Cleveland', 'Longitude': '-81.72', 'Region': 'Ohio', 'Country': 'US'},
+    {'Dataset': 'US0059a-Columbus', 'Comments': '2009 PHI', 'Code': '0059a', 'Latitude': '39.98', 'Source': 'Source: Meteonorm', 'Location': 'Columbus', 'Longitude': '-83.05', 'Region': 'Ohio', 'Country': 'US'},
+    {'Dataset': 'US0060a-Toledo', 'Comments': '2009 PHI', 'Code': '0060a', 'Latitude': '41.67', 'Source': 'Source: Meteonorm', 'Location': 'Toledo', 'Longitude': '-83.58', 'Region': 'Ohio', 'Country': 'US'},
+    {'Dataset': 'US0061a-Oklahoma City', 'Comments': '2009 PHI', 'Code': '0061a', 'Latitude': '35.47', 'Source': 'Source: Meteonorm', 'Location': 'Oklahoma City', 'Longitude': '-97.55', 'Region': 'Oklahoma', 'Country': 'US'},
+    {'Dataset': 'US0062a-Tulsa', 'Comments': '2009 PHI', 'Code': '0062a', 'Latitude': '36.12', 'Source': 'Source: Meteonorm', 'Location': 'Tulsa', 'Longitude': '-95.97', 'Region': 'Oklahoma', 'Country': 'US'},
+    {'Dataset': 'US0063a-Portland', 'Comments': '2009 PHI', 'Code': '0063a', 'Latitude': '45.53', 'Source': 'Source: Meteonorm', 'Location': 'Portland', 'Longitude': '-122.67', 'Region': 'Oregon', 'Country': 'US'},
+    {'Dataset': 'US0064a-Philadelphia', 'Comments': '2009 PHI', 'Code': '0064a', 'Latitude': '40', 'Source': 'Source: Meteonorm', 'Location': 'Philadelphia', 'Longitude': '-75.17', 'Region': 'Pennsylvania', 'Country': 'US'},
+    {'Dataset': 'US0065b-Pittsburgh', 'Comments': '2015 PHI', 'Code': '0065b', 'Latitude': '40.5', 'Source': 'Temp = 1981-2010; Other = Meteonorm / TMY3', 'Location': 'Pittsburgh', 'Longitude': '-80.08', 'Region': 'Pennsylvania', 'Country': 'US'},
+    {'Dataset': 'US0066a-Providence', 'Comments': '2009 PHI', 'Code': '0066a', 'Latitude': '41.73', 'Source': 'Source: Meteonorm', 'Location': 'Providence', 'Longitude': '-71.25', 'Region': 'Rhode Island', 'Country': 'US'},
+    {'Dataset': 'US0067a-Charleston', 'Comments': '2009 PHI', 'Code': '0067a', 'Latitude': '32.9', 'Source': 'Source: Meteonorm', 'Location': 'Charleston', 'Longitude': '-80.033', 'Region': 'South Carolina', 'Country': 'US'},
+    {'Dataset': 'US0068a-Sioux Falls', 'Comments': '2009 PHI', 'Code': '0068a', 'Latitude': '43.567', 'Source': 'Source: Meteonorm', 'Location': 'Sioux Falls', 'Longitude': '-96.733', 'Region': 'South Dakota', 'Country': 'US'},
+    {'Dataset': 'US0069a-Memphis', 'Comments': '2009 PHI', 'Code': '0069a', 'Latitude': '35.12', 'Source': 'Source: Meteonorm', 'Location': 'Memphis', 'Longitude': '-90', 'Region': 'Tennessee', 'Country': 'US'},
+    {'Dataset': 'US0070a-Nashville', 'Comments': '2009 PHI', 'Code': '0070a', 'Latitude': '36.2', 'Source': 'Source: Meteonorm', 'Location': 'Nashville', 'Longitude': '-86.77', 'Region': 'Tennessee', 'Country': 'US'},
+    {'Dataset': 'US0071a-Amarillo', 'Comments': '2009 PHI', 'Code': '0071a', 'Latitude': '35.23', 'Source': 'Source: Meteonorm', 'Location': 'Amarillo', 'Longitude': '-101.83', 'Region': 'Texas', 'Country': 'US'},
+    {'Dataset': 'US0072a-Austin', 'Comments': '2009 PHI', 'Code': '0072a', 'Latitude': '30.33', 'Source': 'Source: Meteonorm', 'Location': 'Austin', 'Longitude': '-97.75', 'Region': 'Texas', 'Country': 'US'},
+    {'Dataset': 'US0073a-Corpus Christi', 'Comments': '2009 PHI', 'Code': '0073a', 'Latitude': '28', 'Source': 'Source: Meteonorm', 'Location': 'Corpus Christi', 'Longitude': '-97.9', 'Region': 'Texas', 'Country': 'US'},
+    {'Dataset': 'US0074a-Dallas', 'Comments': '2009 PHI', 'Code': '0074a', 'Latitude': '32.83', 'Source': 'Source: Meteonorm', 'Location': 'Dallas', 'Longitude': '-96.83', 'Region': 'Texas', 'Country': 'US'},
+    {'Dataset': 'US0076a-Houston', 'Comments': '2009 PHI', 'Code': '0076a', 'Latitude': '29.83', 'Source': 'Source: Meteonorm', 'Location': 'Houston', 'Longitude': '-95.33', 'Region': 'Texas', 'Country': 'US'},
+    {'Dataset': 'US0077a-San Antonio', 'Comments': '2009 PHI', 'Code': '0077a', 'Latitude': '29.5', 'Source': 'Source: Meteonorm', 'Location': 'San Antonio', 'Longitude': '-98.5', 'Region': 'Texas', 'Country': 'US'},
+    {'Dataset': 'US0078a-Provo', 'Comments': '2009 PHI', 'Code': '0078a', 'Latitude': '40.22', 'Source': 'Source: Meteonorm', 'Location': 'Provo', 'Longitude': '-111.72', 'Region': 'Utah', 'Country': 'US'},
+    {'Dataset': 'US0079a-Salt Lake City', 'Comments': '2009 PHI', 'Code': '0079a', 'Latitude': '40.75', 'Source': 'Source: Meteonorm', 'Location': 'Salt Lake City', 'Longitude': '-111.92', 'Region': 'Utah', 'Country': 'US'},
+    {'Dataset': 'US0080a-Norfolk', 'Comments': '2009 PHI', 'Code': '0080a', 'Latitude': '36.85', 'Source': 'Source: Meteonorm', 'Location': 'Norfolk', 'Longitude': '-76.28', 'Region': 'Virginia', 'Country': 'US'},
+    {'Dataset': 'US0081a-Virginia Beach', 'Comments': '2009 PHI', 'Code': '0081a', 'Latitude': '36.85', 'Source': 'Source: Meteonorm', 'Location': 'Virginia Beach', 'Longitude': '-75.98', 'Region': 'Virginia', 'Country': 'US'},
+    {'Dataset': 'US0082a-Seattle', 'Comments': '2009 PHI', 'Code': '0082a', 'Latitude': '47.58', 'Source': 'Source: Meteonorm', 'Location': 'Seattle', 'Longitude': '-122.33', 'Region': 'Washington', 'Country': 'US'},
+    {'Dataset': 'US0083a-Spokane', 'Comments': '2009 PHI', 'Code': '0083a', 'Latitude': '47.67', 'Source': 'Source: Meteonorm', 'Location': 'Spokane', 'Longitude': '-117.42', 'Region': 'Washington', 'Country': 'US'},
+    {'Dataset': 'US0084a-Madison', 'Comments': '2009 PHI', 'Code': '0084a', 'Latitude': '43.08', 'Source': 'Source: Meteonorm', 'Location': 'Madison', 'Longitude': '-89.42', 'Region': 'Wisconsin', 'Country': 'US'},
+    {'Dataset': 'US0085a-Milwaukee', 'Comments': '2009 PHI', 'Code': '0085a', 'Latitude': '43.05', 'Source': 'Source: Meteonorm', 'Location': 'Milwaukee', 'Longitude': '-87.93', 'Region': 'Wisconsin', 'Country': 'US'},
+    {'Dataset': 'US0086a-Burlington ', 'Comments': '2014 PHI', 'Code': '0086a', 'Latitude': '44.47', 'Source': 'Source: TMY3. ', 'Location': 'Burlington ', 'Longitude': '-73.15', 'Region': 'Vermont', 'Country': 'US'},
+    {'Dataset': 'US0087a-Beaver Island', 'Comments': '2013 PHI. Compared with satellite and TMY data of the region. Longterm locally measured data not available. Load data: EOSWEB (on the safe side)', 'Code': '0087a', 'Latitude': '45.67', 'Source': 'Source: Meteonorm V7 Interpolation (User Defined Site). Use carefully. PHI December 2013.', 'Location': 'Beaver Island', 'Longitude': '-85.53', 'Region': 'Michigan', 'Country': 'US'},
+    {'Dataset': 'US0088a-Traverse City', 'Comments': '2014 PHI', 'Code': '0088a', 'Latitude': '44.73', 'Source': 'Source: TMY3 (Category I)', 'Location': 'Traverse City', 'Longitude': '-85.58', 'Region': 'Michigan', 'Country': 'US'},
+    {'Dataset': 'US0089a-Marthas Vineyard', 'Comments': '2015 PHI', 'Code': '0089a', 'Latitude': '41.4', 'Source': 'Source: MeteonormV7. Load data derived from TMY3. ', 'Location': 'Marthas Vineyard', 'Longitude': '-70.61', 'Region': 'Massachusetts', 'Country': 'US'},
+    {'Dataset': 'US0090a-South Fallsburg', 'Comments': '2012 PHI', 'Code': '0090a', 'Latitude': '41.7', 'Source': 'Source: EOSWEB (Dew Point = TMY3)', 'Location': 'South Fallsburg', 'Longitude': '-74.6', 'Region': 'New York', 'Country': 'US'},
+    {'Dataset': 'US0091a-Medford', 'Comments': '2015 PHI', 'Code': '0091a', 'Latitude': '42.38', 'Source': 'Temp: 1981-2010 US Normals Data. Other: Meteonorm. Load data derived by PHI. ', 'Location': 'Medford', 'Longitude': '-122.87', 'Region': 'Oregon', 'Country': 'US'},
+    {'Dataset': 'US0092a-Aspen', 'Comments': '2015 PHI.', 'Code': '0092a', 'Latitude': '39.21', 'Source': 'Source: Meteonorm7. Load data derived by PHI. ', 'Location': 'Aspen', 'Longitude': '-106.86', 'Region': 'Colorado', 'Country': 'US'},
+    {'Dataset': 'US0094a-Gunnison', 'Comments': '2015 PHI', 'Code': '0094a', 'Latitude': '38.53', 'Source': 'Temp: 1981-2010 US Normals Data. Other: Meteonorm. Load data derived by PHI. ', 'Location': 'Gunnison', 'Longitude': '-106.97', 'Region': 'Colorado', 'Country': 'US'},
+    {'Dataset': 'US0095a-Allentown', 'Comments': '2015 PHI', 'Code': '0095a', 'Latitude': '40.65', 'Source': 'Temp = 1981-2010; Load data derived by PHI with reference to TMY3 data. ', 'Location': 'Allentown', 'Longitude': '-75.45', 'Region': 'Pennsylvania', 'Country': 'US'},
+    {'Dataset': 'US0096a-Lewistown', 'Comments': '2015 PHI', 'Code': '0096a', 'Latitude': '40.59', 'Source': 'Temp = 1981-2010; Other = Meteonorm & Satellite data. ', 'Location': 'Lewistown', 'Longitude': '-77.57', 'Region': 'Pennsylvania', 'Country': 'US'},
+    {'Dataset': 'US0097a-Elmira', 'Comments': '2015 PHI', 'Code': '0097a', 'Latitude': '42.1', 'Source': 'Temp = 1981-2010; Load data derived by PHI. ', 'Location': 'Elmira', 'Longitude': '-76.84', 'Region': 'New York', 'Country': 'US'},
+    {'Dataset': 'US0099a-Olympia', 'Comments': '2016 PHI', 'Code': '0099a', 'Latitude': '46.97', 'Source': 'Temp = 1981-2010. Other derived from Meteonorm & TRY3 data. ', 'Location': 'Olympia', 'Longitude': '-122.9', 'Region': 'Washington', 'Country': 'US'},
+    {'Dataset': 'US0100a-Portland', 'Comments': '2013 PHI', 'Code': '0100a', 'Latitude': '43.65', 'Source': 'Derived from TMY3 and satellite data.', 'Location': 'Portland', 'Longitude': '-70.3', 'Region': 'Maine', 'Country': 'US'}
+    ]
+
+def findNearestPHPPclimateZone(_lat, _long, _climateData=None):
+    """ Finds the nearest PHPP Climate zone to the EPW Lat /Long 
+    
+    Methodology copied from the PHPP v 9.6a (SI) Climate worksheet
+    """
+    def sortByDist(e):
+        return e['distToEPW']
+    
+    if _climateData is None:
+        _climateData = getClimateData()
+    
+    for each in _climateData:
+        eachLat = float(each.get('Latitude', 0))
+        eachLong = float(each.get('Longitude', 0))
+        
+        a = math.sin(math.pi/180*eachLat)*math.sin(math.pi/180*_lat)+math.cos(math.pi/180*eachLat)*math.cos(math.pi/180*_lat)*math.cos(math.pi/180*(eachLong-_long))
+        b = max([-1, a])
+        c = min([1, b])
+        d = math.acos(c)
+        kmFromEPWLocation = 6378 * d
+        
+        each['distToEPW'] = kmFromEPWLocation
+    
+    _climateData.sort(key=sortByDist)
+    climateSetToUse = _climateData[0]
+    
+    dataSet = climateSetToUse.get('Dataset', 'US0055b-New York')
+    alt = '=J23'
+    country = climateSetToUse.get('Country', 'US-United States of America')
+    region = climateSetToUse.get('Region', 'New York')
+    
+    climateSetToUse = PHPP_ClimateDataSet(dataSet, alt, country, region)
+    
+    return [climateSetToUse]
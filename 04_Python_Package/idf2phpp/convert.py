@@ -0,0 +1,833 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Converts an IDF Model into the Excel-ready PHPP_XL_Obj cell writes, without Rhino or 
+Grasshopper. 
+
+The 'IDF-->PHPP Objs' and 'Create Excel Obj - Geom' Grasshopper components use the 
+same functions, and add the Honeybee Zone data (Rooms, Ventilation, DHW, Ground) on top.
+
+    >>> from idf2phpp.convert import convertIDF
+    >>> for xlObj in convertIDF('in.idf'):
+    ...     print(xlObj.Worksheet, xlObj.Range, xlObj.Value)
+"""
+
+from __future__ import absolute_import
+import csv
+import json
+import logging
+import warnings
+
+from ._compat import IDF2PHPPWarning
+from .idf import IDF_Class, readIDF
+from .geometry import PHPP_Vector, phpp_polygonPropsBatch, phpp_mergeTriangles
+from .phpp import PHPP_XL_Obj
+from .climate import findNearestPHPPclimateZone
+from .idfobjs import (IDF_Zone, IDF_ZoneList, IDF_ZoneInfilFlowRate, IDF_Obj_building, 
+                        IDF_Obj_MaterialLayer, IDF_Obj_MaterialWindowSimple, 
+                        IDF_Obj_MaterialWindowGlazing, IDF_Obj_MaterialWindowGas, 
+                        IDF_Obj_Construction, IDF_Obj_surfaceWindow, IDF_Obj_surfaceOpaque)
+
+log = logging.getLogger(__name__)
+
+#-------------------------------------------------------------------------------
+# IDF Objects --> PHPP Objects
+def parseIDFObjects(_idfModel, _surfaceClass=IDF_Obj_surfaceOpaque):
+    # Looks at the IDF Objects and parses them  out
+    # Builds class objects as appropriate
+    # Only the IDF Classes needed are looked up (and built) from the IDF Model's index
+    # _surfaceClass lets Grasshopper use its own IDF_Obj_surfaceOpaque (with Rhino geometry)
+    zones = []
+    zoneInfiltrationRates = []
+    zonesList = []
+    opaqueMaterials = []
+    windowMaterialsSimple = {}
+    windowMaterialGas = {}
+    windowMaterialGlazing = {}
+    allConstructions = []
+    opaqueSurfaces = []
+    location = []
+    bldgNorthVec = PHPP_Vector(0.0, 1.0, 0.0)
+    
+    # First, need to find the North Direction. Have to do that before the rest
+    for each in _idfModel.getObjs('Building'):
+        # Create the Building Object and get the Project's North Angle Vector
+        bldg = IDF_Obj_building(each)
+        bldgNorthVec = bldg.NorthVector
+    
+    # Now go through and pull out each class object
+    # If its an opaque Building Surface object
+    # Area, Centroid and Normal are calc'd for all the surfaces in one batch (no Rhino geometry)
+    bldgSurfaces = _idfModel.getObjsLike('BuildingSurface:Detailed')
+    bldgSurfaceGeomProps = phpp_polygonPropsBatch( [x.getVertices() for x in bldgSurfaces] )
+    for eachIDFobj, eachGeomProps in zip(bldgSurfaces, bldgSurfaceGeomProps):
+        opaqueSurfaces.append(  _surfaceClass(eachIDFobj, bldgNorthVec, eachGeomProps)  )
+    
+    # If its a 'Material', 'Material:AirGap' or 'Material:NoMass' object
+    for eachIDFobj in _idfModel.getObjs('Material', 'Material:AirGap', 'Material:NoMass'):
+        if eachIDFobj.objName == 'Material:NoMass':
+            opaqueMaterials.append( IDF_Obj_MaterialLayer(eachIDFobj, noMass=True) )
+        else:
+            opaqueMaterials.append( IDF_Obj_MaterialLayer(eachIDFobj) )
+    
+    # If its a simple EP Style Window Material
+    for eachIDFobj in _idfModel.getObjsLike('WindowMaterial:SimpleGlazingSystem'):
+        windowMaterialsSimple[eachIDFobj.Name] = IDF_Obj_MaterialWindowSimple(eachIDFobj)
+    
+    for eachIDFobj in _idfModel.getObjsLike('WindowMaterial:Gas'):
+        windowMaterialGas[eachIDFobj.Name]  = IDF_Obj_MaterialWindowGas( eachIDFobj )
+    
+    for eachIDFobj in _idfModel.getObjsLike('WindowMaterial:Glazing'):
+        windowMaterialGlazing[eachIDFobj.Name]  = IDF_Obj_MaterialWindowGlazing( eachIDFobj )
+    
+    for eachIDFobj in _idfModel.getObjsLike('Construction'):
+        allConstructions.append( IDF_Obj_Construction( eachIDFobj )  )
+    
+    for eachIDFobj in _idfModel.getObjs('Zone'):
+        zones.append( IDF_Zone( eachIDFobj ) )
+    
+    for eachIDFobj in _idfModel.getObjs('ZoneList'):
+        zonesList.append( IDF_ZoneList( eachIDFobj ) )
+    
+    for eachIDFobj in _idfModel.getObjsLike('ZoneInfiltration:DesignFlowRate'):
+        zoneInfiltrationRates.append( IDF_ZoneInfilFlowRate( eachIDFobj  ) )
+    
+    for eachIDFobj in _idfModel.getObjsLike('Site:Location'):
+        location = eachIDFobj
+    
+    return opaqueSurfaces, opaqueMaterials, windowMaterialsSimple, windowMaterialGas, windowMaterialGlazing, allConstructions, zones, zoneInfiltrationRates, zonesList, location
+
+def materialWindowSimpleFromLayers(_const, _windowMaterialGlazing, _windowMaterialGas):
+    # If its a Window 'construction' of multiple layers, calc an approximate effective Uw
+    # https://bigladdersoftware.com/epx/docs/8-5/engineering-reference/window-heat-balance-calculation.html#equivalent-layer-thermal-model
+    # NOTE: Not doing this correctly right now. Neglecting radiation of convective effects. Only a super simplified approximiation for now....
+    
+    class temp:
+        # temp holder for params to pass
+        def __init__(self):
+            pass
+    
+    # Ok... so its a window with multiple layers. So need to calc equiv conductivity
+    newWinUg = [0.04, 0.13] # Start with the Surface Film Resistances...
+    for eachLayer in _const.Layers:
+        if eachLayer[1] in _windowMaterialGlazing:
+            newWinUg.append( 1 / _windowMaterialGlazing[ eachLayer[1] ].uValue ) # Resistance of Glass Layers
+        elif eachLayer[1] in _windowMaterialGas:
+            newWinUg.append( 1 / _windowMaterialGas[ eachLayer[1] ].uValue * 0.5 ) # Resistance of Gas Layers
+    newWinUg = 1/sum(newWinUg)
+    
+    # Create a New WindowMaterial:SimpleGlazingSystem Object to approximate this built-up construction
+    tempObj = temp()
+    setattr(tempObj, 'U-Factor {W/m2-K}', newWinUg)
+    setattr(tempObj, 'Solar Heat Gain Coefficient', 0.4)
+    setattr(tempObj, 'Visible Transmittance', 0.75)
+    setattr(tempObj, 'Name', _const.Name)
+    
+    return IDF_Obj_MaterialWindowSimple( tempObj )
+
+def filterConstructions(_allConst, _materialsWindowSimple, _windowMaterialGas, _windowMaterialGlazing):
+    # Takes in all the construction and splits them into 
+    # Window and Opaque constructions
+    
+    opaqueConstructions = []
+    windowConstructionsSimple = {}
+    
+    for construction in _allConst:
+        isWindow = False
+        
+        # Is it a Window Construction?
+        # If the Construction includes any materials found in the WindowMaterialsSimple, WindowGas or WindowGlazing, then yes
+        for eachMat in _materialsWindowSimple.keys():
+            if _materialsWindowSimple[eachMat].Name in construction.LayerNames:
+                 isWindow = True
+        for eachMat in _windowMaterialGas:
+            if eachMat in construction.LayerNames:
+                 isWindow = True
+        for eachMat in _windowMaterialGlazing:
+            if eachMat in construction.LayerNames:
+                 isWindow = True
+        
+        # Now branch off the construction as appropriate
+        if isWindow==True:
+            # Its a window, so add to the Window Construction list
+            
+            if len(construction.Layers) > 1:
+                # Its a built up window. So turn that into a Simple Window
+                # Modify window construction using approximation and create a 'Simple' Window
+                materialWindowSimple = materialWindowSimpleFromLayers( construction, _windowMaterialGlazing, _windowMaterialGas )  # Create a new MaterialWindowSimple
+                _materialsWindowSimple[construction.Name] = materialWindowSimple       # Add the new MaterialWindowSimple to the list
+                construction.Layers = [ ['Layer1', materialWindowSimple.Name]  ]       # Change the Construction Layers to ONLY include the MaterialWindowSimple now  
+                windowConstructionsSimple[construction.Name] = construction            # Add the modified window construction to the list
+            else:
+                windowConstructionsSimple[construction.Name] =  construction
+        else:
+            # its not a window, so add to the Opaque Construction List
+            opaqueConstructions.append( construction )
+    
+    return opaqueConstructions, windowConstructionsSimple, _materialsWindowSimple
+
+def getIDFWindowObjects(_idfModel, _windowConstructionsSimple, _windowMaterialsSimple, _windowClass=IDF_Obj_surfaceWindow):
+    # Finds all  the widnow surfaces and builds window objects
+    # _windowClass lets Grasshopper use its own IDF_Obj_surfaceWindow (with Rhino geometry)
+    windowSurfaces = []
+    windowObjs_filtered = []
+    windowObjs_triangulated = {}
+    
+    # All the EP Window Objects
+    windowObjs_raw = _idfModel.getObjsLike('FenestrationSurface:Detailed')
+    
+    ##################################################
+    # Fix for window triangulation
+    for windowObj in windowObjs_raw:
+        # Honeybee adds the code '..._glzP_0, ..._glzP_1, etc..' suffix to the name for its triangulated windows
+        if '_glzP_' in windowObj.Name:
+            # See if it has only 3 vertices as well just to double check
+            numOfVerts = len(windowObj.getVertices()) // 3
+            if numOfVerts == 3:
+                # Ok, so its a triangulated window.
+                # File the triangulated window in the dictionary using its name as key
+                
+                tempWindowName = windowObj.Name.split('_glzP_')[0]
+                if tempWindowName not in windowObjs_triangulated.keys():
+                    windowObjs_triangulated[ tempWindowName ] = [windowObj]
+                else:
+                    windowObjs_triangulated[ tempWindowName ].append(windowObj)
+            else:
+                windowObjs_filtered.append(windowObj)
+        else:
+            windowObjs_filtered.append(windowObj)
+
+    # Unite the triangulated objects
+    for key in windowObjs_triangulated.keys():
+        # Find the outside perimeter of all the triangle segments
+        newVerts = phpp_mergeTriangles( [windowObj.getVertices() for windowObj in windowObjs_triangulated[key]] )
+        if not newVerts:
+            triWarning = "Couldn't join the triangulated window '{}' back together? Using the triangles as separate windows.".format(key)
+            warnings.warn(triWarning, IDF2PHPPWarning)
+            windowObjs_filtered.extend( windowObjs_triangulated[key] )
+            continue
+        
+        # Build a new Window Obj using this now unioned geometry
+        windowObj = windowObjs_triangulated[key][-1]
+        newFields = []
+        for fieldName, fieldValue in zip(windowObj.Schema.Keys, windowObj.Values):
+            if fieldName == 'Name':
+                newFields.append( (fieldName, windowObj.Name[:-7]) )
+            elif 'XYZ Vertex' not in fieldName:
+                newFields.append( (fieldName, fieldValue) )
+        
+        for i in range(0, len(newVerts), 3):
+            for coord in newVerts[i:i+3]:
+                newFields.append( ('XYZ Vertex {} {}'.format(i//3+1, '{m}'), str(coord)) )
+        
+        newWindowObj = IDF_Class.fromFields(windowObj.objName, newFields)
+        windowObjs_filtered.append(newWindowObj)
+    
+    ##################################################
+    
+    # Build the Window Objects
+    for eachWindowObj in windowObjs_filtered:
+            # Find the windows's CONSTRUCTION and MATERIAL information in the IDF
+            thisWindowEP_CONST_Name = getattr(eachWindowObj, 'Construction Name')                         # Get the name of the Windows' Construction  
+            thisWindowEP_MAT_Name = _windowConstructionsSimple[  thisWindowEP_CONST_Name  ].Layers[0][1]  # Find the Material name of 'Layer 1' in the Window's Construction
+            thisWindowEP_WinSimp_Obj = _windowMaterialsSimple[  thisWindowEP_MAT_Name  ]                  # Find the 'WindowMaterial:SimpleGlazingSystem' Object with the same name as 'Layer 1' 
+            winterShadingFactor = 0.75
+            summerShadingFactor = 0.75
+            
+            # Create the new IDF_Obj_surfaceWindow Object
+            windowSurfaces.append( _windowClass(eachWindowObj, thisWindowEP_WinSimp_Obj, winterShadingFactor, summerShadingFactor) )
+    
+    return windowSurfaces
+
+def filterSurfaces(_surfaces):
+    # Filter to only include the surface if its 'exposed' to the outdoors or Ground (not an interior floor / wall)
+    exposedSurfaces = []
+    
+    for srfc in _surfaces:
+        if srfc.exposure != 'Surface':
+        #if srfc.exposure == 'Outdoors' or srfc.exposure == 'Ground':
+            exposedSurfaces.append(srfc)
+        
+    return exposedSurfaces
+
+#-------------------------------------------------------------------------------
+# PHPP Objects --> Excel-ready cell writes
+def getUvalues(_inputBranch, _materials):
+    uID_Count = 1
+    uValueUID_Names = []
+    uValuesConstructorStartRow = 10
+    uValuesList = []
+    log.info('Creating the U-Values Objects...')
+    for eachConst in _inputBranch:
+        # for each Construction Assembly in the model....
+        
+        # Get the Construction's Name and the Materal Layers in the EP Model
+        construcionNameEP = getattr(eachConst, 'Name')
+        layers = sorted(getattr(eachConst, 'Layers'))
+        intInsuFlag = eachConst.IntInsul if eachConst.IntInsul != None else ''
+        
+        # Filter out any of the Window Constructions
+        isWindow = False
+        opaqueMaterialNames = []
+        for eachMat in _materials:
+            opaqueMaterialNames.append(eachMat.Name) # Get all the Opaque Construction Material Names
+        
+        # Check if the material matches any of the Opaque ones
+        for eachLayer in layers:
+            if eachLayer[1] in opaqueMaterialNames:
+                eachLayer[1]
+                break
+            else:
+                # If not... it must be a window (maybe?)
+                isWindow = True
+        
+        if isWindow == True:
+            pass
+        else:
+            # Fix the name to remove 'PHPP_CONST_'
+            if 'PHPP_CONST_' in construcionNameEP:
+                constName_clean = construcionNameEP.split('PHPP_CONST_')[1].replace('_', ' ')
+            else:
+                constName_clean = construcionNameEP.replace('_', ' ')
+            
+            # Create the list of User-ID Constructions to match PHPP
+            uValueUID_Names.append('{:02d}ud-{}'.format(uID_Count, constName_clean) )
+            
+            # Create the Objects for the Header Piece (Name, Rsi, Rse)
+            nameAddress = '{}{}'.format('M', uValuesConstructorStartRow + 1) # Construction Name
+            rSi = '{}{}'.format('M', uValuesConstructorStartRow + 3) # R-surface-int
+            rSe = '{}{}'.format('M', uValuesConstructorStartRow + 4) # R-surface-ext
+            intIns = '{}{}'.format('S', uValuesConstructorStartRow + 1) # Interior Insulation Flag
+            
+            uValuesList.append( PHPP_XL_Obj('U-Values', nameAddress, constName_clean))
+            uValuesList.append( PHPP_XL_Obj('U-Values', rSi, 0, 'M2K/W', 'HR-FT2-F/BTU'))
+            uValuesList.append( PHPP_XL_Obj('U-Values', rSe, 0, 'M2K/W', 'HR-FT2-F/BTU')) # For now, zero out
+            if eachConst.IntInsul != None:
+                uValuesList.append( PHPP_XL_Obj('U-Values', intIns, 'x'))
+            
+            # Create the actual Material Layers for PHPP U-Value
+            layerCount = 0
+            for layer in layers:
+                # For each layer in the Construction Assembly...
+                for eachMatLayer in  _materials:
+                    # See if the Construction's Layer material name matches one in the Materials list....
+                    # If so, use those parameters from the Material Layer
+                    if layer[1] == getattr(eachMatLayer, 'Name'):
+                        # Filter out any MASSLAYERs
+                        if layer[1] != 'MASSLAYER':
+                            
+                            # Clean the name
+                            if 'PHPP_MAT_' in layer[1]:
+                                layerMatName = layer[1].split('PHPP_MAT_')[1].replace('_', ' ')
+                            else:
+                                layerMatName = layer[1].replace('_', ' ')
+                            
+                            layerNum = layer[0]
+                            layerMatCond = getattr(eachMatLayer, 'LayerConductivity')
+                            layerThickness = getattr(eachMatLayer, 'LayerThickness')*1000 # Cus PHPP uses mm for thickness
+                            
+                            # Set up the Range tagets
+                            layer1Address_L = '{}{}'.format('L', uValuesConstructorStartRow + 7 + layerCount) # Material Name
+                            layer1Address_M = '{}{}'.format('M', uValuesConstructorStartRow + 7 + layerCount) # Conductivity
+                            layer1Address_S = '{}{}'.format('S', uValuesConstructorStartRow + 7 + layerCount) # Thickness
+                            
+                            # Create the Layer Objects
+                            uValuesList.append( PHPP_XL_Obj('U-Values', layer1Address_L, layerMatName))# Material Name
+                            uValuesList.append( PHPP_XL_Obj('U-Values', layer1Address_M, layerMatCond, 'W/MK', 'HR-FT2-F/BTU-IN')) # Conductivity
+                            uValuesList.append( PHPP_XL_Obj('U-Values', layer1Address_S, layerThickness, 'MM', 'IN')) # Thickness
+                            
+                            layerCount+=1
+            
+            uID_Count += 1
+            uValuesConstructorStartRow += 21
+    
+    return uValuesList, uValueUID_Names
+
+def getComponents(_inputBranch):
+    winComponentStartRow = 15
+    frame_Count = 0
+    glass_Count = 0
+    winComponentsList = []
+    glassNameDict = {}
+    frameNameDict = {}
+    
+    log.info('Creating the Components:Window Objects...')
+    
+    for eachWin in _inputBranch:
+        # For each PHPP Style Window Object in the model....
+        
+        ########## Glass ##########
+        # Pull out the Glass info from the window
+        gNm = getattr(eachWin.Type_Glass, 'Name')
+        gV = getattr(eachWin.Type_Glass, 'gValue')
+        uG = getattr(eachWin.Type_Glass, 'uValue')
+        
+        if gNm not in glassNameDict.keys():
+            # Add the new glass type to the dict of UD Names:
+            # ie: {'Ikon: SDH': '01ud-Ikon: SDH', ....}
+            glassNameDict[gNm] = '{:02d}ud-{}'.format(glass_Count+1, gNm)
+            
+            # Set the glass range addresses
+            Address_Gname = '{}{}'.format('IE', winComponentStartRow + glass_Count) # Name
+            Address_Gvalue = '{}{}'.format('IF', winComponentStartRow + glass_Count) # g-Value
+            Address_Uvalue = '{}{}'.format('IG', winComponentStartRow + glass_Count) # U-Value
+            
+            # Create the PHPP write Objects
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Gname, gNm))# Glass Type Name
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Gvalue, gV))# g-Value
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uvalue, uG, 'W/M2K', 'BTU/HR-FT2-F' ))# U-Value
+            
+            glass_Count +=1
+            
+        # Add the new PHPP UD Glass Name to the Window:Simple Object
+        setattr(eachWin, 'UD_glass_Name', glassNameDict[gNm] )
+        
+        ########## Frames ##########
+        # Get the Frame info
+        fNm = getattr(eachWin.Type_Frame, 'Name')
+        uF_L, uF_R, uF_B, uF_T  = eachWin.Type_Frame.uLeft, eachWin.Type_Frame.uRight, eachWin.Type_Frame.uBottom, eachWin.Type_Frame.uTop
+        wF_L, wF_R, wF_B, wF_T  = eachWin.Type_Frame.fLeft, eachWin.Type_Frame.fRight, eachWin.Type_Frame.fBottom, eachWin.Type_Frame.fTop
+        psiG_L, psiG_R, psiG_B, psiG_T  = eachWin.Type_Frame.psigLeft, eachWin.Type_Frame.psigRight, eachWin.Type_Frame.psigBottom, eachWin.Type_Frame.psigTop
+        psiI_L, psiI_R, psiI_B, psiI_T  = eachWin.Type_Frame.psiInstLeft, eachWin.Type_Frame.psiInstRight, eachWin.Type_Frame.psiInstBottom, eachWin.Type_Frame.psiInstTop
+        
+        if fNm not in frameNameDict.keys():
+            # Add the new frame type to the dict of UD Names:
+            # ie: {'Ikon: SDH': '01ud-Ikon: SDH', ....}
+            frameNameDict[fNm] = '{:02d}ud-{}'.format(frame_Count+1, fNm) # was glass_count????
+            
+            # Set the frame range address
+            Address_Fname = '{}{}'.format('IL', winComponentStartRow + frame_Count)
+            Address_Uf_Left = '{}{}'.format('IM', winComponentStartRow + frame_Count)
+            Address_Uf_Right = '{}{}'.format('IN', winComponentStartRow + frame_Count)
+            Address_Uf_Bottom = '{}{}'.format('IO', winComponentStartRow + frame_Count)
+            Address_Uf_Top = '{}{}'.format('IP', winComponentStartRow + frame_Count)
+            Address_W_Left = '{}{}'.format('IQ', winComponentStartRow + frame_Count)
+            Address_W_Right = '{}{}'.format('IR', winComponentStartRow + frame_Count)
+            Address_W_Bottom = '{}{}'.format('IS', winComponentStartRow + frame_Count)
+            Address_W_Top = '{}{}'.format('IT', winComponentStartRow + frame_Count)
+            Address_Psi_g_Left = '{}{}'.format('IU', winComponentStartRow + frame_Count)
+            Address_Psi_g_Right = '{}{}'.format('IV', winComponentStartRow + frame_Count)
+            Address_Psi_g_Bottom = '{}{}'.format('IW', winComponentStartRow + frame_Count)
+            Address_Psi_g_Top = '{}{}'.format('IX', winComponentStartRow + frame_Count)
+            Address_Psi_I_Left = '{}{}'.format('IY', winComponentStartRow + frame_Count)
+            Address_Psi_I_Right = '{}{}'.format('IZ', winComponentStartRow + frame_Count)
+            Address_Psi_I_Bottom = '{}{}'.format('JA', winComponentStartRow + frame_Count)
+            Address_Psi_I_Top = '{}{}'.format('JB', winComponentStartRow + frame_Count)
+            
+            # Create the PHPP Objects for the Frames
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Fname, fNm))# Frame Type Name
+            
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Left, uF_L, 'W/M2K', 'BTU/HR-FT2-F')) # Frame Type U-Values
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Right, uF_R, 'W/M2K', 'BTU/HR-FT2-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Bottom, uF_B, 'W/M2K', 'BTU/HR-FT2-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Top, uF_T, 'W/M2K', 'BTU/HR-FT2-F'))
+            
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Left, wF_L, 'M', 'IN')) # Frame Type Widths
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Right, wF_R, 'M', 'IN'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Bottom, wF_B, 'M', 'IN'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Top, wF_T, 'M', 'IN'))
+            
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Left, psiG_L, 'W/MK', 'BTU/HR-FT-F')) # Frame Type Psi-Glazing
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Right, psiG_R, 'W/MK', 'BTU/HR-FT-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Bottom, psiG_B, 'W/MK', 'BTU/HR-FT-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Top, psiG_T, 'W/MK', 'BTU/HR-FT-F'))
+            
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Left, psiI_L, 'W/MK', 'BTU/HR-FT-F')) # Frame Type Psi-Installs
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Right, psiI_R, 'W/MK', 'BTU/HR-FT-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Bottom, psiI_B, 'W/MK', 'BTU/HR-FT-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Top, psiI_T, 'W/MK', 'BTU/HR-FT-F'))
+            
+            frame_Count +=1
+            
+        # Add the PHPP UD Frame Name to the Window:Simple Object
+        setattr(eachWin, 'UD_frame_Name', frameNameDict[fNm] )
+    
+    return winComponentsList
+
+def getAreas(_inputBranch, _zones, _uValueUID_Names):
+    areasRowStart = 41
+    areaCount = 0
+    uID_Count = 1
+    areasList = []
+    surfacesIncluded = []
+    log.info("Creating the 'Areas' Objects...")
+    for surface in _inputBranch:
+        # for each Opaque Surface in the model....
+        
+        # First, see if the Surface should be included in the output
+        includeSurface = surface.HostZoneName in _zones
+        
+        if includeSurface:
+            # Get the Surface Parameters
+            nm = getattr(surface, 'Name')
+            groupNum = getattr(surface, 'GroupNum')
+            quantity = 1
+            surfaceArea = getattr(surface, 'SurfaceArea')
+            assemblyName = getattr(surface, 'AssemblyName').replace('_', ' ') 
+            angleFromNorth = getattr(surface, 'AngleFromNorth')
+            angleFromHoriz = getattr(surface, 'AngleFromHoriz')
+            shading = getattr(surface, 'Factor_Shading')
+            abs = getattr(surface, 'Factor_Absorptivity')
+            emmis = getattr(surface, 'Factor_Emissivity')
+            
+            # Find the right UID name (with the numeric prefix)
+            for uIDName in _uValueUID_Names:
+                if assemblyName in uIDName[5:] or uIDName[5:] in assemblyName: # compare to slice without prefix
+                    assemblyName = uIDName
+            
+            # Setup the Excel Address Locations
+            Address_Name = '{}{}'.format('L', areasRowStart + areaCount)
+            Address_GroupNum = '{}{}'.format('M', areasRowStart + areaCount)
+            Address_Quantity = '{}{}'.format('P', areasRowStart + areaCount)
+            Address_Area = '{}{}'.format('V', areasRowStart + areaCount)
+            Address_Assembly = '{}{}'.format('AC', areasRowStart + areaCount)
+            Address_AngleNorth = '{}{}'.format('AG', areasRowStart + areaCount)
+            Address_AngleHoriz = '{}{}'.format('AH', areasRowStart + areaCount)
+            Address_ShadingFac = '{}{}'.format('AJ', areasRowStart + areaCount)
+            Address_Abs = '{}{}'.format('AK', areasRowStart + areaCount)
+            Address_Emmis = '{}{}'.format('AL', areasRowStart + areaCount)
+            
+            areasList.append( PHPP_XL_Obj('Areas', Address_Name, nm))# Surface Name
+            areasList.append( PHPP_XL_Obj('Areas', Address_GroupNum, groupNum))# Surface Group Number
+            areasList.append( PHPP_XL_Obj('Areas', Address_Quantity, quantity))# Surface Quantity
+            areasList.append( PHPP_XL_Obj('Areas', Address_Area, surfaceArea, 'M2', 'FT2'))# Surface Area (m2)
+            areasList.append( PHPP_XL_Obj('Areas', Address_Assembly, assemblyName))# Assembly Type Name
+            areasList.append( PHPP_XL_Obj('Areas', Address_AngleNorth, angleFromNorth))# Orientation Off North
+            areasList.append( PHPP_XL_Obj('Areas', Address_AngleHoriz, angleFromHoriz))# Orientation Off Horizontal
+            areasList.append( PHPP_XL_Obj('Areas', Address_ShadingFac, shading))# Shading Factor
+            areasList.append( PHPP_XL_Obj('Areas', Address_Abs, abs))# Absorptivity
+            areasList.append( PHPP_XL_Obj('Areas', Address_Emmis, emmis))# Emmissivity
+            
+            # Add the PHPP UD Surface Name to the Surface Object
+            setattr(surface, 'UD_Srfc_Name', '{:d}-{}'.format(uID_Count, nm) )
+            
+            # Keep track of which Surfaces are included in the output
+            surfacesIncluded.append(nm)
+            
+            uID_Count += 1
+            areaCount += 1
+    
+    areasList.append( PHPP_XL_Obj('Areas', 'L19', 'Suspended Floor') )
+    return areasList, surfacesIncluded
+
+def getWindows(_inputBranch, _surfacesIncluded, _srfcBranch):
+    windowsRowStart = 24
+    windowsCount = 0
+    winSurfacesList = []
+    
+    log.info("Creating the 'Windows' Objects...")
+    for window in _inputBranch:
+        # for each Window Surface Object in the model....
+        # Get the window's basic params
+        quant = getattr(window, 'Quantity')
+        nm = getattr(window, 'Name')
+        w = getattr(window, 'Width')
+        h = getattr(window, 'Height')
+        host = getattr(window, 'HostSrfc')
+        glassType = getattr(window.Type_Glass, 'Name')
+        frameType = getattr(window.Type_Frame, 'Name')
+        glassTypeUD = getattr(window, 'UD_glass_Name')
+        frameTypeUD = getattr(window, 'UD_frame_Name')
+        variantType = getattr(window, 'Type_Variant', 'a')
+        
+        # See if the Window should be included in the output
+        includeWindow = False
+        for eachSurfaceName in _surfacesIncluded:
+            if eachSurfaceName == host:
+                includeWindow = True
+                break
+            else:
+                includeWindow = False
+        
+        if includeWindow:
+            # Find the Window's Host Surface UD
+            for srfc in _srfcBranch:
+                if host == getattr(srfc, 'Name'):
+                    hostUD = getattr(srfc, 'UD_Srfc_Name')
+           
+           # Get the Window Range Addresses
+            Address_varType = '{}{}'.format('F', windowsRowStart + windowsCount)
+            Address_winQuantity = '{}{}'.format('L', windowsRowStart + windowsCount)
+            Address_winName = '{}{}'.format('M', windowsRowStart + windowsCount)
+            Address_w = '{}{}'.format('Q', windowsRowStart + windowsCount)
+            Address_h = '{}{}'.format('R', windowsRowStart + windowsCount)
+            Address_hostName = '{}{}'.format('S', windowsRowStart + windowsCount)
+            Address_glassType = '{}{}'.format('T', windowsRowStart + windowsCount)
+            Address_frameType = '{}{}'.format('U', windowsRowStart + windowsCount)
+            Address_install_Left = '{}{}'.format('AA', windowsRowStart + windowsCount)
+            Address_install_Right = '{}{}'.format('AB', windowsRowStart + windowsCount)
+            Address_install_Bottom = '{}{}'.format('AC', windowsRowStart + windowsCount)
+            Address_install_Top = '{}{}'.format('AD', windowsRowStart + windowsCount)
+            
+            # Create the PHPP Window Object
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_varType, variantType)) # Quantity
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_winQuantity, quant)) # Quantity
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_winName, nm)) # Name
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_w, w, 'M', 'FT')) # Width
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_h, h, 'M', 'FT')) # Height
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_hostName, hostUD)) # Host Name
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_glassType, glassTypeUD)) # Glass UD Name
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_frameType, frameTypeUD)) # Frame UD Name
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Left, window.Installs.Inst_L)) # Install Condition Left
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Right, window.Installs.Inst_R)) # Install Condition Right
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Bottom, window.Installs.Inst_B)) # Install Condition Bottom
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Top, window.Installs.Inst_T)) # Install Condition Top
+            
+            windowsCount += 1
+            
+    return winSurfacesList
+
+def getShading(_inputBranch, _surfacesIncluded):
+    shadingRowStart = 17
+    shadingCount = 0
+    shadingList = []
+    log.info("Creating the 'Shading' Objects...")
+    for window in _inputBranch:
+        # for each Window IDF Object in the model....
+        
+        # First, see if the Window should be included in the output
+        host = getattr(window, 'HostSrfc')
+        includeWindow = False
+        for eachSurfaceName in _surfacesIncluded:
+            if eachSurfaceName == host:
+                includeWindow = True
+                break
+            else:
+                includeWindow = False
+        
+        if includeWindow:
+            # Get the Window's shading Params
+            try:
+                winterShadingFactor = getattr(window, 'winterShadingFac')
+                summerShadingFactor = getattr(window, 'summerShadingFac')
+            except:
+                winterShadingFactor = 0.75
+                summerShadingFactor = 0.75
+            
+            # Create the PHPP Objects
+            Address1_start = '{}{}'.format('AF', shadingRowStart + shadingCount)
+            Address1_end = '{}{}'.format('AG', shadingRowStart + shadingCount)
+            shadingList.append( PHPP_XL_Obj( 'Shading', Address1_start , winterShadingFactor))
+            shadingList.append( PHPP_XL_Obj( 'Shading', Address1_end , summerShadingFactor))
+            
+            shadingCount += 1
+        
+    return shadingList
+
+def getInfiltration(_inputBranch, _zonesToInclude):
+    ##########################################
+    ######   Envelope Airtightness    ########
+    
+    # Defaults
+    Coef_E = 0.07
+    Coef_F  = 15
+    bldgWeightedACH = None
+    bldgVn50 = None
+    
+    # Find the Floor-Area Weighted Average ACH of the Zones
+    zonesVn50 = []
+    zonesFloorArea = []
+    zonesWeightedACH = []
+    
+    for zoneNametoInclude in _zonesToInclude:
+        for zoneObj in _inputBranch:
+            if zoneObj.ZoneName == zoneNametoInclude:
+                try:
+                    zonesFloorArea.append(zoneObj.FloorArea_Gross if zoneObj.FloorArea_Gross else False)
+                    zonesWeightedACH.append(zoneObj.InfiltrationACH50 * zoneObj.FloorArea_Gross)
+                    zonesVn50.append(zoneObj.Volume_Vn50)
+                except:
+                    pass
+    
+    if sum(zonesFloorArea)!= 0:
+        bldgWeightedACH = sum(zonesWeightedACH) / sum(zonesFloorArea)
+        bldgVn50 = sum(zonesVn50)
+    
+    airtightness = []
+    log.info("Creating the Airtightness Objects...")
+    airtightness.append(PHPP_XL_Obj('Ventilation', 'N25', Coef_E if Coef_E else float(0.07) ))# Wind protection E
+    airtightness.append(PHPP_XL_Obj('Ventilation', 'N26', Coef_F if Coef_F else float(15) ))# Wind protection F
+    airtightness.append(PHPP_XL_Obj('Ventilation', 'N27', bldgWeightedACH if bldgWeightedACH else float(0.6) ))# ACH50
+    airtightness.append(PHPP_XL_Obj('Ventilation', 'P27', bldgVn50 if bldgVn50 else '=N9*1.2', 'M3', 'FT3' ))#  Internal Reference Volume
+    
+    return airtightness
+
+def getLocation(_locationObjs):
+    climate = []
+    
+    if len(_locationObjs) == 0:
+        return climate
+    
+    loc = _locationObjs[0]
+    log.info("Creating the 'Climate' Objeects...")
+    climate.append( PHPP_XL_Obj('Climate', 'D9', loc.Country if loc else 'US-United States of America' )) # Climate Data Set Name (Dropdown)
+    climate.append( PHPP_XL_Obj('Climate', 'D10', loc.Region if loc else 'New York' )) # Climate Data Set Name (Dropdown)
+    climate.append( PHPP_XL_Obj('Climate', 'D12', loc.DataSet if loc else 'US0055b-New York' )) # Climate Data Set Name (Dropdown)
+    climate.append( PHPP_XL_Obj('Climate', 'D18', loc.Altitude if loc else '=D17' )) # Altitude
+    
+    return climate
+
+def filterName(_zoneName, _zonesNamesToFilter):
+    flag = True
+    for each in _zonesNamesToFilter:
+        if each in _zoneName:
+            flag = False
+    
+    return flag
+
+#-------------------------------------------------------------------------------
+# The whole IDF --> PHPP conversion
+def idfToPHPPObjs(_idfModel):
+    """ Reads the IDF Model and builds all the PHPP objects from it
+    
+    The same steps as the 'IDF-->PHPP Objs' Grasshopper component, without the 
+    Honeybee Zone data (PHPP Rooms, Ventilation, DHW, Ground).
+    
+    Args:
+        _idfModel (IDF_Model): The IDF Model to read
+    Returns:
+        dict: The PHPP objects, by type: 'opaqueMaterials', 'opaqueConstructions', 
+            'windowMaterialsSimple', 'windowConstructionsSimple', 'opaqueSurfaces', 
+            'windowObjects', 'zones', 'zoneInfiltrationRates', 'climate'
+    """
+    
+    (opaqueSurfaces,
+    opaqueMaterials,
+    windowMaterialsSimple,
+    windowMaterialGas,
+    windowMaterialGlazing,
+    allConstructions,
+    zones,
+    zoneInfiltrationRates,
+    zonesList,
+    location) = parseIDFObjects(_idfModel)
+    
+    (opaqueConstructions,
+    windowConstructionsSimple,
+    windowMaterialsSimple) = filterConstructions(allConstructions, windowMaterialsSimple, windowMaterialGas, windowMaterialGlazing)
+    
+    windowObjects = getIDFWindowObjects(_idfModel, windowConstructionsSimple, windowMaterialsSimple)
+    
+    # Figure out the Closest PHPP Climate Zone
+    try:
+        latitude = float(getattr(location, 'Latitude {deg}', 51.30))
+        longitude = float(getattr(location, 'Longitude {deg}', 9.44))
+        climate = findNearestPHPPclimateZone(latitude, longitude)
+    except Exception as e:
+        warnings.warn('Error finding the nearest PHPP Climate Zone? {}'.format(e), IDF2PHPPWarning)
+        climate = []
+    
+    return {'opaqueMaterials': opaqueMaterials,
+            'opaqueConstructions': opaqueConstructions,
+            'windowMaterialsSimple': list(windowMaterialsSimple.values()),
+            'windowConstructionsSimple': list(windowConstructionsSimple.values()),
+            'opaqueSurfaces': filterSurfaces(opaqueSurfaces),
+            'windowObjects': windowObjects,
+            'zones': zones,
+            'zoneInfiltrationRates': zoneInfiltrationRates,
+            'climate': climate}
+
+def phppObjsToXLObjs(_phppObjs, _zonesInclude=None, _zonesExclude=None, _tfa=None):
+    """ Builds the Excel-ready PHPP_XL_Obj cell writes from the PHPP objects
+    
+    The same steps as the 'Create Excel Obj - Geom' Grasshopper component, 
+    for the U-Values, Components, Areas, Windows, Shading, Ventilation (airtightness) 
+    and Climate worksheets.
+    
+    Args:
+        _phppObjs (dict): The PHPP objects from idfToPHPPObjs()
+        _zonesInclude (list): <Optional> Only output the zones whose name includes any of these
+        _zonesExclude (list): <Optional> Don't output the zones whose name includes any of these
+        _tfa (float): <Optional> The Treated Floor Area (m2) to write to the 'Areas' worksheet
+    Returns:
+        list: All the PHPP_XL_Obj cell writes, in write order
+    """
+    
+    zones = [x.ZoneName for x in _phppObjs['zones']]
+    if _zonesInclude:
+        zones = [x for x in zones if not filterName(x, _zonesInclude)]
+    if _zonesExclude:
+        zones = [x for x in zones if filterName(x, _zonesExclude)]
+    log.info('Inlcuding Zones {} in the Export'.format(zones))
+    
+    uValuesList, uValueUID_Names    = getUvalues( _phppObjs['opaqueConstructions'], _phppObjs['opaqueMaterials'] )
+    winComponentsList               = getComponents( _phppObjs['windowObjects'] )
+    areasList, surfacesIncluded     = getAreas( _phppObjs['opaqueSurfaces'], zones, uValueUID_Names )
+    winSurfacesList                 = getWindows( _phppObjs['windowObjects'], surfacesIncluded, _phppObjs['opaqueSurfaces'] )
+    shadingList                     = getShading( _phppObjs['windowObjects'], surfacesIncluded )
+    airtightness                    = getInfiltration( _phppObjs['zones'], zones )
+    location                        = getLocation( _phppObjs['climate'] )
+    
+    tfa = []
+    if _tfa:
+        tfa.append( PHPP_XL_Obj('Areas', 'V34', float(_tfa), 'M2', 'FT2' )) # TFA (m2)
+    
+    return uValuesList + winComponentsList + areasList + winSurfacesList + shadingList + tfa + airtightness + location
+
+def convertIDF(_idfFilePath, _zonesInclude=None, _zonesExclude=None, _tfa=None, _useCache=True):
+    """ Reads an IDF file and returns the list of PHPP_XL_Obj cell writes for it
+    
+    Args:
+        _idfFilePath (str): The full path to the .idf file
+        _zonesInclude (list): <Optional> Only output the zones whose name includes any of these
+        _zonesExclude (list): <Optional> Don't output the zones whose name includes any of these
+        _tfa (float): <Optional> The Treated Floor Area (m2) to write to the PHPP
+        _useCache (bool): Default=True. Read / write the parsed IDF cache next to the file
+    Returns:
+        list: All the PHPP_XL_Obj cell writes, in write order
+    """
+    
+    idfModel = readIDF(_idfFilePath, _useCache)
+    phppObjs = idfToPHPPObjs(idfModel)
+    
+    return phppObjsToXLObjs(phppObjs, _zonesInclude, _zonesExclude, _tfa)
+
+def xlObjToDict(_xlObj, _units='SI'):
+    """ Returns a PHPP_XL_Obj as a plain dict (for JSON / CSV output)
+    
+    Args:
+        _xlObj (PHPP_XL_Obj): The cell write
+        _units (str): 'SI' or 'IP'. The unit system to output the value in.
+    Returns:
+        dict: {'worksheet':..., 'range':..., 'value':..., 'unit':...}
+    """
+    
+    unit = _xlObj.Unit_IP if _units == 'IP' and _xlObj.Unit_SI else _xlObj.Unit_SI
+    
+    return {'worksheet': _xlObj.getWorksheet(_units),
+            'range': _xlObj.Range,
+            'value': _xlObj.getValue(_units),
+            'unit': unit}
+
+#-------------------------------------------------------------------------------
+# Output
+FIELDS = ['worksheet', 'range', 'value', 'unit']
+
+def writeJSON(_records, _outFile):
+    json.dump(_records, _outFile, indent=1)
+    _outFile.write('\n')
+
+def writeCSV(_records, _outFile):
+    writer = csv.DictWriter(_outFile, fieldnames=FIELDS, lineterminator='\n')
+    writer.writeheader()
+    for record in _records:
+        writer.writerow(record)
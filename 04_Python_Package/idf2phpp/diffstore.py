@@ -0,0 +1,230 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Remembers the values last written to each PHPP workbook, so that only the cells which 
+have changed need to be written the next time. 
+
+The values are saved to a small sidecar file next to the workbook 
+('idf2phpp_cache/<workbook name>.diff.json') along with the hash of the saved workbook 
+file. When the workbook file has changed since (edited and saved by hand, swapped for 
+another copy...) the saved values aren't trusted, and the cells should be checked 
+against the values read from the workbook instead.
+
+    >>> store = XL_DiffStore.load('C:/PHPP/house.xlsx')
+    >>> if store.Trusted:
+    ...     writes = store.diff(newValues)
+    ... else:
+    ...     writes = store.verify(newValues, readCells(store.cellsToVerify(newValues)))
+    >>> # ... write them to the workbook
+    >>> store.update(newValues)
+    >>> # ... save the workbook
+    >>> store.save()
+"""
+
+from __future__ import absolute_import
+import os
+import json
+import logging
+import warnings
+
+from ._compat import IDF2PHPPWarning, toStr
+from .idf import IDF_CACHE_FOLDER, fileHash
+
+log = logging.getLogger(__name__)
+
+# Bump the version whenever the sidecar file layout changes so old files get ignored
+DIFF_STORE_VERSION = 1
+DIFF_STORE_EXTENSION = '.diff.json'
+
+def sameValue(_a, _b):
+    """ Returns True if the two cell values are the same, the way Excel stores them
+    
+    Empty cells (None) and empty text are the same, and numbers are compared as
+    numbers (Excel reads the text '12' back as 12.0).
+    """
+    
+    if _a is None or _a == '':
+        return _b is None or _b == ''
+    if _a == _b:
+        return True
+    
+    try:
+        return float(_a) == float(_b)
+    except (TypeError, ValueError):
+        return False
+
+class XL_DiffStore:
+    """ The values last written to one workbook: {(worksheet name, cell address): value} """
+    
+    def __init__(self, _workbookPath):
+        """
+        Args:
+            _workbookPath (str): The full path to the workbook file
+        """
+        self.WorkbookPath = os.path.abspath(_workbookPath)
+        self.Values = {}
+        self.WorkbookHash = None    # Hash of the saved workbook file the Values are in. None if not saved since the last write
+        self.Trusted = False        # True if the Values are known to match the open workbook
+    
+    @property
+    def SidecarPath(self):
+        folder, fileName = os.path.split(self.WorkbookPath)
+        return os.path.join(folder, IDF_CACHE_FOLDER, fileName + DIFF_STORE_EXTENSION)
+    
+    @classmethod
+    def load(cls, _workbookPath):
+        """ Returns the store saved for the workbook. It is only Trusted if the workbook file hasn't changed since it was saved
+        
+        If there isn't a good sidecar file, returns an empty (not Trusted) store.
+        """
+        
+        store = cls(_workbookPath)
+        if not os.path.exists(store.SidecarPath):
+            return store
+        
+        try:
+            with open(store.SidecarPath, 'r') as sidecarFile:
+                data = json.load(sidecarFile)
+            
+            if data.get('version') != DIFF_STORE_VERSION:
+                log.info('Ignoring the old diff store file: {}'.format(store.SidecarPath))
+                return store
+            
+            store.Values = {(sheet, address): value for sheet, address, value in data['values']}
+            store.WorkbookHash = data['workbookHash']
+        except Exception as e:
+            log.info('Ignoring the unreadable diff store file: {} ({})'.format(store.SidecarPath, e))
+            return store
+        
+        store.Trusted = os.path.exists(store.WorkbookPath) and fileHash(store.WorkbookPath) == store.WorkbookHash
+        
+        return store
+    
+    def save(self):
+        """ Call this after the workbook has been saved. Records the saved file's hash and writes the sidecar file.
+        
+        Nothing is written if the Values aren't known to match the workbook.
+        
+        Returns:
+            bool: True if the sidecar file was written
+        """
+        
+        if not self.Trusted or not os.path.exists(self.WorkbookPath):
+            return False
+        
+        try:
+            self.WorkbookHash = fileHash(self.WorkbookPath)
+            
+            sidecarFolder = os.path.dirname(self.SidecarPath)
+            if not os.path.exists(sidecarFolder):
+                os.makedirs(sidecarFolder)
+            
+            data = {'version': DIFF_STORE_VERSION,
+                    'workbook': self.WorkbookPath,
+                    'workbookHash': self.WorkbookHash,
+                    'values': sorted([sheet, address, value] for (sheet, address), value in self.Values.items())}
+            
+            tempFilePath = self.SidecarPath + '.tmp'
+            with open(tempFilePath, 'w') as sidecarFile:
+                json.dump(data, sidecarFile, default=str)
+            
+            if os.path.exists(self.SidecarPath):
+                os.remove(self.SidecarPath)
+            os.rename(tempFilePath, self.SidecarPath)
+        except Exception as e:
+            warning = 'Unable to write the diff store file: {}\n{}'.format(self.SidecarPath, e)
+            warnings.warn(warning, IDF2PHPPWarning)
+            return False
+        
+        return True
+    
+    def diff(self, _newValues):
+        """ Returns the cell writes needed to go from the stored Values to the new values
+        
+        Cells which were written last time but aren't in the new values are cleared ('').
+        
+        Args:
+            _newValues (dict): {(worksheet name, cell address): value}
+        Returns:
+            list: The (worksheet name, cell address, value) writes
+        """
+        
+        writes = [(sheet, address, value) for (sheet, address), value in _newValues.items()
+                    if (sheet, address) not in self.Values or not sameValue(self.Values[(sheet, address)], value)]
+        writes.extend( (sheet, address, '') for (sheet, address) in self.Values if (sheet, address) not in _newValues )
+        
+        return writes
+    
+    def cellsToVerify(self, _newValues):
+        """ Returns the (worksheet name, cell address) of every cell verify() needs read from the workbook """
+        
+        return sorted( set(_newValues) | set(self.Values) )
+    
+    def verify(self, _newValues, _liveValues):
+        """ Same as diff(), but checks the new values against the values read from the workbook itself
+        
+        Args:
+            _newValues (dict): {(worksheet name, cell address): value}
+            _liveValues (dict): {(worksheet name, cell address): value} read from the 
+                workbook, for the cells from cellsToVerify()
+        Returns:
+            list: The (worksheet name, cell address, value) writes
+        """
+        
+        writes = [(sheet, address, value) for (sheet, address), value in _newValues.items()
+                    if not sameValue(_liveValues.get((sheet, address)), value)]
+        writes.extend( (sheet, address, '') for (sheet, address) in self.Values
+                    if (sheet, address) not in _newValues and not sameValue(_liveValues.get((sheet, address)), '') )
+        
+        return writes
+    
+    def update(self, _newValues, _written=None):
+        """ Call this after the writes: the open workbook now has the new values (but isn't saved yet)
+        
+        Args:
+            _newValues (dict): {(worksheet name, cell address): value}
+            _written (list): <Optional> The (worksheet name, cell address) of the cells which 
+                were actually written. Only these take their new value (or are forgotten, for 
+                the cells cleared), so any that couldn't be written get tried again next time. 
+                Default is all of them.
+        """
+        
+        if _written is None:
+            self.Values = dict(_newValues)
+        else:
+            for key in _written:
+                if key in _newValues:
+                    self.Values[key] = _newValues[key]
+                else:
+                    self.Values.pop(key, None)
+        
+        self.WorkbookHash = None
+        self.Trusted = True
+    
+    def __unicode__(self):
+        return u"XL Diff Store | Workbook: {}  |  {} cells  |  Trusted: {}".format(self.WorkbookPath, len(self.Values), self.Trusted)
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}( _workbookPath={!r} )".format(
+                self.__class__.__name__,
+                self.WorkbookPath)
@@ -0,0 +1,482 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+One shared Excel service for all the components and Rhino commands which need Excel.
+
+Starting Excel takes seconds, and every Excel started and not cleaned up properly is 
+left running as an EXCEL.EXE process. So instead of each component starting (and 
+quitting) its own Excel, they all borrow from the one service:
+
+    >>> service = getExcelService()
+    >>> with service.workbook('C:/PHPP/Library.xls', _readOnly=True) as xlWorkbook:
+    ...     glazing = xlWorkbook.Worksheets['Components'].Range['IE15:IG113'].Value2
+
+The Excel applications are kept in a pool and re-used: a released application is hidden 
+and kept running (up to _maxIdle of them) for the next component to borrow. Workbooks 
+are reference counted by file, so borrowing a workbook which is already open gives the 
+same open workbook, and it is only closed when the last borrower releases it. Closed 
+workbooks and quit applications have their COM references released right away, rather 
+than whenever the garbage collector gets to them.
+
+The recalculation policies used by 'Write XL Workbook' and 'Read XL Workbook' are here too 
+(see recalculate() and RECALC_POLICIES).
+
+Excel itself is only needed once an application is asked for, so this module imports 
+fine outside of Rhino (ie: to pass in a stand-in _appFactory).
+"""
+
+from __future__ import absolute_import
+import os
+import gc
+import time
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+
+from ._compat import toStr
+
+log = logging.getLogger(__name__)
+
+#-------------------------------------------------------------------------------
+# COM helpers
+def startExcel():
+    """ Starts a new (hidden) Excel application through the COM interface """
+    
+    import clr
+    clr.AddReferenceByName('Microsoft.Office.Interop.Excel')
+    from Microsoft.Office.Interop import Excel
+    
+    app = Excel.ApplicationClass()
+    app.Visible = False
+    app.DisplayAlerts = False
+    app.EnableEvents = False
+    log.info('Started a new Excel application')
+    
+    return app
+
+def releaseCOM(*_objs):
+    """ Releases the COM references to the objects now, instead of waiting for the garbage collector """
+    
+    try:
+        from System.Runtime.InteropServices import Marshal
+    except ImportError:
+        return  # Not running on .NET, nothing to release
+    
+    for obj in _objs:
+        try:
+            if obj is not None and Marshal.IsComObject(obj):
+                Marshal.FinalReleaseComObject(obj)
+        except Exception as e:
+            log.debug('Could not release the COM object: {}'.format(e))
+
+def collectCOM():
+    """ Runs the garbage collector, so any COM references still held by Python objects are let go """
+    
+    gc.collect()
+    try:
+        import System
+    except ImportError:
+        return
+    System.GC.Collect()
+    System.GC.WaitForPendingFinalizers()
+
+def isAlive(_app):
+    """ Returns True if the Excel application is still running (hasn't been closed by the user) """
+    
+    try:
+        _app.Workbooks.Count
+        return True
+    except Exception:
+        return False
+
+#-------------------------------------------------------------------------------
+class XL_Workbook:
+    """ A workbook borrowed from the Excel service. Call release() (or use 'with') when done with it """
+    
+    def __init__(self, _service, _filePath, _app, _workbook, _readOnly, _ownsApp):
+        """
+        Args:
+            _service (XL_Service): The service the workbook was borrowed from
+            _filePath (str): The full path to the workbook file
+            _app: The Excel application the workbook is open in
+            _workbook: The Excel COM Workbook
+            _readOnly (bool): True if the workbook was opened read-only
+            _ownsApp (bool): True if the application was borrowed just for this workbook,
+                and goes back to the pool when the workbook is closed
+        """
+        self._service = _service
+        self.FilePath = _filePath
+        self.App = _app
+        self.Workbook = _workbook
+        self.ReadOnly = _readOnly
+        self.RefCount = 0
+        self._ownsApp = _ownsApp
+        self._worksheets = None
+    
+    @property
+    def Worksheets(self):
+        """ {worksheet name: COM Worksheet}, loaded the first time it's asked for """
+        
+        if self._worksheets is None:
+            self._worksheets = {}
+            for sheet in self.Workbook.Worksheets:
+                self._worksheets[sheet.Name] = sheet
+        return self._worksheets
+    
+    @property
+    def IsOpen(self):
+        return self.Workbook is not None
+    
+    def save(self):
+        self.Workbook.Save()
+    
+    def release(self):
+        """ Gives the workbook back to the service. It is closed once no one is using it """
+        
+        self._service.closeWorkbook(self)
+    
+    def _close(self):
+        """ Closes the workbook (without saving) and releases its COM references """
+        
+        worksheets = list((self._worksheets or {}).values())
+        workbook = self.Workbook
+        self._worksheets = None
+        self.Workbook = None
+        
+        try:
+            workbook.Close(False)
+        except Exception as e:
+            log.debug('Could not close the workbook {}: {}'.format(self.FilePath, e))
+        releaseCOM(*(worksheets + [workbook]))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, _type, _value, _traceback):
+        self.release()
+    
+    def __unicode__(self):
+        return u"XL Workbook | {}  |  {} borrower(s)".format(self.FilePath, self.RefCount)
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}( _filePath={!r}, _readOnly={!r}, _refCount={!r} )".format(
+                self.__class__.__name__,
+                self.FilePath,
+                self.ReadOnly,
+                self.RefCount)
+
+class XL_Service:
+    """ A pool of re-usable Excel applications, and the reference counted workbooks open in them """
+    
+    def __init__(self, _appFactory=None, _maxIdle=1):
+        """
+        Args:
+            _appFactory (callable): <Optional> Returns a new Excel application. Default is startExcel()
+            _maxIdle (int): Default=1. How many released applications to keep running for re-use.
+                Any more than this are quit when they're released.
+        """
+        self._appFactory = _appFactory or startExcel
+        self.MaxIdle = _maxIdle
+        self._idle = []         # The applications no one is using, ready to borrow
+        self._leased = []       # The applications lent out
+        self._workbooks = {}    # {normalized file path: XL_Workbook}
+        self._lock = threading.RLock()
+    
+    @staticmethod
+    def _key(_filePath):
+        return os.path.normcase(os.path.abspath(_filePath))
+    
+    @property
+    def NumApps(self):
+        return len(self._idle) + len(self._leased)
+    
+    def acquireApp(self):
+        """ Borrows an Excel application: a running one from the pool, or a new one if none are free """
+        
+        with self._lock:
+            while self._idle:
+                app = self._idle.pop()
+                if isAlive(app):
+                    break
+                log.info('Dropping an Excel application which was closed')
+                releaseCOM(app)
+            else:
+                app = self._appFactory()
+            
+            self._leased.append(app)
+            return app
+    
+    def releaseApp(self, _app):
+        """ Gives back a borrowed Excel application. It is hidden and kept for re-use, or quit if the pool is full 
+        
+        If any workbooks open in it are still borrowed, the application stays leased 
+        until the last of them is given back.
+        """
+        
+        with self._lock:
+            # Close anything still open in it which no one is using
+            borrowed = []
+            for key, xlWorkbook in list(self._workbooks.items()):
+                if xlWorkbook.App is not _app:
+                    continue
+                
+                if xlWorkbook.RefCount > 0:
+                    borrowed.append(xlWorkbook)
+                else:
+                    xlWorkbook._close()
+                    del self._workbooks[key]
+            
+            if borrowed:
+                log.info('Keeping the Excel application leased, {} workbook(s) open in it are still borrowed'.format(len(borrowed)))
+                for xlWorkbook in borrowed:
+                    xlWorkbook._ownsApp = True
+                return
+            
+            if _app in self._leased:
+                self._leased.remove(_app)
+            
+            if not isAlive(_app):
+                releaseCOM(_app)
+                return
+            
+            if len(self._idle) < self.MaxIdle:
+                try:
+                    _app.Visible = False
+                    _app.ScreenUpdating = True
+                except Exception as e:
+                    log.debug('Could not reset the Excel application: {}'.format(e))
+                self._idle.append(_app)
+            else:
+                self._quit(_app)
+    
+    def _quit(self, _app):
+        try:
+            _app.Quit()
+        except Exception as e:
+            log.debug('Could not quit the Excel application: {}'.format(e))
+        releaseCOM(_app)
+        log.info('Quit an Excel application')
+    
+    def openWorkbook(self, _filePath, _readOnly=False, _app=None):
+        """ Borrows the workbook. If it's already open, the same open workbook is shared
+        
+        Args:
+            _filePath (str): The workbook file to open
+            _readOnly (bool): Default=False. Open the workbook read-only (doesn't lock the file)
+            _app: <Optional> A borrowed Excel application to open the workbook in. Default 
+                is to borrow one from the pool just for this workbook.
+        Returns:
+            XL_Workbook: The borrowed workbook. Call release() on it when done.
+        Raises:
+            IOError: If the workbook is already open read-only and is wanted for writing
+        """
+        
+        filePath = os.path.abspath(_filePath)
+        key = self._key(filePath)
+        
+        with self._lock:
+            xlWorkbook = self._workbooks.get(key)
+            if xlWorkbook and not isAlive(xlWorkbook.App):
+                log.info('Re-opening the workbook, its Excel application was closed: {}'.format(filePath))
+                del self._workbooks[key]
+                xlWorkbook = None
+            
+            if xlWorkbook:
+                if xlWorkbook.ReadOnly and not _readOnly:
+                    raise IOError('The workbook is already open read-only: {}'.format(filePath))
+            else:
+                app = _app or self.acquireApp()
+                try:
+                    workbook = app.Workbooks.Open(filePath, ReadOnly=_readOnly)
+                except Exception:
+                    if not _app:
+                        self.releaseApp(app)
+                    raise
+                
+                xlWorkbook = XL_Workbook(self, filePath, app, workbook, _readOnly, _app is None)
+                self._workbooks[key] = xlWorkbook
+            
+            xlWorkbook.RefCount += 1
+            return xlWorkbook
+    
+    def closeWorkbook(self, _xlWorkbook):
+        """ Gives back a borrowed workbook. Once the last borrower has given it back it is 
+        closed (without saving) and, if the application was borrowed for it, the application 
+        goes back to the pool.
+        """
+        
+        with self._lock:
+            if _xlWorkbook.RefCount <= 0:
+                return
+            
+            _xlWorkbook.RefCount -= 1
+            if _xlWorkbook.RefCount > 0:
+                return
+            
+            key = self._key(_xlWorkbook.FilePath)
+            if self._workbooks.get(key) is _xlWorkbook:
+                del self._workbooks[key]
+            _xlWorkbook._close()
+            
+            if _xlWorkbook._ownsApp:
+                self.releaseApp(_xlWorkbook.App)
+    
+    @contextmanager
+    def workbook(self, _filePath, _readOnly=False):
+        """ Borrows the workbook for the 'with' block. See openWorkbook() """
+        
+        xlWorkbook = self.openWorkbook(_filePath, _readOnly)
+        try:
+            yield xlWorkbook
+        finally:
+            xlWorkbook.release()
+    
+    def shutdown(self):
+        """ Closes every workbook (without saving) and quits every Excel application """
+        
+        with self._lock:
+            for xlWorkbook in list(self._workbooks.values()):
+                xlWorkbook._close()
+            self._workbooks = {}
+            
+            for app in self._idle + self._leased:
+                self._quit(app)
+            self._idle = []
+            self._leased = []
+        
+        collectCOM()
+    
+    def __unicode__(self):
+        return u"XL Service | {} Excel application(s), {} idle  |  {} open workbook(s)".format(
+                self.NumApps, len(self._idle), len(self._workbooks))
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}( _appFactory={!r}, _maxIdle={!r} )".format(
+                self.__class__.__name__,
+                self._appFactory,
+                self.MaxIdle)
+
+#-------------------------------------------------------------------------------
+# Recalculation
+XL_CALCULATION_MANUAL = -4135
+XL_CALCULATION_AUTOMATIC = -4105
+
+RECALC_FULL = 'full'            # Application.Calculate(), every open workbook
+RECALC_SHEETS = 'sheets'        # Worksheet.Calculate() on a list of worksheets, in order
+RECALC_DEFERRED = 'deferred'    # Nothing now, a full recalculation before the next read
+RECALC_POLICIES = (RECALC_FULL, RECALC_SHEETS, RECALC_DEFERRED)
+
+def parseRecalcPolicy(_policy):
+    """ Returns the recalculation policy name for the input (None is RECALC_FULL)
+    
+    Raises:
+        ValueError: If it isn't one of the RECALC_POLICIES
+    """
+    
+    if _policy is None or str(_policy).strip() == '':
+        return RECALC_FULL
+    
+    policy = str(_policy).strip().lower()
+    if policy not in RECALC_POLICIES:
+        raise ValueError('Unknown recalculation "{}", use one of: {}'.format(_policy, ', '.join(RECALC_POLICIES)))
+    return policy
+
+def recalculate(_app, _worksheets=None):
+    """ Recalculates, and returns how long it took
+    
+    Args:
+        _app: The Excel application
+        _worksheets (list): <Optional> Only recalculate these (COM) worksheets, in this 
+            order. Default is a full recalculation of every open workbook.
+    Returns:
+        float: The time taken, in seconds
+    """
+    
+    start = time.time()
+    if _worksheets is None:
+        _app.Calculate()
+    else:
+        for sheet in _worksheets:
+            sheet.Calculate()
+    return time.time() - start
+
+class XL_RecalcTimer:
+    """ The recalculation times for each policy, to see which is quickest on a PHPP """
+    
+    def __init__(self):
+        self.Times = {}     # {policy: [seconds, ...]}
+    
+    def add(self, _policy, _seconds):
+        self.Times.setdefault(_policy, []).append(_seconds)
+    
+    def average(self, _policy):
+        times = self.Times.get(_policy)
+        if not times:
+            return None
+        return sum(times) / len(times)
+    
+    def summary(self, _policy):
+        """ Returns the last and the average time for the policy as text """
+        
+        times = self.Times.get(_policy)
+        if not times:
+            return u"Recalc ({}): not run yet".format(_policy)
+        return u"Recalc ({}): {:.3f} s  |  average {:.3f} s over {} run(s)".format(
+                _policy, times[-1], self.average(_policy), len(times))
+    
+    def __unicode__(self):
+        return u"XL Recalc Timer | " + u", ".join(
+                u"{}: {:.3f} s avg".format(policy, self.average(policy)) for policy in sorted(self.Times))
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}()".format(self.__class__.__name__)
+
+#-------------------------------------------------------------------------------
+_service = None
+
+def getExcelService():
+    """ Returns the one shared Excel service, started the first time it's asked for
+    
+    Every Excel application it started is quit when Rhino closes, or when Python shuts 
+    down outside of Rhino.
+    """
+    
+    global _service
+    if _service is None:
+        _service = XL_Service()
+        atexit.register(_service.shutdown)
+        
+        # atexit isn't always run by Rhino's IronPython, so quit on Rhino's 'Closing' too
+        try:
+            import Rhino
+            Rhino.RhinoApp.Closing += _shutdownOnRhinoClosing
+        except Exception:
+            pass
+    return _service
+
+def _shutdownOnRhinoClosing(_sender, _e):
+    if _service is not None:
+        _service.shutdown()
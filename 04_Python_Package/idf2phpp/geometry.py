@@ -0,0 +1,437 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Pure Python geometry for building PHPP data from IDF vertex lists. No Rhino needed.
+
+Rhino / Grasshopper geometry (for previews) is built from the same vertex 
+lists by the BT_CORE component.
+"""
+
+from __future__ import absolute_import
+import math
+from collections import namedtuple, defaultdict
+
+class PHPP_Vector(namedtuple('PHPP_Vector', ['X', 'Y', 'Z'])):
+    """ A plain X, Y, Z vector / point which doesn't need Rhino. Same .X .Y .Z attributes as Rhino's Point3d / Vector3d """
+    
+    __slots__ = ()
+    
+    def toRhino(self, _asPoint=False):
+        import Rhino
+        
+        if _asPoint:
+            return Rhino.Geometry.Point3d(self.X, self.Y, self.Z)
+        return Rhino.Geometry.Vector3d(self.X, self.Y, self.Z)
+
+def phpp_polygonProps(_vertsXYZ):
+    """ Calcs the area, centroid and normal of a planar polygon from its vertices, without Rhino
+    
+    Uses Newell's method for the normal, so the direction follows the vertex order
+    (EnergyPlus vertices are counter-clockwise seen from outside, so the normal faces out).
+    The centroid is the area-weighted centroid of the triangles fanned from the first vertex.
+    
+    Args:
+        _vertsXYZ: One flat list / array of the vertex coordinates: [x1, y1, z1, x2, y2, z2, ...]
+    Returns (tuple): 
+        0: area (m2)
+        1: centroid (PHPP_Vector)
+        2: normal (PHPP_Vector) Unit length. (0, 0, 0) if the polygon has no area
+    """
+    
+    xs = _vertsXYZ[0::3]
+    ys = _vertsXYZ[1::3]
+    zs = _vertsXYZ[2::3]
+    numVerts = min(len(xs), len(ys), len(zs))
+    if numVerts == 0:
+        return 0.0, PHPP_Vector(0.0, 0.0, 0.0), PHPP_Vector(0.0, 0.0, 0.0)
+    
+    # Newell Normal (twice the area, in the direction of the normal)
+    nx = ny = nz = 0.0
+    for i in range(numVerts):
+        j = (i + 1) % numVerts
+        nx += (ys[i] - ys[j]) * (zs[i] + zs[j])
+        ny += (zs[i] - zs[j]) * (xs[i] + xs[j])
+        nz += (xs[i] - xs[j]) * (ys[i] + ys[j])
+    
+    length = math.sqrt(nx*nx + ny*ny + nz*nz)
+    area = length / 2.0
+    if length == 0:
+        cen = PHPP_Vector(sum(xs[:numVerts])/numVerts, sum(ys[:numVerts])/numVerts, sum(zs[:numVerts])/numVerts)
+        return 0.0, cen, PHPP_Vector(0.0, 0.0, 0.0)
+    nx, ny, nz = nx/length, ny/length, nz/length
+    
+    # Centroid, from the triangle fan. Signed areas so concave shapes work too
+    x0, y0, z0 = xs[0], ys[0], zs[0]
+    cx = cy = cz = totalWeight = 0.0
+    for i in range(1, numVerts-1):
+        ax, ay, az = xs[i]-x0, ys[i]-y0, zs[i]-z0
+        bx, by, bz = xs[i+1]-x0, ys[i+1]-y0, zs[i+1]-z0
+        weight = (ay*bz - az*by)*nx + (az*bx - ax*bz)*ny + (ax*by - ay*bx)*nz
+        cx += weight * (x0 + xs[i] + xs[i+1])
+        cy += weight * (y0 + ys[i] + ys[i+1])
+        cz += weight * (z0 + zs[i] + zs[i+1])
+        totalWeight += weight
+    
+    if totalWeight == 0:
+        cen = PHPP_Vector(sum(xs[:numVerts])/numVerts, sum(ys[:numVerts])/numVerts, sum(zs[:numVerts])/numVerts)
+    else:
+        cen = PHPP_Vector(cx/(3*totalWeight), cy/(3*totalWeight), cz/(3*totalWeight))
+    
+    return area, cen, PHPP_Vector(nx, ny, nz)
+
+def phpp_polygonPropsBatch(_vertArrays):
+    """ Calcs the area, centroid and normal for a whole list of polygons in one go
+    
+    Args:
+        _vertArrays: A list of flat vertex arrays, one for each polygon. See phpp_polygonProps()
+    Returns:
+        A list of (area, centroid, normal) tuples, in the same order as the input
+    """
+    
+    return [phpp_polygonProps(vertsXYZ) for vertsXYZ in _vertArrays]
+
+def phpp_angleFromHoriz(_normalVec):
+    """ Returns the angle (Degrees) between a surface's normal and straight up (Z). 0=facing up, 90=vertical, 180=facing down """
+    
+    length = math.sqrt(_normalVec.X**2 + _normalVec.Y**2 + _normalVec.Z**2)
+    if length == 0:
+        return 0.0
+    
+    return math.degrees( math.acos( max(-1.0, min(1.0, _normalVec.Z / length)) ) )
+
+def phpp_calcNorthAngle(_objNormVec, _refNorthVec):
+    """ Takes in a Surface's Normal Vector and the project's north angle vector and computes the angle 0--360 between
+    
+    http://frasergreenroyd.com/obtaining-the-angle-between-two-vectors-for-360-degrees/
+    Results 0=north, 90=east, 180=south, 270=west
+    
+    Args:
+        _objNormVec: A Vector3d of the surface's normal
+        _refNorthVec: A Vector3d of the project's north vector 
+    Returns: 
+        angle: the angle of North for the surface (Degrees)
+    """
+    
+    # Get the input Vector's X and Y parts
+    x1 = _objNormVec.X
+    y1 = _objNormVec.Y
+    
+    x2 = _refNorthVec.X
+    y2 = _refNorthVec.Y
+    
+    # Calc the angle between
+    angle = math.atan2(y2, x2) - math.atan2(y1, x1)
+    angle = angle * 360 / (2 * math.pi)
+    
+    if angle < 0:
+        angle = angle + 360
+    
+    # Return Angle in Degrees
+    return angle
+
+def phpp_windowSizeFromVerts(_vertsXYZ):
+    """ Finds the width and height of a (rectangular) window from its vertices, without Rhino
+    
+    Width is measured along the horizontal direction in the window's plane, 
+    height along the 'up' direction in the plane. For horizontal windows (skylights) 
+    the width is measured along the X-Axis.
+    
+    Args:
+        _vertsXYZ: One flat list / array of the vertex coordinates: [x1, y1, z1, x2, y2, z2, ...]
+    Returns (list): 
+        0: width (float)
+        1: height (float)
+    """
+    
+    area, cen, n = phpp_polygonProps(_vertsXYZ)
+    
+    # Horizontal direction in the plane: Z-Axis x Normal
+    hx, hy, hz = -n.Y, n.X, 0.0
+    length = math.sqrt(hx*hx + hy*hy)
+    if length < 1e-9:
+        hx, hy, hz = 1.0, 0.0, 0.0
+    else:
+        hx, hy = hx/length, hy/length
+    
+    # Up direction in the plane: Normal x Horizontal
+    ux = n.Y*hz - n.Z*hy
+    uy = n.Z*hx - n.X*hz
+    uz = n.X*hy - n.Y*hx
+    
+    pts = list(zip(_vertsXYZ[0::3], _vertsXYZ[1::3], _vertsXYZ[2::3]))
+    if not pts:
+        return 0.0, 0.0
+    
+    along = [x*hx + y*hy + z*hz for x, y, z in pts]
+    up = [x*ux + y*uy + z*uz for x, y, z in pts]
+    
+    return max(along) - min(along), max(up) - min(up)
+
+def phpp_mergeTriangles(_triangles, _tolerance=1e-5):
+    """ Joins a set of triangles (ie: a triangulated window) back into a single polygon
+    
+    The perimeter is made from the triangle edges which aren't shared with any 
+    other triangle. Points in the middle of a straight edge are removed.
+    
+    Args:
+        _triangles: A list of flat vertex arrays, one for each triangle: [x1, y1, z1, x2, y2, z2, x3, y3, z3]
+        _tolerance (float): Points closer than this are treated as the same point
+    Returns:
+        list: The flat vertex array of the merged polygon, in the same direction as the 
+            triangles. Empty if the triangles don't make a single closed perimeter.
+    """
+    
+    def key(pt):
+        return tuple(int(round(c / _tolerance)) for c in pt)
+    
+    points = {}
+    edges = []
+    for tri in _triangles:
+        pts = list(zip(tri[0::3], tri[1::3], tri[2::3]))
+        for i in range(len(pts)):
+            a, b = pts[i], pts[(i+1) % len(pts)]
+            points.setdefault(key(a), a)
+            points.setdefault(key(b), b)
+            edges.append( (key(a), key(b)) )
+    
+    # The outside edges are the ones used only once, in either direction
+    edgeCount = defaultdict(int)
+    for a, b in edges:
+        edgeCount[frozenset((a, b))] += 1
+    nextPoint = dict((a, b) for a, b in edges if a != b and edgeCount[frozenset((a, b))] == 1)
+    
+    if not nextPoint:
+        return []
+    
+    start = min(nextPoint)
+    perimeter = [start]
+    while True:
+        pt = nextPoint.get(perimeter[-1])
+        if pt is None or len(perimeter) > len(nextPoint):
+            return []
+        if pt == start:
+            break
+        perimeter.append(pt)
+    
+    if len(perimeter) != len(nextPoint):
+        return [] # More than one loop (holes or separate pieces)
+    
+    # Drop any points in the middle of a straight edge
+    corners = []
+    for i, k in enumerate(perimeter):
+        p0, p1, p2 = points[perimeter[i-1]], points[k], points[perimeter[(i+1) % len(perimeter)]]
+        ax, ay, az = p1[0]-p0[0], p1[1]-p0[1], p1[2]-p0[2]
+        bx, by, bz = p2[0]-p1[0], p2[1]-p1[1], p2[2]-p1[2]
+        cross = (ay*bz - az*by, az*bx - ax*bz, ax*by - ay*bx)
+        if math.sqrt(sum(c*c for c in cross)) > _tolerance * max(1.0, math.sqrt(ax*ax + ay*ay + az*az)):
+            corners.append(p1)
+    
+    return [c for pt in corners for c in pt]
+
+class PHPP_Rectangle(namedtuple('PHPP_Rectangle', ['Corners', 'Width', 'Height', 'Normal', 'Center', 'Across', 'Up'])):
+    """ A planar rectangle (ie: a window) lined up with its 'up' direction. See phpp_windowRectangle()
+    
+    Corners are in the order: bottom-left, bottom-right, top-right, top-left, seen from 
+    the outside (the side the Normal points to). Across runs left to right, Up bottom to top.
+    """
+    
+    __slots__ = ()
+    
+    @property
+    def Edges(self):
+        """ The (start, end) points of the bottom, left, top and right edges """
+        
+        bl, br, tr, tl = self.Corners
+        return (bl, br), (tl, bl), (tr, tl), (br, tr)
+    
+    @property
+    def Area(self):
+        return self.Width * self.Height
+
+def _dot(_a, _b):
+    return _a[0]*_b[0] + _a[1]*_b[1] + _a[2]*_b[2]
+
+def _cross(_a, _b):
+    return PHPP_Vector(_a[1]*_b[2] - _a[2]*_b[1], _a[2]*_b[0] - _a[0]*_b[2], _a[0]*_b[1] - _a[1]*_b[0])
+
+def _sub(_a, _b):
+    return PHPP_Vector(_a[0] - _b[0], _a[1] - _b[1], _a[2] - _b[2])
+
+def _unit(_v):
+    length = math.sqrt(_dot(_v, _v))
+    if length < 1e-12:
+        return None
+    return PHPP_Vector(_v[0]/length, _v[1]/length, _v[2]/length)
+
+def phpp_windowRectangle(_corners, _normal, _tolerance=1e-4):
+    """ Works out a window's width, height, edges etc. with plain vector math, if it is a planar rectangle
+    
+    The window's 'up' is the world Z-Axis flattened onto the window (for horizontal 
+    windows: the Y-Axis). Only rectangles with their sides along 'up' and 'across' 
+    count; anything else (rotated, skewed, not planar, not 4 corners) returns None.
+    
+    Args:
+        _corners: The 4 corner points, in any order. Anything with .X .Y .Z or (x, y, z) tuples
+        _normal: The window's (outward) normal
+        _tolerance (float): How far (m) a corner can be off and still count
+    Returns:
+        PHPP_Rectangle | None
+    """
+    
+    pts = [PHPP_Vector(pt.X, pt.Y, pt.Z) if hasattr(pt, 'X') else PHPP_Vector(*pt) for pt in _corners]
+    n = _unit((_normal.X, _normal.Y, _normal.Z) if hasattr(_normal, 'X') else _normal)
+    if len(pts) != 4 or n is None:
+        return None
+    
+    up = _unit((-n.X*n.Z, -n.Y*n.Z, 1.0 - n.Z*n.Z))
+    if up is None:
+        up = _unit((-n.X*n.Y, 1.0 - n.Y*n.Y, -n.Z*n.Y))
+    across = _cross(up, n)
+    
+    cen = PHPP_Vector(*[sum(pt[i] for pt in pts) / 4.0 for i in range(3)])
+    local = [(_dot(d, across), _dot(d, up), _dot(d, n)) for d in ((pt.X-cen.X, pt.Y-cen.Y, pt.Z-cen.Z) for pt in pts)]
+    
+    width = max(a for a, u, d in local) - min(a for a, u, d in local)
+    height = max(u for a, u, d in local) - min(u for a, u, d in local)
+    if width <= _tolerance or height <= _tolerance:
+        return None
+    
+    corners = {}
+    for pt, (a, u, d) in zip(pts, local):
+        if abs(d) > _tolerance or abs(abs(a) - width/2) > _tolerance or abs(abs(u) - height/2) > _tolerance:
+            return None
+        corners[(a > 0, u > 0)] = pt
+    if len(corners) != 4:
+        return None
+    
+    ordered = (corners[(False, False)], corners[(True, False)], corners[(True, True)], corners[(False, True)])
+    return PHPP_Rectangle(ordered, width, height, n, cen, across, up)
+
+def phpp_insetRectangle(_rect, _inset, _offset=0.0):
+    """ Returns the rectangle shrunk by _inset on every side, and moved _offset along its normal
+    
+    Returns None if the rectangle is too small to shrink that much.
+    """
+    
+    width, height = _rect.Width - 2*_inset, _rect.Height - 2*_inset
+    if width <= 0 or height <= 0:
+        return None
+    
+    n, a, u = _rect.Normal, _rect.Across, _rect.Up
+    corners = []
+    for pt, (sa, su) in zip(_rect.Corners, ((1, 1), (-1, 1), (-1, -1), (1, -1))):
+        corners.append(PHPP_Vector(*[pt[i] + sa*_inset*a[i] + su*_inset*u[i] + _offset*n[i] for i in range(3)]))
+    
+    cen = PHPP_Vector(*[_rect.Center[i] + _offset*n[i] for i in range(3)])
+    return PHPP_Rectangle(tuple(corners), width, height, n, cen, a, u)
+
+def phpp_windingNumber(_point, _triangles):
+    """ Returns how many times the closed triangle mesh winds around the point
+    
+    Sums the solid angles of the triangles seen from the point (Van Oosterom & Strackee).
+    About 1 (-1 if the triangles face inwards) for a point inside the mesh and 0 for 
+    one outside, with no rays to line up with edges. Points on (or very near) the mesh 
+    come out somewhere in between.
+    
+    Args:
+        _point: The point. Anything with .X .Y .Z or an (x, y, z) tuple
+        _triangles (list): The mesh's ((x, y, z), (x, y, z), (x, y, z)) triangles
+    Returns:
+        float: The winding number
+    """
+    
+    px, py, pz = (_point.X, _point.Y, _point.Z) if hasattr(_point, 'X') else _point
+    
+    total = 0.0
+    for tri in _triangles:
+        a, b, c = [(v[0] - px, v[1] - py, v[2] - pz) for v in tri]
+        la, lb, lc = [math.sqrt(_dot(v, v)) for v in (a, b, c)]
+        if not (la and lb and lc):
+            continue  # The point is on a vertex
+        
+        numerator = _dot(a, _cross(b, c))
+        denominator = la*lb*lc + _dot(a, b)*lc + _dot(b, c)*la + _dot(c, a)*lb
+        total += 2.0 * math.atan2(numerator, denominator)
+    
+    return total / (4.0 * math.pi)
+
+def phpp_insetPolygon(_points, _inset, _tolerance=1e-5, _offsetZ=0.0):
+    """ Returns the planar polygon shrunk by _inset on every side, in one pass
+    
+    Each edge is moved _inset towards the inside of the polygon (found from the 
+    vertex order and its Newell normal, so clockwise or counter-clockwise both work) 
+    and the new corners are where the moved edges meet (sharp corners).
+    
+        >>> phpp_insetPolygon([(0, 0, 0), (4, 0, 0), (4, 2, 0), (0, 2, 0)], 0.5)
+        [PHPP_Vector(X=0.5, Y=0.5, Z=0.0), PHPP_Vector(X=3.5, Y=0.5, Z=0.0), PHPP_Vector(X=3.5, Y=1.5, Z=0.0), PHPP_Vector(X=0.5, Y=1.5, Z=0.0)]
+    
+    Args:
+        _points (list): The polygon's (x, y, z) points / anything with .X .Y .Z. A last
+            point repeating the first is fine.
+        _inset (float): How far to move each edge in. Negative moves them out.
+        _tolerance (float): Default=1e-5. For repeated points and the planarity check.
+        _offsetZ (float): Default=0. Moves the inset polygon this much up (world Z)
+    Returns:
+        list: The inset polygon's PHPP_Vector points, one for each corner of the 
+            original. None if the polygon isn't planar or is too small to shrink that much.
+    """
+    
+    pts = []
+    for pt in _points:
+        pt = PHPP_Vector(*((pt.X, pt.Y, pt.Z) if hasattr(pt, 'X') else pt))
+        if not pts or math.sqrt(_dot(_sub(pt, pts[-1]), _sub(pt, pts[-1]))) > _tolerance:
+            pts.append(pt)
+    if len(pts) > 1 and math.sqrt(_dot(_sub(pts[0], pts[-1]), _sub(pts[0], pts[-1]))) <= _tolerance:
+        pts.pop()
+    if len(pts) < 3:
+        return None
+    
+    area, cen, n = phpp_polygonProps([c for pt in pts for c in pt])
+    if area == 0 or any(abs(_dot(_sub(pt, cen), n)) > _tolerance for pt in pts):
+        return None
+    
+    # Each edge's inward direction (in the plane, to the left looking down the normal)
+    dirs = [_unit(_sub(pts[(i + 1) % len(pts)], pt)) for i, pt in enumerate(pts)]
+    inwards = [_cross(n, d) for d in dirs]
+    
+    inset = []
+    for i, pt in enumerate(pts):
+        before, after = inwards[i - 1], inwards[i]
+        cosAngle = 1.0 + _dot(before, after)
+        if cosAngle < 1e-9:
+            return None # The polygon doubles back on itself here
+        
+        scale = _inset / cosAngle
+        inset.append(PHPP_Vector(*[pt[k] + scale*(before[k] + after[k]) for k in range(3)]))
+    
+    # Too small: an edge has shrunk past nothing (turned around), or the polygon has flipped over
+    for i, pt in enumerate(inset):
+        if _dot(_sub(inset[(i + 1) % len(inset)], pt), dirs[i]) <= 0:
+            return None
+    newArea, _, newNormal = phpp_polygonProps([c for pt in inset for c in pt])
+    if newArea == 0 or _dot(newNormal, n) <= 0:
+        return None
+    
+    if _offsetZ:
+        inset = [PHPP_Vector(pt.X, pt.Y, pt.Z + _offsetZ) for pt in inset]
+    
+    return inset
@@ -0,0 +1,536 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Reading EnergyPlus IDF files: the tokenizer, the compact IDF_Class / IDF_Model 
+objects and the on-disk cache of parsed models. No Rhino or Grasshopper needed.
+"""
+
+from __future__ import absolute_import
+import io
+import os
+import re
+import hashlib
+import logging
+import warnings
+from collections import defaultdict
+from array import array
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from ._compat import toStr, IDF2PHPPWarning
+
+log = logging.getLogger(__name__)
+
+# Bump the version whenever the tokenizer or the IDF_Model data changes so old cache files get ignored
+IDF_READER_VERSION = 3
+IDF_CACHE_FOLDER = 'idf2phpp_cache'
+IDF_CACHE_MAX_SIZE = 500 * 1024 * 1024 # bytes, for all the files in the cache folder
+
+# (abspath, mtime, size) -> SHA-1 of the file contents, for the session
+_fileHashes = {}
+
+class IDF_Schema(object):
+    """ The field-name table shared by all the IDF objects with the same IDF Class and field layout
+    
+    Field names come from the '!-' comments, with their commas removed ('X,Y,Z Vertex 1 {m}' 
+    -> 'XYZ Vertex 1 {m}'). Fields without any '!-' name are keyed by their position: 
+    'Field 1', 'Field 2', etc... Fields sharing a single name (like the three vertex
+    coordinates) are stored as one run under that name.
+    """
+    
+    __slots__ = ('ObjName', 'Keys', 'FieldNames', 'KeyIndex', 'VertexFields')
+    _schemas = {}
+    
+    def __init__(self, _objName, _keys):
+        self.ObjName = _objName
+        self.Keys = tuple(_keys)     # The name for each field value, in order
+        self.FieldNames = []         # Each distinct name, in order
+        self.KeyIndex = {}           # name -> (start, stop) of the fields with that name
+        self.VertexFields = []       # The index of each field holding a vertex coordinate
+        
+        for i, key in enumerate(self.Keys):
+            if key not in self.KeyIndex:
+                self.FieldNames.append(key)
+                self.KeyIndex[key] = (i, i+1)
+            else:
+                self.KeyIndex[key] = (self.KeyIndex[key][0], i+1)
+            
+            if 'Vertex' in key:
+                self.VertexFields.append(i)
+    
+    @classmethod
+    def get(cls, _objName, _keys):
+        """ Returns the shared schema for the IDF Class and field names, creating it the first time """
+        
+        keys = tuple(_keys)
+        try:
+            return cls._schemas[(_objName, keys)]
+        except KeyError:
+            newSchema = cls(_objName, keys)
+            cls._schemas[(_objName, keys)] = newSchema
+            return newSchema
+    
+    @staticmethod
+    def keysFromNames(_names):
+        """ Cleans up the raw '!-' comments into field names """
+        
+        keys = []
+        for i, name in enumerate(_names):
+            if name:
+                keys.append( name.replace(',', '').replace(';', '').strip() )
+            else:
+                keys.append( 'Field {}'.format(i+1) )
+        return keys
+    
+    def __repr__(self):
+        return "{}( _objName={!r}, _keys={!r} )".format(
+               self.__class__.__name__,
+               self.ObjName,
+               self.Keys)
+
+class IDF_Class(object):
+    """ A compact holder for the data of a single IDF object
+    
+    The field values are stored in order in a tuple, and the names come from a 
+    schema shared by all objects with the same layout. Use getattr() for names with 
+    spaces in them. Names which cover several fields (ie: 'XYZ Vertex 1 {m}') return
+    the values joined with a space ('0.0 0.0 3.0'). Use getVertices() to get all of 
+    an object's vertex coordinates as a single float array.
+    """
+    
+    __slots__ = ('objName', 'Schema', 'Values')
+    
+    def __init__(self, _schema, _values):
+        self.objName = _schema.ObjName
+        self.Schema = _schema
+        self.Values = tuple(_values)
+    
+    @classmethod
+    def fromTokens(cls, _objName, _values, _names):
+        """ Builds an IDF_Class object from the IDF tokenizer output
+        
+        Args:
+            _objName (str): The IDF Class of the object
+            _values (list): The field values, in order
+            _names (list): The raw '!-' name for each value (or None)
+        Returns:
+            IDF_Class: The new IDF Object
+        """
+        
+        return cls(IDF_Schema.get(_objName, IDF_Schema.keysFromNames(_names)), _values)
+    
+    @classmethod
+    def fromFields(cls, _objName, _fields):
+        """ Builds an IDF_Class object from a list of (name, value) pairs. Repeat the name for multi-value fields """
+        
+        keys = [field[0] for field in _fields]
+        values = [field[1] for field in _fields]
+        return cls(IDF_Schema.get(_objName, keys), values)
+    
+    def __getattr__(self, _key):
+        if _key.startswith('__') or _key in IDF_Class.__slots__:
+            raise AttributeError(_key)
+        
+        try:
+            start, stop = self.Schema.KeyIndex[_key]
+        except KeyError:
+            raise AttributeError(_key)
+        
+        if stop - start == 1:
+            return self.Values[start]
+        return ' '.join(self.Values[start:stop])
+    
+    def getFieldNames(self):
+        """ Returns each of the object's field names, in order """
+        
+        return list(self.Schema.FieldNames)
+    
+    def getFields(self):
+        """ Returns (name, value) for each of the object's fields, in order """
+        
+        return [(key, getattr(self, key)) for key in self.Schema.FieldNames]
+    
+    def getVertices(self):
+        """ Returns all the object's vertex coordinates as one flat array: [x1, y1, z1, x2, y2, z2, ...] """
+        
+        return array('d', [float(self.Values[i]) for i in self.Schema.VertexFields])
+    
+    def __getstate__(self):
+        return (self.Schema.ObjName, self.Schema.Keys, self.Values)
+    
+    def __setstate__(self, _state):
+        self.Schema = IDF_Schema.get(_state[0], _state[1])
+        self.objName = self.Schema.ObjName
+        self.Values = _state[2]
+    
+    def __repr__(self):
+        return "An IDF File object with all its Params"
+
+class IDF_Model:
+    """ All the objects read from an IDF file, indexed by IDF Class and by Name
+    
+    Objects are stored as compact IDF_Class records (a tuple of values and a shared 
+    schema). Named fields are only looked up when something asks for them. Looking 
+    up all the objects of one IDF Class only touches those objects, not the whole file.
+    """
+    
+    def __init__(self):
+        self._records = []                   # IDF_Class for each object, in file order
+        self.ClassIndex = defaultdict(list)  # 'Construction' -> [record index, ...]
+        self.NameIndex = {}                  # ('CONSTRUCTION', 'EXT_WALL') -> record index
+        self.FromCache = False               # True if the model was loaded from the cache file
+    
+    @classmethod
+    def fromInput(cls, _input):
+        """ Returns the IDF_Model passed in, or builds one from a plain list of IDF_Class objects """
+        
+        _input = list(_input or [])
+        if len(_input) == 1 and isinstance(_input[0], IDF_Model):
+            return _input[0]
+        
+        model = cls()
+        for eachObj in _input:
+            model.addObj(eachObj)
+        return model
+    
+    def add(self, _objName, _values, _names):
+        """ Adds a new object to the model from the IDF tokenizer output """
+        
+        self.addObj( IDF_Class.fromTokens(_objName, _values, _names) )
+    
+    def addObj(self, _idfObj):
+        """ Adds an IDF_Class object to the model """
+        
+        objName = getattr(_idfObj, 'objName', '')
+        name = getattr(_idfObj, 'Name', None)
+        if name is None and isinstance(_idfObj, IDF_Class) and _idfObj.Values:
+            name = _idfObj.Values[0] # The 'Name' field is almost always the first one
+        
+        i = len(self._records)
+        self._records.append(_idfObj)
+        self.ClassIndex[objName].append(i)
+        if name:
+            self.NameIndex[(objName.upper(), name.upper())] = i
+    
+    def toData(self):
+        """ Returns the model as plain data (lists, tuples and strings) so it can be saved to disk 
+        
+        Each distinct schema is only stored once. Rebuild the model with IDF_Model.fromData()
+        """
+        
+        schemaNums = {}
+        schemas = []
+        records = []
+        for eachObj in self._records:
+            schemaNum = schemaNums.get(eachObj.Schema)
+            if schemaNum is None:
+                schemaNum = len(schemas)
+                schemaNums[eachObj.Schema] = schemaNum
+                schemas.append( (eachObj.Schema.ObjName, eachObj.Schema.Keys) )
+            records.append( (schemaNum, eachObj.Values) )
+        
+        return {'schemas':schemas, 'records':records}
+    
+    @classmethod
+    def fromData(cls, _data):
+        """ Rebuilds a model from the plain data created by toData() """
+        
+        schemas = [IDF_Schema.get(objName, keys) for objName, keys in _data['schemas']]
+        nameFields = [schema.KeyIndex.get('Name', (0, 1))[0] for schema in schemas]
+        
+        model = cls()
+        records = model._records
+        for i, (schemaNum, values) in enumerate(_data['records']):
+            schema = schemas[schemaNum]
+            records.append( IDF_Class(schema, values) )
+            model.ClassIndex[schema.ObjName].append(i)
+            name = values[nameFields[schemaNum]] if values else None
+            if name:
+                model.NameIndex[(schema.ObjName.upper(), name.upper())] = i
+        
+        return model
+    
+    def getClassNames(self, _like=None):
+        """ Returns the IDF Class names found in the file, in file order
+        
+        Args:
+            _like (str): <Optional> Only return the Class names which include this text
+        """
+        
+        classNames = sorted(self.ClassIndex.keys(), key=lambda nm: self.ClassIndex[nm][0])
+        if _like is None:
+            return classNames
+        return [nm for nm in classNames if _like in nm]
+    
+    def getObjs(self, *_objNames):
+        """ Returns the IDF_Class objects of the IDF Class(es) given, in file order """
+        
+        indexes = []
+        for objName in _objNames:
+            indexes.extend( self.ClassIndex.get(objName, []) )
+        
+        return [self._records[i] for i in sorted(indexes)]
+    
+    def getObjsLike(self, _text):
+        """ Returns the IDF_Class objects of every IDF Class whose name includes the text """
+        
+        return self.getObjs(*self.getClassNames(_text))
+    
+    def getObjByName(self, _objName, _name, _default=None):
+        """ Finds a single object by its IDF Class and Name (not case sensitive) """
+        
+        i = self.NameIndex.get( (_objName.upper(), str(_name).upper()) )
+        if i is None:
+            return _default
+        return self._records[i]
+    
+    def __len__(self):
+        return len(self._records)
+    
+    def __iter__(self):
+        return iter(self._records)
+    
+    def __unicode__(self):
+        return u'An IDF Model with {} objects of {} IDF Classes'.format(len(self), len(self.ClassIndex))
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+    
+    def __repr__(self):
+        return "{}( _numObjs={!r}, _classNames={!r} )".format(
+               self.__class__.__name__,
+               len(self),
+               self.getClassNames())
+
+def idfTokenize(_idfFilePath):
+    """ Reads an IDF file in place and yields each object as soon as its closing ';' is found
+    
+    Follows the EnergyPlus IDF grammar: fields are separated by commas, each 
+    object ends with a semicolon, and anything after a '!' is a comment. Any number 
+    of fields may sit on a single line. An '!-' comment names the field(s) completed 
+    on that line, ie: "0.0, 0.0, 3.0,  !- X,Y,Z Vertex 1 {m}". Only one object 
+    is ever held in memory at a time.
+    
+    Args:
+        _idfFilePath (str): The full path to the .idf file to read
+    Yields (tuple):
+        0: objName (str) The IDF Class of the object, ie: 'BuildingSurface:Detailed'
+        1: values (list) The object's field values, in order
+        2: names (list) The '!-' name for each field value (None if it has no name)
+    """
+    
+    splitter = re.compile(r'([,;])')
+    objName = None
+    values = []
+    names = []
+    partial = ''
+    
+    with io.open(_idfFilePath, 'r', encoding='utf-8', errors='replace') as idfFile:
+        for line in idfFile:
+            body, bang, comment = line.partition('!')
+            fieldName = comment[1:].strip() if comment.startswith('-') else None
+            lineStart = len(values)
+            
+            pieces = splitter.split(body)
+            for i in range(0, len(pieces)-1, 2):
+                token = (partial + pieces[i]).strip()
+                partial = ''
+                
+                if objName is None:
+                    objName = token
+                else:
+                    values.append(token)
+                    names.append(None)
+                
+                if pieces[i+1] == ';':
+                    # Name any fields completed on this line before handing the object off
+                    if fieldName:
+                        for j in range(lineStart, len(values)):
+                            names[j] = fieldName
+                    
+                    if objName:
+                        yield objName, values, names
+                    
+                    objName = None
+                    values = []
+                    names = []
+                    lineStart = 0
+                    fieldName = None
+            
+            # Anything after the last separator carries on to the next line
+            partial = partial + pieces[-1] if pieces[-1].strip() else partial
+            
+            if fieldName:
+                for j in range(lineStart, len(values)):
+                    names[j] = fieldName
+
+def fileHash(_filePath):
+    """ Returns the SHA-1 of the file's contents. Remembered for the session while the file's mtime and size don't change """
+    
+    fileStat = os.stat(_filePath)
+    fileKey = (os.path.abspath(_filePath), fileStat.st_mtime, fileStat.st_size)
+    knownHashes = _fileHashes
+    
+    if fileKey not in knownHashes:
+        sha = hashlib.sha1()
+        with open(_filePath, 'rb') as dataFile:
+            for chunk in iter(lambda: dataFile.read(1024 * 1024), b''):
+                sha.update(chunk)
+        knownHashes[fileKey] = sha.hexdigest()
+    
+    return knownHashes[fileKey]
+
+def idfCacheFilePath(_idfFilePath):
+    """ Returns the cache file path for the IDF, keyed by its content hash, mtime and the reader version
+    
+    ie: '.../idf2phpp_cache/in.idf_3f2a9c0d1b7e4a5c6d8e.cache'
+    """
+    
+    cacheKey = '{}|{!r}|{}'.format(fileHash(_idfFilePath), os.path.getmtime(_idfFilePath), IDF_READER_VERSION)
+    cacheKey = hashlib.sha1(cacheKey.encode('utf-8')).hexdigest()[:20]
+    
+    idfFolder, idfFileName = os.path.split(os.path.abspath(_idfFilePath))
+    return os.path.join(idfFolder, IDF_CACHE_FOLDER, '{}_{}.cache'.format(idfFileName, cacheKey))
+
+def readIDFCache(_cacheFilePath):
+    """ Returns the IDF_Model saved in the cache file, or None if there isn't a good one """
+    
+    if not os.path.exists(_cacheFilePath):
+        return None
+    
+    try:
+        with open(_cacheFilePath, 'rb') as cacheFile:
+            return IDF_Model.fromData( pickle.load(cacheFile) )
+    except Exception as e:
+        log.info('Ignoring the unreadable IDF cache file: {} ({})'.format(_cacheFilePath, e))
+        return None
+
+def writeIDFCache(_cacheFilePath, _idfModel):
+    """ Saves the IDF_Model to the cache file. Writes to a temp file first so a half written cache is never read 
+    
+    Returns:
+        bool: True if the cache file was written
+    """
+    
+    try:
+        cacheFolder = os.path.dirname(_cacheFilePath)
+        if not os.path.exists(cacheFolder):
+            os.makedirs(cacheFolder)
+        
+        tempFilePath = _cacheFilePath + '.tmp'
+        with open(tempFilePath, 'wb') as cacheFile:
+            pickle.dump(_idfModel.toData(), cacheFile, pickle.HIGHEST_PROTOCOL)
+        
+        if os.path.exists(_cacheFilePath):
+            os.remove(_cacheFilePath)
+        os.rename(tempFilePath, _cacheFilePath)
+    except Exception as e:
+        warning = 'Unable to write the IDF cache file: {}\n{}'.format(_cacheFilePath, e)
+        warnings.warn(warning, IDF2PHPPWarning)
+        return False
+    
+    return True
+
+def cleanIDFCache(_cacheFolder, _idfFileName, _keepFilePath=None, _maxSize=IDF_CACHE_MAX_SIZE):
+    """ Removes the stale cache files for the IDF, then the oldest files until the folder fits in the max size
+    
+    Args:
+        _cacheFolder (str): The cache folder to clean up
+        _idfFileName (str): The IDF file name ('in.idf'). Any of its cache files other than the one to keep are removed
+        _keepFilePath (str): <Optional> The current cache file, which is never removed
+        _maxSize (int): The max total size (bytes) of all the cache files in the folder
+    """
+    
+    if not os.path.isdir(_cacheFolder):
+        return
+    
+    # Only this IDF's own cache files ('in.idf_<key>.cache'), not 'in.idf_v2.idf_<key>.cache'
+    idfCacheName = re.compile(re.escape(_idfFileName) + r'_[0-9a-f]{20}\.cache(\.tmp)?$')
+    
+    cacheFiles = []
+    for fileName in os.listdir(_cacheFolder):
+        filePath = os.path.join(_cacheFolder, fileName)
+        if not fileName.endswith(('.cache', '.tmp')) or not os.path.isfile(filePath):
+            continue
+        
+        if filePath != _keepFilePath and idfCacheName.match(fileName):
+            # Old version of this same IDF file
+            try:
+                os.remove(filePath)
+            except OSError:
+                pass
+        else:
+            fileStat = os.stat(filePath)
+            cacheFiles.append( (fileStat.st_mtime, fileStat.st_size, filePath) )
+    
+    # Oldest first
+    cacheFiles.sort()
+    totalSize = sum(fileSize for _, fileSize, _ in cacheFiles)
+    for _, fileSize, filePath in cacheFiles:
+        if totalSize <= _maxSize:
+            break
+        if filePath == _keepFilePath:
+            continue
+        try:
+            os.remove(filePath)
+            totalSize -= fileSize
+        except OSError:
+            pass
+
+def readIDF(_idfFilePath, _useCache=True, _invalidateCache=False):
+    """ Reads an IDF file into an IDF_Model, using the cached copy next to the file when there is a good one
+    
+    Args:
+        _idfFilePath (str): The full path to the .idf file to read
+        _useCache (bool): Default=True. Set False to always parse the file and never read or write the cache
+        _invalidateCache (bool): Default=False. Set True to delete any cached copies of this file and parse it again
+    Returns:
+        IDF_Model: The model of all the IDF objects. Its 'FromCache' attribute is True if it was read from the cache
+    """
+    
+    idfModel = None
+    if _useCache:
+        cacheFilePath = idfCacheFilePath(_idfFilePath)
+        cacheFolder = os.path.dirname(cacheFilePath)
+        idfFileName = os.path.basename(_idfFilePath)
+        
+        if _invalidateCache:
+            cleanIDFCache(cacheFolder, idfFileName)
+        else:
+            idfModel = readIDFCache(cacheFilePath)
+    
+    if idfModel is not None:
+        idfModel.FromCache = True
+        return idfModel
+    
+    # Index all the IDF objects, one at a time as the file is read
+    idfModel = IDF_Model()
+    for objName, values, names in idfTokenize(_idfFilePath):
+        idfModel.add(objName, values, names)
+    
+    if _useCache:
+        writeIDFCache(cacheFilePath, idfModel)
+        cleanIDFCache(cacheFolder, idfFileName, cacheFilePath)
+    
+    return idfModel
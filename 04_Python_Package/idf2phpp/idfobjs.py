@@ -0,0 +1,373 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Classes for holding onto the IDF data needed for the PHPP: Zones, Materials, 
+Constructions, Surfaces and Windows. Built from the IDF_Class objects in an 
+IDF_Model. No Rhino or Grasshopper needed.
+"""
+
+from __future__ import absolute_import
+import math
+import logging
+import warnings
+
+from ._compat import toStr, IDF2PHPPWarning
+from .geometry import (PHPP_Vector, phpp_polygonProps, phpp_calcNorthAngle, 
+                        phpp_angleFromHoriz, phpp_windowSizeFromVerts)
+from .phpp import PHPP_Glazing, PHPP_Frame, PHPP_Window_Install
+
+log = logging.getLogger(__name__)
+
+class IDF_Zone:
+    def __init__(self, _idfObj):
+        self.ZoneName = getattr(_idfObj, 'Name')
+        self.InfiltrationACH50 = None
+        self.Volume_Gross = None
+        self.FloorArea_Gross = False
+        self.Volume_Vn50 = None
+        self.TFA = None
+        
+    def __unicode__(self):
+        return u'An IDF Zone Object: {}'.format(self.ZoneName)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+
+class IDF_ZoneList:
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name')
+        
+        for eachKey, eachValue in _idfObj.getFields():
+            if 'Zone ' in eachKey:
+                setattr(self, eachKey, eachValue )
+                
+    def __unicode__(self):
+        return u'An IDF ZoneList Object: {}'.format(self.Name)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+
+class IDF_ZoneInfilFlowRate:
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name')
+        self.ZoneName = getattr(_idfObj, 'Zone or ZoneList Name')
+        self.ScheduleName = getattr(_idfObj, 'Schedule Name')
+        self.DesignFlowRate = getattr(_idfObj, 'Design Flow Rate {m3/s}')
+        self.FlowRatePerFloorArea = getattr(_idfObj, 'Flow per Zone Floor Area {m3/s-m2}')
+        self.FlowRatePerSurfaceArea =  getattr(_idfObj, 'Flow per Exterior Surface Area {m3/s-m2}')
+        self.ACH =  getattr(_idfObj, 'Air Changes per Hour {1/hr}')
+        
+    def __unicode__(self):
+        return u'An IDF Zone Infiltration Flow Rate Object: {}'.format(self.Name)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+
+class IDF_Obj_building:
+    # Basic Building Data and North Orientation information
+    
+    def __init__(self, _idfObj):
+        self.BldgName = getattr(_idfObj, 'Name')
+        self.NorthAngle = getattr(_idfObj, 'North Axis {deg}') # in Degrees off North (North=0 ,East=90, etc..)
+        self.NorthVector = self.calcNorthAnglefromVec(self.NorthAngle) # Calc degrees from the Vector
+    
+    def calcNorthAnglefromVec(self, _northAngle):
+        _northAngle = float(_northAngle) * -1 # *-1 to go clockwise?
+        # Rotate the Y-Axis (0,1,0) about Z by the angle
+        northVec = PHPP_Vector(-math.sin(math.radians(_northAngle)), math.cos(math.radians(_northAngle)), 0.0)
+        return northVec
+    
+    def __unicode__(self):
+        return u'The Building Data Object: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+
+class IDF_Obj_MaterialLayer:
+    # For holding onto Params for 
+    # 'Material' and 'Material:AirGap' objects
+    
+    def __init__(self, _idfObj, noMass=False):
+        self.Name = getattr(_idfObj, 'Name').replace('__Int__', '')
+        self.MatType = getattr(_idfObj, 'objName')
+        
+        # Set object defaults
+        self.LayerThickness = None
+        self.LayerConductivity = None
+        self.LayerConductance = None
+        self.Type = None
+        
+        if noMass == False:
+            # Get the actual data from the IDF Object to set up the rest
+            self.getLayerData(_idfObj)
+            self.setLayerData()
+        elif noMass == True:
+            self.getNoMassData(_idfObj)
+    
+    def getNoMassData(self, _idfObj):
+        # Get all the relevant data from the IDF Object
+        for eachKey in _idfObj.getFieldNames():
+            if 'Thermal Resistance {m2-K/W}' in eachKey:
+                self.LayerConductance = 1 / float(getattr(_idfObj, 'Thermal Resistance {m2-K/W}'))
+                self.LayerThickness = 1
+                self.LayerConductivity = self.LayerConductance
+    
+    def getLayerData(self, _idfObj):
+        # Get all the relevant data from the IDF Object
+        for eachKey in _idfObj.getFieldNames():
+            if 'Thickness {m}' in eachKey:
+                self.LayerThickness = getattr(_idfObj, 'Thickness {m}')
+            elif 'Conductivity {W/m-K}' in eachKey:
+                self.LayerConductivity = getattr(_idfObj, 'Conductivity {W/m-K}')
+            elif 'Thermal Resistance {m2-K/W}' in eachKey:
+                self.LayerConductance = 1 / float(getattr(_idfObj, 'Thermal Resistance {m2-K/W}'))
+    
+    def setLayerData(self):
+        # Sort out the layer conductances/Resistances (m2-k/W)
+        if 'AirGap' in self.MatType:
+            self.LayerThickness = 1
+        
+        self.LayerThickness = float(self.LayerThickness) if self.LayerThickness else 0.1 # Apply default thickness if none
+        
+        if self.LayerConductance == None:
+            self.LayerConductance = float(self.LayerConductivity) * float(self.LayerThickness)
+        elif self.LayerConductance != None and self.LayerConductivity == None:
+            log.debug('{}: {}'.format(self.Name, self.LayerThickness))
+            self.LayerConductivity = float(self.LayerConductance) / float(self.LayerThickness)
+        
+    def __unicode__(self):
+        return u'EnergyPlus Material Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+
+class IDF_Obj_MaterialWindowSimple:
+    # For holding onto Params for
+    # WindowMaterial:SimpleGlazingSystem Objects
+    
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name' )
+        self.uValue = getattr(_idfObj, 'U-Factor {W/m2-K}' )
+        self.gValue = getattr(_idfObj, 'Solar Heat Gain Coefficient' )
+        self.VT = getattr(_idfObj, 'Visible Transmittance' )
+    
+    def __unicode__(self):
+        return u'EnergyPlus WindowMaterial:Simple Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+
+class IDF_Obj_MaterialWindowGlazing:
+    # For holding onto Params for
+    # WindowMaterial:Glazing Objects
+    
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name' )
+        self.Thickness = float( getattr(_idfObj, 'Thickness {m}' ) )
+        self.Conductivity = float( getattr(_idfObj, 'Conductivity {W/m-K}' ) )
+        self.uValue = 1 / (self.Thickness/self.Conductivity)
+        self.gValue = getattr(_idfObj, 'Solar Transmittance at Normal Incidence' )
+        self.VT = getattr(_idfObj, 'Visible Transmittance at Normal Incidence' )
+    
+    def __unicode__(self):
+        return u'EnergyPlus WindowMaterial:Glazing Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+
+class IDF_Obj_MaterialWindowGas:
+    # For holding onto Params for
+    # WindowMaterial:Gas Objects
+    #https://www.engineersedge.com/heat_transfer/thermal-conductivity-gases.htm
+    
+    gasConductivities = {'Air': 0.0262,
+                        'Argon': 0.0179,
+                        'Krypton': 0.0095,
+                        'Xenon': 0.0055
+    }
+    
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name' )
+        self.GasType = getattr(_idfObj, 'Gas Type' )
+        self.Conductivity = self.gasConductivities[self.GasType]
+        self.Thickness = float( (getattr(_idfObj, 'Thickness {m}' ) ) )
+        self.uValue = 1 / (self.Thickness / self.Conductivity)
+    
+    def __unicode__(self):
+        return u'EnergyPlus WindowMaterial:Gas Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+
+class IDF_Obj_Construction:
+    """
+    For holding onto Params for EnergPlus 'Construction' objects (Assemblies)
+    Note that when created, the new Object will clean up its name to remove any 
+    '__Int_' flags and then set the 'IntInsul' attribute as appropriate
+    """
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name')
+        self.getLayerNames(_idfObj)
+        self.checkInteriorInsul()
+    
+    def checkInteriorInsul(self):
+        if '__Int__' in self.Name:
+            self.IntInsul = 'x'
+            self.Name = self.Name.replace('__Int__', '')
+        else:
+            self.IntInsul = None
+            
+    def getLayerNames(self, _idfObj):
+        # Set the self.Layers list of names
+        self.Layers = []
+        self.LayerNames = []
+        
+        for eachKey in _idfObj.getFieldNames():
+            if 'Layer' in eachKey:
+                layerNum = eachKey
+                layerName = getattr(_idfObj, eachKey)
+                layerName = layerName.replace('__Int__', '')
+                self.Layers.append( [layerNum, layerName]  )
+                self.LayerNames.append(layerName)
+    
+    def __unicode__(self):
+        return u'EnergyPlus Construction Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+
+class IDF_Obj_surfaceWindow:
+    # For holding onto Params for
+    # FenestrationSurface:Detailed Objects
+    
+    def __init__(self, _idfObj, _winSimpleMat, _wShadFac, _sShadFac):
+        self.Quantity = 1
+        self.Name = getattr(_idfObj, 'Name')
+        self.Dims = self.getWindowSize(_idfObj)
+        self.Width = self.Dims[0]
+        self.Height = self.Dims[1]
+        self.HostSrfc = getattr(_idfObj, 'Building Surface Name')
+        self.winterShadingFac = _wShadFac
+        self.summerShadingFac = _sShadFac
+        self.EPConstuctionName = getattr(_idfObj, "Construction Name")
+        
+        # This will take in an EP 'WindowMaterial:SimpleGlazingSystem' and build PHPP style frame / glass
+        self.setPHPPConstruction(self.EPConstuctionName, _winSimpleMat)
+    
+    def getWindowSize(self, _idfObj):
+        # Width, Height from the Vertex points
+        return phpp_windowSizeFromVerts( _idfObj.getVertices() )
+    
+    def setPHPPConstruction(self, _constructionName, _winSimpleMat, _installs=[1,1,1,1]):
+        # Sets the PHPP Style Frame, Glass and Installs 
+        self.Type_Glass = PHPP_Glazing(
+                _constructionName, # Name
+                _winSimpleMat.gValue, # g-Value
+                _winSimpleMat.uValue # U-Value
+                )
+        
+        self.Type_Frame = PHPP_Frame(
+                _constructionName, # Name
+                [_winSimpleMat.uValue, _winSimpleMat.uValue, _winSimpleMat.uValue, _winSimpleMat.uValue], # Frame U-Values
+                [0.12, 0.12, 0.12, 0.12], # Frame Widths (Default to 0.1m)
+                [0.00, 0.00, 0.00, 0.00], # Psi-Glazing Edge Defaults
+                [0.00, 0.00, 0.00, 0.00] # Psi-Installs Defaults)
+                ) 
+        
+        self.Installs = PHPP_Window_Install(_installs)
+    
+    def __unicode__(self):
+        return u'FenestrationSurface:Detailed: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+
+class IDF_Obj_surfaceOpaque:
+    # For holding onto Params for
+    # BuildingSurface:Detailed Objects
+    
+    def __init__(self, _idfObj, _northAngle, _geomProps=None):
+        self.Name = getattr(_idfObj, 'Name')
+        self.AssemblyName = getattr(_idfObj, 'Construction Name')
+        self.srfcType = getattr(_idfObj, 'Surface Type')
+        self.exposure = getattr(_idfObj, 'Outside Boundary Condition')
+        self.HostZoneName = getattr(_idfObj, 'Zone Name')
+        self.findGroupNumber(self.srfcType, self.exposure)
+        self.getGeometryData(_idfObj, _northAngle, _geomProps)
+    
+    def getGeometryData(self, idfObj, _northAngle, _geomProps=None):
+        # Area, Centroid and Normal from the Vertex points
+        self._vertsXYZ = idfObj.getVertices()
+        self.SurfaceArea, self.Centroid, self.NormalVector = _geomProps or phpp_polygonProps(self._vertsXYZ)
+        
+        # Find the Rotation off North Vector
+        self.AngleFromNorth = phpp_calcNorthAngle(self.NormalVector, _northAngle)
+        
+        # Find the Rotation off Horizontal
+        self.AngleFromHoriz = phpp_angleFromHoriz(self.NormalVector)
+        
+        # Use Defaults at this time.
+        # Someday calc the shading factors and have inputs for the rest?
+        self.Factor_Shading = 0.5 # Default
+        self.Factor_Absorptivity = 0.6  # Default
+        self.Factor_Emissivity = 0.9   # Default
+    
+    def findGroupNumber(self, _srfcType, _exposureType):
+        # Figure out the 'Group Number' for PHPP based on the EP Exposure type
+        if _exposureType == 'Surface':
+            pass
+        elif _srfcType == 'Wall' and _exposureType == 'Outdoors':
+            self.GroupNum = 8
+        elif _srfcType == 'Wall' and _exposureType == 'Ground':
+            self.GroupNum = 9
+        elif _srfcType == 'Roof' and _exposureType == 'Outdoors':
+            self.GroupNum = 10
+        elif _srfcType == 'Floor' and _exposureType == 'Ground':
+            self.GroupNum = 11
+        elif _srfcType == 'Floor' and _exposureType == 'Outdoors':
+            self.GroupNum = 12
+        elif _exposureType == 'Adiabatic':
+            self.GroupNum = 18
+        else:
+            self.GroupNum = 13
+            groupWarning = "Couldn't figure out the Group Number for surface '{}' ({}, {})?".format(self.Name, _srfcType, _exposureType)
+            warnings.warn(groupWarning, IDF2PHPPWarning)
+    
+    def __unicode__(self):
+        return u'EnergyPlus BuildingSurface:Detailed Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+
+class IDF_Obj_location:
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name')
+        self.Latitude = getattr(_idfObj, 'Latitude {deg}')
+        self.Longitude = getattr(_idfObj, 'Longitude {deg}')
+        self.TimeZone = getattr(_idfObj, 'Time Zone {hr}')
+        self.Elevation = getattr(_idfObj, 'Elevation {m}')
+    
+    def __unicode__(self):
+        return u'EnergyPlus Location Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
@@ -0,0 +1,97 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Helpers for running work in parallel: the number of CPUs, and an ordered map over 
+a pool of threads (for work on shared objects, such as Rhino geometry, which can't 
+be sent to other processes).
+"""
+
+from __future__ import absolute_import
+import threading
+
+def cpuCount():
+    """ Returns the number of CPUs (1 if it can't tell) """
+    
+    try:
+        import multiprocessing
+        return multiprocessing.cpu_count()
+    except (ImportError, NotImplementedError):
+        pass
+    
+    try:
+        import System  # IronPython has no multiprocessing
+        return System.Environment.ProcessorCount
+    except ImportError:
+        return 1
+
+def mapThreaded(_func, _items, _workers=None):
+    """ Calls _func(item) for each of the items on a pool of threads, and returns the results in the items' order
+    
+    Under IronPython (no GIL) the threads really do run at the same time. Each thread 
+    takes the next item as it finishes the last one, so slow items don't hold up 
+    the others. The results are always in the same order as the items, however the 
+    work was split up.
+    
+    Args:
+        _func: The function to call with each item
+        _items (list): The items
+        _workers (int): <Optional> The number of threads. Default is the number of CPUs. 
+            Use 1 to run them one after the other, in this thread.
+    Returns:
+        list: _func(item) for each item
+    Raises:
+        The first error (in item order) from any of the calls, once all the threads have finished
+    """
+    
+    items = list(_items)
+    workers = max(1, min(_workers or cpuCount(), len(items) or 1))
+    if workers == 1:
+        return [_func(item) for item in items]
+    
+    results = [None] * len(items)
+    errors = {}
+    nextIndex = iter(range(len(items)))
+    lock = threading.Lock()
+    
+    def work():
+        while True:
+            with lock:
+                i = next(nextIndex, None)
+            if i is None:
+                return
+            
+            try:
+                results[i] = _func(items[i])
+            except Exception as e:
+                errors[i] = e
+    
+    threads = [threading.Thread(target=work) for _ in range(workers)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    if errors:
+        raise errors[min(errors)]
+    
+    return results
@@ -0,0 +1,257 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+The PHPP objects built from the IDF data (Window Components, Climate) and the 
+Excel-ready PHPP_XL_Obj cell writes. No Rhino or Grasshopper needed.
+"""
+
+from __future__ import absolute_import
+
+from ._compat import toStr
+from .units import CONVERSIONS, convertValue
+
+class PHPP_Window_Install:
+    """ For storing the install conditions (0|1) of each edge in a window component """
+    
+    def __init__(self, _installs):
+        """
+        Args:
+            _installs (list): A list of four 'install' types (Left, Right, Bottom, Top)
+        """
+        self.Installs = _installs
+        self.setInstalls()
+        
+    def setInstalls(self):
+        # In case the number of installs passed != 4, use the first one for all of them
+        if len(self.Installs) != 4:
+            self.Inst_L = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
+            self.Inst_R = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
+            self.Inst_B = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
+            self.Inst_T = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
+        else:
+            self.Inst_L = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
+            self.Inst_R = float(self.Installs[1]) if self.Installs[1] != None else 'Auto'
+            self.Inst_B = float(self.Installs[2]) if self.Installs[2] != None else 'Auto'
+            self.Inst_T = float(self.Installs[3]) if self.Installs[3] != None else 'Auto'
+    
+    def getAllasList(self):
+        # So can easily output all the items in a single list
+        return [int(self.Inst_L), int(self.Inst_R), int(self.Inst_B), int(self.Inst_T)]
+    
+    def __unicode__(self):
+        return u'A PHPP Style Window Install Object: < L={self.Inst_L} | R={self.Inst_R} | T={self.Inst_T} | B={self.Inst_B} >'.format(self=self)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+    
+    def __repr__(self):
+       return "{}( _installs={!r} )".format(
+               self.__class__.__name__, self.Installs)
+
+class PHPP_Glazing:
+    """ For storing PHPP Style Glazing Parameters """
+    
+    def __init__(self, _nm, _gValue, _uValue):
+        """
+        Args:
+            _nm (str): The name of the glass type
+            _gValue (float): The g-Value (SHGC) value of the glass only as per EN 410 (%)
+            _uValue (float): The Thermal Trasmittance value of the center of glass (W/m2k) as per EN 673
+        """
+        self.Name = _nm
+        try:
+            self.gValue = float(_gValue)
+        except:
+            self.gValue = _gValue
+        
+        try:
+            self.uValue = float(_uValue)
+        except:
+            self.uValue = _uValue
+        
+        
+    def __unicode__(self):
+        return u'A PHPP Style Glazing Object: < {self.Name} >'.format(self=self)
+    
+    def __str__(self):
+        return toStr(self.__unicode__())
+    
+    def __repr__(self):
+       return "{}( _nm={!r}, _gValue={!r}, _uValue={!r} )".format(
+               self.__class__.__name__,
+               self.Name,
+               self.gValue,
+               self.uValue)
+
+class PHPP_Frame:
+    """ For Storing PHPP Style Frame Parameters """
+    
+    def __init__(self, _nm, _uValues, _frameWidths, _psiGlazings, _psiInstalls, _chiGlassCarrier=None):
+        """
+        Args:
+            _nm (str): The name of the Frame Type
+            _uValues (list): A list of the 4 U-Values (W/m2k) for the frame sides (Left, Right, Bottom, Top)
+            _frameWidths (list): A list of the 4 U-Values (W/m2k) for the frame sides (Left, Right, Bottom, Top)
+            _psiGlazings (list): A list of the 4 Psi-Values (W/mk) for the glazing spacers (Left, Right, Bottom, Top)
+            _psiInstalls (list): A list of the 4 Psi-Values (W/mk) for the frame Installations (Left, Right, Bottom, Top)
+            _chiGlassCarrier (list): A value for the Chi-Value (W/k) of the glass carrier for curtain walls
+        """
+        self.Name = _nm
+        
+        self.uValues = _uValues
+        self.frameWidths = _frameWidths
+        self.PsiGVals = _psiGlazings
+        self.PsiInstalls = _psiInstalls
+        self.chiGlassCarrier = _chiGlassCarrier
+        
+        self.cleanAttrSet(['uLeft', 'uRight', 'uBottom', 'uTop'], self.uValues)
+        self.cleanAttrSet(['fLeft', 'fRight', 'fBottom', 'fTop'], self.frameWidths)
+        self.cleanAttrSet(['psigLeft', 'psigRight', 'psigBottom', 'psigTop'], self.PsiGVals)
+        self.cleanAttrSet(['psiInstLeft', 'psiInstRight', 'psiInstBottom', 'psiInstTop'], self.PsiInstalls)
+    
+    def cleanAttrSet(self, _inList, _attrList):
+        # In case the input len != 4 and convert to float values
+        if len(_attrList) != 4:
+            try:
+                val = float(_attrList[0])
+            except:
+                val = _attrList[0]
+            
+            for each in _inList:
+                setattr(self, each, val)
+        else:
+            for i, each in enumerate(_inList):
+                try:
+                    val = float(_attrList[i])
+                except:
+                    val = _attrList[i]
+                
+                setattr(self, _inList[i], val)
+    
+    def __unicode__(self):
+        return u'A PHPP Style Frame Object: < {self.Name} >'.format(self=self)
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+       return "{}( _nm={!r}, _uValues={!r}, _frameWidths={!r}, _psiGlazings={!r}, "\
+              "_psiInstalls={!r}, _chiGlassCarrier={!r} )".format(
+               self.__class__.__name__,
+               self.Name,
+               self.uValues,
+               self.frameWidths,
+               self.PsiGVals,
+               self.PsiInstalls,
+               self.chiGlassCarrier )
+
+class PHPP_ClimateDataSet:
+    
+    def __init__(self, _dataSet='US0055b-New York', _alt='=J23', _cntry='US-United States of America', _reg='New York'):
+        self.DataSet = _dataSet
+        self.Altitude = _alt
+        self.Country = _cntry
+        self.Region = _reg
+    
+    def __unicode__(self):
+        return u'A Location Object for: "{!r}":'.format(self.DataSet)
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}( _dataSet={!r}, _alt={!r}, _cntry={!r}, _reg{!r} )".format(
+               self.__class__.__name__,
+               self.DataSet,
+               self.Altitude,
+               self.Country,
+               self.Region)
+
+class PHPP_XL_Obj:
+    """ A holder for an Excel writable datapoint with a worksheet, range and value """
+    
+    # {Unit You have: {Unit you Want: (kind, factor, offset)}, ...} See units.py
+    conversionSchema = CONVERSIONS
+    
+    def __init__(self, _shtNm, _rangeAddress, _val, _unitSI=None, _unitIP='SI'):
+        """
+        Args:
+            _shtNm (str): The Name of the Worksheet to write to
+            _rangeAddress (str): The Cell Range (A1, B12, etc...) to write to on the Worksheet
+            _val (str): The Value to write to the Cell Range (Value2)
+            _unitSI: (str) The SI unit for the item
+            _unitIP: (str) The IP unit for the item
+        """
+        self.Worksheet = _shtNm
+        self.Range = _rangeAddress
+        self.Value = _val
+        self.Unit_SI = _unitSI
+        self.Unit_IP = _unitIP
+    
+    def getWorksheet(self, _units='SI'):
+        if _units == 'SI':
+            return self.Worksheet
+        
+        if self.Worksheet == 'U-Values':
+            return 'R-Values'
+        elif self.Worksheet == 'Additional Vent':
+            return 'Addl vent'
+        else:
+            return self.Worksheet
+    
+    def getValue(self, _targetUnit='SI'):
+        """ Get the Item Value properly. Allows for unit conversion.
+        
+        For instance calling "obj.getValue(obj.Unit_IP)" will return the 
+        converted value into Inch-Pound units. Pass 'SI' or leave 
+        input blank for no conversion (return = self.Value x 1.0). Values which
+        can't be converted (text, formulas...) are returned as is.
+        
+        Args:
+            _targetUnit: (str) The unit to convert the value to. 'SI' or 'IP'
+        Returns:
+            value converted into the right units
+        """
+        
+        if not self.Unit_SI:
+            return self.Value
+        
+        if _targetUnit == 'IP':
+            targetUnit = self.Unit_IP
+        elif _targetUnit == 'SI':
+            targetUnit = self.Unit_SI
+        else:
+            targetUnit = _targetUnit
+        
+        try:
+            return convertValue(self.Value, self.Unit_SI, targetUnit)
+        except (ValueError, TypeError, ZeroDivisionError):
+            return self.Value
+    
+    def __unicode__(self):
+        return u"PHPP Obj | Worksheet: {self.Worksheet}  |  Cell: {self.Range}  |  Value: {self.Value}".format(self=self)
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+       return "{}( _nm={!r}, _shtNm={!r}, _rangeAddress={!r}, _val={!r}, _unitSI={!r}, _unitIP={!r}".format(
+               self.__class__.__name__,
+               self.Worksheet,
+               self.Range,
+               self.Value,
+               self.Unit_SI,
+               self.Unit_IP)
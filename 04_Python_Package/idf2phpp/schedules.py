@@ -0,0 +1,194 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Hourly schedule profiles (ie: a zone's 8760 occupancy schedule) kept as compact 
+array('d') values, with the annual reductions the ventilation calcs need, and a 
+cache of the profiles already read so each schedule only gets parsed once.
+"""
+
+from __future__ import absolute_import
+import os
+from array import array
+from collections import OrderedDict
+
+from ._compat import toStr, text_type
+
+class PHPP_HourlyProfile:
+    """ A schedule's hourly values (fractions), stored as an array('d') """
+    
+    def __init__(self, _values, _name=None):
+        """
+        Args:
+            _values (iterable): The hourly values (floats)
+            _name (str): <Optional> The schedule's name
+        """
+        self.Name = _name
+        self.Values = array('d', _values)
+    
+    @classmethod
+    def fromHBResult(cls, _result, _name=None):
+        """ Builds the profile from a Honeybee / Ladybug 'header + values' list
+        
+        Anything which isn't a number (the header's text and date tuples) is left out.
+        """
+        
+        values = array('d')
+        for item in _result:
+            try:
+                values.append(float(item))
+            except (TypeError, ValueError):
+                pass
+        
+        return cls(values, _name)
+    
+    def mean(self):
+        """ The average of the hourly values (0 if there are none) """
+        
+        if not self.Values:
+            return 0.0
+        return sum(self.Values) / len(self.Values)
+    
+    def __len__(self):
+        return len(self.Values)
+    
+    def __iter__(self):
+        return iter(self.Values)
+    
+    def __unicode__(self):
+        return u"PHPP Hourly Profile: '{}' | {} hours, avg {:.3f}".format(self.Name, len(self), self.mean())
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}( _values={!r}, _name={!r} )".format(
+                self.__class__.__name__,
+                self.Values.tolist(),
+                self.Name)
+
+def definitionKey(_definition):
+    """ Returns a hashable key built from the contents of a schedule definition
+    
+    Dicts (in key order), lists, tuples and sets are gone through item by item, and 
+    any other object by its attributes, so the key only changes if the contents do 
+    (never for the object's memory address, as a repr() might).
+    
+        >>> definitionKey({'values': [0, 1], 'type': 'compact'}) == definitionKey({'type': 'compact', 'values': (0, 1)})
+        True
+    """
+    
+    if _definition is None or isinstance(_definition, (bool, int, float, text_type, str, bytes)):
+        return _definition
+    elif isinstance(_definition, dict):
+        items = [(definitionKey(k), definitionKey(v)) for k, v in _definition.items()]
+        return ('dict', tuple(sorted(items, key=repr)))
+    elif isinstance(_definition, (list, tuple)):
+        return tuple(definitionKey(item) for item in _definition)
+    elif isinstance(_definition, (set, frozenset)):
+        return ('set', tuple(sorted((definitionKey(item) for item in _definition), key=repr)))
+    elif hasattr(_definition, '__dict__'):
+        return (type(_definition).__name__, definitionKey(vars(_definition)))
+    
+    return (type(_definition).__name__, text_type(_definition))
+
+def scheduleKey(_schedName, _startDay=None, _epwFile=None, _customHolidays=(), _definition=None):
+    """ Returns the PHPP_ScheduleCache key for reading a schedule with these options
+    
+    For a CSV file schedule the file's modified time is part of the key, so editing 
+    the file means it gets read again.
+    
+    Args:
+        _schedName (str): The schedule's name, or the path to its CSV file
+        _startDay: <Optional> The start day of the week option
+        _epwFile (str): <Optional> The EPW file used for the national holidays
+        _customHolidays (list): <Optional> Any custom holidays
+        _definition: <Optional> Anything else which changes if the schedule is re-defined 
+            (ie: its Honeybee library entry). Keyed by its contents, see definitionKey()
+    Returns:
+        tuple: The key
+    """
+    
+    modified = None
+    if str(_schedName).lower().endswith('.csv'):
+        try:
+            modified = os.path.getmtime(_schedName)
+        except OSError:
+            pass
+    
+    return (_schedName, modified, _startDay, _epwFile, tuple(_customHolidays or ()), definitionKey(_definition))
+
+class PHPP_ScheduleCache:
+    """ The PHPP_HourlyProfiles already read, by scheduleKey(). Least recently used are dropped first """
+    
+    def __init__(self, _maxEntries=256):
+        self.MaxEntries = _maxEntries
+        self.Entries = OrderedDict()
+        self.Hits = 0
+        self.Misses = 0
+    
+    def get(self, _key, _read):
+        """ Returns the profile for the key, calling _read() to get it if it isn't in the cache yet
+        
+        Args:
+            _key (tuple): From scheduleKey()
+            _read: Function which reads the schedule and returns its PHPP_HourlyProfile 
+                (None if it couldn't, which isn't kept, so it is tried again next time)
+        Returns:
+            PHPP_HourlyProfile: The profile (or None)
+        """
+        
+        if _key in self.Entries:
+            self.Hits += 1
+            profile = self.Entries.pop(_key)
+            self.Entries[_key] = profile
+            return profile
+        
+        self.Misses += 1
+        profile = _read()
+        if profile is not None:
+            self.Entries[_key] = profile
+            while len(self.Entries) > self.MaxEntries:
+                self.Entries.popitem(last=False)
+        
+        return profile
+    
+    def clear(self):
+        self.Entries.clear()
+        self.Hits = 0
+        self.Misses = 0
+    
+    def stats(self):
+        """ Returns {'entries', 'hits', 'misses', 'hitRate'} """
+        
+        lookups = self.Hits + self.Misses
+        return {'entries': len(self.Entries), 'hits': self.Hits, 'misses': self.Misses,
+                'hitRate': self.Hits / float(lookups) if lookups else 0.0}
+    
+    def __len__(self):
+        return len(self.Entries)
+    
+    def __unicode__(self):
+        return u"PHPP Schedule Cache | {} schedules  |  {} hits, {} misses".format(len(self), self.Hits, self.Misses)
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}( _maxEntries={!r} )".format(
+                self.__class__.__name__,
+                self.MaxEntries)
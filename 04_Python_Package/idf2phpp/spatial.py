@@ -0,0 +1,281 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Pure Python spatial indexes (no Rhino needed), for finding which objects are near 
+a line or a region before running the (slow) exact Rhino intersections on them.
+
+Everything works on axis aligned bounding boxes: (minX, minY, minZ, maxX, maxY, maxZ)
+
+    >>> bvh = PHPP_BVH([(0, 0, 0, 1, 1, 1), (5, 0, 0, 6, 1, 1)], ['a', 'b'])
+    >>> bvh.querySegment((-1, 0.5, 0.5), (2, 0.5, 0.5))
+    ['a']
+"""
+
+from __future__ import absolute_import
+import math
+from collections import defaultdict
+
+from ._compat import toStr
+
+def boxAround(_points, _pad=0.0):
+    """ Returns the bounding box (minX, minY, minZ, maxX, maxY, maxZ) around the points
+    
+    Args:
+        _points: The points. Anything with .X .Y .Z (Point3d, PHPP_Vector) or (x, y, z) tuples
+        _pad (float): Default=0. Grows the box by this much on every side.
+    """
+    
+    xyz = [(pt.X, pt.Y, pt.Z) if hasattr(pt, 'X') else tuple(pt) for pt in _points]
+    xs, ys, zs = zip(*xyz)
+    
+    return (min(xs) - _pad, min(ys) - _pad, min(zs) - _pad,
+            max(xs) + _pad, max(ys) + _pad, max(zs) + _pad)
+
+def boxesOverlap(_a, _b):
+    return (_a[0] <= _b[3] and _b[0] <= _a[3] and
+            _a[1] <= _b[4] and _b[1] <= _a[4] and
+            _a[2] <= _b[5] and _b[2] <= _a[5])
+
+def boxContains(_outer, _inner):
+    """ True if the _inner box is all inside (or on) the _outer box """
+    
+    return (_outer[0] <= _inner[0] and _outer[1] <= _inner[1] and _outer[2] <= _inner[2] and
+            _inner[3] <= _outer[3] and _inner[4] <= _outer[4] and _inner[5] <= _outer[5])
+
+def segmentHitsBox(_start, _end, _box):
+    """ True if the line segment from _start to _end (x, y, z) passes through the box (slab test) """
+    
+    tMin, tMax = 0.0, 1.0
+    for axis in range(3):
+        origin = _start[axis]
+        delta = _end[axis] - origin
+        lo, hi = _box[axis], _box[axis + 3]
+        
+        if abs(delta) < 1e-12:
+            if origin < lo or origin > hi:
+                return False
+            continue
+        
+        t1, t2 = (lo - origin) / delta, (hi - origin) / delta
+        if t1 > t2:
+            t1, t2 = t2, t1
+        tMin, tMax = max(tMin, t1), min(tMax, t2)
+        if tMin > tMax:
+            return False
+    
+    return True
+
+class PHPP_BVH:
+    """ A bounding volume hierarchy over a set of boxes, for quickly finding the boxes near a line or region
+    
+    Built once (top-down, splitting the boxes at the median of their centers along 
+    the longest axis) and then queried as often as needed. Queries return the items 
+    in the same order they were given in, so results match a plain loop over them.
+    """
+    
+    def __init__(self, _boxes, _items=None, _leafSize=4):
+        """
+        Args:
+            _boxes (list): The (minX, minY, minZ, maxX, maxY, maxZ) box for each item
+            _items (list): <Optional> The items the boxes belong to. Default is the box index.
+            _leafSize (int): Default=4. The most boxes in each leaf of the tree.
+        """
+        self.Boxes = [tuple(float(v) for v in box) for box in _boxes]
+        self.Items = list(_items) if _items is not None else list(range(len(self.Boxes)))
+        if len(self.Items) != len(self.Boxes):
+            raise ValueError('Got {} boxes for {} items'.format(len(self.Boxes), len(self.Items)))
+        
+        self.LeafSize = max(1, int(_leafSize))
+        self._root = self._build(list(range(len(self.Boxes)))) if self.Boxes else None
+    
+    def _build(self, _ids):
+        """ Returns a node: [box, left node, right node, ids (leaves only)] """
+        
+        box = self._boxAroundBoxes(_ids)
+        if len(_ids) <= self.LeafSize:
+            return [box, None, None, _ids]
+        
+        # Split at the median center along the box's longest axis
+        axis = max(range(3), key=lambda i: box[i + 3] - box[i])
+        _ids.sort(key=lambda i: self.Boxes[i][axis] + self.Boxes[i][axis + 3])
+        half = len(_ids) // 2
+        
+        return [box, self._build(_ids[:half]), self._build(_ids[half:]), None]
+    
+    def _boxAroundBoxes(self, _ids):
+        boxes = [self.Boxes[i] for i in _ids]
+        return (min(b[0] for b in boxes), min(b[1] for b in boxes), min(b[2] for b in boxes),
+                max(b[3] for b in boxes), max(b[4] for b in boxes), max(b[5] for b in boxes))
+    
+    def _query(self, _hitsBox):
+        """ Returns the ids of the boxes _hitsBox(box) is True for, in order """
+        
+        found = []
+        stack = [self._root] if self._root else []
+        while stack:
+            box, left, right, ids = stack.pop()
+            if not _hitsBox(box):
+                continue
+            
+            if ids is None:
+                stack.append(left)
+                stack.append(right)
+            else:
+                found.extend(i for i in ids if _hitsBox(self.Boxes[i]))
+        
+        return sorted(found)
+    
+    def queryBox(self, _box):
+        """ Returns the items whose boxes overlap the box (minX, minY, minZ, maxX, maxY, maxZ) """
+        
+        return [self.Items[i] for i in self._query(lambda box: boxesOverlap(box, _box))]
+    
+    def querySegment(self, _start, _end, _pad=0.0):
+        """ Returns the items whose boxes the line segment from _start to _end passes through
+        
+        Args:
+            _start, _end: The segment's end points. Anything with .X .Y .Z or (x, y, z) tuples
+            _pad (float): Default=0. Grows each box by this much first (ie: the model tolerance)
+        """
+        
+        start = [float(v) for v in ((_start.X, _start.Y, _start.Z) if hasattr(_start, 'X') else _start)]
+        end = [float(v) for v in ((_end.X, _end.Y, _end.Z) if hasattr(_end, 'X') else _end)]
+        
+        def hits(_box):
+            if _pad:
+                _box = (_box[0] - _pad, _box[1] - _pad, _box[2] - _pad,
+                        _box[3] + _pad, _box[4] + _pad, _box[5] + _pad)
+            return segmentHitsBox(start, end, _box)
+        
+        return [self.Items[i] for i in self._query(hits)]
+    
+    def queryPoints(self, _points, _pad=0.0):
+        """ Returns the items whose boxes overlap the box around the points (ie: a test surface's corners) """
+        
+        return self.queryBox(boxAround(_points, _pad))
+    
+    def __len__(self):
+        return len(self.Boxes)
+    
+    def __unicode__(self):
+        return u"PHPP Bounding Volume Hierarchy | {} boxes".format(len(self))
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}( _boxes={!r}, _items={!r}, _leafSize={!r} )".format(
+                self.__class__.__name__,
+                self.Boxes,
+                self.Items,
+                self.LeafSize)
+
+def overlappingPairs(_boxes, _cellSize=None, _maxCells=64):
+    """ Returns all the (i, j) pairs (i < j) of the boxes which overlap, sorted
+    
+    The boxes are bucketed in a uniform grid (a spatial hash), so only boxes which 
+    share a grid cell get compared: near-linear for lots of similar sized boxes, 
+    rather than comparing every box with every other.
+    
+    Args:
+        _boxes (list): The (minX, minY, minZ, maxX, maxY, maxZ) boxes
+        _cellSize (float): <Optional> The grid cell size. Default is the median box size.
+        _maxCells (int): Default=64. Boxes covering more grid cells than this (a few 
+            very big ones) are compared with every other box instead.
+    Returns:
+        list: The (i, j) index pairs
+    """
+    
+    if not _boxes:
+        return []
+    
+    cell = _cellSize
+    if not cell:
+        sizes = sorted(max(b[3] - b[0], b[4] - b[1], b[5] - b[2]) for b in _boxes)
+        cell = sizes[len(sizes) // 2] or 1.0
+    
+    grid = defaultdict(list)
+    bigBoxes = []
+    for i, box in enumerate(_boxes):
+        lo = [int(math.floor(box[axis] / cell)) for axis in range(3)]
+        hi = [int(math.floor(box[axis + 3] / cell)) for axis in range(3)]
+        if (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) * (hi[2] - lo[2] + 1) > _maxCells:
+            bigBoxes.append(i)
+            continue
+        
+        for x in range(lo[0], hi[0] + 1):
+            for y in range(lo[1], hi[1] + 1):
+                for z in range(lo[2], hi[2] + 1):
+                    grid[(x, y, z)].append(i)
+    
+    pairs = set()
+    for ids in grid.values():
+        for n, i in enumerate(ids):
+            for j in ids[n + 1:]:
+                if boxesOverlap(_boxes[i], _boxes[j]):
+                    pairs.add((i, j))
+    
+    for i in bigBoxes:
+        for j in range(len(_boxes)):
+            if i != j and boxesOverlap(_boxes[i], _boxes[j]):
+                pairs.add((min(i, j), max(i, j)))
+    
+    return sorted(pairs)
+
+class PHPP_UnionFind:
+    """ Disjoint sets of the items 0..n-1, for grouping things which touch (directly or through others) """
+    
+    def __init__(self, _count):
+        self.Parents = list(range(_count))
+    
+    def find(self, _i):
+        root = _i
+        while self.Parents[root] != root:
+            root = self.Parents[root]
+        
+        while self.Parents[_i] != root:
+            self.Parents[_i], _i = root, self.Parents[_i]
+        
+        return root
+    
+    def union(self, _i, _j):
+        """ Joins the sets _i and _j are in. The set is known by its lowest item """
+        
+        rootI, rootJ = self.find(_i), self.find(_j)
+        if rootI != rootJ:
+            self.Parents[max(rootI, rootJ)] = min(rootI, rootJ)
+    
+    def groups(self):
+        """ Returns the sets as lists of items, each sorted, ordered by their lowest item """
+        
+        groups = defaultdict(list)
+        for i in range(len(self.Parents)):
+            groups[self.find(i)].append(i)
+        
+        return [groups[root] for root in sorted(groups)]
+    
+    def __unicode__(self):
+        return u"PHPP Union Find | {} items in {} groups".format(len(self.Parents), len(self.groups()))
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}( _count={!r} )".format(
+                self.__class__.__name__,
+                len(self.Parents))
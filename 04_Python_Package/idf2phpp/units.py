@@ -0,0 +1,171 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Unit conversion for the PHPP values. 
+
+Each (SI unit, target unit) pair is built once, when the module is first imported, 
+into a plain function: a linear factor, an affine (factor and offset, for C --> F) or a 
+reciprocal (for U-Value --> R-Value). The reverse (target unit --> SI unit) of each is 
+built too. 
+
+    >>> convertValue(0.25, 'W/M2K', 'HR-FT2-F/BTU')
+    22.713056536
+    >>> convertMany([20, 21.5], 'C', 'F')
+    [68.0, 70.7]
+"""
+
+from __future__ import absolute_import
+
+from ._compat import string_types
+
+LINEAR = 'LINEAR'           # target = value * factor
+AFFINE = 'AFFINE'           # target = value * factor + offset
+RECIPROCAL = 'RECIPROCAL'   # target = factor / value
+
+# {SI unit: {Target unit: (kind, factor, offset)}, ...}
+CONVERSIONS = {
+        'C'     : {'F': (AFFINE, 1.8, 32.0)},
+        'LITER' : {'GALLON': (LINEAR, 0.264172, 0)},
+        'MM'    : {'FT': (LINEAR, 0.00328084, 0), 'IN': (LINEAR, 0.0394, 0)},
+        'M'     : {'FT': (LINEAR, 3.280839895, 0), 'IN': (LINEAR, 39.3701, 0)},
+        'M/DAY' : {'FT/DAY': (LINEAR, 3.280839895, 0)},
+        'M2'    : {'FT2': (LINEAR, 10.76391042, 0)},
+        'M3'    : {'FT3': (LINEAR, 35.31466672, 0)},
+        'M3/H'  : {'CFM': (LINEAR, 0.588577779, 0)},
+        'WH/M3' : {'W/CFM': (LINEAR, 1.699010796, 0)},
+        'WH/KM2': {'BTU/FT2': (LINEAR, 0.176110159, 0)},
+        'MJ/M3K': {'BTU/FT3-F': (LINEAR, 14.91066014, 0)},
+        'W/M2K' : {'BTU/HR-FT2-F': (LINEAR, 0.176110159, 0), 'HR-FT2-F/BTU': (RECIPROCAL, 5.678264134, 0)},
+        'M2K/W' : {'HR-FT2-F/BTU': (LINEAR, 5.678264134, 0)},
+        'W/MK'  : {'HR-FT2-F/BTU-IN': (RECIPROCAL, 0.144227909, 0), 'BTU/HR-FT-F': (LINEAR, 0.577789236, 0)},
+        'W/K'   : {'BTU/HR-F': (LINEAR, 1.895633976, 0)},
+        'KW'    : {'BTU/H': (LINEAR, 3412.141156, 0)},
+        'W/W'   : {'BTU/HW': (LINEAR, 3.412141156, 0)} # SEER
+        }
+
+def _identity(_value):
+    return _value
+
+def _buildConverter(_kind, _factor, _offset):
+    """ Returns the conversion function for the kind of conversion """
+    
+    if _kind == LINEAR:
+        return lambda _value: _value * _factor
+    elif _kind == AFFINE:
+        return lambda _value: _value * _factor + _offset
+    elif _kind == RECIPROCAL:
+        return lambda _value: _factor / _value
+    else:
+        raise ValueError('Unknown unit conversion kind: {}'.format(_kind))
+
+def _buildReverse(_kind, _factor, _offset):
+    """ Returns the function to convert back from the target unit to the SI unit """
+    
+    if _kind == LINEAR:
+        return _buildConverter(LINEAR, 1.0 / _factor, 0)
+    elif _kind == AFFINE:
+        return _buildConverter(AFFINE, 1.0 / _factor, -_offset / _factor)
+    else:
+        return _buildConverter(RECIPROCAL, _factor, 0)
+
+def _buildConverters(_conversions):
+    converters = {}
+    for unitSI, targets in _conversions.items():
+        for unitTarget, (kind, factor, offset) in targets.items():
+            converters[(unitSI, unitTarget)] = _buildConverter(kind, factor, offset)
+            converters[(unitTarget, unitSI)] = _buildReverse(kind, factor, offset)
+    
+    return converters
+
+_CONVERTERS = _buildConverters(CONVERSIONS)
+
+def getConverter(_fromUnit, _toUnit):
+    """ Returns the function which converts a number from one unit to another
+    
+    Any pair of units without a conversion (including to / from 'SI') returns the 
+    value unchanged.
+    
+    Args:
+        _fromUnit (str): The unit the value is in, ie: 'M'
+        _toUnit (str): The unit to convert the value to, ie: 'FT'
+    Returns:
+        function: Takes a number, returns the number in the new unit
+    """
+    
+    return _CONVERTERS.get((_fromUnit, _toUnit), _identity)
+
+def toNumber(_value):
+    """ Returns the value as a number. Numeric text ('12', '0.5') is read as an int or a float.
+    
+    Raises:
+        ValueError / TypeError: if the value is not a number
+    """
+    
+    if isinstance(_value, string_types):
+        try:
+            return int(_value)
+        except ValueError:
+            return float(_value)
+    elif isinstance(_value, (int, float)):
+        return _value
+    
+    return float(_value)
+
+def convertValue(_value, _fromUnit, _toUnit):
+    """ Converts a single value from one unit to another
+    
+    Args:
+        _value: The number (or numeric text) to convert
+        _fromUnit (str): The unit the value is in
+        _toUnit (str): The unit to convert the value to
+    Returns:
+        The converted number
+    Raises:
+        ValueError / TypeError / ZeroDivisionError: if the value can't be converted
+    """
+    
+    return getConverter(_fromUnit, _toUnit)(toNumber(_value))
+
+def convertMany(_values, _fromUnit, _toUnit):
+    """ Converts a list of values from one unit to another
+    
+    The conversion is only looked up once for the whole list. Any values which can't 
+    be converted (text, None, a reciprocal of 0) are returned unchanged.
+    
+    Args:
+        _values (list): The numbers (or numeric text) to convert
+        _fromUnit (str): The unit the values are in
+        _toUnit (str): The unit to convert the values to
+    Returns:
+        list: The converted values, in the same order
+    """
+    
+    converter = getConverter(_fromUnit, _toUnit)
+    
+    results = []
+    for value in _values:
+        try:
+            results.append(converter(toNumber(value)))
+        except (ValueError, TypeError, ZeroDivisionError):
+            results.append(value)
+    
+    return results
@@ -0,0 +1,492 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Writes cell values straight into a PHPP .xlsx file, without Excel. 
+
+The .xlsx file is a zip package of XML parts. Only the worksheets being written to are 
+changed, and only the rows in them with cells to write: every other part (and every 
+other row) is copied across as is, so the styles, formulas, names and macros in the PHPP 
+are kept. The workbook is flagged to do a full recalculation the next time Excel opens it.
+
+    >>> writeXLSX('house_PHPP.xlsx', [('Areas', 'L41', 12.5), ('Areas', 'M41', 'Ext Wall')])
+    2
+
+Works with the .xlsx / .xlsm files as saved by Excel (not the older binary .xls).
+"""
+
+from __future__ import absolute_import
+import os
+import re
+import zlib
+import struct
+import zipfile
+import posixpath
+import warnings
+from collections import OrderedDict
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from ._compat import IDF2PHPPWarning, text_type, string_types
+from .cells import parseCellAddress, cellAddress
+from .units import toNumber
+
+NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+NS_DOC_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+WORKBOOK_PART = 'xl/workbook.xml'
+WORKBOOK_RELS_PART = 'xl/_rels/workbook.xml.rels'
+CONTENT_TYPES_PART = '[Content_Types].xml'
+CALC_CHAIN_PART = 'xl/calcChain.xml'
+
+_ROW_START = re.compile(r'<(\w+:)?sheetData\b[^>]*?(/?)>')
+_ATTR_R = re.compile(r'\sr="([^"]*)"')
+_ATTR_S = re.compile(r'\ss="([^"]*)"')
+_ATTR_SPANS = re.compile(r'\sspans="[^"]*"')
+_FORMULA = re.compile(r'<(?:\w+:)?f\b([^>]*)')
+_CALC_PR = re.compile(r'<(\w+:)?calcPr\b([^>]*?)\s*/>')
+_FULL_CALC = re.compile(r'\sfullCalcOnLoad="[^"]*"')
+_AFTER_CALC_PR = re.compile(r'<(?:\w+:)?(?:oleSize|customWorkbookViews|pivotCaches|smartTagPr|smartTagTypes|webPublishing|fileRecoveryPr|webPublishObjects|extLst)\b|</(?:\w+:)?workbook>')
+_BAD_XML_CHARS = re.compile(u'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+#-------------------------------------------------------------------------------
+# The package parts
+def partPath(_sourcePart, _target):
+    """ Returns the zip member name for a relationship Target, relative to the part it belongs to """
+    
+    if _target.startswith('/'):
+        return _target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(_sourcePart), _target))
+
+def getSheetParts(_zipFile):
+    """ Returns the zip member name of each worksheet, by worksheet name
+    
+    Args:
+        _zipFile (zipfile.ZipFile): The open .xlsx file
+    Returns:
+        OrderedDict: {worksheet name: 'xl/worksheets/sheet1.xml', ...} in workbook order
+    """
+    
+    rels = ElementTree.fromstring(_zipFile.read(WORKBOOK_RELS_PART))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter('{%s}Relationship' % NS_PKG_REL)}
+    
+    workbook = ElementTree.fromstring(_zipFile.read(WORKBOOK_PART))
+    sheetParts = OrderedDict()
+    for sheet in workbook.iter('{%s}sheet' % NS_MAIN):
+        target = targets.get(sheet.get('{%s}id' % NS_DOC_REL))
+        if target:
+            sheetParts[sheet.get('name')] = partPath(WORKBOOK_PART, target)
+    
+    return sheetParts
+
+#-------------------------------------------------------------------------------
+# Cell XML
+def cellXML(_prefix, _address, _style, _value):
+    """ Returns the <c> element XML for the value, the same way Excel stores a value typed into the cell
+    
+    Numbers (and numeric text) are stored as numbers, text as an inline string, 
+    True / False as booleans and text starting with '=' as a formula. None or '' clears the cell.
+    """
+    
+    attrs = ' r="{}"'.format(_address)
+    if _style:
+        attrs += ' s="{}"'.format(_style)
+    
+    if _value is None or _value == '':
+        return u'<{0}c{1}/>'.format(_prefix, attrs)
+    
+    if isinstance(_value, bool):
+        return u'<{0}c{1} t="b"><{0}v>{2}</{0}v></{0}c>'.format(_prefix, attrs, int(_value))
+    
+    if isinstance(_value, string_types) and len(_value) > 1 and _value.startswith('='):
+        formula = escape(_BAD_XML_CHARS.sub(u'', _value[1:]))
+        return u'<{0}c{1}><{0}f>{2}</{0}f></{0}c>'.format(_prefix, attrs, formula)
+    
+    try:
+        number = toNumber(_value)
+        if number != number or number in (float('inf'), float('-inf')):
+            raise ValueError('Not a number Excel can store')
+        number = repr(float(number)) if isinstance(number, float) else str(number)
+        return u'<{0}c{1}><{0}v>{2}</{0}v></{0}c>'.format(_prefix, attrs, number)
+    except (ValueError, TypeError):
+        pass
+    
+    text = escape(_BAD_XML_CHARS.sub(u'', text_type(_value)))
+    return u'<{0}c{1} t="inlineStr"><{0}is><{0}t xml:space="preserve">{2}</{0}t></{0}is></{0}c>'.format(_prefix, attrs, text)
+
+def _formulaKind(_cellContent):
+    """ Returns None (no formula), 'formula', or 'master' for the first cell of a shared / array formula """
+    
+    match = _FORMULA.search(_cellContent or '')
+    if not match:
+        return None
+    
+    attrs = match.group(1)
+    if 'ref="' in attrs and ('t="shared"' in attrs or 't="array"' in attrs or 't="dataTable"' in attrs):
+        return 'master'
+    return 'formula'
+
+def patchRowXML(_prefix, _rowNum, _rowAttrs, _rowContent, _rowCells, _sheetName):
+    """ Returns the <row> element XML with the new cell values merged in (in column order)
+    
+    Args:
+        _prefix (str): The XML namespace prefix used in the worksheet ('' for Excel files)
+        _rowNum (int): The row number
+        _rowAttrs (str): The existing <row> attributes
+        _rowContent (str): The existing <row> content (its <c> elements)
+        _rowCells (dict): {column number: value} to write
+        _sheetName (str): The worksheet name, for the warnings
+    Returns:
+        tuple: (row XML, number of cells written, True if a formula was written over)
+    """
+    
+    # spans is only a hint for Excel, and may not be right anymore
+    rowAttrs = _ATTR_SPANS.sub('', _rowAttrs)
+    if not _ATTR_R.search(rowAttrs):
+        rowAttrs = ' r="{}"'.format(_rowNum) + rowAttrs
+    
+    cellRe = re.compile(r'<{0}c\b([^>]*?)(?:/>|>(.*?)</{0}c>)'.format(re.escape(_prefix)), re.S)
+    newCols = sorted(_rowCells)
+    out = []
+    pos = 0
+    col = 0
+    i = 0
+    numWritten = 0
+    formulaReplaced = False
+    
+    for cellMatch in cellRe.finditer(_rowContent):
+        cellAttrs = cellMatch.group(1)
+        ref = _ATTR_R.search(cellAttrs)
+        col = parseCellAddress(ref.group(1))[1] if ref else col + 1
+        
+        out.append(_rowContent[pos:cellMatch.start()])
+        while i < len(newCols) and newCols[i] < col:
+            out.append( cellXML(_prefix, cellAddress(_rowNum, newCols[i]), None, _rowCells[newCols[i]]) )
+            numWritten += 1
+            i += 1
+        
+        if i < len(newCols) and newCols[i] == col:
+            i += 1
+            address = cellAddress(_rowNum, col)
+            formula = _formulaKind(cellMatch.group(2))
+            if formula == 'master':
+                warnings.warn('Not writing to {}!{}: it is the first cell of a shared or array formula'.format(_sheetName, address), IDF2PHPPWarning)
+                out.append(cellMatch.group(0))
+            else:
+                style = _ATTR_S.search(cellAttrs)
+                out.append( cellXML(_prefix, address, style.group(1) if style else None, _rowCells[col]) )
+                numWritten += 1
+                formulaReplaced = formulaReplaced or bool(formula)
+        elif ref:
+            out.append(cellMatch.group(0))
+        else:
+            # Give it its address, since new cells may have been put in front of it
+            out.append('<{}c r="{}"{}'.format(_prefix, cellAddress(_rowNum, col), cellMatch.group(0)[len(_prefix) + 2:]))
+        
+        pos = cellMatch.end()
+    
+    for newCol in newCols[i:]:
+        out.append( cellXML(_prefix, cellAddress(_rowNum, newCol), None, _rowCells[newCol]) )
+        numWritten += 1
+    out.append(_rowContent[pos:])
+    
+    rowXML = u'<{0}row{1}>{2}</{0}row>'.format(_prefix, rowAttrs, u''.join(out))
+    
+    return rowXML, numWritten, formulaReplaced
+
+def patchSheetXML(_sheetXML, _cells, _sheetName=''):
+    """ Returns the worksheet XML with the new cell values in it. Rows without any new values are left exactly as they were.
+    
+    Args:
+        _sheetXML (str): The worksheet part's XML text
+        _cells (dict): {row number: {column number: value}}
+        _sheetName (str): The worksheet name, for the warnings
+    Returns:
+        tuple: (worksheet XML, number of cells written, True if a formula was written over)
+    """
+    
+    match = _ROW_START.search(_sheetXML)
+    if not match:
+        raise ValueError('No <sheetData> found in the worksheet {}'.format(_sheetName))
+    
+    prefix = match.group(1) or ''
+    if match.group(2):
+        # Empty <sheetData/>
+        head = _sheetXML[:match.start()] + u'<{}sheetData>'.format(prefix)
+        body = u''
+        tail = u'</{}sheetData>'.format(prefix) + _sheetXML[match.end():]
+    else:
+        end = _sheetXML.index(u'</{}sheetData>'.format(prefix), match.end())
+        head = _sheetXML[:match.end()]
+        body = _sheetXML[match.end():end]
+        tail = _sheetXML[end:]
+    
+    rowRe = re.compile(r'<{0}row\b([^>]*?)(?:/>|>(.*?)</{0}row>)'.format(re.escape(prefix)), re.S)
+    newRows = sorted(_cells)
+    out = [head]
+    pos = 0
+    rowNum = 0
+    i = 0
+    numWritten = 0
+    formulaReplaced = False
+    
+    for rowMatch in rowRe.finditer(body):
+        ref = _ATTR_R.search(rowMatch.group(1))
+        rowNum = int(ref.group(1)) if ref else rowNum + 1
+        
+        out.append(body[pos:rowMatch.start()])
+        while i < len(newRows) and newRows[i] < rowNum:
+            rowXML, n, _ = patchRowXML(prefix, newRows[i], '', '', _cells[newRows[i]], _sheetName)
+            out.append(rowXML)
+            numWritten += n
+            i += 1
+        
+        if i < len(newRows) and newRows[i] == rowNum:
+            rowXML, n, f = patchRowXML(prefix, rowNum, rowMatch.group(1), rowMatch.group(2) or '', _cells[rowNum], _sheetName)
+            out.append(rowXML)
+            numWritten += n
+            formulaReplaced = formulaReplaced or f
+            i += 1
+        else:
+            out.append(rowMatch.group(0))
+        
+        pos = rowMatch.end()
+    
+    for newRow in newRows[i:]:
+        rowXML, n, _ = patchRowXML(prefix, newRow, '', '', _cells[newRow], _sheetName)
+        out.append(rowXML)
+        numWritten += n
+    out.append(body[pos:])
+    out.append(tail)
+    
+    return u''.join(out), numWritten, formulaReplaced
+
+#-------------------------------------------------------------------------------
+# Workbook level parts
+def setFullCalcOnLoad(_workbookXML):
+    """ Returns the workbook XML with <calcPr fullCalcOnLoad="1"> set, so Excel recalculates everything when it opens the file """
+    
+    match = _CALC_PR.search(_workbookXML)
+    if match:
+        prefix, attrs = match.group(1) or '', _FULL_CALC.sub('', match.group(2))
+        calcPr = u'<{}calcPr{} fullCalcOnLoad="1"/>'.format(prefix, attrs)
+        return _workbookXML[:match.start()] + calcPr + _workbookXML[match.end():]
+    
+    prefix = re.search(r'<(\w+:)?workbook\b', _workbookXML).group(1) or ''
+    match = _AFTER_CALC_PR.search(_workbookXML)
+    calcPr = u'<{}calcPr fullCalcOnLoad="1"/>'.format(prefix)
+    return _workbookXML[:match.start()] + calcPr + _workbookXML[match.start():]
+
+def removeCalcChain(_parts):
+    """ Removes the calcChain part (and the references to it) from the {member name: XML text} parts
+    
+    Excel reports the file as damaged if the calculation chain lists a cell which no longer 
+    has a formula. It rebuilds the chain when the file is opened.
+    """
+    
+    _parts[CONTENT_TYPES_PART] = re.sub(r'<Override\b[^>]*PartName="/xl/calcChain.xml"[^>]*/>', '', _parts[CONTENT_TYPES_PART])
+    _parts[WORKBOOK_RELS_PART] = re.sub(r'<Relationship\b[^>]*Target="(?:/xl/)?calcChain.xml"[^>]*/>', '', _parts[WORKBOOK_RELS_PART])
+
+def _copyZipInfo(_info):
+    info = zipfile.ZipInfo(_info.filename, _info.date_time)
+    info.compress_type = _info.compress_type
+    info.external_attr = _info.external_attr
+    info.create_system = _info.create_system
+    return info
+
+#-------------------------------------------------------------------------------
+# Writing the zip package
+_ZIP_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_ZIP_CENTRAL_DIR = struct.Struct('<4s4B4HL2L5H2L')
+_ZIP_END = struct.Struct('<4s4H2LH')
+_ZIP_DATA_DESCRIPTOR = 0x08
+_ZIP_UTF8_NAME = 0x800
+_ZIP_MAX_SIZE = 0x7FFFFFFF  # Anything bigger might need Zip64, so is left to the zipfile module
+
+def _canCopyRaw(_zipIn, _filePath):
+    """ True if the zip package can be written by _RawZipWriter (no Zip64, nothing encrypted) """
+    
+    infos = _zipIn.infolist()
+    if len(infos) >= 0xFFFF or os.path.getsize(_filePath) > _ZIP_MAX_SIZE:
+        return False
+    
+    return all(not info.flag_bits & 0x01 and info.file_size <= _ZIP_MAX_SIZE for info in infos)
+
+class _RawZipWriter:
+    """ Writes a zip package where the unchanged members are copied still compressed
+    
+    The zipfile module can only write a member by compressing it again, which for a 
+    PHPP is nearly all the time spent saving. This copies the compressed bytes (and CRC) 
+    of each unchanged member straight across, and only compresses the changed ones.
+    No Zip64, so only for packages checked with _canCopyRaw().
+    """
+    
+    def __init__(self, _fileObj):
+        self.File = _fileObj
+        self.Offset = 0
+        self.Entries = []   # The central directory records
+    
+    def copy(self, _info, _fileIn):
+        """ Copies the member's compressed bytes from the (open, binary) source zip file """
+        
+        _fileIn.seek(_info.header_offset)
+        header = _ZIP_LOCAL_HEADER.unpack(_fileIn.read(_ZIP_LOCAL_HEADER.size))
+        if header[0] != b'PK\x03\x04':
+            raise zipfile.BadZipfile('Bad local file header for: {}'.format(_info.filename))
+        _fileIn.seek(header[10] + header[11], os.SEEK_CUR)
+        
+        self._write(_info, _info.flag_bits, _info.compress_type, _info.CRC, 
+                    _fileIn.read(_info.compress_size), _info.file_size)
+    
+    def writestr(self, _info, _data):
+        """ Compresses the bytes (deflate, unless the member was stored) and writes them as the member """
+        
+        compressType = zipfile.ZIP_STORED if _info.compress_type == zipfile.ZIP_STORED else zipfile.ZIP_DEFLATED
+        if compressType == zipfile.ZIP_DEFLATED:
+            compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            rawData = compressor.compress(_data) + compressor.flush()
+        else:
+            rawData = _data
+        
+        self._write(_info, 0, compressType, zlib.crc32(_data) & 0xFFFFFFFF, rawData, len(_data))
+    
+    def _write(self, _info, _flags, _compressType, _crc, _rawData, _fileSize):
+        if isinstance(_info.filename, bytes):
+            name, flags = _info.filename, _flags & ~_ZIP_UTF8_NAME
+        else:
+            try:
+                name, flags = _info.filename.encode('ascii'), _flags & ~_ZIP_UTF8_NAME
+            except UnicodeError:
+                name, flags = _info.filename.encode('utf-8'), _flags | _ZIP_UTF8_NAME
+        flags &= ~_ZIP_DATA_DESCRIPTOR # The sizes and CRC are all in the header
+        
+        year, month, day, hour, minute, second = _info.date_time
+        dosTime = hour << 11 | minute << 5 | second // 2
+        dosDate = (year - 1980) << 9 | month << 5 | day
+        version = 20 if _compressType == zipfile.ZIP_DEFLATED else 10
+        
+        self.File.write(_ZIP_LOCAL_HEADER.pack(b'PK\x03\x04', version, 0, flags, _compressType, 
+                        dosTime, dosDate, _crc, len(_rawData), _fileSize, len(name), 0))
+        self.File.write(name)
+        self.File.write(_rawData)
+        
+        self.Entries.append(_ZIP_CENTRAL_DIR.pack(b'PK\x01\x02', 20, _info.create_system, version, 0, 
+                        flags, _compressType, dosTime, dosDate, _crc, len(_rawData), _fileSize, 
+                        len(name), 0, 0, 0, 0, _info.external_attr & 0xFFFFFFFF, self.Offset) + name)
+        self.Offset += _ZIP_LOCAL_HEADER.size + len(name) + len(_rawData)
+    
+    def close(self):
+        """ Writes the central directory. Call once all the members are written """
+        
+        centralDir = b''.join(self.Entries)
+        self.File.write(centralDir)
+        self.File.write(_ZIP_END.pack(b'PK\x05\x06', 0, 0, len(self.Entries), len(self.Entries), 
+                        len(centralDir), self.Offset, 0))
+
+#-------------------------------------------------------------------------------
+def writeXLSX(_filePath, _writes, _outputFilePath=None, _fullCalcOnLoad=True):
+    """ Writes the cell values into an .xlsx file, without Excel
+    
+    The new file is written next to the output file first, then moved into place, so 
+    the workbook is never left half written.
+    
+    Args:
+        _filePath (str): The .xlsx file to write to
+        _writes (list): The (worksheet name, cell address, value) writes, ie: the 
+            same as the PHPP_XL_Obj Worksheet, Range and Value. If the same cell is 
+            written more than once, the last value is used.
+        _outputFilePath (str): <Optional> Save the new workbook as this file. Default
+            is to update the _filePath file.
+        _fullCalcOnLoad (bool): Default=True. Have Excel recalculate the whole workbook when it's opened
+    Returns:
+        int: The number of cells written
+    """
+    
+    outputFilePath = os.path.abspath(_outputFilePath or _filePath)
+    
+    # {sheet name: {row: {col: value}}}
+    cellsBySheet = OrderedDict()
+    for sheet, address, value in _writes:
+        rowCol = parseCellAddress(address)
+        if not rowCol:
+            warnings.warn('Can only write single cells to an .xlsx file, not: {}!{}'.format(sheet, address), IDF2PHPPWarning)
+            continue
+        cellsBySheet.setdefault(sheet, {}).setdefault(rowCol[0], {})[rowCol[1]] = value
+    
+    numWritten = 0
+    tempFilePath = outputFilePath + '.tmp'
+    with zipfile.ZipFile(_filePath, 'r') as zipIn:
+        sheetParts = getSheetParts(zipIn)
+        
+        # Build the changed parts
+        parts = {}
+        formulaReplaced = False
+        for sheet, cells in cellsBySheet.items():
+            if sheet not in sheetParts:
+                warnings.warn('Worksheet not found: {}'.format(sheet), IDF2PHPPWarning)
+                continue
+            
+            part = sheetParts[sheet]
+            sheetXML, n, f = patchSheetXML(zipIn.read(part).decode('utf-8'), cells, sheet)
+            parts[part] = sheetXML
+            numWritten += n
+            formulaReplaced = formulaReplaced or f
+        
+        if _fullCalcOnLoad:
+            parts[WORKBOOK_PART] = setFullCalcOnLoad(zipIn.read(WORKBOOK_PART).decode('utf-8'))
+        
+        names = zipIn.namelist()
+        if formulaReplaced and CALC_CHAIN_PART in names:
+            parts[CONTENT_TYPES_PART] = zipIn.read(CONTENT_TYPES_PART).decode('utf-8')
+            parts[WORKBOOK_RELS_PART] = zipIn.read(WORKBOOK_RELS_PART).decode('utf-8')
+            removeCalcChain(parts)
+            parts[CALC_CHAIN_PART] = None
+        
+        # Write the new package, in the same order. Unchanged parts are copied as is 
+        # (still compressed, unless it's too big to copy without the zipfile module)
+        try:
+            if _canCopyRaw(zipIn, _filePath):
+                with open(_filePath, 'rb') as fileIn, open(tempFilePath, 'wb') as fileOut:
+                    zipOut = _RawZipWriter(fileOut)
+                    for info in zipIn.infolist():
+                        if info.filename not in parts:
+                            zipOut.copy(info, fileIn)
+                        elif parts[info.filename] is not None:
+                            zipOut.writestr(info, parts[info.filename].encode('utf-8'))
+                    zipOut.close()
+            else:
+                with zipfile.ZipFile(tempFilePath, 'w', zipfile.ZIP_DEFLATED) as zipOut:
+                    for info in zipIn.infolist():
+                        if info.filename not in parts:
+                            zipOut.writestr(_copyZipInfo(info), zipIn.read(info.filename))
+                        elif parts[info.filename] is not None:
+                            zipOut.writestr(_copyZipInfo(info), parts[info.filename].encode('utf-8'))
+        except:
+            if os.path.exists(tempFilePath):
+                os.remove(tempFilePath)
+            raise
+    
+    if os.path.exists(outputFilePath):
+        os.remove(outputFilePath)
+    os.rename(tempFilePath, outputFilePath)
+    
+    return numWritten
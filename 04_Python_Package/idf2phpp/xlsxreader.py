@@ -0,0 +1,347 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Reads cell values from a PHPP (or library) .xlsx file, without Excel. 
+
+Only the XML of the worksheets asked for is read, with an iterative parser which stops 
+at the last row needed, and the workbook's shared strings are only read as far as the 
+cells found need them. Ranges come back the same as Excel's Range.Value2: a single value 
+for a single cell, or a tuple of rows (each a tuple of values) for a block of cells.
+
+    >>> with XLSX_Reader('PHPP_Library.xlsx') as reader:
+    ...     glazing, frames = reader.readRanges('Components', ['IE15:IG113', 'IL15:JC113'])
+    >>> glazing[0]
+    (u'2x Low-e, Argon', 0.52, 1.1)
+
+Formula cells give the value they had when the file was last saved by Excel. Works with 
+the .xlsx / .xlsm files as saved by Excel (not the older binary .xls).
+"""
+
+from __future__ import absolute_import
+import zipfile
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
+
+from ._compat import toStr
+from .cells import parseCellAddress, parseRangeAddress, cellAddress, groupCellReads, blockValues
+from .xlsx import NS_MAIN, getSheetParts
+
+SHARED_STRINGS_PART = 'xl/sharedStrings.xml'
+
+_TAG_ROW = '{%s}row' % NS_MAIN
+_TAG_CELL = '{%s}c' % NS_MAIN
+_TAG_VALUE = '{%s}v' % NS_MAIN
+_TAG_TEXT = '{%s}t' % NS_MAIN
+_TAG_INLINE = '{%s}is' % NS_MAIN
+_TAG_SHEET_DATA = '{%s}sheetData' % NS_MAIN
+_TAG_SI = '{%s}si' % NS_MAIN
+_TAG_PHONETIC = '{%s}rPh' % NS_MAIN
+
+def _itemText(_element):
+    """ Returns the text of a shared string <si> or inline string <is> element 
+    
+    Rich text is made up of several runs, each with its own <t>. The phonetic 
+    hints (<rPh>) are left out, the same as Excel does for the cell's value.
+    """
+    
+    texts = []
+    for child in _element:
+        if child.tag == _TAG_TEXT:
+            texts.append(child.text or u'')
+        elif child.tag != _TAG_PHONETIC:
+            texts.extend(t.text or u'' for t in child.iter(_TAG_TEXT))
+    
+    return u''.join(texts)
+
+def _cellValue(_cell):
+    """ Returns the value of the <c> element: a float, text, bool or None (empty), like Range.Value2 
+    
+    Shared strings come back as their index (an int), to be looked up once the 
+    whole worksheet has been read.
+    """
+    
+    cellType = _cell.get('t', 'n')
+    
+    if cellType == 'inlineStr':
+        inline = _cell.find(_TAG_INLINE)
+        return _itemText(inline) if inline is not None else None
+    
+    value = _cell.findtext(_TAG_VALUE)
+    if value is None or value == '':
+        return None
+    elif cellType == 's':
+        return int(value)
+    elif cellType == 'b':
+        return value == '1'
+    elif cellType in ('str', 'e'):
+        return value
+    
+    return float(value)
+
+class XLSX_SharedStrings:
+    """ The workbook's shared strings (the text used by the cells with t="s"), read lazily
+    
+    The sharedStrings part is only parsed as far as the highest index asked for so far.
+    """
+    
+    def __init__(self, _zipFile):
+        self._zipFile = _zipFile
+        self._strings = []
+        self._source = None
+        self._events = None
+        self._root = None
+        
+        if SHARED_STRINGS_PART in _zipFile.namelist():
+            self._source = _zipFile.open(SHARED_STRINGS_PART)
+            self._events = ElementTree.iterparse(self._source, events=('start', 'end'))
+    
+    def _readTo(self, _index):
+        while self._events is not None and len(self._strings) <= _index:
+            try:
+                event, element = next(self._events)
+            except StopIteration:
+                self.close()
+                break
+            
+            if event == 'start':
+                if self._root is None:
+                    self._root = element
+                continue
+            
+            if element.tag == _TAG_SI:
+                self._strings.append(_itemText(element))
+                self._root.clear()  # Done with the string, don't hold the whole part in memory
+    
+    def __getitem__(self, _index):
+        self._readTo(_index)
+        return self._strings[_index]
+    
+    def close(self):
+        if self._source is not None:
+            self._source.close()
+        self._source = None
+        self._events = None
+    
+    def __len__(self):
+        return len(self._strings)
+    
+    def __unicode__(self):
+        return u"XLSX Shared Strings | {} read so far".format(len(self._strings))
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}( _zipFile={!r} )".format(
+                self.__class__.__name__,
+                self._zipFile)
+
+class XLSX_Reader:
+    """ A read-only .xlsx file, to read cell values and ranges from without Excel """
+    
+    def __init__(self, _filePath):
+        """
+        Args:
+            _filePath (str): The .xlsx file to read
+        """
+        self.FilePath = _filePath
+        self._zipFile = zipfile.ZipFile(_filePath, 'r')
+        self._sheetParts = getSheetParts(self._zipFile)
+        self._sharedStrings = None
+    
+    @property
+    def SheetNames(self):
+        return list(self._sheetParts.keys())
+    
+    @property
+    def SharedStrings(self):
+        if self._sharedStrings is None:
+            self._sharedStrings = XLSX_SharedStrings(self._zipFile)
+        return self._sharedStrings
+    
+    def _readSheetCells(self, _sheet, _bounds):
+        """ Reads the cells inside any of the (top, left, bottom, right) bounds from the worksheet
+        
+        Returns:
+            dict: {(row, col): value} for each cell with a value. Empty cells are left out.
+        """
+        
+        if _sheet not in self._sheetParts:
+            raise KeyError('Worksheet not found: {}'.format(_sheet))
+        
+        lastRow = max(bounds[2] for bounds in _bounds)
+        
+        # The (left, right) columns wanted on each row, so each cell is only checked against its own row's
+        colsByRow = {}
+        for top, left, bottom, right in _bounds:
+            for row in range(top, bottom + 1):
+                colsByRow.setdefault(row, []).append((left, right))
+        
+        values = {}
+        sharedIndexes = {}
+        
+        source = self._zipFile.open(self._sheetParts[_sheet])
+        try:
+            sheetData = None
+            rowNum = 0
+            col = 0
+            for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+                if event == 'start':
+                    if element.tag == _TAG_ROW:
+                        ref = element.get('r')
+                        rowNum = int(ref) if ref else rowNum + 1
+                        col = 0
+                        if rowNum > lastRow:
+                            break
+                    elif element.tag == _TAG_SHEET_DATA:
+                        sheetData = element
+                    continue
+                
+                if element.tag == _TAG_CELL:
+                    ref = element.get('r')
+                    col = parseCellAddress(ref)[1] if ref else col + 1
+                    
+                    for left, right in colsByRow.get(rowNum, ()):
+                        if left <= col <= right:
+                            value = _cellValue(element)
+                            if value is not None:
+                                values[(rowNum, col)] = value
+                                if element.get('t') == 's':
+                                    sharedIndexes[(rowNum, col)] = value
+                            break
+                elif element.tag == _TAG_ROW and sheetData is not None:
+                    sheetData.clear()  # Done with the row, don't hold the whole sheet in memory
+        finally:
+            source.close()
+        
+        for rowCol, index in sharedIndexes.items():
+            values[rowCol] = self.SharedStrings[index]
+        
+        return values
+    
+    def readRanges(self, _sheet, _addresses):
+        """ Reads several ranges from the same worksheet, in one pass over its XML
+        
+        Args:
+            _sheet (str): The worksheet name
+            _addresses (list): The A1 style range addresses, ie: ['IE15:IG113', 'IL15:JC113', 'B3']
+        Returns:
+            list: The value for each address, the same as Range.Value2: a single value for 
+                a single cell address, or a tuple of rows (tuples of values) for a range. 
+                Empty cells are None.
+        """
+        
+        bounds = []
+        for address in _addresses:
+            rangeBounds = parseRangeAddress(address)
+            if not rangeBounds:
+                raise ValueError('Can only read cell ranges like "A1:B2" from an .xlsx file, not: {}!{}'.format(_sheet, address))
+            bounds.append(rangeBounds)
+        
+        if not bounds:
+            return []
+        
+        values = self._readSheetCells(_sheet, bounds)
+        
+        results = []
+        for address, (top, left, bottom, right) in zip(_addresses, bounds):
+            if ':' not in str(address):
+                results.append(values.get((top, left)))
+                continue
+            
+            results.append(tuple(tuple(values.get((row, col)) for col in range(left, right + 1))
+                                 for row in range(top, bottom + 1)))
+        
+        return results
+    
+    def readRange(self, _sheet, _address):
+        """ Reads one range (or cell) from the worksheet. See readRanges() """
+        
+        return self.readRanges(_sheet, [_address])[0]
+    
+    def readCells(self, _cells):
+        """ Reads single cells from any of the worksheets, one pass over each worksheet's XML
+        
+        The cells are grouped into rectangular blocks first (see cells.groupCellReads), 
+        so each worksheet's XML is only checked against a few ranges.
+        
+        Args:
+            _cells (list): The (worksheet name, cell address) cells to read
+        Returns:
+            dict: {(worksheet name, cell address): value}. Empty cells are None, and 
+                cells on worksheets which don't exist are left out.
+        """
+        
+        cells = [(sheet, address) for sheet, address in _cells
+                 if parseCellAddress(address) and sheet in self._sheetParts]
+        
+        blockValuesBySheet = {}
+        for sheet, blocks in groupCellReads(cells).items():
+            sheetValues = blockValuesBySheet.setdefault(sheet, {})
+            for block, value2 in zip(blocks, self.readRanges(sheet, [block.Address for block in blocks])):
+                sheetValues.update(blockValues(block, value2))
+        
+        values = {}
+        for sheet, address in cells:
+            values[(sheet, address)] = blockValuesBySheet[sheet].get(cellAddress(*parseCellAddress(address)))
+        
+        return values
+    
+    def close(self):
+        if self._sharedStrings is not None:
+            self._sharedStrings.close()
+        self._zipFile.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, _type, _value, _traceback):
+        self.close()
+    
+    def __unicode__(self):
+        return u"XLSX Reader | {}  |  {} worksheets".format(self.FilePath, len(self._sheetParts))
+    def __str__(self):
+        return toStr(self.__unicode__())
+    def __repr__(self):
+        return "{}( _filePath={!r} )".format(
+                self.__class__.__name__,
+                self.FilePath)
+
+def readXLSXRanges(_filePath, _sheet, _addresses):
+    """ Reads the ranges from one worksheet of an .xlsx file. See XLSX_Reader.readRanges() """
+    
+    with XLSX_Reader(_filePath) as reader:
+        return reader.readRanges(_sheet, _addresses)
+
+def readXLSXCells(_filePath, _cells):
+    """ Reads the values of some cells from an .xlsx file, without Excel
+    
+    Args:
+        _filePath (str): The .xlsx file to read
+        _cells (list): The (worksheet name, cell address) cells to read
+    Returns:
+        dict: {(worksheet name, cell address): value}. Empty cells are None, and 
+            cells on worksheets which don't exist are left out.
+    """
+    
+    with XLSX_Reader(_filePath) as reader:
+        return reader.readCells(_cells)
@@ -0,0 +1,166 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Checks the idf2phpp.units converters against the old eval() conversion schema
+
+Run from the 04_Python_Package folder with:  python -m pytest tests
+"""
+
+from __future__ import absolute_import, division
+
+import unittest
+
+from idf2phpp.phpp import PHPP_XL_Obj
+from idf2phpp.units import CONVERSIONS, RECIPROCAL, convertValue, convertMany, getConverter
+
+# The PHPP_XL_Obj.conversionSchema before it was replaced by idf2phpp.units. 
+# This module uses true division, so the '(9/5)' gives 1.8 on Python 2 as well.
+OLD_SCHEMA = {
+        'C'    : {'SI':'*1', 'C':'*1', 'F':'*(9/5)+32'},
+        'LITER': {'SI':'*1', 'LITER':'*1', 'GALLON':'*0.264172'},
+        'MM'   : {'SI':'*1', 'MM':'*1', 'FT':'*0.00328084', 'IN':'*0.0394'},
+        'M'    : {'SI':'*1', 'M':'*1', 'FT':'*3.280839895', 'IN':'*39.3701'},
+        'M/DAY': {'SI':'*1', 'M/DAY':'*1', 'FT/DAY':'*3.280839895'},
+        'M2'   : {'SI':'*1', 'M2':'*1', 'FT2':'*10.76391042'},
+        'M3'   : {'SI':'*1', 'M3':'*1', 'FT3':'*35.31466672'},
+        'M3/H' : {'SI':'*1', 'M3/H':'*1', 'CFM':'*0.588577779'},
+        'WH/M3': {'SI':'*1', 'WH/M3':'*1', 'W/CFM':'*1.699010796'},
+        'WH/KM2':{'SI':'*1', 'WH/KM2':'*1', 'BTU/FT2':'*0.176110159'},
+        'MJ/M3K':{'SI':'*1', 'MJ/M3K':'*1', 'BTU/FT3-F':'*14.91066014'},
+        'W/M2K': {'SI':'*1', 'W/M2K':'*1', 'BTU/HR-FT2-F':'*0.176110159','HR-FT2-F/BTU':'**-1*5.678264134' },
+        'M2K/W': {'SI':'*1', 'M2K/W':'*1', 'HR-FT2-F/BTU':'*5.678264134'},
+        'W/MK' : {'SI':'*1', 'W/MK':'*1', 'HR-FT2-F/BTU-IN':'**-1*0.144227909', 'BTU/HR-FT-F':'*0.577789236'},
+        'W/K'  : {'SI':'*1', 'W/K':'*1', 'BTU/HR-F':'*1.895633976'},
+        'KW'   : {'SI':'*1', 'KW':'*1','BTU/H':'*3412.141156'},
+        'W/W'  : {'SI':'*1', 'W/W':'*1', 'BTU/HW':'*3.412141156'} # SEER
+        }
+
+VALUES = [0, 1, -5, 20, 0.25, 2.5, 21.5, 1234.5678, '12', '0.5']
+
+def oldGetValue(_value, _unitSI, _targetUnit):
+    """ The old PHPP_XL_Obj.getValue() conversion """
+    
+    try:
+        schema = OLD_SCHEMA.get(_unitSI, {'SI':1})
+        conversionFactor = schema.get(_targetUnit, 1)
+        return eval( str(_value)+str(conversionFactor))
+    except:
+        return _value
+
+def allPairs():
+    for unitSI, targets in sorted(CONVERSIONS.items()):
+        for unitTarget in sorted(targets):
+            yield unitSI, unitTarget
+
+class TestConversionTable(unittest.TestCase):
+    
+    def test_same_units_as_old_schema(self):
+        old = set((unitSI, unitTarget) for unitSI, targets in OLD_SCHEMA.items()
+                  for unitTarget in targets if unitTarget not in ('SI', unitSI))
+        
+        self.assertEqual(set(allPairs()), old)
+
+class TestConvertValue(unittest.TestCase):
+    
+    def assertClose(self, _a, _b, _msg=None):
+        self.assertTrue(abs(_a - _b) <= 1e-9 * max(1.0, abs(_b)), _msg or '{!r} != {!r}'.format(_a, _b))
+    
+    def test_matches_old_eval(self):
+        for unitSI, unitTarget in allPairs():
+            for value in VALUES:
+                old = oldGetValue(value, unitSI, unitTarget)
+                msg = '{!r} {} --> {}'.format(value, unitSI, unitTarget)
+                
+                if old is value:
+                    # The old eval failed (a reciprocal of 0), so returned the value as is
+                    self.assertRaises(ZeroDivisionError, convertValue, value, unitSI, unitTarget)
+                else:
+                    self.assertClose(convertValue(value, unitSI, unitTarget), old, msg)
+    
+    def test_same_unit_and_si_unchanged(self):
+        for unitSI in CONVERSIONS:
+            for target in ('SI', unitSI):
+                for value in VALUES:
+                    self.assertEqual(convertValue(value, unitSI, target), oldGetValue(value, unitSI, target))
+    
+    def test_affine_c_to_f(self):
+        self.assertClose(convertValue(20, 'C', 'F'), 68.0)
+        self.assertClose(convertValue(-40, 'C', 'F'), -40.0)
+        self.assertClose(convertValue(0, 'C', 'F'), oldGetValue(0, 'C', 'F'))
+        self.assertClose(convertValue(212, 'F', 'C'), 100.0)
+    
+    def test_reciprocal_r_value(self):
+        self.assertClose(convertValue(0.25, 'W/M2K', 'HR-FT2-F/BTU'), 5.678264134 / 0.25)
+        self.assertClose(convertValue(0.25, 'W/M2K', 'HR-FT2-F/BTU'), oldGetValue(0.25, 'W/M2K', 'HR-FT2-F/BTU'))
+        self.assertClose(convertValue(0.04, 'W/MK', 'HR-FT2-F/BTU-IN'), oldGetValue(0.04, 'W/MK', 'HR-FT2-F/BTU-IN'))
+        self.assertClose(convertValue(22.713056536, 'HR-FT2-F/BTU', 'W/M2K'), 0.25)
+    
+    def test_reverse_round_trips(self):
+        for unitSI, unitTarget in allPairs():
+            toTarget = getConverter(unitSI, unitTarget)
+            toSI = getConverter(unitTarget, unitSI)
+            for value in (1, 0.25, 21.5, 1234.5678):
+                self.assertClose(toSI(toTarget(value)), value, '{} <--> {}'.format(unitSI, unitTarget))
+    
+    def test_none_and_empty_raise(self):
+        for unitSI, unitTarget in allPairs():
+            for value in (None, ''):
+                self.assertRaises((ValueError, TypeError), convertValue, value, unitSI, unitTarget)
+
+class TestConvertMany(unittest.TestCase):
+    
+    def test_matches_convert_value(self):
+        for unitSI, unitTarget in allPairs():
+            values = [v for v in VALUES if v not in (0, '0')]
+            expected = [convertValue(v, unitSI, unitTarget) for v in values]
+            
+            self.assertEqual(convertMany(values, unitSI, unitTarget), expected)
+    
+    def test_unconvertible_values_unchanged_like_old_eval(self):
+        for unitSI, unitTarget in allPairs():
+            values = [None, '', 'n/a']
+            
+            self.assertEqual(convertMany(values, unitSI, unitTarget), values)
+            self.assertEqual(values, [oldGetValue(v, unitSI, unitTarget) for v in values])
+    
+    def test_reciprocal_of_zero_unchanged_like_old_eval(self):
+        for unitSI, unitTarget in allPairs():
+            if CONVERSIONS[unitSI][unitTarget][0] != RECIPROCAL:
+                continue
+            
+            self.assertEqual(convertMany([0, 0.5], unitSI, unitTarget)[0], oldGetValue(0, unitSI, unitTarget))
+
+class TestPHPPXLObj(unittest.TestCase):
+    
+    def test_get_value_matches_old_eval(self):
+        for unitSI, unitTarget in allPairs():
+            for value in VALUES + [None, '']:
+                obj = PHPP_XL_Obj('Areas', 'A1', value, unitSI, unitTarget)
+                old = oldGetValue(value, unitSI, unitTarget)
+                
+                if isinstance(old, float):
+                    self.assertTrue(abs(obj.getValue('IP') - old) <= 1e-9 * max(1.0, abs(old)))
+                else:
+                    self.assertEqual(obj.getValue('IP'), old)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+# 
+# This component is part of IDF2PHPP.
+# 
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com> 
+# IDF2PHPP is free software; you can redistribute it and/or modify 
+# it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation; either version 3 of the License, 
+# or (at your option) any later version. 
+# 
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the 
+# GNU General Public License for more details.
+# 
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+# 
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Checks the pure Python parts of finding a TFA surface's host zone (BT_CORE's 
+PHPP_ZoneLocator): the inset test outline, the bounding box pre-filter and the 
+winding number test of its corners.
+
+Run from the 04_Python_Package folder with:  python -m pytest tests
+"""
+
+from __future__ import absolute_import, division
+
+import unittest
+
+from idf2phpp.geometry import phpp_insetPolygon, phpp_windingNumber
+from idf2phpp.spatial import boxAround, boxContains
+
+TOLERANCE = 0.001   # The usual Rhino model tolerance (m)
+INSET = 0.01        # How far the TFA surface is inset, and moved up, to test it
+
+def boxTriangles(_min, _max):
+    """ The 12 (outward facing) triangles of an axis aligned box zone """
+    
+    (x0, y0, z0), (x1, y1, z1) = _min, _max
+    pts = [(x0, y0, z0), (x1, y0, z0), (x1, y1, z0), (x0, y1, z0),
+           (x0, y0, z1), (x1, y0, z1), (x1, y1, z1), (x0, y1, z1)]
+    faces = [(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)]
+    
+    triangles = []
+    for a, b, c, d in faces:
+        triangles.append((pts[a], pts[b], pts[c]))
+        triangles.append((pts[a], pts[c], pts[d]))
+    return triangles
+
+def insetCorners(_outline):
+    """ Same as PHPP_ZoneLocator.insetCorners() """
+    
+    return phpp_insetPolygon(_outline, INSET, TOLERANCE, INSET)
+
+def floorSurface(_maxX):
+    """ A floor surface in the 4 x 3 zone, reaching out to _maxX """
+    
+    return [(0, 0, 0), (_maxX, 0, 0), (_maxX, 3, 0), (0, 3, 0)]
+
+class TestZoneCandidates(unittest.TestCase):
+    
+    def setUp(self):
+        self.zoneBox = boxAround([(0, 0, 0), (4, 3, 2.5)], TOLERANCE)
+        self.zoneTriangles = boxTriangles((0, 0, 0), (4, 3, 2.5))
+    
+    def isCandidate(self, _outline):
+        return boxContains(self.zoneBox, boxAround(insetCorners(_outline)))
+    
+    def cornersInZone(self, _outline):
+        return all(abs(phpp_windingNumber(pt, self.zoneTriangles)) > 0.75 for pt in insetCorners(_outline))
+    
+    def test_inset_corners_moved_up(self):
+        corners = insetCorners(floorSurface(4))
+        
+        self.assertEqual(len(corners), 4)
+        for pt in corners:
+            self.assertAlmostEqual(pt.Z, INSET)
+            self.assertTrue(INSET - 1e-9 <= pt.X <= 4 - INSET + 1e-9)
+    
+    def test_surface_inside_the_zone(self):
+        self.assertTrue(self.isCandidate(floorSurface(4)))
+        self.assertTrue(self.cornersInZone(floorSurface(4)))
+    
+    def test_surface_a_few_mm_past_the_wall_keeps_its_host(self):
+        # 5mm past the wall: more than the tolerance, less than the inset
+        outline = floorSurface(4.005)
+        rawBox = boxAround(outline)
+        
+        self.assertFalse(boxContains(self.zoneBox, rawBox))
+        self.assertTrue(self.isCandidate(outline))
+        self.assertTrue(self.cornersInZone(outline))
+    
+    def test_surface_a_few_mm_below_the_floor_keeps_its_host(self):
+        outline = [(x, y, -0.005) for x, y, z in floorSurface(4)]
+        
+        self.assertTrue(self.isCandidate(outline))
+        self.assertTrue(self.cornersInZone(outline))
+    
+    def test_surface_through_the_wall_has_no_host(self):
+        outline = floorSurface(4.5)
+        
+        self.assertFalse(self.isCandidate(outline))
+        self.assertFalse(self.cornersInZone(outline))
+
+if __name__ == '__main__':
+    unittest.main()